@@ -0,0 +1,512 @@
+"""Load-test the strain-gauge acquisition stack on the synthetic LJM backend.
+
+This runs ``start_sg_logging`` end to end (stream callback, sink pipeline,
+CSV files and plot buffers) against :class:`tvac.labjack_sim.SyntheticLJM`,
+so it needs neither a T7 nor the LJM library. For example, 100 kHz
+aggregate over eight channels for one minute:
+
+    sg_load_test run --channels 8 --aggregate-rate 100000 --duration 60
+
+``replay`` feeds a raw stream recording (``record_raw``) through the same
+path, at the recorded pace, N times faster or as fast as possible:
+
+    sg_load_test replay sg_20260918_101500.ljr --speed max
+
+``bench`` measures the stream callback latency and the sink throughput while
+a matplotlib redraw and busy "building block" threads compete for the
+interpreter, and writes the results as JSON. Run it once on the regular
+CPython build and once on the free-threaded build (``python3.13t``) and put
+the two side by side with ``compare``:
+
+    python3.13  -m scripts.sg_load_test bench --json gil.json
+    python3.13t -m scripts.sg_load_test bench --json nogil.json
+    sg_load_test compare gil.json nogil.json
+"""
+
+import bisect
+import json
+import platform
+import sys
+import sysconfig
+import tempfile
+import threading
+import time
+
+import click
+import rich
+from egse.setup import Setup
+
+from tvac.labjack_replay import ReplayLJM
+from tvac.labjack_sim import Noise, Offset, Sine, SyntheticLJM
+from tvac.strain_gauge import (
+    drain_sg_sinks,
+    get_sg_buffer_stats,
+    get_sg_sink_stats,
+    get_sg_status,
+    get_sg_stream_stats,
+    reset_sg_runtime_settings,
+    set_sg_backend,
+    start_sg_logging,
+    stop_sg_logging,
+)
+
+
+def _synthetic_setup(
+    num_channels: int,
+    scan_rate: float,
+    save_path: str,
+    plot: bool,
+    ain_channels: list[int] | None = None,
+):
+    """Build a minimal Setup with a ``gse.labjack_t7`` block for the load test.
+
+    The channels are AIN0, AIN2, ... unless ``ain_channels`` lists them.
+    """
+    if ain_channels is None:
+        ain_channels = [2 * idx for idx in range(num_channels)]
+    channels = {
+        f"SG_AIN{ain}": {
+            "ain_channel": ain,
+            "voltage_range": 0.1,
+            "neg_voltage_range": 10.0,
+            "resolution_index": 0,
+        }
+        for ain in ain_channels
+    }
+    return Setup(
+        {
+            "gse": {
+                "labjack_t7": {
+                    "channels": channels,
+                    "stream": {
+                        "scan_rate": scan_rate,
+                        "resync_interval_s": 60,
+                        "buffer_size": 32768,
+                    },
+                    "csv": {
+                        "enabled": True,
+                        "save_path": save_path,
+                        "base_filename": "sg_load_test",
+                        "max_file_size_bytes": 50_000_000,
+                    },
+                    "metrics": {"enabled": False},
+                    "plot": {
+                        "enabled": plot,
+                        "window_seconds": 10,
+                        "interval_ms": 200,
+                        "show_stats": False,
+                    },
+                }
+            }
+        }
+    )
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option("--channels", default=8, show_default=True, help="Number of SG channels.")
+@click.option(
+    "--aggregate-rate",
+    default=100_000.0,
+    show_default=True,
+    help="Total samples/s over all channels.",
+)
+@click.option("--duration", default=30.0, show_default=True, help="Test duration [s].")
+@click.option(
+    "--time-scale",
+    default=1.0,
+    show_default=True,
+    help="Simulated device clock speed relative to real time.",
+)
+@click.option("--plot/--no-plot", default=True, help="Feed the live-plot buffers.")
+@click.option("--save-path", default=None, help="CSV directory (default: a temp dir).")
+def run(channels, aggregate_rate, duration, time_scale, plot, save_path):
+    """Stream synthetic data through start_sg_logging and report throughput."""
+    scan_rate = aggregate_rate / channels
+    save_path = save_path or tempfile.mkdtemp(prefix="sg_load_test_")
+    setup = _synthetic_setup(channels, scan_rate, save_path, plot)
+
+    backend = SyntheticLJM(
+        default_signal=[Offset(1e-3), Sine(5e-4, 17.0), Noise(20e-6)],
+        time_scale=time_scale,
+    )
+    set_sg_backend(backend)
+    reset_sg_runtime_settings()
+
+    rich.print(
+        f"Load test: {channels} channels x {scan_rate:.1f} Hz "
+        f"= {aggregate_rate:.0f} samples/s for {duration} s -> {save_path}"
+    )
+
+    start_sg_logging(setup=setup)
+    t_start = time.monotonic()
+    max_backlog = 0
+    try:
+        while time.monotonic() - t_start < duration:
+            time.sleep(1.0)
+            max_backlog = max(max_backlog, backend.buffered_scans)
+            rich.print(get_sg_status())
+    finally:
+        sink_stats = get_sg_sink_stats()
+        buffer_stats = get_sg_buffer_stats()
+        stop_sg_logging()
+        set_sg_backend(None)
+
+    elapsed = time.monotonic() - t_start
+    _print_throughput(elapsed, channels, max_backlog, backend, sink_stats, buffer_stats)
+
+
+@cli.command()
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--speed",
+    default="1.0",
+    show_default=True,
+    help="1.0 = recorded pace, N = N times faster, 'max' = as fast as possible.",
+)
+@click.option("--plot/--no-plot", default=True, help="Feed the live-plot buffers.")
+@click.option("--save-path", default=None, help="CSV directory (default: a temp dir).")
+@click.option(
+    "--timeout", default=None, type=float, help="Stop the replay after this [s]."
+)
+def replay(file, speed, plot, save_path, timeout):
+    """Replay a raw stream recording through start_sg_logging and report throughput.
+
+    FILE is a ``.ljr`` recording of a session with ``record_raw`` enabled. The
+    analog channels in its header become the channels of the replayed
+    session.
+    """
+    if speed.lower() in ("max", "none", "0"):
+        speed = None
+    else:
+        try:
+            speed = float(speed)
+        except ValueError:
+            raise click.BadParameter(
+                f"expected a number or 'max', got {speed!r}", param_hint="--speed"
+            ) from None
+
+    backend = ReplayLJM(file, speed=speed)
+    names = backend.header["channel_names"]
+    ain_channels = [
+        int(name[3:]) for name in names if name.startswith("AIN") and name[3:].isdigit()
+    ]
+    if len(ain_channels) != len(names):
+        other = ", ".join(name for name in names if not name.startswith("AIN"))
+        raise click.ClickException(
+            f"{file} also streams {other}; replay it with "
+            "replay_sg_recording() and the original setup."
+        )
+    scan_rate = float(backend.header["scan_rate"])
+    save_path = save_path or tempfile.mkdtemp(prefix="sg_load_test_")
+    setup = _synthetic_setup(
+        len(ain_channels), scan_rate, save_path, plot, ain_channels=ain_channels
+    )
+
+    set_sg_backend(backend)
+    reset_sg_runtime_settings()
+
+    rich.print(
+        f"Replay: {file}, {len(ain_channels)} channels x {scan_rate:.1f} Hz at "
+        f"{'maximum' if speed is None else f'{speed:g}x'} speed -> {save_path}"
+    )
+
+    # Restarting would replay the recording from the start, and the end of
+    # the recording looks like a stall.
+    start_sg_logging(setup=setup, supervise=False)
+    t_start = time.monotonic()
+    max_backlog = 0
+    try:
+        while not backend.wait_until_drained(timeout=1.0):
+            max_backlog = max(max_backlog, backend.buffered_scans)
+            rich.print(get_sg_status())
+            if timeout is not None and time.monotonic() - t_start > timeout:
+                rich.print(f"Replay did not finish within {timeout} s.")
+                break
+        drain_sg_sinks(timeout=timeout)
+    finally:
+        sink_stats = get_sg_sink_stats()
+        buffer_stats = get_sg_buffer_stats()
+        stop_sg_logging()
+        set_sg_backend(None)
+
+    elapsed = time.monotonic() - t_start
+    _print_throughput(
+        elapsed, len(ain_channels), max_backlog, backend, sink_stats, buffer_stats
+    )
+
+
+def _print_throughput(
+    elapsed: float,
+    num_channels: int,
+    max_backlog: int,
+    backend,
+    sink_stats: dict,
+    buffer_stats: dict,
+) -> None:
+    rich.print(f"\nElapsed: {elapsed:.1f} s, max LJM backlog: {max_backlog} scans")
+    rich.print(f"Scans lost in the simulated LJM buffer: {backend.overflowed_scans}")
+    rich.print(
+        f"Pipeline allocations: {buffer_stats['allocations']} in "
+        f"{buffer_stats['batches']} batches "
+        f"({buffer_stats['allocations_per_batch']:.3f}/batch), "
+        f"fewest free blocks: {buffer_stats['low_water']}/{buffer_stats['blocks']}"
+    )
+    for name, stats in sink_stats.items():
+        throughput = stats["processed_scans"] * num_channels / elapsed
+        rich.print(
+            f"  {name:8s} {throughput:12.0f} samples/s  "
+            f"busy={stats['busy_s']:.1f} s  "
+            f"max lag={stats['high_water_scans']} scans  "
+            f"dropped={stats['dropped_scans']}  spilled={stats['spilled_scans']}"
+        )
+
+
+def _interpreter() -> dict:
+    """Describe the running interpreter, including whether the GIL is on."""
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    # Only free-threaded builds can run without the GIL (and may re-enable it,
+    # e.g. for an extension module that does not declare support).
+    gil_enabled = sys._is_gil_enabled() if hasattr(sys, "_is_gil_enabled") else True
+    return {
+        "version": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "free_threaded_build": free_threaded,
+        "gil_enabled": gil_enabled,
+    }
+
+
+def _plot_load(stop: threading.Event, num_channels: int, window_seconds: float):
+    """Redraw an off-screen figure from the plot buffers, like the live plot."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from tvac.strain_gauge import ch_buffers, plot_lock, time_buffers
+
+    fig, axes = plt.subplots(num_channels, 1, sharex=True, squeeze=False)
+    lines = [ax.plot([], [], linewidth=0.8)[0] for ax in axes[:, 0]]
+    redraws = 0
+    while not stop.is_set():
+        with plot_lock:
+            latest = [times[-1] for times in time_buffers if times]
+            t_now = max(latest, default=0.0)
+            t_start = max(0.0, t_now - window_seconds)
+            windows = []
+            for times, values in zip(time_buffers, ch_buffers):
+                lo = bisect.bisect_left(times, t_start)
+                windows.append((times[lo:], values[lo:]))
+        if latest:
+            for line, ax, (times, values) in zip(lines, axes[:, 0], windows):
+                line.set_data(times, values)
+                ax.set_xlim(t_start, t_now)
+                ax.relim()
+                ax.autoscale_view(scalex=False, scaley=True)
+            fig.canvas.draw()
+            redraws += 1
+        stop.wait(0.05)
+    plt.close(fig)
+    return redraws
+
+
+def _block_load(stop: threading.Event, counter: list):
+    """Busy pure-Python work, standing in for a building block computing."""
+    while not stop.is_set():
+        total = 0
+        for i in range(10_000):
+            total += i * i
+        counter[0] += 1
+
+
+def _cpu_sink(*, readings, **kwargs):
+    """Sink with pure-Python work per scan, like formatting CSV rows."""
+    for row in readings.tolist():
+        sum(row)
+
+
+@cli.command()
+@click.option("--channels", default=8, show_default=True, help="Number of SG channels.")
+@click.option(
+    "--aggregate-rate",
+    default=100_000.0,
+    show_default=True,
+    help="Total samples/s over all channels.",
+)
+@click.option("--duration", default=20.0, show_default=True, help="Test duration [s].")
+@click.option(
+    "--plot-load/--no-plot-load",
+    default=True,
+    help="Redraw a matplotlib figure from the plot buffers meanwhile.",
+)
+@click.option(
+    "--block-threads",
+    default=2,
+    show_default=True,
+    help="Threads running busy pure-Python work meanwhile.",
+)
+@click.option(
+    "--cpu-sinks",
+    default=2,
+    show_default=True,
+    help="Extra sinks doing pure-Python work per scan.",
+)
+@click.option("--json", "json_path", default=None, help="Write the results to a file.")
+def bench(
+    channels, aggregate_rate, duration, plot_load, block_threads, cpu_sinks, json_path
+):
+    """Measure callback latency and sink throughput under concurrent load."""
+    scan_rate = aggregate_rate / channels
+    save_path = tempfile.mkdtemp(prefix="sg_bench_")
+    setup = _synthetic_setup(channels, scan_rate, save_path, plot=True)
+
+    backend = SyntheticLJM(
+        default_signal=[Offset(1e-3), Sine(5e-4, 17.0), Noise(20e-6)]
+    )
+    set_sg_backend(backend)
+    reset_sg_runtime_settings()
+
+    interpreter = _interpreter()
+    rich.print(
+        f"Benchmark on Python {interpreter['version']} "
+        f"({'free-threaded' if interpreter['free_threaded_build'] else 'GIL'} build, "
+        f"GIL {'on' if interpreter['gil_enabled'] else 'off'}): "
+        f"{channels} channels x {scan_rate:.1f} Hz for {duration} s, "
+        f"{block_threads} block thread(s), {cpu_sinks} CPU sink(s), "
+        f"plot load {'on' if plot_load else 'off'}"
+    )
+
+    stop = threading.Event()
+    block_counter = [0]
+    results = {}
+    threads = [
+        threading.Thread(target=_block_load, args=(stop, block_counter), daemon=True)
+        for _ in range(block_threads)
+    ]
+    if plot_load:
+        threads.append(
+            threading.Thread(
+                target=lambda: results.update(redraws=_plot_load(stop, channels, 10.0)),
+                daemon=True,
+            )
+        )
+
+    extra_sinks = {f"cpu{i}": _cpu_sink for i in range(cpu_sinks)}
+    start_sg_logging(setup=setup, extra_sinks=extra_sinks)
+    for thread in threads:
+        thread.start()
+    t_start = time.monotonic()
+    try:
+        time.sleep(duration)
+    finally:
+        elapsed = time.monotonic() - t_start
+        stream_stats = get_sg_stream_stats()
+        sink_stats = get_sg_sink_stats()
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=5.0)
+        stop_sg_logging()
+        set_sg_backend(None)
+
+    stream = next(iter(stream_stats.values()))
+    results.update(
+        interpreter=interpreter,
+        channels=channels,
+        scan_rate=scan_rate,
+        duration_s=elapsed,
+        block_threads=block_threads,
+        block_iterations_per_s=block_counter[0] / elapsed,
+        callback={
+            "reads": stream["reads"],
+            "scans_per_read": stream["scans_per_read"],
+            "mean_ms": stream["mean_busy_ms"],
+            "max_ms": stream["max_busy_ms"],
+            "max_ljm_backlog": stream["max_ljm_backlog"],
+            "gap_scans": stream["gap_scans"],
+        },
+        lost_scans=backend.overflowed_scans,
+        sinks={
+            name: {
+                "samples_per_s": stats["processed_scans"] * channels / elapsed,
+                "busy_s": stats["busy_s"],
+                "max_lag_scans": stats["high_water_scans"],
+                "dropped_scans": stats["dropped_scans"],
+            }
+            for name, stats in sink_stats.items()
+        },
+    )
+    results["sinks_busy_s"] = sum(s["busy_s"] for s in results["sinks"].values())
+    # Above 1, sinks ran at the same time: more than one thread's worth of
+    # sink work per second of wall-clock time.
+    results["sink_parallelism"] = results["sinks_busy_s"] / elapsed
+
+    _print_bench(results)
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        rich.print(f"Results written to {json_path}")
+
+
+def _print_bench(results: dict) -> None:
+    callback = results["callback"]
+    rich.print(
+        f"Callback: {callback['reads']} reads of {callback['scans_per_read']} scans, "
+        f"mean {callback['mean_ms']:.3f} ms, max {callback['max_ms']:.3f} ms, "
+        f"max LJM backlog {callback['max_ljm_backlog']} scans, "
+        f"{results['lost_scans']} scans lost"
+    )
+    for name, stats in results["sinks"].items():
+        rich.print(
+            f"  {name:8s} {stats['samples_per_s']:12.0f} samples/s  "
+            f"busy={stats['busy_s']:.1f} s  max lag={stats['max_lag_scans']} scans  "
+            f"dropped={stats['dropped_scans']}"
+        )
+    rich.print(
+        f"Sink parallelism: {results['sink_parallelism']:.2f}, "
+        f"block iterations: {results['block_iterations_per_s']:.0f}/s, "
+        f"plot redraws: {results.get('redraws', 0)}"
+    )
+
+
+@cli.command()
+@click.argument("baseline", type=click.Path(exists=True))
+@click.argument("other", type=click.Path(exists=True))
+def compare(baseline, other):
+    """Put two ``bench --json`` results side by side."""
+    runs = []
+    for path in (baseline, other):
+        with open(path) as f:
+            runs.append(json.load(f))
+
+    def _label(run):
+        interpreter = run["interpreter"]
+        return f"{interpreter['version']} GIL {'on' if interpreter['gil_enabled'] else 'off'}"
+
+    rows = [
+        ("callback mean (ms)", lambda r: r["callback"]["mean_ms"]),
+        ("callback max (ms)", lambda r: r["callback"]["max_ms"]),
+        ("max LJM backlog (scans)", lambda r: r["callback"]["max_ljm_backlog"]),
+        ("lost scans", lambda r: r["lost_scans"]),
+        ("sink parallelism", lambda r: r["sink_parallelism"]),
+        ("block iterations (1/s)", lambda r: r["block_iterations_per_s"]),
+        ("plot redraws", lambda r: r.get("redraws", 0)),
+    ]
+    for name in runs[0]["sinks"]:
+        rows.append(
+            (
+                f"{name} (samples/s)",
+                lambda r, name=name: r["sinks"].get(name, {}).get("samples_per_s", 0.0),
+            )
+        )
+
+    rich.print(f"{'':28s}{_label(runs[0]):>20s}{_label(runs[1]):>20s}")
+    for label, value in rows:
+        rich.print(f"{label:28s}{value(runs[0]):20.3f}{value(runs[1]):20.3f}")
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
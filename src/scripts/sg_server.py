@@ -0,0 +1,112 @@
+"""Run the strain-gauge acquisition as a long-lived server process.
+
+Start the server in its own terminal (or as a service), then point the GUI
+kernel at it by setting ``TVAC_SG_SERVER`` before the GUI is launched:
+
+    sg_server start
+    TVAC_SG_SERVER=tcp://localhost:6720 tvac_ui
+
+The strain-gauge tasks and building blocks then send their commands to the
+server, and a session keeps running when the kernel is restarted.
+
+The server only accepts connections from the same machine. Anyone who can
+reach it can start sessions and choose where files are written, so only
+bind it to another interface (``--interface``) on a trusted network.
+"""
+
+import sys
+import time
+
+import click
+import rich
+
+from tvac.strain_gauge import set_sg_backend
+from tvac.strain_gauge_server import (
+    DEFAULT_COMMAND_PORT,
+    DEFAULT_DATA_PORT,
+    DEFAULT_INTERFACE,
+    StrainGaugeClient,
+    StrainGaugeServer,
+)
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option(
+    "--interface",
+    default=DEFAULT_INTERFACE,
+    show_default=True,
+    help="IP address to listen on; '*' for all interfaces (unauthenticated!).",
+)
+@click.option("--command-port", default=DEFAULT_COMMAND_PORT, show_default=True)
+@click.option("--data-port", default=DEFAULT_DATA_PORT, show_default=True)
+@click.option(
+    "--publish-data/--no-publish-data",
+    default=True,
+    help="Publish every streamed batch to subscribers.",
+)
+@click.option("--synthetic", is_flag=True, help="Use a simulated T7 (no hardware).")
+def start(interface, command_port, data_port, publish_data, synthetic):
+    """Run the strain-gauge server in the foreground."""
+    if synthetic:
+        from tvac.labjack_sim import Noise, Offset, Sine, SyntheticLJM
+
+        set_sg_backend(
+            SyntheticLJM(default_signal=[Offset(1e-3), Sine(5e-4, 17.0), Noise(20e-6)])
+        )
+    server = StrainGaugeServer(
+        interface=interface,
+        command_port=command_port,
+        data_port=data_port,
+        publish_data=publish_data,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command()
+@click.option("--endpoint", default=f"tcp://localhost:{DEFAULT_COMMAND_PORT}")
+def status(endpoint):
+    """Print the status of a running server."""
+    client = StrainGaugeClient(endpoint, timeout_s=5.0)
+    if not client.ping():
+        rich.print(f"No strain-gauge server at {endpoint}.")
+        return 1
+    rich.print(client.status())
+
+
+@cli.command()
+@click.option("--endpoint", default=f"tcp://localhost:{DEFAULT_COMMAND_PORT}")
+def stop(endpoint):
+    """Stop the logging session and the server."""
+    client = StrainGaugeClient(endpoint, timeout_s=10.0)
+    client.shutdown()
+    rich.print("Strain-gauge server stopped.")
+
+
+@cli.command()
+@click.option("--endpoint", default=f"tcp://localhost:{DEFAULT_COMMAND_PORT}")
+@click.option("--duration", default=10.0, show_default=True, help="Time to listen [s].")
+def monitor(endpoint, duration):
+    """Print the status and the batch rate published by a running server."""
+    client = StrainGaugeClient(endpoint, timeout_s=5.0)
+    t_end = time.monotonic() + duration
+    batches = scans = 0
+    for topic, header, readings in client.subscribe(timeout_s=duration):
+        if topic == "status":
+            rich.print(f"{header['status']}  [{batches} batches, {scans} scans]")
+        else:
+            batches += 1
+            scans += len(readings)
+        if time.monotonic() > t_end:
+            break
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -0,0 +1,206 @@
+"""Process-wide reuse of open LabJack T7 handles.
+
+Opening a T7 (``openS`` plus ``getHandleInfo``) costs a USB enumeration and
+several round trips. Piezo building blocks start and stop strain-gauge
+sessions several times per observation, so :class:`T7DeviceManager` keeps
+the handle open between sessions and hands it to the next
+:class:`tvac.labjack_t7.LabJackT7Logger`. An idle handle is checked with one
+register read before it is reused and reopened if the check fails (e.g. the
+T7 was power cycled or unplugged).
+
+The manager also remembers the register values last written to each device
+(by serial number), so a new session only writes the registers whose value
+changed, and keeps the latency of opening, reusing, starting and stopping so
+the cost of a session cycle is visible in the status.
+"""
+
+import atexit
+import collections
+import threading
+import time
+
+_LATENCY_KINDS = ("open", "reuse", "start", "stop")
+
+
+class _OpenDevice:
+    """One open handle, the backend it belongs to, and its usage."""
+
+    def __init__(self, backend, handle, info):
+        self.backend = backend
+        self.handle = handle
+        self.info = info
+        self.in_use = False
+        self.reuses = 0
+
+
+class T7DeviceManager:
+    """Keep LabJack T7 handles open and healthy between streaming sessions.
+
+    Parameters
+    ----------
+    history : int
+        Number of latency samples kept per kind (open, reuse, start, stop).
+    """
+
+    def __init__(self, history: int = 100):
+        self._lock = threading.Lock()
+        self._devices: dict[tuple, _OpenDevice] = {}
+        self._registers: dict[int, dict[str, float]] = {}
+        self._latencies = {
+            kind: collections.deque(maxlen=history) for kind in _LATENCY_KINDS
+        }
+
+    def acquire(
+        self,
+        backend,
+        device_type: str = "T7",
+        connection_type: str = "USB",
+        identifier: str = "ANY",
+    ):
+        """Return ``(handle, info)`` for an open device, reusing an idle handle.
+
+        ``info`` is the ``getHandleInfo`` tuple from when the handle was
+        opened. LJM errors from ``openS`` propagate to the caller.
+        """
+        key = (id(backend), device_type, connection_type, identifier)
+        t_start = time.perf_counter()
+
+        with self._lock:
+            device = self._devices.get(key)
+            if device is not None:
+                if device.in_use:
+                    raise RuntimeError(
+                        f"LabJack {device_type} {identifier} is already in use by "
+                        "another session."
+                    )
+                if self._is_healthy(device):
+                    device.in_use = True
+                    device.reuses += 1
+                    self._latencies["reuse"].append(time.perf_counter() - t_start)
+                    return device.handle, device.info
+                print("LabJack handle failed its health check, reopening.")
+                self._close(device)
+                del self._devices[key]
+                # A device that stopped answering may have been power cycled.
+                self._registers.pop(device.info[2], None)
+
+            handle = backend.openS(device_type, connection_type, identifier)
+            info = backend.getHandleInfo(handle)
+            device = _OpenDevice(backend, handle, info)
+            device.in_use = True
+            self._devices[key] = device
+            self._latencies["open"].append(time.perf_counter() - t_start)
+            return handle, info
+
+    def release(self, handle, keep_open: bool = True, backend=None) -> None:
+        """Hand a handle back after a session; close it unless ``keep_open``.
+
+        Pass the ``backend`` the handle was acquired from when several
+        in-process backends (which number their handles independently) are
+        in use.
+        """
+        with self._lock:
+            for key, device in list(self._devices.items()):
+                if device.handle == handle and backend in (None, device.backend):
+                    device.in_use = False
+                    if not keep_open:
+                        self._close(device)
+                        del self._devices[key]
+                        self._registers.pop(device.info[2], None)
+                    return
+
+    def stop_streams(self) -> None:
+        """Stop any stream still running on an idle handle."""
+        with self._lock:
+            for device in self._devices.values():
+                if not device.in_use:
+                    try:
+                        device.backend.eStreamStop(device.handle)
+                    except Exception:
+                        pass  # Not streaming, which is the normal case
+
+    def close_all(self) -> None:
+        """Close every handle, including the ones in use."""
+        with self._lock:
+            for device in self._devices.values():
+                self._close(device)
+            self._devices.clear()
+            self._registers.clear()
+
+    def register_delta(
+        self, serial_number: int, names: list[str], values: list[float]
+    ) -> tuple[list[str], list[float]]:
+        """Return the subset of ``names``/``values`` that differs from the cache.
+
+        Registers never written through the manager are always included.
+        """
+        with self._lock:
+            cache = self._registers.get(serial_number, {})
+            delta = [
+                (name, value)
+                for name, value in zip(names, values)
+                if name not in cache or cache[name] != value
+            ]
+        return [name for name, _ in delta], [value for _, value in delta]
+
+    def remember_registers(
+        self, serial_number: int, names: list[str], values: list[float]
+    ) -> None:
+        """Record register values that were written successfully."""
+        with self._lock:
+            self._registers.setdefault(serial_number, {}).update(zip(names, values))
+
+    def forget_registers(self, serial_number: int) -> None:
+        """Drop the register cache of a device, so the next session writes everything."""
+        with self._lock:
+            self._registers.pop(serial_number, None)
+
+    def record_latency(self, kind: str, seconds: float) -> None:
+        """Add a start or stop latency measured by the session owner."""
+        self._latencies[kind].append(seconds)
+
+    def stats(self) -> dict:
+        """Return open handles and the last/mean/max latency per kind [ms]."""
+        with self._lock:
+            devices = [
+                {
+                    "serial_number": device.info[2],
+                    "in_use": device.in_use,
+                    "reuses": device.reuses,
+                    "cached_registers": len(self._registers.get(device.info[2], {})),
+                }
+                for device in self._devices.values()
+            ]
+        latencies = {}
+        for kind, samples in self._latencies.items():
+            if samples:
+                latencies[kind] = {
+                    "last_ms": samples[-1] * 1e3,
+                    "mean_ms": sum(samples) / len(samples) * 1e3,
+                    "max_ms": max(samples) * 1e3,
+                    "count": len(samples),
+                }
+        return {"devices": devices, "latency": latencies}
+
+    @staticmethod
+    def _is_healthy(device: _OpenDevice) -> bool:
+        # A real register read, unlike getHandleInfo, which LJM answers from
+        # its own cache without talking to the device.
+        try:
+            device.backend.eReadName(device.handle, "SERIAL_NUMBER")
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _close(device: _OpenDevice) -> None:
+        try:
+            device.backend.close(device.handle)
+        except Exception:
+            pass
+
+
+device_manager = T7DeviceManager()
+"""Manager shared by all strain-gauge sessions in this process."""
+
+atexit.register(device_manager.close_all)
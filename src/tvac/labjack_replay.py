@@ -0,0 +1,208 @@
+"""Record and replay raw LabJack T7 stream reads.
+
+During a TVAC session :class:`StreamRecorder` captures every ``eStreamRead``
+result exactly as LJM delivered it (the flat data vector, the device and LJM
+scan backlogs, and the host arrival time) in a compact binary file. Stream
+errors raised by ``eStreamRead`` are recorded as well.
+
+:class:`ReplayLJM` is an in-process LJM backend (see
+:mod:`tvac.labjack_sim`) that feeds such a file back through the normal
+:class:`tvac.labjack_t7.LabJackT7Logger` callback path at the recorded pace,
+N times faster, or as fast as the consumers keep up. Bursts, backlog spikes
+and errors of a real campaign can thus be reproduced against the stream
+callback of a strain-gauge session, the sink pipeline, CSV rotation and the
+live plot.
+
+File layout (little endian)::
+
+    b"TVACLJR1"                     magic and format version
+    uint32 n, n bytes               JSON header (channel names, scan rates, ...)
+    records:
+        uint8  kind                 0 = data, 1 = error
+        int64  arrival_ns           host time when eStreamRead returned
+        int32  device_backlog       (error records: LJM error code)
+        int32  ljm_backlog
+        uint32 n_values
+        float64[n_values]           raw eStreamRead data vector
+"""
+
+import json
+import struct
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from tvac.labjack_sim import InProcessLJM
+
+MAGIC = b"TVACLJR1"
+FILE_SUFFIX = ".ljr"
+
+_RECORD = struct.Struct("<BqiiI")
+_KIND_DATA = 0
+_KIND_ERROR = 1
+
+
+class StreamRecorder:
+    """Append raw ``eStreamRead`` results to a binary recording file.
+
+    Parameters
+    ----------
+    path : str | Path
+        Output file. Parent directories are created when needed.
+    header : dict
+        JSON-serialisable stream description stored at the start of the file,
+        at least ``channel_names`` and ``scan_rate``.
+    """
+
+    def __init__(self, path, header: dict):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "wb", buffering=1024 * 1024)
+
+        header_bytes = json.dumps(header).encode()
+        self._file.write(MAGIC)
+        self._file.write(struct.pack("<I", len(header_bytes)))
+        self._file.write(header_bytes)
+
+        self.records = 0
+
+    def write(self, raw_data, device_backlog: int, ljm_backlog: int, arrival_ns: int):
+        """Record one ``eStreamRead`` result."""
+        values = np.asarray(raw_data, dtype="<f8")
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(
+                _RECORD.pack(
+                    _KIND_DATA, arrival_ns, device_backlog, ljm_backlog, values.size
+                )
+            )
+            self._file.write(values.tobytes())
+            self.records += 1
+
+    def write_error(self, error_code: int, arrival_ns: int):
+        """Record an ``eStreamRead`` that raised an LJM error."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD.pack(_KIND_ERROR, arrival_ns, error_code, 0, 0))
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_recording(path):
+    """Return ``(header, records)`` for a recording file.
+
+    ``records`` is a list of ``(kind, arrival_ns, device_backlog, ljm_backlog,
+    values)`` tuples, where ``kind`` is ``"data"`` or ``"error"`` and
+    ``values`` is a float64 array (empty for errors, whose LJM error code is
+    stored in the ``device_backlog`` position).
+    """
+    with open(path, "rb") as fd:
+        if fd.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a LabJack stream recording.")
+        (header_len,) = struct.unpack("<I", fd.read(4))
+        header = json.loads(fd.read(header_len))
+
+        records = []
+        while True:
+            chunk = fd.read(_RECORD.size)
+            if len(chunk) < _RECORD.size:
+                break  # End of file, or a record cut short by a crash
+            kind, arrival_ns, device_backlog, ljm_backlog, n_values = _RECORD.unpack(
+                chunk
+            )
+            payload = fd.read(8 * n_values)
+            if len(payload) < 8 * n_values:
+                break
+            records.append(
+                (
+                    "data" if kind == _KIND_DATA else "error",
+                    arrival_ns,
+                    device_backlog,
+                    ljm_backlog,
+                    np.frombuffer(payload, dtype="<f8"),
+                )
+            )
+
+    return header, records
+
+
+class ReplayLJM(InProcessLJM):
+    """In-process LJM backend that replays a :class:`StreamRecorder` file.
+
+    Parameters
+    ----------
+    path : str | Path
+        Recording to replay.
+    speed : float | None
+        ``1.0`` replays at the recorded arrival times, ``N`` N times faster,
+        and ``None`` as fast as the consumer keeps up.
+    **kwargs
+        Passed to :class:`tvac.labjack_sim.InProcessLJM`.
+
+    Notes
+    -----
+    Batches are delivered with their recorded size and device backlog. The
+    reported LJM backlog is the recorded value plus whatever the replay
+    consumer itself has not read yet. Recorded stream errors are raised from
+    ``eStreamRead`` at the same position in the sequence of reads.
+    """
+
+    def __init__(self, path, speed: float | None = 1.0, **kwargs):
+        super().__init__(time_scale=speed, **kwargs)
+        self.path = Path(path)
+        self.header, self._records = read_recording(self.path)
+        self.serial_number = int(self.header.get("serial_number", self.serial_number))
+        self._data_records = []
+        self._position = 0
+
+    @property
+    def num_channels(self) -> int:
+        return len(self.header["channel_names"])
+
+    def eStreamStart(self, handle, scansPerRead, numAddresses, aScanList, scanRate):
+        if numAddresses != self.num_channels:
+            raise self.LJMError(
+                errorString=(
+                    f"Recording {self.path.name} has {self.num_channels} channels "
+                    f"({', '.join(self.header['channel_names'])}), "
+                    f"the stream requests {numAddresses}."
+                )
+            )
+        super().eStreamStart(
+            handle, scansPerRead, numAddresses, aScanList, self.header["scan_rate"]
+        )
+        return self.header["scan_rate"]
+
+    def _on_stream_start(self) -> None:
+        self._data_records = []
+        self._position = 0
+        for kind, arrival_ns, device_backlog, ljm_backlog, values in self._records:
+            if kind == "error":
+                # Raise on the read that followed the recorded data batches.
+                self.inject_error(device_backlog, after_reads=len(self._data_records))
+            else:
+                self._data_records.append(
+                    (arrival_ns, device_backlog, ljm_backlog, values)
+                )
+
+    def _batch_delay(self, scan_index: int, n_scans: int) -> float | None:
+        if self._position >= len(self._data_records):
+            return None
+        first_arrival_ns = self._data_records[0][0]
+        return (self._data_records[self._position][0] - first_arrival_ns) / 1e9
+
+    def _next_batch(self, scan_index: int, n_scans: int):
+        if self._position >= len(self._data_records):
+            return None
+        _, device_backlog, ljm_backlog, values = self._data_records[self._position]
+        self._position += 1
+        return values.reshape(-1, self.num_channels), device_backlog, ljm_backlog
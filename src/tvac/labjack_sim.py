@@ -0,0 +1,871 @@
+"""In-process stand-ins for the LabJack LJM library.
+
+:class:`tvac.labjack_t7.LabJackT7Logger` talks to the T7 through a small set
+of LJM functions (``openS``, ``eWriteNames``, ``eStreamStart``,
+``setStreamCallback``, ``eStreamRead``, ...). The classes in this module
+implement those functions in-process, so the whole strain-gauge stack can be
+run, debugged and load-tested without a T7 or even the LJM native library:
+
+    from tvac.labjack_sim import Noise, Sine, SyntheticLJM
+    from tvac.strain_gauge import set_sg_backend, start_sg_logging
+
+    backend = SyntheticLJM(signals={"AIN0": [Sine(1e-3, 5.0), Noise(20e-6)]})
+    set_sg_backend(backend)
+    start_sg_logging(setup=setup)
+
+:class:`InProcessLJM` provides the device registers, handles and the stream
+threading model. Subclasses only decide which values a batch contains, see
+:class:`SyntheticLJM`.
+
+Threading mirrors LJM: a producer thread fills an internal buffer at the
+stream rate (optionally accelerated), and a separate callback thread invokes
+the registered stream callback once per available batch. A slow callback
+therefore shows up as a growing LJM backlog, just like on the real device.
+"""
+
+import collections
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from tvac.stream_clock import CORE_TIMER_CHANNELS, CORE_TIMER_HZ
+from tvac.stream_planner import noise_uv_rms, plan_stream
+
+
+class LJMError(Exception):
+    """Error raised by the in-process backends, shaped like ``labjack.ljm.LJMError``."""
+
+    def __init__(self, errorCode=None, errorAddress=None, errorString=None):
+        self.errorCode = errorCode
+        self.errorAddress = errorAddress
+        self.errorString = errorString or f"LJM error {errorCode}"
+        super().__init__(self.errorString)
+
+
+class constants:
+    """Subset of ``labjack.ljm.constants`` used by the logger."""
+
+    dtT7 = 7
+    ctUSB = 1
+    STREAM_RECEIVE_TIMEOUT_MODE = "LJM_STREAM_RECEIVE_TIMEOUT_MODE"
+    STREAM_RECEIVE_TIMEOUT_MODE_CALCULATED = 1
+    STREAM_RECEIVE_TIMEOUT_MODE_MANUAL = 2
+    STREAM_RECEIVE_TIMEOUT_MS = "LJM_STREAM_RECEIVE_TIMEOUT_MS"
+
+
+class errorcodes:
+    """Subset of ``labjack.ljm.errorcodes`` used by the logger and the simulation.
+
+    Code compares these by name, so only their uniqueness matters here.
+    """
+
+    DEVICE_NOT_OPEN = 1224
+    NO_DEVICES_FOUND = 1227
+    DEVICE_DISCONNECTED = 1219
+    STREAM_NOT_RUNNING = 2943
+    STREAM_BURST_COMPLETE = 2944
+    STREAM_SCAN_OVERLAP = 4990
+
+
+# Value LJM auto-recovery writes for lost scans (tvac.labjack_t7.LJM_DUMMY_VALUE)
+AUTO_RECOVERY_DUMMY = -9999.0
+
+
+class _StreamOutBuffer:
+    """Values written to one simulated ``STREAM_OUT#`` and the loop at their end.
+
+    Like the T7, the output continues with the last ``LOOP_NUM_VALUES``
+    values written when ``SET_LOOP`` was set once the written data runs out,
+    and holds the last value (an underrun) if there is no loop.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._chunks: collections.deque = collections.deque()
+        self._queued = 0
+        self._history: collections.deque = collections.deque()  # Last values written
+        self._history_len = 0
+        self._loop = np.empty(0)
+        self._loop_pos = 0
+        self._last = 0.0
+        self.underruns = 0
+        self.overflows = 0
+
+    def append(self, values) -> None:
+        values = np.array(values, dtype=np.float64)
+        if self._queued + len(values) > self.capacity:
+            self.overflows += 1
+        self._chunks.append(values)
+        self._queued += len(values)
+        self._history.append(values)
+        self._history_len += len(values)
+        while self._history_len - len(self._history[0]) >= self.capacity:
+            self._history_len -= len(self._history.popleft())
+
+    def set_loop(self, n_values: int) -> None:
+        if n_values <= 0 or not self._history:
+            self._loop = np.empty(0)
+        else:
+            self._loop = np.concatenate(self._history)[-n_values:]
+        self._loop_pos = 0
+
+    def take(self, n_scans: int) -> np.ndarray:
+        """Return the values output at the next ``n_scans`` scans."""
+        out = np.empty(n_scans)
+        filled = 0
+        while filled < n_scans and self._chunks:
+            chunk = self._chunks[0]
+            n = min(len(chunk), n_scans - filled)
+            out[filled : filled + n] = chunk[:n]
+            filled += n
+            self._queued -= n
+            if n == len(chunk):
+                self._chunks.popleft()
+            else:
+                self._chunks[0] = chunk[n:]
+            self._last = out[filled - 1]
+        if filled < n_scans:
+            if len(self._loop):
+                indices = (self._loop_pos + np.arange(n_scans - filled)) % len(
+                    self._loop
+                )
+                out[filled:] = self._loop[indices]
+                self._loop_pos = int(indices[-1] + 1) % len(self._loop)
+            else:
+                out[filled:] = self._last
+                self.underruns += 1
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Signal components
+# ---------------------------------------------------------------------------
+# Each component maps device time ``t`` (seconds since stream start, one value
+# per scan) to a voltage. The signal of one channel is the sum of its
+# components.
+
+
+class Offset:
+    """Constant voltage."""
+
+    def __init__(self, value: float):
+        self.value = float(value)
+
+    def sample(self, t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return np.full(t.shape, self.value)
+
+
+class Noise:
+    """White Gaussian noise with standard deviation ``sigma`` [V]."""
+
+    def __init__(self, sigma: float):
+        self.sigma = float(sigma)
+
+    def sample(self, t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return rng.normal(0.0, self.sigma, t.shape)
+
+
+class Sine:
+    """Sine wave with the given amplitude [V], frequency [Hz] and phase [rad]."""
+
+    def __init__(self, amplitude: float, frequency: float, phase: float = 0.0):
+        self.amplitude = float(amplitude)
+        self.frequency = float(frequency)
+        self.phase = float(phase)
+
+    def sample(self, t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return self.amplitude * np.sin(2 * np.pi * self.frequency * t + self.phase)
+
+
+class Step:
+    """Voltage step of ``amplitude`` [V] at time ``at`` [s] after stream start."""
+
+    def __init__(self, amplitude: float, at: float):
+        self.amplitude = float(amplitude)
+        self.at = float(at)
+
+    def sample(self, t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return np.where(t >= self.at, self.amplitude, 0.0)
+
+
+class Pulse:
+    """Digital pulse on line ``bit`` of a DIO state register (e.g. ``FIO_STATE``).
+
+    The line is high from ``start`` [s] after stream start for ``width`` [s],
+    repeating every ``period`` [s] if given. Combine several pulses on
+    different bits for several lines of one port.
+    """
+
+    def __init__(
+        self, bit: int, start: float, width: float, period: float | None = None
+    ):
+        self.bit = int(bit)
+        self.start = float(start)
+        self.width = float(width)
+        self.period = None if period is None else float(period)
+
+    def sample(self, t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        since = t - self.start
+        if self.period is not None:
+            since = np.where(since >= 0, since % self.period, since)
+        high = (since >= 0) & (since < self.width)
+        return np.where(high, float(1 << self.bit), 0.0)
+
+
+class Drift:
+    """Linear drift of ``rate`` [V/s] since stream start."""
+
+    def __init__(self, rate: float):
+        self.rate = float(rate)
+
+    def sample(self, t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        return self.rate * t
+
+
+class InProcessLJM:
+    """Base class for in-process LJM backends.
+
+    Parameters
+    ----------
+    serial_number : int
+        Serial number reported by ``getHandleInfo``.
+    time_scale : float | None
+        Speed of the simulated device clock relative to the host clock. ``1.0``
+        streams in real time, ``10.0`` ten times faster, and ``None`` as fast
+        as the consumer keeps up.
+    max_buffered_scans : int
+        Largest number of scans the simulated LJM buffer holds. In real-time
+        mode older scans are discarded beyond this limit (and counted in
+        :attr:`overflowed_scans`); in max-speed mode the producer waits.
+    clock_error_ppm : float
+        Error of the simulated device clock. Positive values make the device
+        deliver scans slower than the nominal scan rate, like a T7 whose
+        crystal runs slow against the host clock.
+    """
+
+    LJMError = LJMError
+    constants = constants
+    errorcodes = errorcodes
+
+    def __init__(
+        self,
+        serial_number: int = 470000001,
+        time_scale: float | None = 1.0,
+        max_buffered_scans: int = 1_000_000,
+        clock_error_ppm: float = 0.0,
+    ):
+        self.serial_number = int(serial_number)
+        self.clock_error_ppm = float(clock_error_ppm)
+        self.time_scale = time_scale
+        self.max_buffered_scans = int(max_buffered_scans)
+
+        self._lock = threading.Condition()
+        self._handles = itertools.count(1)
+        self._open_handles: set[int] = set()
+        self._registers: dict[str, float] = {}
+        self._addresses: dict[int, str] = {}
+
+        self._stream_handle = None
+        self._scan_names: list[str] = []
+        self._scans_per_read = 0
+        self._scan_rate = 0.0
+        self._num_scans = 0
+        self._callback = None
+        self._queue = collections.deque()
+        self._queued_scans = 0
+        self._streaming = False
+        self._producer: threading.Thread | None = None
+        self._dispatcher: threading.Thread | None = None
+        self._pending_errors: list[tuple[int, int]] = []
+        self._pending_recoveries: list[tuple[int, int]] = []
+        self._reads = 0
+        self._exhausted = False
+        self._burst_complete = False
+        self._burst_reported = False
+        self._in_callback = False
+        self._disconnected_until = 0.0
+        self._stream_armed = False
+        self._trigger_at: float | None = None
+        self._out_names: list[str] = []
+        self._stream_outs: dict[int, _StreamOutBuffer] = {}
+        self._batch_outputs: dict[str, np.ndarray] = {}
+
+        self.overflowed_scans = 0
+        self.library_config: dict[str, float] = {}
+        self.write_log: list[tuple[str, float]] = []
+        self._opened_at = time.monotonic()
+
+    # -- Device access ------------------------------------------------------
+
+    def openS(self, deviceType, connectionType, identifier):
+        if (
+            str(identifier).upper() not in ("ANY", str(self.serial_number))
+            or time.monotonic() < self._disconnected_until
+        ):
+            raise self.LJMError(
+                errorCode=self.errorcodes.NO_DEVICES_FOUND,
+                errorString=f"No simulated T7 with serial number {identifier}.",
+            )
+        handle = next(self._handles)
+        self._open_handles.add(handle)
+        return handle
+
+    def getHandleInfo(self, handle):
+        self._check_handle(handle)
+        return self.constants.dtT7, self.constants.ctUSB, self.serial_number, 0, 0, 64
+
+    @staticmethod
+    def numberToIP(number):
+        return ".".join(str((int(number) >> shift) & 0xFF) for shift in (24, 16, 8, 0))
+
+    def close(self, handle):
+        self._open_handles.discard(handle)
+
+    def writeLibraryConfigS(self, parameter, value):
+        self.library_config[parameter] = value
+
+    def eWriteNames(self, handle, numFrames, aNames, aValues):
+        self._check_handle(handle)
+        for name, value in zip(aNames[:numFrames], aValues[:numFrames]):
+            self._registers[name] = value
+            self.write_log.append((name, value))
+            if name.startswith("STREAM_OUT"):
+                self._write_stream_out(name, value)
+
+    def eWriteNameArray(self, handle, name, numValues, aValues):
+        self._check_handle(handle)
+        index = self._stream_out_index(name)
+        if index is None or not name.endswith("_BUFFER_F32"):
+            self._registers[name] = list(aValues[:numValues])
+            return
+        with self._lock:
+            if index in self._stream_outs:
+                self._stream_outs[index].append(aValues[:numValues])
+
+    @staticmethod
+    def _stream_out_index(name: str) -> int | None:
+        prefix = name.split("_")[1] if name.startswith("STREAM_OUT") else ""
+        return int(prefix[3:]) if prefix[3:].isdigit() else None
+
+    def _write_stream_out(self, name: str, value) -> None:
+        index = self._stream_out_index(name)
+        if index is None:
+            return
+        with self._lock:
+            if name.endswith("_ENABLE"):
+                # Enabling a stream-out sets up an empty buffer.
+                if value:
+                    size = int(self._registers.get(f"STREAM_OUT{index}_BUFFER_SIZE", 0))
+                    self._stream_outs[index] = _StreamOutBuffer(size // 2)
+                else:
+                    self._stream_outs.pop(index, None)
+            elif name.endswith("_SET_LOOP") and index in self._stream_outs:
+                n_values = int(
+                    self._registers.get(f"STREAM_OUT{index}_LOOP_NUM_VALUES", 0)
+                )
+                self._stream_outs[index].set_loop(n_values)
+
+    @property
+    def stream_out_stats(self) -> dict[str, dict[str, int]]:
+        """Underruns and overflows per enabled stream-out (``STREAM_OUT#``)."""
+        with self._lock:
+            return {
+                f"STREAM_OUT{index}": {
+                    "underruns": buffer.underruns,
+                    "overflows": buffer.overflows,
+                }
+                for index, buffer in self._stream_outs.items()
+            }
+
+    def eWriteName(self, handle, name, value):
+        self.eWriteNames(handle, 1, [name], [value])
+
+    def eReadNames(self, handle, numFrames, aNames):
+        self._check_handle(handle)
+        return [self._read_register(name) for name in aNames[:numFrames]]
+
+    def eReadName(self, handle, name):
+        return self.eReadNames(handle, 1, [name])[0]
+
+    def namesToAddresses(self, numFrames, aNames, aNumTypes=None):
+        addresses = []
+        for name in aNames[:numFrames]:
+            address = self._address_of(name)
+            self._addresses[address] = name
+            addresses.append(address)
+        return addresses, [3] * len(addresses)  # 3 = FLOAT32
+
+    def _read_register(self, name: str) -> float:
+        if name in self._registers:
+            return self._registers[name]
+        t = np.array([time.monotonic() - self._opened_at])
+        if name.startswith("AIN") and name[3:].isdigit():
+            # Command-response reads sample the signal at the current time.
+            return float(self._channel_values(name, t)[0])
+        if name[:3] in ("FIO", "EIO", "CIO", "MIO") and name[3:].isdigit():
+            from tvac.labjack_t7 import marker_register
+
+            register, bit = marker_register(name)
+            return float((int(self._channel_values(register, t)[0]) >> bit) & 1)
+        return 0.0
+
+    @staticmethod
+    def _address_of(name: str) -> int:
+        # The T7 maps AIN# to Modbus address 2 * #. Other names get stable
+        # synthetic addresses well above the AIN range.
+        if name.startswith("AIN") and name[3:].isdigit():
+            return 2 * int(name[3:])
+        return 60000 + (sum(ord(c) * (i + 1) for i, c in enumerate(name)) % 5000)
+
+    def _check_handle(self, handle):
+        if handle not in self._open_handles:
+            raise self.LJMError(
+                self.errorcodes.DEVICE_NOT_OPEN, errorString="LJME_DEVICE_NOT_OPEN"
+            )
+
+    # -- Stream -------------------------------------------------------------
+
+    def eStreamStart(self, handle, scansPerRead, numAddresses, aScanList, scanRate):
+        self._check_handle(handle)
+        with self._lock:
+            self._stream_handle = handle
+            names = [
+                self._addresses.get(address, f"ADDR{address}")
+                for address in aScanList[:numAddresses]
+            ]
+            # Stream-outs take a place in the scan list but return no data.
+            self._scan_names = [n for n in names if not n.startswith("STREAM_OUT")]
+            self._out_names = [n for n in names if n.startswith("STREAM_OUT")]
+            self._scans_per_read = int(scansPerRead)
+            self._scan_rate = float(scanRate)
+            # Like the T7, a non-zero STREAM_NUM_SCANS makes this a burst.
+            self._num_scans = int(self._registers.get("STREAM_NUM_SCANS", 0))
+            # A non-zero STREAM_TRIGGER_INDEX arms the stream until trigger().
+            self._stream_armed = bool(self._registers.get("STREAM_TRIGGER_INDEX", 0))
+            self._trigger_at = None
+            self._queue.clear()
+            self._queued_scans = 0
+            self._exhausted = False
+            self._burst_complete = False
+            self._burst_reported = False
+            self._streaming = True
+
+        self._on_stream_start()
+
+        self._producer = threading.Thread(
+            target=self._produce_loop, name="ljm-sim-producer", daemon=True
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="ljm-sim-callback", daemon=True
+        )
+        self._producer.start()
+        self._dispatcher.start()
+        return self._scan_rate
+
+    def setStreamCallback(self, handle, callback):
+        with self._lock:
+            self._callback = callback
+            self._lock.notify_all()
+
+    def eStreamRead(self, handle):
+        with self._lock:
+            if not self._streaming or handle != self._stream_handle:
+                raise self.LJMError(
+                    self.errorcodes.STREAM_NOT_RUNNING,
+                    errorString="LJME_STREAM_NOT_RUNNING",
+                )
+
+            self._reads += 1
+            if handle not in self._open_handles:
+                # Unplugged: the stream is gone along with the device.
+                self._streaming = False
+                self._lock.notify_all()
+                raise self.LJMError(
+                    self.errorcodes.DEVICE_DISCONNECTED,
+                    errorString="LJME_DEVICE_DISCONNECTED",
+                )
+            for i, (after, code) in enumerate(self._pending_errors):
+                if self._reads > after:
+                    del self._pending_errors[i]
+                    raise self.LJMError(code, errorString=f"Injected LJM error {code}")
+
+            while not self._queue and self._streaming and not self._burst_complete:
+                self._lock.wait(0.1)
+            if not self._queue and self._burst_complete:
+                # Like LJM, the read after the last scan of a burst reports
+                # that the device has stopped by itself.
+                self._burst_reported = True
+                raise self.LJMError(
+                    self.errorcodes.STREAM_BURST_COMPLETE,
+                    errorString="LJME_STREAM_BURST_COMPLETE",
+                )
+            if not self._queue:
+                raise self.LJMError(
+                    self.errorcodes.STREAM_NOT_RUNNING,
+                    errorString="LJME_STREAM_NOT_RUNNING",
+                )
+
+            data, device_backlog, ljm_backlog = self._queue.popleft()
+            self._queued_scans -= len(data) // max(1, len(self._scan_names))
+            for i, (after, n_scans) in enumerate(self._pending_recoveries):
+                if self._reads > after:
+                    del self._pending_recoveries[i]
+                    n_values = min(len(data), n_scans * len(self._scan_names))
+                    data = [AUTO_RECOVERY_DUMMY] * n_values + data[n_values:]
+                    break
+            self._lock.notify_all()
+            return data, device_backlog, ljm_backlog + self._queued_scans
+
+    def eStreamStop(self, handle):
+        with self._lock:
+            if not self._streaming:
+                raise self.LJMError(
+                    self.errorcodes.STREAM_NOT_RUNNING,
+                    errorString="LJME_STREAM_NOT_RUNNING",
+                )
+            self._streaming = False
+            self._callback = None
+            self._lock.notify_all()
+
+        for thread in (self._producer, self._dispatcher):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=2.0)
+
+    def wait_until_drained(self, timeout: float | None = None) -> bool:
+        """Wait until the source is exhausted and the callback has handled every batch.
+
+        Only meaningful for finite sources such as a replayed recording.
+        Returns ``False`` on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while not (self._exhausted and not self._queue and not self._in_callback):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._lock.wait(0.1 if remaining is None else min(0.1, remaining))
+        return True
+
+    @property
+    def buffered_scans(self) -> int:
+        """Scans waiting in the simulated LJM buffer (the LJM backlog)."""
+        with self._lock:
+            return self._queued_scans
+
+    # -- Fault injection ----------------------------------------------------
+
+    def inject_error(self, error_code: int, after_reads: int = 0) -> None:
+        """Make ``eStreamRead`` raise ``error_code`` once, after ``after_reads`` more reads."""
+        with self._lock:
+            self._pending_errors.append((self._reads + int(after_reads), error_code))
+
+    def disconnect(self, duration_s: float = 0.0, silent: bool = False) -> None:
+        """Unplug the simulated T7 for ``duration_s``.
+
+        Open handles become invalid and ``openS`` finds no device until the
+        time is up. A running stream fails on its next read with
+        ``DEVICE_DISCONNECTED``, or, with ``silent``, just stops delivering
+        data, like a device that hangs without an error.
+        """
+        with self._lock:
+            self._disconnected_until = time.monotonic() + float(duration_s)
+            if silent:
+                self._streaming = False
+            self._open_handles.clear()
+            self._lock.notify_all()
+
+    def trigger(self, delay_s: float = 0.0) -> None:
+        """Apply the edge that starts an armed stream, after ``delay_s``.
+
+        Stands in for the pigpio GPIO going high on the line that
+        ``STREAM_TRIGGER_INDEX`` points at. Scan 0 is acquired at the edge.
+        An edge before the stream is armed is missed, as on the T7.
+        """
+        with self._lock:
+            if self._streaming and self._stream_armed:
+                self._trigger_at = time.monotonic() + float(delay_s)
+                self._lock.notify_all()
+
+    def inject_auto_recovery(self, n_scans: int, after_reads: int = 0) -> None:
+        """Replace the first ``n_scans`` scans of a later read with LJM auto-recovery dummy scans."""
+        with self._lock:
+            self._pending_recoveries.append((self._reads + int(after_reads), n_scans))
+
+    # -- Hooks for subclasses -----------------------------------------------
+
+    def _on_stream_start(self) -> None:
+        """Reset per-stream generator state. Called from ``eStreamStart``."""
+
+    def _next_batch(self, scan_index: int, n_scans: int):
+        """Return ``(data, device_backlog)`` for the next batch, or ``None`` when exhausted.
+
+        ``data`` is a ``(n_scans, n_addresses)`` array. A third element, if
+        present, is added to the LJM backlog reported by ``eStreamRead``.
+        """
+        raise NotImplementedError
+
+    def _batch_delay(self, scan_index: int, n_scans: int) -> float | None:
+        """Device time [s] at which the batch starting at ``scan_index`` is complete."""
+        return (
+            (scan_index + n_scans) / self._scan_rate * (1 + self.clock_error_ppm * 1e-6)
+        )
+
+    def _channel_values(self, name: str, t: np.ndarray) -> np.ndarray:
+        return np.zeros(t.shape)
+
+    # -- Worker threads -----------------------------------------------------
+
+    def _produce_loop(self) -> None:
+        with self._lock:
+            while self._streaming and self._stream_armed:
+                if self._trigger_at is not None:
+                    if time.monotonic() >= self._trigger_at:
+                        break
+                    self._lock.wait(max(0.0, self._trigger_at - time.monotonic()))
+                else:
+                    self._lock.wait(0.1)
+            self._stream_armed = False
+        t_start = time.monotonic()
+        scan_index = 0
+
+        while True:
+            with self._lock:
+                if not self._streaming:
+                    return
+                n_scans = self._scans_per_read
+                if self._num_scans:
+                    n_scans = min(n_scans, self._num_scans - scan_index)
+
+            if n_scans <= 0:
+                # Burst complete: the device stops acquiring, and LJM reports
+                # it once the buffered scans have been read.
+                with self._lock:
+                    self._exhausted = True
+                    self._burst_complete = True
+                    self._lock.notify_all()
+                return
+
+            due = self._batch_delay(scan_index, n_scans)
+            if self.time_scale is not None and due is not None:
+                delay = t_start + due / self.time_scale - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+            # The DACs output one stream-out value per scan.
+            with self._lock:
+                self._batch_outputs = {
+                    self._addresses.get(
+                        int(self._registers.get(f"{name}_TARGET", -1)), name
+                    ): self._stream_outs[index].take(n_scans)
+                    for name in self._out_names
+                    if (index := self._stream_out_index(name)) in self._stream_outs
+                }
+            batch = self._next_batch(scan_index, n_scans)
+
+            with self._lock:
+                if not self._streaming:
+                    return
+                if batch is None:
+                    # Source exhausted: keep the stream "running" without data,
+                    # which is what a stalled device looks like to LJM.
+                    self._exhausted = True
+                    self._lock.notify_all()
+                    self._lock.wait(0.1)
+                    continue
+
+                data, device_backlog, *extra = batch
+                ljm_backlog = int(extra[0]) if extra else 0
+                n_scans = data.shape[0]
+                if self.time_scale is None:
+                    while (
+                        self._streaming
+                        and self._queued_scans + n_scans > self.max_buffered_scans
+                    ):
+                        self._lock.wait(0.1)
+                while (
+                    self._queue
+                    and self._queued_scans + n_scans > self.max_buffered_scans
+                ):
+                    dropped, _, _ = self._queue.popleft()
+                    lost = len(dropped) // max(1, len(self._scan_names))
+                    self._queued_scans -= lost
+                    self.overflowed_scans += lost
+
+                # LJM hands out a flat Python list, interleaved per scan.
+                self._queue.append(
+                    (data.ravel().tolist(), int(device_backlog), ljm_backlog)
+                )
+                self._queued_scans += n_scans
+                self._lock.notify_all()
+
+            scan_index += n_scans
+
+    def _has_news(self) -> bool:
+        """Whether a read would return data or the end of a burst (lock held)."""
+        return bool(self._queue) or (self._burst_complete and not self._burst_reported)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._lock:
+                # An unplugged device is reported at once, like LJM does,
+                # also when no data is due (e.g. an armed stream).
+                while (
+                    self._streaming
+                    and (not self._has_news() or self._callback is None)
+                    and self._stream_handle in self._open_handles
+                ):
+                    self._lock.wait(0.1)
+                if not self._streaming:
+                    return
+                callback = self._callback
+                handle = self._stream_handle
+                reads = self._reads
+                self._in_callback = True
+
+            # Same contract as LJM: the callback receives the handle and is
+            # expected to call eStreamRead itself.
+            try:
+                callback(handle)
+            except Exception as exc:
+                print(f"Simulated LJM stream callback raised: {exc!r}")
+                with self._lock:
+                    self._streaming = False
+                    self._in_callback = False
+                    self._lock.notify_all()
+                return
+
+            with self._lock:
+                self._in_callback = False
+                self._lock.notify_all()
+                if self._reads == reads:
+                    # The callback did not read; avoid spinning on the same batch.
+                    self._lock.wait(0.01)
+
+
+class SyntheticLJM(InProcessLJM):
+    """In-process T7 that streams configurable synthetic signals.
+
+    Parameters
+    ----------
+    signals : dict[str, list]
+        Signal components per channel name (e.g. ``"AIN0"``). Channels without
+        an entry get ``default_signal``.
+    default_signal : list | None
+        Components for channels not listed in ``signals``. Defaults to a small
+        offset plus 20 uV RMS noise.
+    device_backlog : int | callable
+        Device backlog reported with every batch, either a constant or a
+        function of the first scan index of the batch.
+    max_sample_rate : float
+        Aggregate samples/s above which the simulated device reports
+        ``STREAM_SCAN_OVERLAP`` from ``eStreamRead``, as a T7 would once the
+        scan rate cannot be sustained.
+    seed : int | None
+        Seed for the noise generator.
+    core_timer_start : int
+        ``CORE_TIMER`` value at the first scan. Values close to ``2**32``
+        make the streamed timer wrap early in the session.
+    model_adc : bool
+        Make the device behave like the T7 timing and noise tables of
+        :mod:`tvac.stream_planner`: every analog channel gets the noise of
+        its configured range and stream resolution index on top of its
+        signal, and scan rates above the planned maximum report
+        ``STREAM_SCAN_OVERLAP`` (instead of using ``max_sample_rate``).
+    loopback : dict[str, str] | None
+        Inputs wired to a DAC (e.g. ``{"AIN0": "DAC0"}``): the voltage the
+        DAC's stream-out outputs at every scan is added to the input's
+        signal.
+    **kwargs
+        Passed to :class:`InProcessLJM` (``time_scale``, ``serial_number``, ...).
+    """
+
+    def __init__(
+        self,
+        signals: dict[str, list] | None = None,
+        default_signal: list | None = None,
+        device_backlog=0,
+        max_sample_rate: float = 100_000.0,
+        seed: int | None = None,
+        core_timer_start: int = 0,
+        model_adc: bool = False,
+        loopback: dict[str, str] | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.signals = dict(signals or {})
+        self.default_signal = (
+            default_signal
+            if default_signal is not None
+            else [Offset(1e-3), Noise(20e-6)]
+        )
+        self.device_backlog = device_backlog
+        self.max_sample_rate = float(max_sample_rate)
+        self._seed = seed
+        self.core_timer_start = int(core_timer_start)
+        self.model_adc = bool(model_adc)
+        self.loopback = dict(loopback or {})
+        self._rng = np.random.default_rng(seed)
+
+    def _on_stream_start(self) -> None:
+        self._rng = np.random.default_rng(self._seed)
+        if self.model_adc:
+            analog = [name for name in self._scan_names if self._is_analog(name)]
+            plan = plan_stream(
+                [self._range_of(name) for name in analog],
+                stream_resolution_index=self._resolution_index(),
+                extra_addresses=len(self._scan_names)
+                + len(self._out_names)
+                - len(analog),
+            )
+            overlap = self._scan_rate > plan.max_scan_rate
+        else:
+            n_addresses = len(self._scan_names) + len(self._out_names)
+            overlap = self._scan_rate * n_addresses > self.max_sample_rate
+        if overlap:
+            self.inject_error(self.errorcodes.STREAM_SCAN_OVERLAP, after_reads=0)
+
+    @staticmethod
+    def _is_analog(name: str) -> bool:
+        return name.startswith("AIN") and name[3:].isdigit()
+
+    def _range_of(self, name: str) -> float:
+        return float(self._registers.get(f"{name}_RANGE", 10.0))
+
+    def _resolution_index(self) -> int:
+        return int(self._registers.get("STREAM_RESOLUTION_INDEX", 0))
+
+    def _channel_values(self, name: str, t: np.ndarray) -> np.ndarray:
+        if name in CORE_TIMER_CHANNELS:
+            ticks = (
+                self.core_timer_start + np.rint(t * CORE_TIMER_HZ).astype(np.int64)
+            ) % (1 << 32)
+            if name == "CORE_TIMER":
+                return (ticks & 0xFFFF).astype(np.float64)
+            return (ticks >> 16).astype(np.float64)
+
+        # Digital registers read 0 unless a signal (e.g. a Pulse) is given.
+        components = self.signals.get(
+            name, self.default_signal if self._is_analog(name) else []
+        )
+        values = np.zeros(t.shape)
+        for component in components:
+            values += component.sample(t, self._rng)
+        if self.model_adc and self._is_analog(name):
+            sigma = noise_uv_rms(self._range_of(name), self._resolution_index()) * 1e-6
+            values += self._rng.normal(0.0, sigma, t.shape)
+        return values
+
+    def _next_batch(self, scan_index: int, n_scans: int):
+        t = (scan_index + np.arange(n_scans)) / self._scan_rate
+        data = np.empty((n_scans, len(self._scan_names)))
+        for col, name in enumerate(self._scan_names):
+            data[:, col] = self._channel_values(name, t)
+            dac = self._batch_outputs.get(self.loopback.get(name))
+            if dac is not None:
+                data[:, col] += dac
+
+        backlog = self.device_backlog
+        device_backlog = backlog(scan_index) if callable(backlog) else backlog
+        return data, device_backlog
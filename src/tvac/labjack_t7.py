@@ -4,21 +4,95 @@ This module is intentionally narrow in scope:
 
 1. connect to a single T7 over USB,
 2. configure the requested analog input channels for differential reads,
-3. start continuous streaming, and
-4. translate each raw stream batch into timestamped scans before handing
-   the data to a caller-supplied callback.
+3. start continuous streaming, or capture a finite burst into memory, and
+4. reshape each raw stream batch into a ``(n_scans, n_channels)`` array and
+   time it with a :class:`tvac.stream_clock.StreamClock` before handing the
+   data to a caller-supplied callback.
+
+For slow housekeeping, :class:`LabJackT7Poller` reads the same channels with
+command-response ``eReadNames`` calls on a timer and hands them to the same
+callback contract.
 
 It does not know anything about CSV files, plotting, or GUI state. Those
 concerns live in :mod:`tvac.strain_gauge`, which owns the higher-level
 session lifecycle and output handling.
+
+All device I/O goes through an LJM *backend*: the ``labjack.ljm`` module by
+default, or any object exposing the same functions, such as the in-process
+:class:`tvac.labjack_sim.SyntheticLJM` used to run the strain-gauge stack
+without a T7.
 """
 
 import datetime
 import threading
+import time
 
+import numpy as np
 from egse.setup import Setup
-from labjack import ljm
-from labjack.ljm.ljm import LJMError
+
+from tvac.labjack_replay import StreamRecorder
+from tvac.stream_clock import (
+    CORE_TIMER_CHANNELS,
+    CoreTimerTracker,
+    StreamClock,
+    scan_timestamps_ns,
+)
+from tvac.stream_out import MAX_STREAM_OUTS, StreamOut
+from tvac.stream_planner import StreamPlan, plan_stream, resolve_scan_rate
+from tvac.stream_tuning import DEFAULT_PROFILE, ReadSizeController, scans_per_read_for
+
+try:
+    from labjack import ljm
+except Exception:  # The LJM package or its native library is not installed
+    ljm = None
+
+LJM_DUMMY_VALUE = -9999.0
+"""Value LJM auto-recovery writes to every address of a scan lost to a
+buffer overflow."""
+
+DIO_PORTS: dict[str, tuple[str, int]] = {
+    "FIO": ("FIO_STATE", 8),
+    "EIO": ("EIO_STATE", 8),
+    "CIO": ("CIO_STATE", 4),
+    "MIO": ("MIO_STATE", 3),
+}
+"""Streamable state register and number of lines per T7 digital I/O port."""
+
+
+def marker_register(line: str) -> tuple[str, int]:
+    """Return the state register to stream for DIO ``line`` and the line's bit.
+
+    For example ``"FIO4"`` is bit 4 of ``FIO_STATE`` and ``"EIO0"`` bit 0 of
+    ``EIO_STATE``.
+    """
+    port, number = str(line).upper()[:3], str(line)[3:]
+    if port not in DIO_PORTS or not number.isdigit():
+        raise ValueError(
+            f"Marker line {line!r} is not a T7 digital line "
+            f"({', '.join(f'{port}#' for port in DIO_PORTS)})."
+        )
+    register, n_lines = DIO_PORTS[port]
+    if int(number) >= n_lines:
+        raise ValueError(f"{port} has lines {port}0-{port}{n_lines - 1}, not {line}.")
+    return register, int(number)
+
+
+TRIGGER_LINES = ("FIO0", "FIO1")
+"""Lines that can start a triggered stream: the T7 detects the edge with the
+Frequency In extended feature, which only DIO0 and DIO1 (FIO0, FIO1) have."""
+
+TRIGGER_EDGES: dict[str, int] = {"rising": 3, "falling": 4}
+"""``DIO#_EF_INDEX`` (Frequency In on that edge) per trigger edge."""
+
+
+def default_backend():
+    """Return the real ``labjack.ljm`` module, or raise if it is unavailable."""
+    if ljm is None:
+        raise ValueError(
+            "The LabJack LJM library is not available. Install it, or pass an "
+            "in-process backend such as tvac.labjack_sim.SyntheticLJM."
+        )
+    return ljm
 
 
 class LabJackT7Logger:
@@ -43,9 +117,76 @@ class LabJackT7Logger:
     stream_resolution_index : int
         Stream-wide resolution index. 0 = auto.
     resync_interval_s : int
-        Seconds between host-clock re-anchor points to limit drift.
+        Length [s] of the sliding window over which the stream clock fits
+        host time against scan index (see :class:`tvac.stream_clock.StreamClock`).
     buffer_size : int
         T7 stream buffer size in bytes (max 32768).
+    backend : module | object | None
+        LJM backend providing ``openS``, ``eWriteNames``, ``eStreamStart``,
+        ``setStreamCallback``, ``eStreamRead`` and friends. Defaults to the
+        ``labjack.ljm`` module.
+    record_path : str | None
+        If given, every raw ``eStreamRead`` result is also written to this
+        file with :class:`tvac.labjack_replay.StreamRecorder`, so the session
+        can be replayed later with :class:`tvac.labjack_replay.ReplayLJM`.
+    hardware_timestamps : bool
+        Stream the T7 ``CORE_TIMER`` (via ``STREAM_DATA_CAPTURE_16``) with
+        every scan. Scans are then indexed by the device timer, which detects
+        timer wraps and scans lost between device and host, instead of by
+        counting the scans that arrive.
+    keep_timer_channel : bool
+        With ``hardware_timestamps``, also hand the unwrapped timer ticks to
+        the callback as an extra ``CORE_TIMER`` column. Off by default, so
+        downstream output only contains the analog inputs.
+    profile : str
+        Acquisition profile from :data:`tvac.stream_tuning.ACQUISITION_PROFILES`
+        (``"balanced"``, ``"low_latency"`` or ``"bulk"``). Sets the read size
+        unless ``scans_per_read`` is given.
+    scans_per_read : int | None
+        Explicit read size, e.g. one suggested by a previous session.
+    adaptive : bool
+        Restart the stream with a larger read size when the device backlog
+        threatens to overflow the T7 buffer. The read size suggested for the
+        next session is tracked either way (:attr:`suggested_scans_per_read`).
+    device_manager : tvac.labjack_devices.T7DeviceManager | None
+        If given, the handle is taken from (and on :meth:`close` returned to)
+        this manager, which keeps it open for the next logger. Otherwise the
+        logger opens and closes the device itself. The manager also caches
+        the configuration written to the device, so only changed registers
+        are written.
+    verify_config : bool
+        Read the configuration back after writing it and raise
+        ``ValueError`` if the device reports different values.
+    identifier : str
+        Device to open: a serial number (or IP address or device name), as
+        accepted by ``ljm.openS``. ``"ANY"`` opens the first T7 found, which
+        is only unambiguous with a single T7 connected.
+    rate_limit : str
+        What to do when ``scan_rate`` is above what the T7 sustains for this
+        scan list (see :mod:`tvac.stream_planner`): ``"clamp"`` streams at
+        the maximum instead, ``"reject"`` raises ``ValueError`` before the
+        device is opened, and ``"off"`` skips the check.
+    marker_line : str | None
+        Digital line wired to a trigger or sync signal (e.g. ``"FIO4"``).
+        Its port's state register is streamed with every scan and handed to
+        the callback as an extra column, named after the line, holding the
+        line's level (0 or 1). The line is configured as an input.
+    trigger_line : str | None
+        Digital line (one of :data:`TRIGGER_LINES`) wired to the signal that
+        starts the waveforms, e.g. the pigpio GPIO behind
+        :func:`tvac.wave_generation.start_signal_trigger`. :meth:`start_stream`
+        then only arms the stream; the T7 acquires scan 0 on the first
+        ``trigger_edge`` of the line. See :attr:`trigger_state` and
+        :meth:`wait_for_trigger`.
+    trigger_edge : str
+        ``"rising"`` or ``"falling"``, the edge of ``trigger_line`` that
+        starts the stream.
+    stream_out : list[tvac.stream_out.StreamOut] | None
+        Excitations to stream to the DACs on the scan clock (see
+        :mod:`tvac.stream_out`). Their buffers are primed before every
+        stream start and refilled from the stream callback. The value
+        output at every scan is handed to the callback as an extra column
+        per stream-out, named after its DAC, after all other columns.
 
     Notes
     -----
@@ -53,6 +194,19 @@ class LabJackT7Logger:
     returning data directly. This mirrors how the LabJack LJM API delivers
     stream reads and keeps device I/O separate from downstream consumers
     such as the CSV writer and live plot.
+
+    Batches are handed out as NumPy arrays (see :meth:`start_stream`), as
+    views of a read buffer that is reused for the next read, so the
+    callback path does not allocate per batch. The
+    older list-of-lists contract with one ``datetime`` per scan is still
+    available through ``start_stream(callback, batch=False)``.
+
+    Scans that never reached the host are not handed out. The dummy scans
+    LJM auto-recovery inserts after a buffer overflow (all values
+    :data:`LJM_DUMMY_VALUE`) are removed, with hardware timestamps lost scans
+    are detected from the device timer, and every batch reports the number
+    of scans missing just before it (``gap_scans``), from a jump in its
+    timeline. :meth:`stream_stats` adds these up.
     """
 
     @staticmethod
@@ -74,11 +228,33 @@ class LabJackT7Logger:
         stream_resolution_index: int = 0,
         resync_interval_s: int = 60,
         buffer_size: int = 32768,
+        backend=None,
+        record_path: str | None = None,
+        hardware_timestamps: bool = False,
+        keep_timer_channel: bool = False,
+        profile: str = DEFAULT_PROFILE,
+        scans_per_read: int | None = None,
+        adaptive: bool = False,
+        device_manager=None,
+        verify_config: bool = False,
+        identifier: str = "ANY",
+        rate_limit: str = "clamp",
+        marker_line: str | None = None,
+        trigger_line: str | None = None,
+        trigger_edge: str = "rising",
+        stream_out: list[StreamOut] | None = None,
     ):
+        self._ljm = backend if backend is not None else default_backend()
+        self.identifier = str(identifier)
+        self._devices = device_manager
+        self.verify_config = bool(verify_config)
+        self.record_path = record_path
         self.ain_channels = ain_channels
         self.scan_rate = scan_rate
         self.resync_interval_s = resync_interval_s
         self.buffer_size = buffer_size
+        self.hardware_timestamps = bool(hardware_timestamps)
+        self.keep_timer_channel = self.hardware_timestamps and bool(keep_timer_channel)
         self.stream_resolution_index = int(stream_resolution_index)
 
         n = len(ain_channels)
@@ -92,28 +268,150 @@ class LabJackT7Logger:
         self.neg_channels = [ch + 1 for ch in ain_channels]
         self.channel_names = [f"AIN{ch}" for ch in ain_channels]
         self.num_addresses = n
-        self.scans_per_read = int(scan_rate / 2)
+
+        self.marker_line = str(marker_line).upper() if marker_line else None
+        marker_names = []
+        if self.marker_line:
+            register, self._marker_bit = marker_register(self.marker_line)
+            marker_names = [register]
+
+        # Scan list as streamed, and columns as handed to the callback. The
+        # marker sits before the timer channels, so it is kept when they are
+        # split off.
+        self.stream_names = (
+            self.channel_names
+            + marker_names
+            + (CORE_TIMER_CHANNELS if self.hardware_timestamps else [])
+        )
+        self._timer_column = n + len(marker_names)
+
+        # Stream-outs follow the inputs in the scan list, but return no data.
+        self.stream_out = list(stream_out or [])
+        if len(self.stream_out) > MAX_STREAM_OUTS:
+            raise ValueError(f"The T7 has {MAX_STREAM_OUTS} stream-outs.")
+        targets = [out.target for out in self.stream_out]
+        if len(set(targets)) != len(targets):
+            raise ValueError(f"Two stream-outs drive the same DAC: {targets}.")
+        for index, out in enumerate(self.stream_out):
+            out.index = index
+        self.scan_list_names = self.stream_names + [out.name for out in self.stream_out]
+
+        self.output_channel_names = (
+            self.channel_names
+            + ([self.marker_line] if self.marker_line else [])
+            + (["CORE_TIMER"] if self.keep_timer_channel else [])
+            + targets
+        )
+
+        self.trigger_line = str(trigger_line).upper() if trigger_line else None
+        if self.trigger_line and self.trigger_line not in TRIGGER_LINES:
+            raise ValueError(
+                f"Trigger line {trigger_line!r} cannot start a T7 stream; "
+                f"use {' or '.join(TRIGGER_LINES)}."
+            )
+        if trigger_edge not in TRIGGER_EDGES:
+            raise ValueError(
+                f"Trigger edge {trigger_edge!r} is not one of "
+                f"{', '.join(TRIGGER_EDGES)}."
+            )
+        self.trigger_edge = trigger_edge
+
+        # Check the scan rate against the T7 timing tables before anything is
+        # written to the device, instead of finding out from a growing backlog.
+        self.plan: StreamPlan = plan_stream(
+            self.voltage_ranges,
+            stream_resolution_index=self.stream_resolution_index,
+            extra_addresses=len(self.scan_list_names) - n,
+            scan_rate=float(scan_rate),
+            channel_names=self.channel_names,
+        )
+        self.scan_rate = resolve_scan_rate(self.plan, rate_limit)
+
+        self.profile = profile
+        self.adaptive = bool(adaptive)
+        self.scans_per_read = (
+            max(1, int(scans_per_read))
+            if scans_per_read
+            else scans_per_read_for(profile, self.scan_rate)
+        )
 
         # State
         self._handle = None
+        self._serial_number = None
+        self._recorder: StreamRecorder | None = None
         self._actual_scan_rate = None
         self._callback = None
         self._lock = threading.Lock()
         self._streaming = False
 
         # Timestamp tracking
-        self._t_anchor = None
+        self._clock: StreamClock | None = None
+        self._timer: CoreTimerTracker | None = None
+        self._tuner: ReadSizeController | None = None
+        self._user_callback = None
+        self._batch = False
+        self._restart_pending = False
+        # Serialises restart_stream and reconnect against stop_stream; a
+        # restart that finds _stop_requested set after stopping gives up.
+        self._restart_lock = threading.Lock()
+        self._stop_requested = False
+        self.restarts = 0
         self._stream_start_time = None
-        self._anchor_scan_count = 0
+        self._stream_start_time_ns = None
         self._scan_index = 0
-        self._resync_interval_scans = int(scan_rate * resync_interval_s)
+
+        # Set while a burst capture owns the stream (see capture_burst), and
+        # set when the T7 reports the end of the burst
+        self._bursting = False
+        self._burst_done: threading.Event | None = None
+
+        # Triggered start: armed until the first batch arrives
+        self._armed = False
+        self._triggered = threading.Event()
+        self._trigger_time_ns: int | None = None
+
+        # Called with the exception when the stream fails (see reconnect)
+        self.error_handler = None
+        self.last_error: Exception | None = None
+        self.reconnects = 0
+
+        # Throughput and backlog since the stream started
+        self._reads = 0
+        self._scans_received = 0
+        self._last_backlogs = (0, 0)
+        self._max_backlogs = (0, 0)
+        self._last_arrival_ns = 0
+
+        # Gaps in the delivered time series since the stream started
+        self._next_t0_ns: int | None = None
+        self._gaps = 0
+        self._gap_scans = 0
+        self._dummy_scans = 0
+        self._gap_reported = False
+
+        # eStreamRead results are copied into these buffers, which are reused
+        # for every read; ``_allocations`` counts the arrays the callback
+        # still had to allocate.
+        self._read_buffer = np.empty(0, dtype=np.float64)
+        self._dummy_mask = np.empty(0, dtype=bool)
+        self._allocations = 0
+
+        # Batches with the stimulus columns of the stream-outs are assembled
+        # in this buffer, reused like the read buffer.
+        self._out_buffer = np.empty((0, len(self.output_channel_names)))
 
         self._connect()
-        self.stop_stream()  # Stop streaming in case it was still active (otherwise, we cannot configure the device)
-        self._configure()
+        try:
+            self.stop_stream()  # Stop streaming in case it was still active (otherwise, we cannot configure the device)
+            self._configure()
+        except Exception:
+            # Do not leave a managed handle marked as in use by a logger that
+            # never came to life.
+            self._release_handle(keep_open=True)
+            raise
 
     @classmethod
-    def from_setup(cls, setup: Setup = None):
+    def from_setup(cls, setup: Setup = None, backend=None):
         """Construct a LabJackT7Logger from a CGSE Setup object.
 
         Reads channel wiring and stream parameters from
@@ -148,6 +446,7 @@ class LabJackT7Logger:
             resolution_index=resolution_indices,
             resync_interval_s=stream.resync_interval_s,
             buffer_size=stream.buffer_size,
+            backend=backend,
         )
 
     @property
@@ -155,6 +454,11 @@ class LabJackT7Logger:
         """Return the active LJM device handle, or ``None`` if closed."""
         return self._handle
 
+    @property
+    def serial_number(self):
+        """Return the serial number of the open device."""
+        return self._serial_number
+
     @property
     def actual_scan_rate(self):
         """Return the actual scan rate negotiated with the device."""
@@ -165,21 +469,130 @@ class LabJackT7Logger:
         """Return the host timestamp used as the stream time origin."""
         return self._stream_start_time
 
+    @property
+    def stream_start_time_ns(self):
+        """Return the stream time origin as integer nanoseconds since the epoch."""
+        return self._stream_start_time_ns
+
+    @property
+    def trigger_state(self) -> str:
+        """``"armed"`` while a triggered stream waits for its edge, ``"triggered"``
+        once it has started, and ``"off"`` for a free-running stream."""
+        if self._triggered.is_set():
+            return "triggered"
+        return "armed" if self._armed else "off"
+
+    @property
+    def trigger_time_ns(self) -> int | None:
+        """Host time of scan 0 of a triggered stream (its trigger edge), in ns."""
+        return self._trigger_time_ns
+
+    def wait_for_trigger(self, timeout: float | None = None) -> bool:
+        """Wait until an armed stream has triggered; ``False`` on timeout.
+
+        Returns ``True`` at once when the stream is not waiting for a trigger.
+        """
+        if not self._armed:
+            return True
+        return self._triggered.wait(timeout)
+
+    def clock_stats(self) -> dict:
+        """Return drift, offset and latency of the stream clock model.
+
+        With hardware timestamps, timer wraps and lost scans are included.
+        """
+        with self._lock:
+            stats = self._clock.stats() if self._clock is not None else {}
+            if self._timer is not None:
+                stats.update(self._timer.stats())
+            return stats
+
+    @property
+    def suggested_scans_per_read(self) -> int:
+        """Read size the adaptive controller recommends for the next session."""
+        with self._lock:
+            if self._tuner is None:
+                return self.scans_per_read
+            return self._tuner.suggestion
+
+    def tuning_stats(self) -> dict:
+        """Return read size, backlog and processing-time statistics."""
+        with self._lock:
+            stats = self._tuner.stats() if self._tuner is not None else {}
+        stats["profile"] = self.profile
+        stats["restarts"] = self.restarts
+        return stats
+
+    def stream_stats(self) -> dict:
+        """Return throughput and backlog of the stream since it started.
+
+        ``scans_per_s`` is the rate at which scans reached the callback, up
+        to the last read, which falls behind ``actual_scan_rate`` when the
+        host does not keep up or scans are lost. ``gaps`` counts the jumps in
+        the delivered time series and ``gap_scans`` the scans missing in
+        them; ``dummy_scans`` are the LJM auto-recovery scans among those.
+        ``allocations`` counts the arrays the stream callback allocated
+        instead of reusing its read buffer, ``allocations_per_read`` per
+        ``eStreamRead``. ``failed`` is the error that stopped the stream, or
+        None while it runs.
+        """
+        with self._lock:
+            reads = self._reads
+            scans = self._scans_received
+            last_backlogs = self._last_backlogs
+            max_backlogs = self._max_backlogs
+            last_arrival_ns = self._last_arrival_ns
+            gaps = (self._gaps, self._gap_scans, self._dummy_scans)
+            allocations = self._allocations
+        start_ns = self._stream_start_time_ns
+        elapsed_s = (last_arrival_ns - start_ns) / 1e9 if start_ns and reads else 0.0
+        error = self.last_error
+        return {
+            "mode": "stream",
+            "serial_number": self._serial_number,
+            "reads": reads,
+            "scans": scans,
+            "scans_per_s": scans / elapsed_s if elapsed_s > 0 else 0.0,
+            "device_backlog": last_backlogs[0],
+            "ljm_backlog": last_backlogs[1],
+            "max_device_backlog": max_backlogs[0],
+            "max_ljm_backlog": max_backlogs[1],
+            "gaps": gaps[0],
+            "gap_scans": gaps[1],
+            "dummy_scans": gaps[2],
+            "allocations": allocations,
+            "allocations_per_read": allocations / reads if reads else 0.0,
+            "trigger": self.trigger_state,
+            "trigger_time_ns": self._trigger_time_ns,
+            "stream_out": [out.stats() for out in self.stream_out],
+            "failed": (
+                str(error) if error is not None and not self._streaming else None
+            ),
+        }
+
     def _connect(self):
         """Open the LabJack and verify that the detected device is a T7."""
         try:
-            self._handle = ljm.openS("T7", "USB", "ANY")
-        except LJMError as e:
-            raise ValueError(f"Could not connect to T7: {e.errorString}") from None
+            if self._devices is not None:
+                self._handle, info = self._devices.acquire(
+                    self._ljm, "T7", "USB", self.identifier
+                )
+            else:
+                self._handle = self._ljm.openS("T7", "USB", self.identifier)
+                info = self._ljm.getHandleInfo(self._handle)
+        except self._ljm.LJMError as e:
+            raise ValueError(
+                f"Could not connect to T7 {self.identifier}: {e.errorString}"
+            ) from None
 
-        info = ljm.getHandleInfo(self._handle)
-        if info[0] != ljm.constants.dtT7:
-            ljm.close(self._handle)
+        self._serial_number = info[2]
+        if info[0] != self._ljm.constants.dtT7:
+            self._release_handle(keep_open=False)
             raise ValueError("Expected T7 device")
 
         print(
             f"Opened LabJack T7  Serial: {info[2]}  "
-            f"IP: {ljm.numberToIP(info[3])}  Port: {info[4]}"
+            f"IP: {self._ljm.numberToIP(info[3])}  Port: {info[4]}"
         )
 
     def _configure(self):
@@ -222,127 +635,1002 @@ class LabJackT7Logger:
             self.buffer_size,
         ]
 
-        ljm.eWriteNames(self._handle, len(names), names, values)
+        # Only write what differs from the last configuration written to this
+        # device; back-to-back sessions with the same channels write nothing.
+        if self._devices is not None:
+            write_names, write_values = self._devices.register_delta(
+                self._serial_number, names, values
+            )
+        else:
+            write_names, write_values = names, values
 
-        print("Configuration written:")
-        for n, v in zip(names, values):
-            print(f"    {n} : {v}")
+        if write_names:
+            self._ljm.eWriteNames(
+                self._handle, len(write_names), write_names, write_values
+            )
+            if self._devices is not None:
+                self._devices.remember_registers(
+                    self._serial_number, write_names, write_values
+                )
+            print(
+                f"Configuration written ({len(write_names)} of {len(names)} registers):"
+            )
+            for n, v in zip(write_names, write_values):
+                print(f"    {n} : {v}")
+        else:
+            print(f"Configuration unchanged ({len(names)} registers).")
+
+        if self.verify_config:
+            self._verify_configuration(names, values)
+
+        if self.marker_line:
+            # A command-response read of a DIO line makes it an input.
+            self._ljm.eReadName(self._handle, self.marker_line)
+
+    def _verify_configuration(self, names, values):
+        """Read ``names`` back in one call and compare them with ``values``."""
+        read_back = self._ljm.eReadNames(self._handle, len(names), names)
+        # Registers are float32 on the device, so compare with a tolerance.
+        mismatches = [
+            f"{name}: wrote {value}, read {actual}"
+            for name, value, actual in zip(names, values, read_back)
+            if not np.isclose(actual, value, rtol=1e-6, atol=1e-9)
+        ]
+        if mismatches:
+            if self._devices is not None:
+                self._devices.forget_registers(self._serial_number)
+            raise ValueError(
+                "T7 configuration readback does not match: " + "; ".join(mismatches)
+            )
+        print(f"Configuration verified ({len(names)} registers).")
 
     def _stream_callback(self, handle):
         """Handle one asynchronous LJM stream-read callback.
 
         The LabJack returns a flat list of interleaved channel samples. This
-        callback groups the raw values back into per-scan rows, synthesizes a
-        timestamp for each scan from the current host-time anchor, and then
-        forwards the batch to the caller-supplied callback.
+        callback reshapes the raw values into a ``(n_scans, n_channels)``
+        array, feeds the arrival time and backlogs to the stream clock to
+        time the batch, and then forwards it to the caller-supplied callback.
         """
         if handle != self._handle or not self._streaming:
             return
 
+        recorder = self._recorder
         try:
-            ret = ljm.eStreamRead(handle)
-        except LJMError as err:
-            if err.errorCode == ljm.errorcodes.STREAM_NOT_RUNNING:
-                return
-            raise
+            ret = self._ljm.eStreamRead(handle)
+        except Exception as err:
+            if isinstance(err, self._ljm.LJMError):
+                if err.errorCode == self._ljm.errorcodes.STREAM_NOT_RUNNING:
+                    return
+                if recorder is not None:
+                    recorder.write_error(err.errorCode, time.time_ns())
+                if err.errorCode == getattr(
+                    self._ljm.errorcodes, "STREAM_BURST_COMPLETE", None
+                ):
+                    self._burst_completed()
+                    return
+            self._stream_failed(err)
+            return
+        arrival_ns = time.time_ns()
+
+        if recorder is not None:
+            recorder.write(ret[0], ret[1], ret[2], arrival_ns)
 
         # LJM returns one flat vector of values ordered by scan:
         # [scan0_ch0, scan0_ch1, ..., scan1_ch0, scan1_ch1, ...]
-        raw_data = ret[0]
+        # It is copied into the reusable read buffer, and a reshape of that
+        # buffer gives one row per scan without allocating.
+        n_values = len(ret[0])
+        allocations = 0
+        if n_values > len(self._read_buffer):
+            # A larger read than the stream was started with (LJM can
+            # return more after a restart); keep the larger buffer.
+            self._read_buffer = np.empty(n_values, dtype=np.float64)
+            self._dummy_mask = np.empty(n_values, dtype=bool)
+            allocations += 1
+        raw = self._read_buffer[:n_values]
+        raw[:] = ret[0]
+        readings = raw.reshape(-1, len(self.stream_names))
         device_backlog = ret[1]
         ljm_backlog = ret[2]
+        n_scans = readings.shape[0]
+        if n_scans == 0:
+            return
+
+        # LJM auto-recovery fills the scans lost to a buffer overflow with
+        # dummy values. They are not data: drop them, and let the jump in
+        # scan index mark the gap. The first column (an analog input, which
+        # never reads -9999 V) is checked in place; only a batch that has
+        # dummy scans is compacted into a new array.
+        dummy_scans = 0
+        first = np.equal(
+            readings[:, 0], LJM_DUMMY_VALUE, out=self._dummy_mask[:n_scans]
+        )
+        if first.any():
+            valid = np.any(readings != LJM_DUMMY_VALUE, axis=1)
+            dummy_scans = n_scans - int(np.count_nonzero(valid))
+            if dummy_scans:
+                readings = readings[valid]
+                allocations += 1
 
-        timestamps = []
-        readings = []
+        if self.marker_line:
+            # The whole port state arrives as a number; keep the line's bit.
+            marker = readings[:, self.num_addresses]
+            np.floor_divide(marker, 1 << self._marker_bit, out=marker)
+            np.remainder(marker, 2, out=marker)
 
+        # The T7 does not provide a per-scan host timestamp. The stream clock
+        # fits host time against the number of scans acquired so far
+        # (including the ones still queued) and describes each run of
+        # consecutive scans by its first timestamp and rate only.
         with self._lock:
-            for i in range(0, len(raw_data), self.num_addresses):
-                scans_since_anchor = self._scan_index - self._anchor_scan_count
-                elapsed = datetime.timedelta(
-                    seconds=scans_since_anchor / self._actual_scan_rate
+            if self._timer is None:
+                # Dummy scans take the place of real ones, so they keep
+                # their scan index.
+                if dummy_scans:
+                    runs = _uniform_runs((self._scan_index + np.arange(n_scans))[valid])
+                else:
+                    runs = [(0, n_scans, self._scan_index)]
+                last_index = self._scan_index + n_scans - 1
+            elif len(readings):
+                ticks, indices = self._timer.scan_indices(
+                    readings[:, self._timer_column],
+                    readings[:, self._timer_column + 1],
                 )
-                scan_time = self._t_anchor + elapsed
-
-                timestamps.append(scan_time)
-                readings.append(raw_data[i : i + self.num_addresses])
-                self._scan_index += 1
-
-            # The T7 does not provide a per-scan host timestamp. We therefore
-            # derive timestamps from the negotiated scan rate and periodically
-            # re-anchor to the current host clock to limit long-run drift.
-            if (
-                self._scan_index - self._anchor_scan_count
-            ) >= self._resync_interval_scans:
-                self._t_anchor = datetime.datetime.now(tz=datetime.timezone.utc)
-                self._anchor_scan_count = self._scan_index
-                print(f"[Re-anchored host clock at scan {self._scan_index}]")
+                # A lost scan splits the batch, so every run stays uniform.
+                runs = _uniform_runs(indices)
+                last_index = int(indices[-1])
+                readings = readings[:, : self._timer_column]
+                # Unwrapping the timer yields new tick and index arrays.
+                allocations += 1
+                if self.keep_timer_channel:
+                    readings = np.column_stack([readings, ticks.astype(np.float64)])
+                    allocations += 1
+            else:
+                # Only dummy scans: the timer tells how many once data returns.
+                runs = []
+                last_index = self._scan_index - 1
+
+            # Scans the device has acquired by now, including the queued ones
+            acquired_scans = (
+                last_index + 1 + max(0, device_backlog) + max(0, ljm_backlog)
+            )
+            if runs or self._timer is None:
+                clock_allocations = self._clock.allocations
+                self._clock.observe(acquired_scans, arrival_ns)
+                allocations += self._clock.allocations - clock_allocations
+            timed_runs = []
+            for lo, hi, scan_index0 in runs:
+                t0_ns, scan_rate = self._clock.timeline(scan_index0, hi - lo)
+                # Scans missing since the previous run, from the jump in time
+                # (lost or dummy scans, a stream restart, a clock step).
+                gap_scans = 0
+                if self._next_t0_ns is not None:
+                    gap_scans = max(
+                        0, round((t0_ns - self._next_t0_ns) * scan_rate / 1e9)
+                    )
+                self._next_t0_ns = t0_ns + round((hi - lo) * 1e9 / scan_rate)
+                if gap_scans:
+                    self._gaps += 1
+                    self._gap_scans += gap_scans
+                timed_runs.append((lo, hi, scan_index0, t0_ns, scan_rate, gap_scans))
+            # The first scans of an armed stream are the trigger edge.
+            fired = self._armed and bool(timed_runs)
+            if fired:
+                _, _, first_index, first_t0_ns, first_rate, _ = timed_runs[0]
+                self._trigger_time_ns = first_t0_ns - round(
+                    first_index * 1e9 / first_rate
+                )
+                self._armed = False
+            report_gap = not self._gap_reported and (
+                dummy_scans > 0 or any(run[-1] for run in timed_runs)
+            )
+            self._gap_reported |= report_gap
+            self._dummy_scans += dummy_scans
+            self._allocations += allocations
+            self._scan_index = last_index + 1
+            self._reads += 1
+            self._scans_received += len(readings)
+            self._last_arrival_ns = arrival_ns
+            self._last_backlogs = (device_backlog, ljm_backlog)
+            self._max_backlogs = (
+                max(self._max_backlogs[0], device_backlog),
+                max(self._max_backlogs[1], ljm_backlog),
+            )
+
+        if self.stream_out:
+            try:
+                readings = self._service_stream_out(
+                    readings, timed_runs, acquired_scans
+                )
+            except Exception as err:
+                self._stream_failed(err)
+                return
+
+        if fired:
+            self._stream_start_time_ns = self._trigger_time_ns
+            self._stream_start_time = datetime.datetime.fromtimestamp(
+                self._trigger_time_ns / 1e9, tz=datetime.timezone.utc
+            )
+            self._triggered.set()
+            print(
+                f"[T7 {self._serial_number}: stream triggered by {self.trigger_line}]"
+            )
+
+        if report_gap:
+            print(
+                f"[T7 {self._serial_number}: scans are missing from the stream; "
+                "gaps are counted in the status]"
+            )
 
         if self._callback:
-            self._callback(
-                timestamps=timestamps,
-                readings=readings,
-                channel_names=self.channel_names,
-                device_backlog=device_backlog,
-                ljm_backlog=ljm_backlog,
+            for lo, hi, scan_index0, t0_ns, scan_rate, gap_scans in timed_runs:
+                self._callback(
+                    scan_index0=scan_index0,
+                    t0_ns=t0_ns,
+                    scan_rate=scan_rate,
+                    readings=readings[lo:hi],
+                    channel_names=self.output_channel_names,
+                    device_backlog=device_backlog,
+                    ljm_backlog=ljm_backlog,
+                    gap_scans=gap_scans,
+                )
+
+        # Time from eStreamRead returning to the callback returning. Together
+        # with the backlog trend this drives the read size suggestion.
+        busy_s = (time.time_ns() - arrival_ns) / 1e9
+        with self._lock:
+            self._tuner.observe(device_backlog, ljm_backlog, busy_s)
+            restart = (
+                self.adaptive
+                and not self._bursting
+                and self._tuner.needs_restart
+                and not self._restart_pending
             )
+            if restart:
+                self._restart_pending = True
+                new_size = self._tuner.suggestion
+
+        if restart:
+            # eStreamStop cannot be called from the LJM callback thread.
+            threading.Thread(
+                target=self.restart_stream,
+                args=(new_size,),
+                name="t7-stream-restart",
+                daemon=True,
+            ).start()
+
+    def _service_stream_out(
+        self, readings: np.ndarray, timed_runs: list, acquired_scans: int
+    ) -> np.ndarray:
+        """Refill the stream-out buffers and add their stimulus columns to a batch.
+
+        Refilling first keeps the time between the read and the writes short.
+        The batch is assembled in the reused output buffer.
+        """
+        for out in self.stream_out:
+            out.refill(self._ljm, self._handle, acquired_scans)
+
+        n_scans, n_columns = readings.shape
+        if len(self._out_buffer) < n_scans:
+            self._out_buffer = np.empty((n_scans, len(self.output_channel_names)))
+            with self._lock:
+                self._allocations += 1
+        batch = self._out_buffer[:n_scans]
+        batch[:, :n_columns] = readings
+        for lo, hi, scan_index0, *_ in timed_runs:
+            for column, out in enumerate(self.stream_out, start=n_columns):
+                out.fill(scan_index0, batch[lo:hi, column])
+        return batch
+
+    def _burst_completed(self) -> None:
+        """End a stream that reached ``STREAM_NUM_SCANS``.
 
-    def start_stream(self, callback):
+        LJM reports the end of a burst from ``eStreamRead``; the device has
+        stopped by itself, which is not a failure.
+        """
+        self._streaming = False
+        done = self._burst_done
+        if done is not None:
+            done.set()
+
+    def _stream_failed(self, error: Exception) -> None:
+        """Mark the stream as failed and hand the error to ``error_handler``.
+
+        Raising from the LJM callback thread would end the stream without a
+        trace, so the error is reported instead. A burst capture waiting for
+        the stream is woken, and raises the error.
+        """
+        self._streaming = False
+        self.last_error = error
+        done = self._burst_done
+        if done is not None:
+            done.set()
+        handler = self.error_handler
+        if handler is not None:
+            handler(error)
+        else:
+            print(f"[T7 {self._serial_number}: stream failed: {error}; stopped]")
+
+    @property
+    def read_period_s(self) -> float:
+        """Time one read covers at the current read size and scan rate [s]."""
+        return self.scans_per_read / (self._actual_scan_rate or self.scan_rate)
+
+    def start_stream(self, callback, batch: bool = False):
         """Start streaming and register a data callback.
 
         Parameters
         ----------
         callback : callable
-            Called for each batch of scans with keyword arguments:
+            Called for each batch of scans with keyword arguments. In batch
+            mode (``batch=True``):
+                scan_index0    : int, index of the first scan since the
+                                 stream started
+                t0_ns          : int, timestamp of that scan in ns since the
+                                 epoch (UTC)
+                scan_rate      : float, rate at which the batch's scans are
+                                 spaced, see
+                                 :func:`tvac.stream_clock.scan_timestamps_ns`
+                readings       : np.ndarray, shape (n_scans, n_channels),
+                                 only valid during the call (copy it to
+                                 keep it)
+                channel_names  : list[str]
+                device_backlog : int
+                ljm_backlog    : int
+                gap_scans      : int, scans missing between the previous
+                                 batch and this one (normally 0)
+            Otherwise the callback receives the list-based contract:
                 timestamps    : list[datetime.datetime]
                 readings      : list[list[float]]
                 channel_names : list[str]
                 device_backlog : int
                 ljm_backlog    : int
+                gap_scans     : int
+        batch : bool
+            Deliver NumPy batches instead of per-scan Python objects.
 
         Notes
         -----
         The actual scan rate may differ slightly from the requested value.
         ``self.actual_scan_rate`` is populated from :func:`ljm.eStreamStart`
-        and is later used to derive scan timestamps.
+        and seeds the stream clock. The ``scan_rate`` handed to the callback
+        is the clock's estimate, measured against the host clock.
+
+        With a ``trigger_line`` the stream is armed rather than started: no
+        callback arrives until the trigger edge, and scan 0 is the first scan
+        after it. The stream start time becomes the time of the edge once
+        the first batch has arrived.
+        """
+        self._user_callback = callback
+        self._batch = batch
+        self._callback = callback if batch else _scan_row_adapter(callback)
+        self._stop_requested = False
+        self.last_error = None
+
+        with self._lock:
+            self._reads = 0
+            self._scans_received = 0
+            self._last_backlogs = (0, 0)
+            self._max_backlogs = (0, 0)
+            self._next_t0_ns = None
+            self._gaps = 0
+            self._gap_scans = 0
+            self._dummy_scans = 0
+            self._gap_reported = False
+            self._allocations = 0
+
+        if self.trigger_line:
+            self._arm_trigger()
+        self._start_ljm_stream()
+        self._stream_start_time_ns = time.time_ns()
+        self._stream_start_time = datetime.datetime.fromtimestamp(
+            self._stream_start_time_ns / 1e9, tz=datetime.timezone.utc
+        )
+
+        if self.record_path:
+            self._recorder = StreamRecorder(
+                self.record_path,
+                header={
+                    "channel_names": self.stream_names,
+                    "scan_rate": self._actual_scan_rate,
+                    "requested_scan_rate": self.scan_rate,
+                    "scans_per_read": self.scans_per_read,
+                    "serial_number": self._serial_number,
+                    "stream_start_time_ns": self._stream_start_time_ns,
+                },
+            )
+            print(f"Recording raw stream reads to: {self.record_path}")
+
+        self._streaming = True
+
+        self._ljm.setStreamCallback(self._handle, self._stream_callback)
+
+        print(
+            f"Stream {'armed' if self._armed else 'started'} at "
+            f"{self._actual_scan_rate:.1f} Hz  "
+            f"({self.scans_per_read} scans/read, {self.profile} profile, "
+            f"clock fit over {self.resync_interval_s} s"
+            f"{', CORE_TIMER timestamps' if self.hardware_timestamps else ''})"
+        )
+        if self._armed:
+            print(
+                f"Waiting for a {self.trigger_edge} edge on {self.trigger_line} "
+                "to start acquiring."
+            )
+
+    def capture_burst(
+        self, n_scans: int, timeout: float | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Stream a fixed number of scans straight into memory and stop.
+
+        The T7 stops by itself after ``STREAM_NUM_SCANS`` scans, which is set
+        to ``n_scans`` rounded up to whole reads (the surplus is dropped), and
+        LJM then reports the end of the burst from ``eStreamRead``. Every read
+        is copied into one preallocated array, without a user callback, and
+        only the stream clock's ``(t0_ns, scan_rate)`` is kept per read; the
+        timestamps are expanded once at the end. This leaves the host little
+        to do per read, so a short record can be taken close to the T7's
+        maximum scan rate.
+
+        Parameters
+        ----------
+        n_scans : int
+            Number of scans to capture.
+        timeout : float | None
+            Seconds to wait for the burst; by default twice its nominal
+            duration plus 5 s.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            ``timestamps_ns`` with shape (n_scans,), in ns since the epoch
+            (UTC), and ``readings`` with shape (n_scans, n_channels), with
+            the columns of ``output_channel_names``. Scans that did not
+            reach the host (also at the end of a burst the T7 completed) are
+            NaN rows.
+
+        Raises
+        ------
+        TimeoutError
+            If the burst did not complete within ``timeout``.
+        Exception
+            The error that stopped the stream during the burst (see
+            ``last_error``), e.g. an LJM error.
         """
-        self._callback = callback
+        n_scans = int(n_scans)
+        if n_scans < 1:
+            raise ValueError(f"A burst needs at least one scan, got {n_scans}.")
+        if self._streaming:
+            raise RuntimeError("Cannot capture a burst while the stream is running.")
+        if timeout is None:
+            timeout = 2 * n_scans / self.scan_rate + 5.0
+
+        # Round the device-side count up to whole reads, so LJM never has to
+        # hand out a partial last read; the surplus is dropped below.
+        scans_per_read = self.scans_per_read
+        self.scans_per_read = min(scans_per_read, n_scans)
+        device_scans = -(-n_scans // self.scans_per_read) * self.scans_per_read
+        buffer = np.empty((device_scans, len(self.output_channel_names)))
+        runs: list[tuple[int, int, float]] = []  # (row, t0_ns, rate) per run
+        filled = 0
+        done = threading.Event()
+
+        def _into_buffer(*, t0_ns, scan_rate, readings: np.ndarray, gap_scans, **_):
+            nonlocal filled
+            # Missing scans stay in the record as NaN rows, so the burst
+            # keeps its length and time axis.
+            gap = min(gap_scans, device_scans - filled)
+            if gap > 0:
+                buffer[filled : filled + gap] = np.nan
+                runs.append((filled, t0_ns - round(gap * 1e9 / scan_rate), scan_rate))
+                filled += gap
+            n = min(len(readings), device_scans - filled)
+            if n > 0:
+                buffer[filled : filled + n] = readings[:n]
+                runs.append((filled, t0_ns, scan_rate))
+                filled += n
+            if filled >= device_scans:
+                done.set()
+
+        self._write_stream_num_scans(device_scans)
+        self._bursting = True
+        self._burst_done = done
+        try:
+            self.start_stream(_into_buffer, batch=True)
+            completed = done.wait(timeout)
+        finally:
+            self.stop_stream()
+            self._bursting = False
+            self._burst_done = None
+            self.scans_per_read = scans_per_read
+            self._write_stream_num_scans(0)
+
+        if self.last_error is not None:
+            # The stream failed during the burst.
+            raise self.last_error
+        if not completed or not runs:
+            raise TimeoutError(
+                f"Burst captured {filled} of {n_scans} scans in {timeout:.1f} s."
+            )
+        # Scans lost at the end of a completed burst have no later batch to
+        # report them as a gap.
+        buffer[filled:] = np.nan
+
+        timestamps_ns = np.empty(device_scans, dtype=np.int64)
+        bounds = [row for row, _, _ in runs[1:]] + [device_scans]
+        for (row, t0_ns, scan_rate), end in zip(runs, bounds):
+            timestamps_ns[row:end] = scan_timestamps_ns(t0_ns, scan_rate, end - row)
+        return timestamps_ns[:n_scans], buffer[:n_scans]
+
+    def _arm_trigger(self) -> None:
+        """Make the next ``eStreamStart`` wait for the edge on ``trigger_line``."""
+        dio = f"DIO{self.trigger_line[3:]}"
+        address = self._ljm.namesToAddresses(1, [dio])[0][0]
+        # The extended feature has to be disabled while its index changes.
+        names = [f"{dio}_EF_ENABLE", f"{dio}_EF_INDEX", f"{dio}_EF_ENABLE"]
+        values = [0, TRIGGER_EDGES[self.trigger_edge], 1]
+        self._ljm.eWriteNames(
+            self._handle,
+            len(names) + 1,
+            names + ["STREAM_TRIGGER_INDEX"],
+            values + [address],
+        )
+        if self._devices is not None:
+            self._devices.remember_registers(
+                self._serial_number, ["STREAM_TRIGGER_INDEX"], [address]
+            )
+        # LJM times out a stream that returns no data for a few read
+        # periods; an armed stream may wait for much longer than that.
+        self._ljm.writeLibraryConfigS(
+            self._ljm.constants.STREAM_RECEIVE_TIMEOUT_MODE,
+            self._ljm.constants.STREAM_RECEIVE_TIMEOUT_MODE_MANUAL,
+        )
+        self._ljm.writeLibraryConfigS(self._ljm.constants.STREAM_RECEIVE_TIMEOUT_MS, 0)
+        self._triggered.clear()
+        self._trigger_time_ns = None
+        self._armed = True
 
-        scan_list = ljm.namesToAddresses(self.num_addresses, self.channel_names)[0]
-        self._actual_scan_rate = ljm.eStreamStart(
+    def _disarm_trigger(self) -> None:
+        """Let the next ``eStreamStart`` start at once, as a free-running stream."""
+        self._armed = False
+        self._ljm.eWriteNames(
+            self._handle,
+            2,
+            ["STREAM_TRIGGER_INDEX", f"DIO{self.trigger_line[3:]}_EF_ENABLE"],
+            [0, 0],
+        )
+        if self._devices is not None:
+            self._devices.remember_registers(
+                self._serial_number, ["STREAM_TRIGGER_INDEX"], [0]
+            )
+        self._ljm.writeLibraryConfigS(
+            self._ljm.constants.STREAM_RECEIVE_TIMEOUT_MODE,
+            self._ljm.constants.STREAM_RECEIVE_TIMEOUT_MODE_CALCULATED,
+        )
+
+    def _write_stream_num_scans(self, n_scans: int) -> None:
+        """Set ``STREAM_NUM_SCANS`` (0 = continuous) and keep the register cache in step."""
+        self._ljm.eWriteName(self._handle, "STREAM_NUM_SCANS", n_scans)
+        if self._devices is not None:
+            self._devices.remember_registers(
+                self._serial_number, ["STREAM_NUM_SCANS"], [n_scans]
+            )
+
+    def _start_ljm_stream(self):
+        """Start the LJM stream and reset the per-stream clock and statistics."""
+        # Stream-out buffers must hold data before the stream starts.
+        for out in self.stream_out:
+            out.configure(self._ljm, self._handle, self.scans_per_read)
+
+        scan_list = self._ljm.namesToAddresses(
+            len(self.scan_list_names), self.scan_list_names
+        )[0]
+        self._actual_scan_rate = self._ljm.eStreamStart(
             self._handle,
             self.scans_per_read,
-            self.num_addresses,
+            len(self.scan_list_names),
             scan_list,
             self.scan_rate,
         )
 
-        self._t_anchor = datetime.datetime.now(tz=datetime.timezone.utc)
-        self._stream_start_time = self._t_anchor
-        self._anchor_scan_count = 0
-        self._scan_index = 0
-        self._streaming = True
+        with self._lock:
+            self._clock = StreamClock(
+                self._actual_scan_rate,
+                window_s=self.resync_interval_s,
+                read_scans=self.scans_per_read,
+            )
+            self._timer = (
+                CoreTimerTracker(self._actual_scan_rate)
+                if self.hardware_timestamps
+                else None
+            )
+            self._tuner = ReadSizeController(
+                self._actual_scan_rate,
+                self.scans_per_read,
+                target_scans=scans_per_read_for(self.profile, self._actual_scan_rate),
+                max_scans=scans_per_read_for("bulk", self._actual_scan_rate),
+                # The T7 stores 2 bytes per sample in its stream buffer.
+                device_capacity_scans=self.buffer_size // (2 * len(self.stream_names)),
+            )
+            self._scan_index = 0
+            n_values = self.scans_per_read * len(self.stream_names)
+            if len(self._read_buffer) < n_values:
+                self._read_buffer = np.empty(n_values, dtype=np.float64)
+                self._dummy_mask = np.empty(n_values, dtype=bool)
+            if self.stream_out and len(self._out_buffer) < self.scans_per_read:
+                self._out_buffer = np.empty(
+                    (self.scans_per_read, len(self.output_channel_names))
+                )
+
+    def restart_stream(self, scans_per_read: int | None = None):
+        """Restart a running stream, optionally with a new read size.
 
-        ljm.setStreamCallback(self._handle, self._stream_callback)
+        The device stays open and configured, the callback and the recording
+        (if any) carry on, and the stream clock starts a new fit. Scans
+        acquired while the stream is stopped are not recovered.
+
+        A :meth:`stop_stream` meanwhile wins: the stream stays stopped. A
+        restart that fails is reported like a failed stream (``last_error``,
+        ``error_handler``), since it usually runs on a thread of its own.
+        """
+        with self._restart_lock:
+            try:
+                if not self._streaming or self._stop_requested:
+                    return
+                self._streaming = False
+                try:
+                    self._ljm.eStreamStop(self._handle)
+                except Exception:
+                    pass
+                if self._stop_requested:
+                    return
 
+                if scans_per_read:
+                    self.scans_per_read = max(1, int(scans_per_read))
+                if self.trigger_line:
+                    # The trigger edge has passed; a restart cannot wait for
+                    # another.
+                    self._disarm_trigger()
+                self._start_ljm_stream()
+                self._streaming = True
+                self._ljm.setStreamCallback(self._handle, self._stream_callback)
+            except Exception as err:
+                self._stream_failed(err)
+                return
+            finally:
+                self._restart_pending = False
+        self.restarts += 1
         print(
-            f"Stream started at {self._actual_scan_rate:.1f} Hz  "
-            f"({self.scans_per_read} scans/read, "
-            f"re-anchor every {self._resync_interval_scans} scans)"
+            f"[Stream restarted with {self.scans_per_read} scans/read "
+            f"at {self._actual_scan_rate:.1f} Hz]"
         )
 
-    def stop_stream(self):
-        """Stop the active LabJack stream if one is running."""
+    def reconnect(self):
+        """Reopen, reconfigure and restart a failed stream in the same session.
+
+        The handle is closed, since the device may have been unplugged or
+        power cycled, and the device is opened and configured again before
+        the stream restarts with the same callback. Statistics and gap
+        tracking carry on, so the first batch afterwards reports the scans
+        lost in between as ``gap_scans``. LJM and connection errors
+        propagate; the caller decides when to try again.
+
+        A triggered stream that failed before its trigger is armed again;
+        one that had already triggered restarts free-running. After a
+        :meth:`stop_stream` this does nothing.
+        """
+        with self._restart_lock:
+            if self._stop_requested:
+                return
+            self._halt()
+            if self._handle is not None:
+                try:
+                    self._release_handle(keep_open=False)
+                except Exception:
+                    self._handle = None  # The device is gone; so is the handle
+            self._connect()
+            self._configure()
+            self._resume()
+            self.last_error = None
+        self.reconnects += 1
+
+    def _halt(self):
+        """Stop acquisition without closing the recording (see :meth:`reconnect`)."""
         self._streaming = False
         try:
-            ljm.eStreamStop(self._handle)
+            self._ljm.eStreamStop(self._handle)
         except Exception:
             pass
+
+    def _resume(self):
+        """Start acquisition again with the registered callback."""
+        if self._armed:
+            self._arm_trigger()
+        self._start_ljm_stream()
+        self._streaming = True
+        self._ljm.setStreamCallback(self._handle, self._stream_callback)
+
+    def stop_stream(self):
+        """Stop the active LabJack stream if one is running."""
+        # Set before waiting for the lock, so a restart in progress does not
+        # start the stream again.
+        self._stop_requested = True
+        with self._restart_lock:
+            self._streaming = False
+            try:
+                self._ljm.eStreamStop(self._handle)
+            except Exception:
+                pass
+            if self.trigger_line and self._handle is not None:
+                try:
+                    self._disarm_trigger()
+                except Exception:
+                    pass  # The device is gone; it starts unarmed when reopened
+            if self._recorder is not None:
+                self._recorder.close()
+                self._recorder = None
         print("Stream stopped.")
 
     def close(self):
-        """Stop streaming and close the LabJack device handle."""
+        """Stop streaming and close the LabJack device handle.
+
+        With a device manager the handle is handed back to it and stays open
+        for the next session.
+        """
         self.stop_stream()
         if self._handle is not None:
-            ljm.close(self._handle)
-            self._handle = None
-        print("Device closed.")
+            self._release_handle(keep_open=True)
+            print("Device released." if self._devices is not None else "Device closed.")
+
+    def _release_handle(self, keep_open: bool):
+        if self._devices is not None:
+            self._devices.release(self._handle, keep_open=keep_open, backend=self._ljm)
+        else:
+            self._ljm.close(self._handle)
+        self._handle = None
+
+
+class LabJackT7Poller(LabJackT7Logger):
+    """Read differential analog inputs from a LabJack T7 on a timer.
+
+    For long, slow measurements (e.g. housekeeping during a thermal plateau)
+    streaming hundreds of scans per second only to throw most of them away
+    costs CPU and disk. The poller reads all channels with one
+    command-response ``eReadNames`` call, ``oversampling`` times back to
+    back, and hands the average to the callback as a one-scan batch with the
+    contract of :meth:`LabJackT7Logger.start_stream`. The backlogs are
+    always 0, the timestamp is the host time halfway through the reads, and
+    polls skipped because the previous one overran (or failed) are reported
+    as ``gap_scans``.
+
+    In command-response mode every channel uses its own
+    ``AIN#_RESOLUTION_INDEX`` instead of the stream resolution index.
+
+    Parameters
+    ----------
+    scan_rate : float
+        Output samples per second.
+    oversampling : int
+        Number of reads averaged into one output sample.
+    **kwargs
+        As for :class:`LabJackT7Logger`. Options that only apply to streams
+        (``record_path``, ``hardware_timestamps``, ``adaptive``, ...) are
+        ignored.
+    """
+
+    def __init__(
+        self,
+        ain_channels: list[int],
+        scan_rate: float = 1.0,
+        oversampling: int = 1,
+        **kwargs,
+    ):
+        if kwargs.get("trigger_line"):
+            raise ValueError(
+                "A triggered start needs a stream; the poller runs on its own timer."
+            )
+        if kwargs.get("stream_out"):
+            raise ValueError("Stream-out needs a stream; the poller has no scan clock.")
+        self.oversampling = max(1, int(oversampling))
+        self._poll_thread: threading.Thread | None = None
+        self._stop_polling = threading.Event()
+        self.overruns = 0
+        self.read_errors = 0
+
+        kwargs.update(
+            record_path=None,
+            hardware_timestamps=False,
+            keep_timer_channel=False,
+            scans_per_read=1,
+            adaptive=False,
+            rate_limit="off",
+        )
+        super().__init__(ain_channels, scan_rate=scan_rate, **kwargs)
+
+    def stream_stats(self) -> dict:
+        """Return the sample count and rate, overruns and failed reads."""
+        stats = super().stream_stats()
+        stats.update(
+            mode="poll",
+            oversampling=self.oversampling,
+            overruns=self.overruns,
+            read_errors=self.read_errors,
+        )
+        return stats
+
+    def start_stream(self, callback, batch: bool = False):
+        """Start polling; see :meth:`LabJackT7Logger.start_stream` for ``callback``."""
+        self._user_callback = callback
+        self._batch = batch
+        self._callback = callback if batch else _scan_row_adapter(callback)
+        self._stop_requested = False
+        self.last_error = None
+
+        with self._lock:
+            self._reads = 0
+            self._scans_received = 0
+            self._scan_index = 0
+            self._gaps = 0
+            self._gap_scans = 0
+        self.overruns = 0
+        self.read_errors = 0
+
+        self._actual_scan_rate = float(self.scan_rate)
+        self._stream_start_time_ns = time.time_ns()
+        self._stream_start_time = datetime.datetime.fromtimestamp(
+            self._stream_start_time_ns / 1e9, tz=datetime.timezone.utc
+        )
+
+        self._resume()
+        print(
+            f"Polling started at {self.scan_rate:.3g} Hz "
+            f"({self.oversampling} read(s) averaged per sample)"
+        )
+
+    def _halt(self):
+        self._streaming = False
+        self._stop_polling.set()
+        thread = self._poll_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        self._poll_thread = None
+
+    def _resume(self):
+        # After a reconnect the polls missed since the last sample are the
+        # gap before the next one.
+        with self._lock:
+            last_arrival_ns = self._last_arrival_ns if self._reads else 0
+        missed = 0
+        if last_arrival_ns:
+            elapsed_s = (time.time_ns() - last_arrival_ns) / 1e9
+            missed = max(0, round(elapsed_s * self.scan_rate) - 1)
+
+        self._stop_polling.clear()
+        self._streaming = True
+        self._poll_thread = threading.Thread(
+            target=self._poll_loop, args=(missed,), name="t7-poll", daemon=True
+        )
+        self._poll_thread.start()
+
+    def _poll_loop(self, gap_scans: int = 0):
+        period_s = 1.0 / self.scan_rate
+        # A DIO line reads as 0 or 1; averaged reads give the fraction high.
+        names = self.channel_names + ([self.marker_line] if self.marker_line else [])
+        # One row per averaged read and the resulting sample, reused.
+        reads = np.empty((self.oversampling, len(names)), dtype=np.float64)
+        readings = np.empty((1, len(names)), dtype=np.float64)
+        failing = False
+        next_poll = time.monotonic()
+
+        while not self._stop_polling.is_set():
+            try:
+                t_first_ns = time.time_ns()
+                try:
+                    for i in range(self.oversampling):
+                        reads[i] = self._ljm.eReadNames(self._handle, len(names), names)
+                except self._ljm.LJMError as err:
+                    # Keep polling through a transient failure (e.g. a USB
+                    # hiccup during a multi-day plateau), but only report the
+                    # change of state, not every failed sample.
+                    self.read_errors += 1
+                    gap_scans += 1
+                    if not failing:
+                        print(
+                            f"T7 {self._serial_number} poll failed: {err.errorString}"
+                        )
+                    failing = True
+                else:
+                    if failing:
+                        print(f"T7 {self._serial_number} poll recovered.")
+                    failing = False
+                    t_last_ns = time.time_ns()
+                    np.mean(reads, axis=0, out=readings[0])
+                    with self._lock:
+                        scan_index0 = self._scan_index + gap_scans
+                        self._scan_index = scan_index0 + 1
+                        self._reads += 1
+                        self._scans_received += 1
+                        self._last_arrival_ns = t_last_ns
+                        if gap_scans:
+                            self._gaps += 1
+                            self._gap_scans += gap_scans
+                    self._callback(
+                        scan_index0=scan_index0,
+                        t0_ns=(t_first_ns + t_last_ns) // 2,
+                        scan_rate=self.scan_rate,
+                        readings=readings,
+                        channel_names=self.output_channel_names,
+                        device_backlog=0,
+                        ljm_backlog=0,
+                        gap_scans=gap_scans,
+                    )
+                    gap_scans = 0
+            except Exception as err:
+                # Anything else, e.g. a sink rejecting the batch, ends polling
+                # and is reported like a failed stream, so that it shows in
+                # the status and a supervisor can restart it.
+                self._stream_failed(err)
+                return
+
+            # Stay on the original schedule; skip the polls there was no time
+            # for instead of bunching them up. Skipped polls are gaps.
+            next_poll += period_s
+            late_s = time.monotonic() - next_poll
+            if late_s > 0:
+                missed = int(late_s // period_s) + 1
+                self.overruns += missed
+                next_poll += missed * period_s
+                gap_scans += missed
+            self._stop_polling.wait(max(0.0, next_poll - time.monotonic()))
+
+    def capture_burst(self, n_scans: int, timeout: float | None = None):
+        raise ValueError("Burst capture needs a streaming LabJackT7Logger.")
+
+    def restart_stream(self, scans_per_read: int | None = None):
+        """Polling has no read size to change; nothing to restart."""
+
+    def stop_stream(self):
+        """Stop polling (and any stream left running on the device)."""
+        # The base constructor calls this before polling has ever started.
+        polling = self._poll_thread is not None
+        self._stop_requested = True
+        with self._restart_lock:
+            self._halt()
+            try:
+                self._ljm.eStreamStop(self._handle)
+            except Exception:
+                pass
+        if polling:
+            print("Polling stopped.")
+
+
+def _uniform_runs(indices: np.ndarray) -> list[tuple[int, int, int]]:
+    """Split scan indices into runs of consecutive scans.
+
+    Returns ``(lo, hi, first_index)`` per run, with ``lo:hi`` the rows of the
+    run in ``indices``.
+    """
+    if len(indices) == 0:
+        return []
+    breaks = (np.flatnonzero(np.diff(indices) != 1) + 1).tolist()
+    bounds = [0] + breaks + [len(indices)]
+    return [(lo, hi, int(indices[lo])) for lo, hi in zip(bounds, bounds[1:])]
+
+
+def _scan_row_adapter(callback):
+    """Wrap a list-based callback so it can consume NumPy batches.
+
+    This keeps the original contract (one ``datetime`` and one list of values
+    per scan) available for callers that have not moved to batch mode.
+    """
+
+    def _adapter(*, scan_index0, t0_ns, scan_rate, readings, **kwargs):
+        epoch = datetime.datetime.fromtimestamp(0, tz=datetime.timezone.utc)
+        timestamps = [
+            epoch + datetime.timedelta(microseconds=ns // 1_000)
+            for ns in scan_timestamps_ns(t0_ns, scan_rate, len(readings)).tolist()
+        ]
+        callback(timestamps=timestamps, readings=readings.tolist(), **kwargs)
+
+    return _adapter
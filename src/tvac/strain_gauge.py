@@ -6,24 +6,35 @@ Its responsibilities are:
 
 1. read the strain-gauge configuration from the active CGSE setup,
 2. apply in-memory runtime overrides from the GUI,
-3. start and stop the :class:`tvac.labjack_t7.LabJackT7Logger`,
-4. receive streamed batches through a callback,
-5. write CSV output, and
+3. start and stop one :class:`tvac.labjack_t7.LabJackT7Logger` per T7,
+4. receive streamed NumPy batches through a callback and hand them to a
+   bounded :class:`tvac.strain_gauge_pipeline.SinkPipeline`,
+5. write CSV output and MetricsHub samples from the sink worker threads, and
 6. maintain bounded in-memory plot buffers for the live plot window.
 
-The module keeps the current session state in module-level globals because the
-GUI tasks interact with it procedurally: ``start`` creates the singleton-like
-streaming session, ``stop`` tears it down, and the plot window reads shared
-buffers while the session is active.
+The state of a session lives on a :class:`StrainGaugeSession`, built from a
+frozen :class:`SessionSettings` snapshot. The GUI tasks interact with the
+module procedurally: ``start`` creates the singleton-like session, ``stop``
+tears it down, and the plot window reads the module's shared plot buffers,
+which that session fills.
 """
 
 import bisect
+import collections
 import csv
+import functools
+import inspect
+import itertools
+import json
 import os
 import threading
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
+import numpy as np
 from egse.observation import building_block, request_obsid
 from egse.system import format_datetime
 from egse.metricshub.client import MetricsHubSender
@@ -31,42 +42,54 @@ from egse.metricshub.client import MetricsHubSender
 from egse.env import get_data_storage_location
 from egse.setup import Setup, load_setup
 
-from tvac.labjack_t7 import LabJackT7Logger
+from tvac.labjack_devices import device_manager
+from tvac.labjack_replay import FILE_SUFFIX as RECORDING_SUFFIX
+from tvac.labjack_t7 import (
+    TRIGGER_EDGES,
+    TRIGGER_LINES,
+    LabJackT7Logger,
+    LabJackT7Poller,
+    marker_register,
+)
+from tvac.strain_gauge_pipeline import SinkPipeline, SinkPolicy
+from tvac.stream_supervisor import StreamSupervisor
+from tvac.stream_clock import CORE_TIMER_CHANNELS, scan_timestamps_ns
+from tvac.stream_decimation import PASSBAND, RateSplit, anti_alias_taps
+from tvac.stream_planner import RATE_LIMIT_POLICIES, StreamPlan, plan_stream
+from tvac.stream_tuning import ACQUISITION_PROFILES, DEFAULT_PROFILE
 
 ORIGIN = "LJ_SG"
+BURST_SUFFIX = "_burst.npz"
+EVENTS_SUFFIX = "_events.csv"
+METADATA_SUFFIX = "_metadata.json"
+# Continuous T7 streaming, or command-response polling for slow housekeeping
+ACQUISITION_MODES = ("stream", "poll")
+
+SERVED_COMMANDS: dict[str, Callable] = {}
+"""Functions a strain-gauge server runs on request, by name (see
+:mod:`tvac.strain_gauge_server`)."""
 
 # ---------------------------------------------------------------------------
 # Module-level state for the active logging session
 # ---------------------------------------------------------------------------
 # The strain-gauge GUI operates as a small state machine around a single
-# streaming session. These globals represent that session and are protected
-# by locks where they may be touched from multiple threads/callbacks.
-_logger: LabJackT7Logger | None = (
-    None  # LabJackT7Logger, imported lazily to avoid LJM init on import
-)
+# streaming session, which may span several T7s. The session keeps its own
+# state; the module only holds on to it, under _session_lock.
+_session: "StrainGaugeSession | None" = None
+_last_session: "StrainGaugeSession | None" = None  # For its marker events
+_backend = None  # LJM backend for new sessions, None = labjack.ljm
+# Strain-gauge server the served functions forward to, None = run here
+_server_endpoint: str | None = os.environ.get("TVAC_SG_SERVER", "").strip() or None
+_server_client = None
 _session_lock = threading.RLock()
-_csv_lock = threading.Lock()
-_csv_file = None
-_csv_writer = None
-_csv_filename = ""
-_file_index = 0
-_read_count = 0
-_start_ts = ""
-
-# CSV defaults (overridden by setup)
-_csv_enabled = True
-_save_path = "."
-_base_filename = "labjack_sg_data"
-_max_file_size = 5_000 * 1024
-
-# Metrics defaults (overridden by setup)
-_metrics_enabled = True
-_metrics_write_failed = False
-_metrics_sender: MetricsHubSender | None = None
-
-# Plot flag
-_plot_enabled = False
-_plot_keep_seconds = 60.0
+# Serialises update_sg_logging, whose decision to keep, retarget or restart
+# depends on the session it finds running.
+_update_lock = threading.Lock()
+
+# Read sizes suggested by the adaptive controller at the end of a session,
+# keyed by (serial number, profile, scan rate, AIN channels), for the next
+# matching session.
+_learned_scans_per_read: dict[tuple, int] = {}
 
 # Runtime overrides applied on top of the Setup values. These overrides are
 # intentionally in-memory only and affect newly started logging sessions.
@@ -77,7 +100,6 @@ _runtime_overrides: dict[str, dict[str, Any]] = {
     "plot": {},
 }
 _runtime_channel_overrides: dict[str, dict[str, Any]] = {}
-_active_channel_labels: list[str] = []
 _cached_channel_names: list[str] = ["SG_AIN0", "SG_AIN2", "SG_AIN4"]
 _cached_channel_settings: dict[str, dict[str, Any]] = {
     "SG_AIN0": {
@@ -86,6 +108,8 @@ _cached_channel_settings: dict[str, dict[str, Any]] = {
         "voltage_range": 0.1,
         "neg_voltage_range": 10.0,
         "resolution_index": 0,
+        "serial_number": "ANY",
+        "decimation": 1,
     },
     "SG_AIN2": {
         "enabled": False,
@@ -93,6 +117,8 @@ _cached_channel_settings: dict[str, dict[str, Any]] = {
         "voltage_range": 0.1,
         "neg_voltage_range": 10.0,
         "resolution_index": 0,
+        "serial_number": "ANY",
+        "decimation": 1,
     },
     "SG_AIN4": {
         "enabled": True,
@@ -100,12 +126,15 @@ _cached_channel_settings: dict[str, dict[str, Any]] = {
         "voltage_range": 0.1,
         "neg_voltage_range": 10.0,
         "resolution_index": 0,
+        "serial_number": "ANY",
+        "decimation": 1,
     },
 }
 
-# Plot buffers (shared with any live-plot consumer)
+# Plot buffers (shared with any live-plot consumer). Each channel has its own
+# time axis, because channels on different T7s arrive in separate batches.
 plot_lock = threading.Lock()
-time_buffer: list[float] = []
+time_buffers: list[list[float]] = []
 ch_buffers: list[list[float]] = []
 
 
@@ -119,6 +148,118 @@ def _sg_debug(message: str) -> None:
     print(f"[strain_gauge {stamp} {thread_name}] {message}")
 
 
+def set_sg_backend(backend) -> None:
+    """Select the LJM backend used by newly started SG sessions.
+
+    Pass ``None`` to use the real ``labjack.ljm`` library, or an in-process
+    backend such as :class:`tvac.labjack_sim.SyntheticLJM` to run the
+    strain-gauge stack without a T7. An in-process backend simulates one
+    device, so a multi-T7 session takes a dict of backends keyed by serial
+    number.
+    """
+    global _backend
+    with _session_lock:
+        _backend = backend
+
+
+def _get_backend(serial_number: str = "ANY"):
+    """Return the LJM backend for the T7 ``serial_number`` in a new session.
+
+    Setting the ``TVAC_SG_BACKEND`` environment variable to ``synthetic``
+    selects a default :class:`tvac.labjack_sim.SyntheticLJM` per device when
+    no backend was set explicitly with :func:`set_sg_backend`.
+    """
+    global _backend
+    with _session_lock:
+        if _backend is None:
+            if os.environ.get("TVAC_SG_BACKEND", "").strip().lower() == "synthetic":
+                _backend = {}
+        if isinstance(_backend, dict):
+            if serial_number not in _backend:
+                from tvac.labjack_sim import SyntheticLJM
+
+                _backend[serial_number] = (
+                    SyntheticLJM(serial_number=int(serial_number))
+                    if serial_number.isdigit()
+                    else SyntheticLJM()
+                )
+            return _backend[serial_number]
+        return _backend
+
+
+def set_sg_server(endpoint: str | None) -> None:
+    """Forward the served SG functions to a strain-gauge server process.
+
+    With an endpoint (e.g. ``"tcp://localhost:6720"``), the functions in
+    :data:`SERVED_COMMANDS` run in the
+    :class:`tvac.strain_gauge_server.StrainGaugeServer` listening there
+    instead of in this process; ``None`` runs them here. The default comes
+    from the ``TVAC_SG_SERVER`` environment variable.
+    """
+    global _server_endpoint, _server_client
+    with _session_lock:
+        _server_endpoint = endpoint or None
+        if _server_client is not None:
+            _server_client.close()
+        _server_client = None
+
+
+def _served(mirror: bool = False, local_only: tuple[str, ...] = ()):
+    """Make a public SG function a command of the strain-gauge server.
+
+    The function is registered in :data:`SERVED_COMMANDS`. While a server is
+    set (see :func:`set_sg_server`), calling it sends the call to the server
+    and returns its result; the ``setup`` argument stays behind, since the
+    server loads its own. With ``mirror`` the function also runs here, for
+    the runtime settings, whose in-memory copy the GUI widgets read.
+
+    ``local_only`` names arguments that cannot travel as JSON (callables,
+    objects). Passing one of them while a server is set raises a
+    ``ValueError`` before anything is sent.
+    """
+
+    def decorate(func):
+        SERVED_COMMANDS[func.__name__] = func
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global _server_client
+            with _session_lock:
+                endpoint = _server_endpoint
+                if endpoint is not None and _server_client is None:
+                    from tvac.strain_gauge_server import StrainGaugeClient
+
+                    _server_client = StrainGaugeClient(endpoint)
+                client = _server_client
+            if endpoint is None:
+                return func(*args, **kwargs)
+
+            arguments = signature.bind(*args, **kwargs).arguments
+            arguments.pop("setup", None)
+            local = [name for name in local_only if arguments.get(name) is not None]
+            if local:
+                raise ValueError(
+                    f"{func.__name__} cannot send {', '.join(local)} to the "
+                    f"strain-gauge server at {endpoint}, they only exist in "
+                    "this process. Leave them out, or run without a server "
+                    "(TVAC_SG_SERVER)."
+                )
+            if mirror:
+                func(*args, **kwargs)
+            # Leave time for commands that run for a given duration.
+            busy_s = float(arguments.get("duration") or arguments.get("timeout_s") or 0)
+            return client.call(
+                func.__name__,
+                reply_timeout_s=client.timeout_s + busy_s,
+                **arguments,
+            )
+
+        return wrapper
+
+    return decorate
+
+
 def _coerce_bool(value, field_name: str) -> bool:
     if isinstance(value, bool):
         return value
@@ -154,6 +295,83 @@ def _coerce_positive_float(value, field_name: str) -> float:
     return coerced
 
 
+def _coerce_sink_policy(value, field_name: str) -> str:
+    try:
+        return SinkPolicy(str(value).strip().lower()).value
+    except ValueError:
+        known = ", ".join(policy.value for policy in SinkPolicy)
+        raise ValueError(
+            f"Invalid sink policy for {field_name}: {value!r}. Known policies: {known}"
+        ) from None
+
+
+def _coerce_profile(value, field_name: str) -> str:
+    profile = str(value).strip().lower()
+    if profile not in ACQUISITION_PROFILES:
+        raise ValueError(
+            f"{field_name} must be one of {', '.join(ACQUISITION_PROFILES)}, "
+            f"got {value!r}"
+        )
+    return profile
+
+
+def _coerce_serial_number(value, field_name: str) -> str:
+    serial_number = str(value).strip().upper()
+    if serial_number != "ANY" and not serial_number.isdigit():
+        raise ValueError(
+            f"{field_name} must be a T7 serial number or 'ANY', got {value!r}"
+        )
+    return serial_number
+
+
+def _coerce_rate_limit(value, field_name: str) -> str:
+    policy = str(value).strip().lower()
+    if policy not in RATE_LIMIT_POLICIES:
+        raise ValueError(
+            f"{field_name} must be one of {', '.join(RATE_LIMIT_POLICIES)}, "
+            f"got {value!r}"
+        )
+    return policy
+
+
+def _coerce_acquisition_mode(value, field_name: str) -> str:
+    mode = str(value).strip().lower()
+    if mode not in ACQUISITION_MODES:
+        raise ValueError(
+            f"{field_name} must be one of {', '.join(ACQUISITION_MODES)}, got {value!r}"
+        )
+    return mode
+
+
+def _coerce_marker_line(value, field_name: str) -> str:
+    """Return a T7 DIO line name, or "" (no marker) for "", "none" or "off"."""
+    line = str(value).strip().upper()
+    if line in ("", "NONE", "OFF"):
+        return ""
+    try:
+        marker_register(line)
+    except ValueError as exc:
+        raise ValueError(f"{field_name}: {exc}") from None
+    return line
+
+
+def _coerce_trigger_line(value, field_name: str) -> str:
+    """Return a T7 line that can start a stream, or "" (free-running)."""
+    line = str(value).strip().upper()
+    if line in ("", "NONE", "OFF"):
+        return ""
+    if line not in TRIGGER_LINES:
+        raise ValueError(f"{field_name}: expected one of {', '.join(TRIGGER_LINES)}")
+    return line
+
+
+def _coerce_trigger_edge(value, field_name: str) -> str:
+    edge = str(value).strip().lower()
+    if edge not in TRIGGER_EDGES:
+        raise ValueError(f"{field_name}: expected one of {', '.join(TRIGGER_EDGES)}")
+    return edge
+
+
 def _resolve_csv_save_path(path: str) -> str:
     """Resolve SG CSV output paths relative to the CGSE daily data directory.
 
@@ -186,19 +404,75 @@ def _snapshot_setup_cfg(setup: Setup) -> dict[str, dict[str, Any]]:
             "stream_resolution_index": 0,
             "resync_interval_s": cfg.stream.resync_interval_s,
             "buffer_size": cfg.stream.buffer_size,
+            # Not a setup.gse.labjack_t7.stream field. Number of batches the
+            # sink pipeline can hold before a slow sink's policy kicks in.
+            "ring_capacity": 64,
+            # Not a setup field either. Capture raw eStreamRead batches next to
+            # the CSV output for later replay (see tvac.labjack_replay).
+            "record_raw": False,
+            # Not setup fields. Stream the T7 CORE_TIMER to index scans by
+            # device time; the timer column itself is left out of the CSV
+            # unless keep_timer_channel is set (it is never plotted).
+            "hardware_timestamps": False,
+            "keep_timer_channel": False,
+            # Not setup fields. Read size per eStreamRead, see
+            # tvac.stream_tuning.ACQUISITION_PROFILES.
+            "profile": DEFAULT_PROFILE,
+            "adaptive_read_size": False,
+            # Not a setup field. Read the T7 configuration back after writing.
+            "verify_config": False,
+            # Not a setup field. Scan rates above what the T7 sustains for the
+            # channel set are clamped, see tvac.stream_planner.
+            "rate_limit": "clamp",
+            # Not setup fields. "poll" reads the channels with eReadNames at
+            # poll_rate [Hz], averaging poll_oversampling reads per sample,
+            # instead of streaming at scan_rate (see LabJackT7Poller).
+            "mode": "stream",
+            "poll_rate": 1.0,
+            "poll_oversampling": 1,
+            # Not setup fields. Reopen and restart a T7 whose stream failed,
+            # or delivered nothing for stall_timeout_s [s], retrying with a
+            # backoff of up to max_backoff_s [s] (see tvac.stream_supervisor).
+            "auto_recover": True,
+            "stall_timeout_s": 2.0,
+            "max_backoff_s": 60.0,
+            # Optional setup field. DIO line wired to the AWG trigger (e.g.
+            # "FIO4"), streamed with the analog inputs; its edges are written
+            # to an events file next to the CSV output. "" streams no marker.
+            # Being in the setup, it survives reset_sg before the piezo tests.
+            "marker_line": _coerce_marker_line(
+                getattr(cfg.stream, "marker_line", ""), "stream.marker_line"
+            ),
+            # Optional setup fields. Line wired to the pigpio trigger GPIO
+            # (FIO0 or FIO1): streams are armed on start and acquire scan 0 on
+            # its edge, in step with the waveforms. "" starts free-running.
+            "trigger_line": _coerce_trigger_line(
+                getattr(cfg.stream, "trigger_line", ""), "stream.trigger_line"
+            ),
+            "trigger_edge": _coerce_trigger_edge(
+                getattr(cfg.stream, "trigger_edge", "rising"), "stream.trigger_edge"
+            ),
         },
+        # The sink policies are not setup fields either. CSV output is the
+        # data of record, so it spills rather than drops; the metrics and plot
+        # sinks only need recent data.
         "csv": {
             "enabled": cfg.csv.enabled,
             "save_path": cfg.csv.save_path,
             "base_filename": cfg.csv.base_filename,
             "max_file_size_bytes": cfg.csv.max_file_size_bytes,
+            "policy": SinkPolicy.SPILL.value,
+        },
+        "metrics": {
+            "enabled": cfg.metrics.enabled,
+            "policy": SinkPolicy.DROP_OLDEST.value,
         },
-        "metrics": {"enabled": cfg.metrics.enabled},
         "plot": {
             "enabled": cfg.plot.enabled,
             "window_seconds": cfg.plot.window_seconds,
             "interval_ms": cfg.plot.interval_ms,
             "show_stats": cfg.plot.show_stats,
+            "policy": SinkPolicy.DROP_OLDEST.value,
         },
     }
 
@@ -217,6 +491,15 @@ def _snapshot_setup_channels(setup: Setup) -> dict[str, dict[str, Any]]:
             "voltage_range": float(ch_cfg.voltage_range),
             "neg_voltage_range": float(ch_cfg.neg_voltage_range),
             "resolution_index": int(ch_cfg.resolution_index),
+            # Optional setup field, only needed with more than one T7
+            "serial_number": _coerce_serial_number(
+                getattr(ch_cfg, "serial_number", "ANY"), f"{sg_name}.serial_number"
+            ),
+            # Optional setup field. Log the channel at scan_rate / decimation,
+            # anti-alias filtered (see tvac.stream_decimation); 1 = full rate.
+            "decimation": _coerce_positive_int(
+                getattr(ch_cfg, "decimation", 1), f"{sg_name}.decimation"
+            ),
         }
     if channels:
         _cached_channel_names = list(channels.keys())
@@ -280,21 +563,42 @@ def get_cached_sg_channel_settings() -> dict[str, dict[str, Any]]:
     return settings
 
 
+@_served(mirror=True)
 def set_sg_runtime_settings(
     *,
     scan_rate=None,
     stream_resolution_index=None,
     resync_interval_s=None,
     buffer_size=None,
+    ring_capacity=None,
+    record_raw=None,
+    hardware_timestamps=None,
+    keep_timer_channel=None,
+    profile=None,
+    adaptive_read_size=None,
+    verify_config=None,
+    rate_limit=None,
+    mode=None,
+    poll_rate=None,
+    poll_oversampling=None,
+    auto_recover=None,
+    stall_timeout_s=None,
+    max_backoff_s=None,
+    marker_line=None,
+    trigger_line=None,
+    trigger_edge=None,
     csv_enabled=None,
     csv_save_path=None,
     csv_base_filename=None,
     csv_max_file_size_bytes=None,
+    csv_policy=None,
     metrics_enabled=None,
+    metrics_policy=None,
     plot_enabled=None,
     plot_window_seconds=None,
     plot_interval_ms=None,
     plot_show_stats=None,
+    plot_policy=None,
 ) -> None:
     """Set in-memory SG runtime overrides for the next logging session.
 
@@ -317,6 +621,70 @@ def set_sg_runtime_settings(
         _runtime_overrides["stream"]["buffer_size"] = _coerce_positive_int(
             buffer_size, "buffer_size"
         )
+    if ring_capacity is not None:
+        _runtime_overrides["stream"]["ring_capacity"] = _coerce_positive_int(
+            ring_capacity, "ring_capacity"
+        )
+    if record_raw is not None:
+        _runtime_overrides["stream"]["record_raw"] = _coerce_bool(
+            record_raw, "record_raw"
+        )
+    if hardware_timestamps is not None:
+        _runtime_overrides["stream"]["hardware_timestamps"] = _coerce_bool(
+            hardware_timestamps, "hardware_timestamps"
+        )
+    if keep_timer_channel is not None:
+        _runtime_overrides["stream"]["keep_timer_channel"] = _coerce_bool(
+            keep_timer_channel, "keep_timer_channel"
+        )
+    if profile is not None:
+        _runtime_overrides["stream"]["profile"] = _coerce_profile(profile, "profile")
+    if adaptive_read_size is not None:
+        _runtime_overrides["stream"]["adaptive_read_size"] = _coerce_bool(
+            adaptive_read_size, "adaptive_read_size"
+        )
+    if verify_config is not None:
+        _runtime_overrides["stream"]["verify_config"] = _coerce_bool(
+            verify_config, "verify_config"
+        )
+    if rate_limit is not None:
+        _runtime_overrides["stream"]["rate_limit"] = _coerce_rate_limit(
+            rate_limit, "rate_limit"
+        )
+    if mode is not None:
+        _runtime_overrides["stream"]["mode"] = _coerce_acquisition_mode(mode, "mode")
+    if poll_rate is not None:
+        _runtime_overrides["stream"]["poll_rate"] = _coerce_positive_float(
+            poll_rate, "poll_rate"
+        )
+    if poll_oversampling is not None:
+        _runtime_overrides["stream"]["poll_oversampling"] = _coerce_positive_int(
+            poll_oversampling, "poll_oversampling"
+        )
+    if auto_recover is not None:
+        _runtime_overrides["stream"]["auto_recover"] = _coerce_bool(
+            auto_recover, "auto_recover"
+        )
+    if stall_timeout_s is not None:
+        _runtime_overrides["stream"]["stall_timeout_s"] = _coerce_positive_float(
+            stall_timeout_s, "stall_timeout_s"
+        )
+    if max_backoff_s is not None:
+        _runtime_overrides["stream"]["max_backoff_s"] = _coerce_positive_float(
+            max_backoff_s, "max_backoff_s"
+        )
+    if marker_line is not None:
+        _runtime_overrides["stream"]["marker_line"] = _coerce_marker_line(
+            marker_line, "marker_line"
+        )
+    if trigger_line is not None:
+        _runtime_overrides["stream"]["trigger_line"] = _coerce_trigger_line(
+            trigger_line, "trigger_line"
+        )
+    if trigger_edge is not None:
+        _runtime_overrides["stream"]["trigger_edge"] = _coerce_trigger_edge(
+            trigger_edge, "trigger_edge"
+        )
 
     if csv_enabled is not None:
         _runtime_overrides["csv"]["enabled"] = _coerce_bool(csv_enabled, "csv_enabled")
@@ -334,11 +702,19 @@ def set_sg_runtime_settings(
         _runtime_overrides["csv"]["max_file_size_bytes"] = _coerce_positive_int(
             csv_max_file_size_bytes, "csv_max_file_size_bytes"
         )
+    if csv_policy is not None:
+        _runtime_overrides["csv"]["policy"] = _coerce_sink_policy(
+            csv_policy, "csv_policy"
+        )
 
     if metrics_enabled is not None:
         _runtime_overrides["metrics"]["enabled"] = _coerce_bool(
             metrics_enabled, "metrics_enabled"
         )
+    if metrics_policy is not None:
+        _runtime_overrides["metrics"]["policy"] = _coerce_sink_policy(
+            metrics_policy, "metrics_policy"
+        )
 
     if plot_enabled is not None:
         _runtime_overrides["plot"]["enabled"] = _coerce_bool(
@@ -356,8 +732,13 @@ def set_sg_runtime_settings(
         _runtime_overrides["plot"]["show_stats"] = _coerce_bool(
             plot_show_stats, "plot_show_stats"
         )
+    if plot_policy is not None:
+        _runtime_overrides["plot"]["policy"] = _coerce_sink_policy(
+            plot_policy, "plot_policy"
+        )
 
 
+@_served(mirror=True)
 def set_sg_channel_runtime_settings(
     *,
     sg_name: str,
@@ -366,6 +747,8 @@ def set_sg_channel_runtime_settings(
     voltage_range=None,
     neg_voltage_range=None,
     resolution_index=None,
+    serial_number=None,
+    decimation=None,
     setup: Setup = None,
 ) -> None:
     """Set in-memory runtime overrides for one SG channel definition.
@@ -401,9 +784,16 @@ def set_sg_channel_runtime_settings(
         overrides["resolution_index"] = _coerce_non_negative_int(
             resolution_index, "resolution_index"
         )
+    if serial_number is not None:
+        overrides["serial_number"] = _coerce_serial_number(
+            serial_number, "serial_number"
+        )
+    if decimation is not None:
+        overrides["decimation"] = _coerce_positive_int(decimation, "decimation")
     _cached_channel_settings[sg_name].update(overrides)
 
 
+@_served(mirror=True)
 def reset_sg_runtime_settings() -> None:
     """Clear all in-memory SG runtime overrides.
 
@@ -420,6 +810,7 @@ def reset_sg_runtime_settings() -> None:
         pass
 
 
+@_served()
 def get_sg_settings(setup: Setup = None) -> str:
     """Return a human-readable snapshot of effective SG settings."""
     setup = setup or load_setup()
@@ -432,21 +823,45 @@ def get_sg_settings(setup: Setup = None) -> str:
             "stream: "
             f"scan_rate={effective['stream']['scan_rate']}, "
             f"resync_interval_s={effective['stream']['resync_interval_s']}, "
-            f"buffer_size={effective['stream']['buffer_size']}"
+            f"buffer_size={effective['stream']['buffer_size']}, "
+            f"ring_capacity={effective['stream']['ring_capacity']}, "
+            f"record_raw={effective['stream']['record_raw']}, "
+            f"hardware_timestamps={effective['stream']['hardware_timestamps']}, "
+            f"keep_timer_channel={effective['stream']['keep_timer_channel']}, "
+            f"profile={effective['stream']['profile']}, "
+            f"adaptive_read_size={effective['stream']['adaptive_read_size']}, "
+            f"verify_config={effective['stream']['verify_config']}, "
+            f"rate_limit={effective['stream']['rate_limit']}, "
+            f"mode={effective['stream']['mode']}, "
+            f"poll_rate={effective['stream']['poll_rate']}, "
+            f"poll_oversampling={effective['stream']['poll_oversampling']}, "
+            f"auto_recover={effective['stream']['auto_recover']}, "
+            f"stall_timeout_s={effective['stream']['stall_timeout_s']}, "
+            f"max_backoff_s={effective['stream']['max_backoff_s']}, "
+            f"marker_line={effective['stream']['marker_line'] or 'none'}, "
+            f"trigger_line={effective['stream']['trigger_line'] or 'none'}, "
+            f"trigger_edge={effective['stream']['trigger_edge']}"
         ),
         (
             "csv: "
             f"enabled={effective['csv']['enabled']}, "
             f"save_path={effective['csv']['save_path']}, "
             f"base_filename={effective['csv']['base_filename']}, "
-            f"max_file_size_bytes={effective['csv']['max_file_size_bytes']}"
+            f"max_file_size_bytes={effective['csv']['max_file_size_bytes']}, "
+            f"policy={effective['csv']['policy']}"
+        ),
+        (
+            "metrics: "
+            f"enabled={effective['metrics']['enabled']}, "
+            f"policy={effective['metrics']['policy']}"
         ),
         (
             "plot: "
             f"enabled={effective['plot']['enabled']}, "
             f"window_seconds={effective['plot']['window_seconds']}, "
             f"interval_ms={effective['plot']['interval_ms']}, "
-            f"show_stats={effective['plot']['show_stats']}"
+            f"show_stats={effective['plot']['show_stats']}, "
+            f"policy={effective['plot']['policy']}"
         ),
         "channels:",
     ]
@@ -457,9 +872,18 @@ def get_sg_settings(setup: Setup = None) -> str:
             f"ain_channel={ch_cfg['ain_channel']}, "
             f"voltage_range={ch_cfg['voltage_range']}, "
             f"neg_voltage_range={ch_cfg['neg_voltage_range']}, "
-            f"resolution_index={ch_cfg['resolution_index']}"
+            f"resolution_index={ch_cfg['resolution_index']}, "
+            f"serial_number={ch_cfg['serial_number']}, "
+            f"decimation={ch_cfg['decimation']}"
         )
 
+    try:
+        for serial_number, plan in plan_sg_stream(setup=setup).items():
+            device = "" if serial_number == "ANY" else f" (T7 {serial_number})"
+            lines.append(f"stream plan{device}: {plan.describe()}")
+    except ValueError as exc:
+        lines.append(f"stream plan: {exc}")
+
     active_value_overrides = {
         section_name: values
         for section_name, values in _runtime_overrides.items()
@@ -467,7 +891,7 @@ def get_sg_settings(setup: Setup = None) -> str:
     }
     if active_value_overrides or _runtime_channel_overrides:
         lines.append("runtime_overrides:")
-        for section_name in ("stream", "csv", "plot"):
+        for section_name in ("stream", "csv", "metrics", "plot"):
             overrides = active_value_overrides.get(section_name)
             if not overrides:
                 continue
@@ -488,333 +912,1779 @@ def get_sg_settings(setup: Setup = None) -> str:
     return "\n".join(lines)
 
 
-def _rotate_csv(headers):
-    """Open the next CSV file segment and write the header row."""
-    global _file_index, _csv_file, _csv_writer, _csv_filename
+def plan_sg_stream(
+    setup: Setup = None, scan_rate: float | None = None
+) -> dict[str, StreamPlan]:
+    """Return the stream plan of every T7 for the effective SG settings.
 
-    if _csv_file:
-        _csv_file.close()
-    fname = f"{_base_filename}_{_start_ts}_{_file_index:03d}.csv"
-    _csv_filename = os.path.join(_save_path, fname)
-    _csv_file = open(_csv_filename, "w", newline="")
-    _csv_writer = csv.writer(_csv_file)
-    _csv_writer.writerow(["timestamp"] + headers)
-    _file_index += 1
-    print(f"Logging to: {_csv_filename}")
+    The plans give the highest scan rate each T7 sustains with its enabled
+    channels, ranges and stream resolution index, and the expected noise per
+    channel (see :mod:`tvac.stream_planner`). The session scan rate is
+    limited by the slowest device. ``scan_rate`` defaults to the effective
+    stream setting.
+    """
+    setup = setup or load_setup()
+    effective = _get_effective_settings(setup=setup)
+    selected_channels = [
+        (sg_name, ch_cfg)
+        for sg_name, ch_cfg in _get_effective_channel_settings(setup=setup).items()
+        if ch_cfg["enabled"]
+    ]
+    if not selected_channels:
+        return {}
 
+    stream = effective["stream"]
+    extra_addresses = len(CORE_TIMER_CHANNELS) if stream["hardware_timestamps"] else 0
+    if stream["marker_line"]:
+        extra_addresses += 1
+    return {
+        serial_number: plan_stream(
+            [float(ch_cfg["voltage_range"]) for _, _, ch_cfg in channels],
+            stream_resolution_index=int(stream["stream_resolution_index"]),
+            extra_addresses=extra_addresses,
+            scan_rate=float(scan_rate or stream["scan_rate"]),
+            channel_names=[sg_name for _, sg_name, _ in channels],
+        )
+        for serial_number, channels in _group_channels_by_device(
+            selected_channels
+        ).items()
+    }
 
-def _on_stream_data(
-    *,
-    timestamps,
-    readings,
-    channel_names,
-    device_backlog,
-    ljm_backlog,
-):
-    """Process one streamed batch from :class:`LabJackT7Logger`.
 
-    This callback is the central fan-out point of the SG data flow:
+def get_sg_max_scan_rate(setup: Setup = None) -> float | None:
+    """Return the highest scan rate all T7s sustain, or None without channels."""
+    plans = plan_sg_stream(setup=setup)
+    if not plans:
+        return None
+    return min(plan.max_scan_rate for plan in plans.values())
+
+
+def _rate_source(serial_number: str, decimation: int) -> str:
+    """Return the ``source`` label of one rate of a T7's channels."""
+    return serial_number if decimation == 1 else f"{serial_number}/{decimation}"
+
 
-    1. receive timestamped scan rows from the LabJack logger,
-    2. append them to the current CSV file and rotate files when needed,
-    3. update the shared live-plot buffers.
+def _isoformat_ns(timestamps_ns: np.ndarray) -> list[str]:
+    """Format int64 UTC nanosecond timestamps as ISO 8601 strings.
 
-    The callback does not talk to the GUI directly. The live plot reads the
-    shared ``time_buffer`` and ``ch_buffers`` data structures independently.
+    The output matches ``datetime.isoformat()`` for timezone-aware UTC
+    datetimes with microsecond precision, but is produced in one vectorized
+    call instead of one ``datetime`` per scan.
     """
-    global _read_count, _csv_writer, _csv_file, _csv_filename, _metrics_write_failed
+    iso = np.datetime_as_string(timestamps_ns.astype("datetime64[ns]"), unit="us")
+    return [f"{ts}+00:00" for ts in iso.tolist()]
 
-    if not timestamps or not readings:
-        return
 
-    with _session_lock:
-        # Copy session state under lock so the rest of the callback can operate
-        # without holding the session lock around file I/O or buffer work.
-        csv_enabled = _csv_enabled
-        metrics_enabled = _metrics_enabled
-        plot_enabled = _plot_enabled
-        plot_keep_seconds = _plot_keep_seconds
-        logger: LabJackT7Logger | None = _logger
-        sender = _metrics_sender
-
-    if csv_enabled:
-        with _csv_lock:
-            if _csv_writer is None:
-                _rotate_csv(channel_names)
-
-            # The logger already grouped raw stream values into per-scan rows.
-            # CSV output therefore becomes a simple row-wise append.
-            rows = [
-                [ts.isoformat()] + list(row) for ts, row in zip(timestamps, readings)
-            ]
-            # noinspection PyUnresolvedReferences
-            _csv_writer.writerows(rows)
-            # noinspection PyUnresolvedReferences
-            _csv_file.flush()
-
-            _read_count += 1
-            if _read_count % 10 == 0:
-                _sg_debug(
-                    f"Read #{_read_count}: {len(timestamps)} scans | "
-                    f"Device backlog: {device_backlog} | LJM backlog: {ljm_backlog}"
+def _marker_edges(levels: np.ndarray, previous: bool | None):
+    """Return the scan offsets where ``levels`` changes, and the last level.
+
+    ``previous`` is the level at the end of the previous batch; ``None``
+    takes the first scan as the starting level, so a session does not start
+    with an edge.
+    """
+    high = levels > 0.5
+    if not len(high):
+        return np.empty(0, dtype=np.intp), previous
+    start = high[0] if previous is None else previous
+    changed = np.flatnonzero(np.diff(high, prepend=start))
+    return changed, bool(high[-1])
+
+
+def _group_channels_by_device(selected_channels) -> dict[str, list]:
+    """Group enabled channels by the T7 they are wired to.
+
+    Returns ``{serial_number: [(plot_index, sg_name, ch_cfg), ...]}`` in
+    channel order. ``plot_index`` is the position of the channel among all
+    enabled channels, which is the order of the plot buffers.
+    """
+    devices: dict[str, list] = {}
+    for plot_index, (sg_name, ch_cfg) in enumerate(selected_channels):
+        devices.setdefault(ch_cfg["serial_number"], []).append(
+            (plot_index, sg_name, ch_cfg)
+        )
+
+    if len(devices) > 1 and "ANY" in devices:
+        raise ValueError(
+            "Enabled SG channels span several T7s; set serial_number on every "
+            "enabled channel."
+        )
+    for serial_number, channels in devices.items():
+        ain_channels = [int(ch_cfg["ain_channel"]) for _, _, ch_cfg in channels]
+        if len(set(ain_channels)) != len(ain_channels):
+            device = "" if serial_number == "ANY" else f" on T7 {serial_number}"
+            raise ValueError(
+                f"Enabled SG channels{device} must use unique AIN channels."
+            )
+    return devices
+
+
+def _close_loggers(loggers) -> None:
+    """Close every logger, reporting (not raising) failures after the first."""
+    first_error = None
+    for logger in loggers:
+        try:
+            logger.close()
+        except Exception as exc:
+            if first_error is None:
+                first_error = exc
+            else:
+                print(f"Warning: closing T7 {logger.identifier} failed: {exc}")
+    if first_error is not None:
+        raise first_error
+
+
+@dataclass(frozen=True)
+class SessionSettings:
+    """Settings of one logging session, fixed when the session is created.
+
+    :meth:`from_setup` merges the setup with the runtime overrides (as
+    :func:`get_sg_effective_settings` does) and resolves the CSV save path.
+    The sections are read-only mappings, so the stream callbacks and sinks
+    of a session read them from any thread without a lock, and a runtime
+    setting changed while the session runs only applies to the next one.
+    """
+
+    stream: Mapping[str, Any]
+    csv: Mapping[str, Any]
+    metrics: Mapping[str, Any]
+    plot: Mapping[str, Any]
+    channels: tuple[tuple[str, Mapping[str, Any]], ...]
+    """Enabled channels as ``(sg_name, channel settings)``, in settings order."""
+    save_path: str
+    """CSV save path, resolved (see :func:`_resolve_csv_save_path`)."""
+
+    @classmethod
+    def from_setup(cls, setup: Setup = None) -> "SessionSettings":
+        """Return the settings a session started now would use."""
+        setup = setup or load_setup()
+        effective = _get_effective_settings(setup=setup)
+        return cls(
+            stream=MappingProxyType(dict(effective["stream"])),
+            csv=MappingProxyType(dict(effective["csv"])),
+            metrics=MappingProxyType(dict(effective["metrics"])),
+            plot=MappingProxyType(dict(effective["plot"])),
+            channels=tuple(
+                (sg_name, MappingProxyType(dict(ch_cfg)))
+                for sg_name, ch_cfg in _get_effective_channel_settings(
+                    setup=setup
+                ).items()
+                if ch_cfg["enabled"]
+            ),
+            save_path=_resolve_csv_save_path(str(effective["csv"]["save_path"])),
+        )
+
+    @property
+    def csv_enabled(self) -> bool:
+        return bool(self.csv["enabled"])
+
+    @property
+    def metrics_enabled(self) -> bool:
+        return bool(self.metrics["enabled"])
+
+    @property
+    def plot_enabled(self) -> bool:
+        return bool(self.plot["enabled"])
+
+    @property
+    def base_filename(self) -> str:
+        return str(self.csv["base_filename"])
+
+    @property
+    def max_file_size(self) -> int:
+        return int(self.csv["max_file_size_bytes"])
+
+    @property
+    def marker_line(self) -> str:
+        return str(self.stream["marker_line"])
+
+    @property
+    def plot_keep_seconds(self) -> float:
+        """Time span of the plot buffers [s], a margin over the plot window."""
+        return max(1.0, float(self.plot["window_seconds"]) * 1.2)
+
+    @property
+    def channel_labels(self) -> list[str]:
+        """``SG_NAME(AINx)`` per enabled channel, for the status."""
+        return [
+            f"{sg_name}(AIN{int(ch_cfg['ain_channel'])})"
+            for sg_name, ch_cfg in self.channels
+        ]
+
+    def with_target(self, save_path: str, base_filename: str) -> "SessionSettings":
+        """Return these settings with the files under another path and name."""
+        csv_settings = {
+            **self.csv,
+            "save_path": save_path,
+            "base_filename": base_filename,
+        }
+        return replace(self, csv=MappingProxyType(csv_settings), save_path=save_path)
+
+    def same_acquisition(self, other: "SessionSettings") -> bool:
+        """Whether ``other`` only differs in the CSV save path and base filename."""
+        return self.with_target("", "") == other.with_target("", "")
+
+
+class _OutputTarget:
+    """Where the files of a session go, from the host time ``switch_ns`` on."""
+
+    __slots__ = ("switch_ns", "settings", "start_ts")
+
+    def __init__(self, switch_ns: int, settings: SessionSettings, start_ts: str):
+        self.switch_ns = switch_ns
+        self.settings = settings
+        self.start_ts = start_ts  # Timestamp in the file names
+
+
+class StrainGaugeSession:
+    """One strain-gauge logging session: its T7 loggers, sinks and outputs.
+
+    Parameters
+    ----------
+    settings : SessionSettings
+        Settings of the session, see :meth:`SessionSettings.from_setup`.
+    extra_sinks : dict[str, Callable] | None
+        Sinks added to the pipeline (see :func:`start_sg_logging`).
+    supervise : bool | None
+        Run every T7 under a :class:`tvac.stream_supervisor.StreamSupervisor`;
+        None follows the ``auto_recover`` stream setting.
+    stream_out : list | None
+        :class:`tvac.stream_out.StreamOut` to play on the DACs of a single T7.
+    plot_buffers : tuple | None
+        ``(lock, time_buffers, ch_buffers)`` for the plot sink to fill. The
+        session started by :func:`start_sg_logging` fills the module's
+        buffers, which the live plot window reads; by default a session has
+        buffers of its own.
+
+    :func:`start_sg_logging` runs one session per process, but other
+    sessions can run next to it on other T7s, e.g. a second rig or a capture
+    for an analysis::
+
+        session = StrainGaugeSession(SessionSettings.from_setup(setup))
+        session.start()
+        ...
+        session.stop()
+
+    Give each its own CSV base filename or save path. All state of a session
+    lives on its object. What the stream callbacks and sink workers read is
+    in place before the streams start and stays until they have stopped, so
+    they read it without taking a lock.
+    """
+
+    def __init__(
+        self,
+        settings: SessionSettings,
+        extra_sinks: dict[str, Callable] | None = None,
+        supervise: bool | None = None,
+        stream_out: list | None = None,
+        plot_buffers: tuple | None = None,
+    ):
+        if not settings.channels:
+            raise ValueError(
+                "No SG channels are enabled. Enable at least one channel first."
+            )
+        self.settings = settings
+        self.devices = _group_channels_by_device(settings.channels)
+        if stream_out:
+            if settings.stream["mode"] == "poll":
+                raise ValueError("Stream-out needs stream mode; set mode='stream'.")
+            if len(self.devices) > 1:
+                raise ValueError("Stream-out drives the DACs of a single T7.")
+        self.multi_device = len(self.devices) > 1
+        self.extra_sinks = dict(extra_sinks or {})
+        self.supervise = (
+            bool(settings.stream["auto_recover"]) if supervise is None else supervise
+        )
+        self.stream_out = list(stream_out or [])
+        self.plot_lock, self.time_buffers, self.ch_buffers = plot_buffers or (
+            threading.Lock(),
+            [],
+            [],
+        )
+
+        self.start_ts = ""
+        self.start_ns: int | None = None  # Host time the streams started
+        self.loggers: dict[str, LabJackT7Logger] = {}  # Per T7 serial number
+        self.supervisors: dict[str, StreamSupervisor] = {}  # Same keys
+        self.pipeline: SinkPipeline | None = None
+        # Per T7 with decimated channels: splits its batches into one series
+        # per rate
+        self.rate_splits: dict[str, RateSplit] = {}
+        # Per source: the plot buffers of its columns
+        self.plot_columns: dict[str, list[int]] = {}
+        self._read_size_keys: dict[str, tuple] = {}
+        # Output targets in switch order (see retarget), and per source the
+        # one its CSV and events files currently belong to
+        self._targets: list[_OutputTarget] = []
+        self._csv_targets: dict[str, int] = {}
+        self._events_targets: dict[str, int] = {}
+        self._lock = threading.Lock()  # Serialises start and stop
+        self._stopped = False
+
+        # CSV output per source, since each device streams its own channel set
+        self._csv_lock = threading.Lock()
+        self._csv_files: dict[str, Any] = {}
+        self._csv_writers: dict[str, Any] = {}
+        self._csv_filenames: dict[str, str] = {}
+        self._file_indices: dict[str, int] = {}
+        self.read_count = 0
+
+        # Edges of the marker line per T7: the events file, the level at the
+        # end of the last batch, and the events of the session for analysis
+        self._events_lock = threading.Lock()
+        self._events_files: dict[str, Any] = {}
+        self._events_writers: dict[str, Any] = {}
+        self._marker_levels: dict[str, bool] = {}
+        self._marker_events: collections.deque = collections.deque(maxlen=100_000)
+
+        self._metrics_sender: MetricsHubSender | None = None
+        self._metrics_write_failed = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the streams have been started and not stopped."""
+        return bool(self.loggers) and not self._stopped
+
+    def uses_device(self, serial_number: str) -> bool:
+        """Whether the T7 ``serial_number`` may be one this session streams from."""
+        return any(
+            serial_number in (serial, "ANY") or serial == "ANY"
+            for serial in self.devices
+        )
+
+    def start(self) -> None:
+        """Open and configure the T7s, start the sinks, and start streaming.
+
+        See :func:`start_sg_logging` for the steps. A session is started
+        once; a failed start leaves nothing open.
+        """
+        with self._lock:
+            if self.loggers or self._stopped:
+                raise RuntimeError("A strain-gauge session can only be started once.")
+            self._start()
+
+    def _start(self) -> None:
+        t_start = time.perf_counter()
+        settings = self.settings
+        stream = settings.stream
+
+        record_raw = bool(stream["record_raw"])
+        if settings.csv_enabled or record_raw or settings.marker_line:
+            os.makedirs(settings.save_path, exist_ok=True)
+        self.start_ts = format_datetime()
+        self._targets = [_OutputTarget(0, settings, self.start_ts)]
+
+        if settings.metrics_enabled:
+            sender = MetricsHubSender()
+            sender.connect()
+            self._metrics_sender = sender
+
+        profile = str(stream["profile"])
+        adaptive = bool(stream["adaptive_read_size"])
+        if stream["mode"] == "poll":
+            # Timed command-response reads into the same sinks
+            logger_cls = LabJackT7Poller
+            scan_rate = float(stream["poll_rate"])
+            mode_options = {"oversampling": int(stream["poll_oversampling"])}
+            if stream["trigger_line"]:
+                print("Polling starts on its own timer; trigger_line is ignored.")
+        else:
+            logger_cls = LabJackT7Logger
+            scan_rate = float(stream["scan_rate"])
+            mode_options = {
+                "trigger_line": stream["trigger_line"] or None,
+                "trigger_edge": str(stream["trigger_edge"]),
+            }
+            if self.stream_out:
+                mode_options["stream_out"] = self.stream_out
+
+        loggers: dict[str, LabJackT7Logger] = {}
+        plot_columns: dict[str, list[int]] = {}
+        rate_splits: dict[str, RateSplit] = {}
+        try:
+            for serial_number, channels in self.devices.items():
+                ain_channels = [int(ch_cfg["ain_channel"]) for _, _, ch_cfg in channels]
+                read_size_key = (
+                    serial_number,
+                    profile,
+                    scan_rate,
+                    tuple(ain_channels),
+                )
+                device_tag = f"_{serial_number}" if self.multi_device else ""
+                with _session_lock:
+                    learned_scans_per_read = _learned_scans_per_read.get(read_size_key)
+                loggers[serial_number] = logger_cls(
+                    ain_channels=ain_channels,
+                    scan_rate=scan_rate,
+                    voltage_range=[
+                        float(ch_cfg["voltage_range"]) for _, _, ch_cfg in channels
+                    ],
+                    neg_voltage_range=[
+                        float(ch_cfg["neg_voltage_range"]) for _, _, ch_cfg in channels
+                    ],
+                    resolution_index=[
+                        int(ch_cfg["resolution_index"]) for _, _, ch_cfg in channels
+                    ],
+                    stream_resolution_index=int(stream["stream_resolution_index"]),
+                    resync_interval_s=int(stream["resync_interval_s"]),
+                    buffer_size=int(stream["buffer_size"]),
+                    backend=_get_backend(serial_number),
+                    record_path=(
+                        os.path.join(
+                            settings.save_path,
+                            f"{settings.base_filename}_{self.start_ts}{device_tag}"
+                            f"{RECORDING_SUFFIX}",
+                        )
+                        if record_raw
+                        else None
+                    ),
+                    hardware_timestamps=bool(stream["hardware_timestamps"]),
+                    keep_timer_channel=bool(stream["keep_timer_channel"]),
+                    profile=profile,
+                    scans_per_read=learned_scans_per_read if adaptive else None,
+                    adaptive=adaptive,
+                    device_manager=device_manager,
+                    verify_config=bool(stream["verify_config"]),
+                    identifier=serial_number,
+                    rate_limit=str(stream["rate_limit"]),
+                    marker_line=settings.marker_line or None,
+                    **mode_options,
                 )
+                self._read_size_keys[serial_number] = read_size_key
+                decimation = [int(ch_cfg["decimation"]) for _, _, ch_cfg in channels]
+                if max(decimation) == 1:
+                    plot_columns[serial_number] = [
+                        plot_index for plot_index, _, _ in channels
+                    ]
+                    continue
+                # Columns after the strain gauges (marker, timer, DACs) stay
+                # at the full rate.
+                logger = loggers[serial_number]
+                names = logger.output_channel_names
+                split = RateSplit(
+                    names,
+                    decimation + [1] * (len(names) - len(decimation)),
+                    logger.scans_per_read,
+                )
+                rate_splits[serial_number] = split
+                for factor, columns in split.groups.items():
+                    plot_columns[_rate_source(serial_number, factor)] = [
+                        channels[column][0]
+                        for column in columns
+                        if column < len(channels)
+                    ]
+        except Exception:
+            # Hand back the devices that were already opened and configured.
+            self._close_metrics()
+            _close_loggers(loggers.values())
+            raise
+
+        # One worker thread per enabled output, fed from a bounded ring that
+        # the stream callbacks of all devices fill without doing any I/O.
+        pipeline = SinkPipeline(
+            n_channels=max(
+                len(logger.output_channel_names) for logger in loggers.values()
+            ),
+            max_scans=max(logger.scans_per_read for logger in loggers.values()),
+            capacity=int(stream["ring_capacity"]),
+        )
+        if settings.csv_enabled:
+            pipeline.add_sink("csv", self._csv_sink, settings.csv["policy"])
+        if settings.metrics_enabled:
+            pipeline.add_sink("metrics", self._metrics_sink, settings.metrics["policy"])
+        if settings.plot_enabled:
+            pipeline.add_sink("plot", self._plot_sink, settings.plot["policy"])
+        if settings.marker_line:
+            # Edges are rare but must not be lost
+            pipeline.add_sink("events", self._events_sink, SinkPolicy.SPILL)
+        for name, handler in self.extra_sinks.items():
+            pipeline.add_sink(name, handler, SinkPolicy.SPILL)
+        pipeline.start()
+        self.pipeline = pipeline
+        self.rate_splits = rate_splits
+        self.plot_columns = plot_columns
+
+        with self.plot_lock:
+            # One buffer per enabled channel, in the order of the channel
+            # settings (which the live plot uses for its axes).
+            n_ch = len(settings.channels)
+            self.time_buffers.clear()
+            self.time_buffers.extend([] for _ in range(n_ch))
+            self.ch_buffers.clear()
+            self.ch_buffers.extend([] for _ in range(n_ch))
+
+        _sg_debug(
+            "starting stream "
+            f"devices={list(loggers)} "
+            f"channels={settings.channel_labels} "
+            f"mode={stream['mode']} "
+            f"scan_rate={scan_rate} "
+            f"plot_enabled={settings.plot_enabled} "
+            f"csv_enabled={settings.csv_enabled}"
+            f"metrics_enabled={settings.metrics_enabled}",
+        )
 
-            if os.path.getsize(_csv_filename) >= _max_file_size:
-                _rotate_csv(channel_names)
+        # All devices are configured by now, so the streams start back to back.
+        # The sinks look the loggers up from the first batch on.
+        self.start_ns = time.time_ns()
+        self.loggers = loggers
+        supervisors: dict[str, StreamSupervisor] = {}
+        try:
+            for serial_number, logger in loggers.items():
+                callback = functools.partial(self._on_stream_data, source=serial_number)
+                if self.supervise:
+                    supervisor = StreamSupervisor(
+                        logger,
+                        stall_timeout_s=float(stream["stall_timeout_s"]),
+                        max_backoff_s=float(stream["max_backoff_s"]),
+                    )
+                    supervisor.start(callback, batch=True)
+                    supervisors[serial_number] = supervisor
+                else:
+                    logger.start_stream(callback=callback, batch=True)
+        except Exception:
+            for supervisor in supervisors.values():
+                supervisor.stop()
+            # noinspection PyBroadException
+            try:
+                _close_loggers(loggers.values())
+            except Exception:
+                pass
+            pipeline.stop()
+            self._close_outputs()
+            self.loggers = {}
+            raise
+        self.supervisors = supervisors
+
+        if settings.csv_enabled:
+            self._write_metadata(self._targets[0])
+
+        device_manager.record_latency("start", time.perf_counter() - t_start)
+
+    def stop(self) -> None:
+        """Stop the streams, let the sinks drain, and close every output."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            if not self.loggers:
+                return
+            self._stop()
+
+    def retarget(
+        self, save_path: str | None = None, base_filename: str | None = None
+    ) -> int:
+        """Continue the CSV and events files under another path and filename.
+
+        The T7s, the stream, the MetricsHub output and the live plot carry on
+        untouched. Every CSV series ends with the last scan before the switch
+        and continues, in a new series of files named after
+        ``base_filename`` and the time of the switch, with the first scan from
+        the switch on, so no scan is lost or written twice. The switch is the
+        host time of this call; it splits the batch that spans it. A raw
+        stream recording (``record_raw``) stays where it is.
+
+        Args:
+            save_path (str | None): New CSV save path; unchanged if None.
+            base_filename (str | None): New CSV base filename; unchanged if None.
+
+        Returns:
+            Host time of the switch [ns].
+        """
+        with self._lock:
+            if not self.running:
+                raise RuntimeError("The strain-gauge session is not running.")
+            current = self._targets[-1]
+            settings = current.settings.with_target(
+                current.settings.save_path
+                if save_path is None
+                else _resolve_csv_save_path(str(save_path)),
+                current.settings.base_filename
+                if base_filename is None
+                else str(base_filename),
+            )
+            # The timestamp has a resolution of a second; a second switch to
+            # the same files within it gets a suffix instead of overwriting.
+            start_ts = timestamp = format_datetime()
+            taken = {
+                t.start_ts
+                for t in self._targets
+                if (t.settings.save_path, t.settings.base_filename)
+                == (settings.save_path, settings.base_filename)
+            }
+            for suffix in itertools.count(1):
+                if start_ts not in taken:
+                    break
+                start_ts = f"{timestamp}_{suffix}"
+            target = _OutputTarget(time.time_ns(), settings, start_ts)
+            if settings.csv_enabled or settings.marker_line:
+                os.makedirs(settings.save_path, exist_ok=True)
+
+            with self._csv_lock, self._events_lock:
+                self._targets.append(target)
+                self.settings = settings
+
+        if settings.csv_enabled:
+            self._write_metadata(target)
+        print(
+            f"Strain-gauge output continues in {settings.save_path} as "
+            f"{settings.base_filename}_{target.start_ts}."
+        )
+        return target.switch_ns
+
+    def _stop(self) -> None:
+        _sg_debug("stop requested")
+        t_stop = time.perf_counter()
+
+        # A recovery must not reopen a device while it is being closed.
+        for supervisor in self.supervisors.values():
+            supervisor.stop()
+
+        for serial_number, logger in self.loggers.items():
+            read_size_key = self._read_size_keys.get(serial_number)
+            if logger.adaptive and read_size_key is not None:
+                suggestion = logger.suggested_scans_per_read
+                with _session_lock:
+                    _learned_scans_per_read[read_size_key] = suggestion
+                if suggestion != logger.scans_per_read:
+                    print(
+                        f"Next session will read {suggestion} scans per eStreamRead"
+                        f"{'' if serial_number == 'ANY' else f' from T7 {serial_number}'}."
+                    )
 
-    if metrics_enabled and sender is not None:
         try:
-            for ts, row in zip(timestamps, readings):
-                sender.send(
-                    {
-                        "measurement": ORIGIN.lower(),
-                        "time": ts.isoformat(),
-                        "fields": dict(zip(channel_names, row)),
-                    }
+            _close_loggers(self.loggers.values())
+        finally:
+            # Tear down each output path even if a device close raised.
+            # Let the sinks drain whatever is still in the ring before their
+            # outputs are closed.
+            if self.pipeline is not None:
+                self.pipeline.stop()
+            self._close_outputs()
+            device_manager.record_latency("stop", time.perf_counter() - t_stop)
+
+    def _close_metrics(self) -> None:
+        sender, self._metrics_sender = self._metrics_sender, None
+        if sender is not None:
+            sender.close()
+
+    def _close_outputs(self) -> None:
+        """Close the MetricsHub sender, CSV and events files, and plot buffers."""
+        self._close_metrics()
+
+        with self._csv_lock:
+            for csv_file in self._csv_files.values():
+                csv_file.close()
+            self._csv_files.clear()
+            self._csv_writers.clear()
+            self._csv_filenames.clear()
+
+        with self._events_lock:
+            for events_file in self._events_files.values():
+                events_file.close()
+            self._events_files.clear()
+            self._events_writers.clear()
+
+        with self.plot_lock:
+            self.time_buffers.clear()
+            self.ch_buffers.clear()
+
+    def _write_metadata(self, target: _OutputTarget) -> None:
+        """Write the sample rate and output file of every channel to a JSON file.
+
+        With decimated channels a session writes several CSV series per T7 at
+        different rates; the metadata ties every channel to its series and rate
+        (and the anti-alias filter it went through) for the analysis. Every
+        output target gets its own, next to its files.
+        """
+        settings = target.settings
+        metadata = {
+            "origin": ORIGIN,
+            "session_start": self.start_ts,
+            "devices": {},
+            "channels": {},
+        }
+        if target.switch_ns:
+            metadata["retargeted"] = target.start_ts
+        for serial_number, channels in self.devices.items():
+            logger = self.loggers[serial_number]
+            scan_rate = float(logger.actual_scan_rate)
+            metadata["devices"][serial_number] = {
+                "mode": logger.stream_stats()["mode"],
+                "scan_rate": scan_rate,
+                "columns": logger.output_channel_names,
+            }
+            for column, (_, sg_name, ch_cfg) in enumerate(channels):
+                decimation = int(ch_cfg["decimation"])
+                source = _rate_source(serial_number, decimation)
+                metadata["channels"][sg_name] = {
+                    "device": serial_number,
+                    "column": logger.output_channel_names[column],
+                    "ain_channel": int(ch_cfg["ain_channel"]),
+                    "voltage_range": float(ch_cfg["voltage_range"]),
+                    "decimation": decimation,
+                    "sample_rate": scan_rate / decimation,
+                    "files": (
+                        f"{settings.base_filename}_{target.start_ts}"
+                        f"{self._source_tag(source)}_###.csv"
+                    ),
+                    "anti_alias": (
+                        {
+                            "taps": len(anti_alias_taps(decimation)),
+                            "cutoff_hz": PASSBAND * scan_rate / (2 * decimation),
+                        }
+                        if decimation > 1
+                        else None
+                    ),
+                }
+
+        filename = os.path.join(
+            settings.save_path,
+            f"{settings.base_filename}_{target.start_ts}{METADATA_SUFFIX}",
+        )
+        try:
+            with open(filename, "w") as metadata_file:
+                json.dump(metadata, metadata_file, indent=2)
+        except OSError as exc:
+            print(f"Warning: could not write the session metadata: {exc}")
+
+    def _source_tag(self, source: str) -> str:
+        """Return the file name tag of a ``source``, e.g. ``"_470012345_dec10"``.
+
+        The serial number is only included in a multi-T7 session, and the
+        decimation for decimated channels.
+        """
+        serial_number, _, decimation = str(source).partition("/")
+        device_tag = f"_{serial_number}" if self.multi_device else ""
+        return device_tag + (f"_dec{decimation}" if decimation else "")
+
+    def _rotate_csv(self, source, headers):
+        """Open the next CSV file segment of ``source`` and write the header row.
+
+        Called with the CSV lock held. Every device of a multi-T7 session
+        writes its own series of files, with the device serial number in the
+        file name, because the devices stream different channel sets at their
+        own pace.
+        """
+        csv_file = self._csv_files.get(source)
+        if csv_file:
+            csv_file.close()
+        target = self._targets[self._csv_targets.get(source, 0)]
+        file_index = self._file_indices.get(source, 0)
+        fname = (
+            f"{target.settings.base_filename}_{target.start_ts}"
+            f"{self._source_tag(source)}_{file_index:03d}.csv"
+        )
+        csv_filename = os.path.join(target.settings.save_path, fname)
+        csv_file = open(csv_filename, "w", newline="")
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(["timestamp"] + headers)
+        self._csv_files[source] = csv_file
+        self._csv_writers[source] = csv_writer
+        self._csv_filenames[source] = csv_filename
+        self._file_indices[source] = file_index + 1
+        print(f"Logging to: {csv_filename}")
+
+    def _close_csv(self, source) -> None:
+        """Close the CSV series of ``source``; the next file starts a new series."""
+        csv_file = self._csv_files.pop(source, None)
+        if csv_file:
+            csv_file.close()
+        self._csv_writers.pop(source, None)
+        self._csv_filenames.pop(source, None)
+        self._file_indices.pop(source, None)
+
+    def csv_filenames(self) -> list[str]:
+        """Return the CSV files being written, one per source."""
+        with self._csv_lock:
+            return list(self._csv_filenames.values())
+
+    def _on_stream_data(
+        self,
+        *,
+        scan_index0,
+        t0_ns,
+        scan_rate,
+        readings,
+        channel_names,
+        device_backlog,
+        ljm_backlog,
+        gap_scans,
+        source,
+    ):
+        """Receive one streamed batch from a :class:`LabJackT7Logger`.
+
+        This callback runs on the LJM callback thread of the device
+        ``source``, so it does no I/O itself: it only copies the batch (a
+        view of the logger's read buffer) into a preallocated block of the
+        session's :class:`SinkPipeline`. The CSV, MetricsHub and live-plot
+        sinks each consume views of those blocks on their own worker thread,
+        so a slow disk or MetricsHub hiccup does not delay the next
+        ``eStreamRead``.
+        """
+        if len(readings) == 0:
+            return
+
+        split = self.rate_splits.get(source)
+        if split is not None:
+            # Full-rate and decimated channels go out as separate series.
+            for decimation, batch in split.split(
+                scan_index0, t0_ns, scan_rate, readings, gap_scans
+            ):
+                self.pipeline.push(
+                    device_backlog=device_backlog,
+                    ljm_backlog=ljm_backlog,
+                    source=_rate_source(source, decimation),
+                    **batch,
+                )
+            return
+
+        self.pipeline.push(
+            scan_index0=scan_index0,
+            t0_ns=t0_ns,
+            scan_rate=scan_rate,
+            readings=readings,
+            channel_names=channel_names,
+            device_backlog=device_backlog,
+            ljm_backlog=ljm_backlog,
+            gap_scans=gap_scans,
+            source=source,
+        )
+
+    def _csv_sink(
+        self,
+        *,
+        scan_index0,
+        t0_ns,
+        scan_rate,
+        readings,
+        channel_names,
+        device_backlog,
+        ljm_backlog,
+        gap_scans,
+        source,
+    ):
+        """Append one batch to the current CSV file and rotate files when needed.
+
+        Scans missing before the batch are marked by one row with the time of
+        the first missing scan and ``nan`` for every channel. After a
+        :meth:`retarget`, the scans from its switch time on start the series
+        of the new target.
+        """
+        timestamps_ns = scan_timestamps_ns(t0_ns, scan_rate, len(readings))
+        with self._csv_lock:
+            lo = 0
+            while True:
+                index = self._csv_targets.get(source, 0)
+                hi = len(readings)
+                if index + 1 < len(self._targets):
+                    switch_ns = self._targets[index + 1].switch_ns
+                    hi = max(lo, int(np.searchsorted(timestamps_ns, switch_ns)))
+                if hi > lo:
+                    self._write_csv_rows(
+                        source,
+                        channel_names,
+                        timestamps_ns[lo:hi],
+                        readings[lo:hi],
+                        gap_scans,
+                        scan_rate,
+                    )
+                    gap_scans = 0
+                if hi == len(readings):
+                    break
+                self._close_csv(source)
+                self._csv_targets[source] = index + 1
+                lo = hi
+
+            self.read_count += 1
+            if self.read_count % 10 == 0:
+                _sg_debug(
+                    f"Read #{self.read_count} ({source}): {len(readings)} scans | "
+                    f"Device backlog: {device_backlog} | LJM backlog: {ljm_backlog}"
                 )
+
+    def _write_csv_rows(
+        self, source, channel_names, timestamps_ns, readings, gap_scans, scan_rate
+    ) -> None:
+        """Write scans to the current CSV file of ``source``; CSV lock held."""
+        if source not in self._csv_writers:
+            self._rotate_csv(source, channel_names)
+        writer = self._csv_writers[source]
+
+        if gap_scans:
+            gap_ns = timestamps_ns[:1] - round(gap_scans * 1e9 / scan_rate)
+            writer.writerow(_isoformat_ns(gap_ns) + [float("nan")] * len(channel_names))
+
+        # Transposing once gives one Python list per channel, so each CSV
+        # row is a plain tuple without per-scan list concatenation.
+        writer.writerows(zip(_isoformat_ns(timestamps_ns), *readings.T.tolist()))
+        self._csv_files[source].flush()
+
+        if os.path.getsize(self._csv_filenames[source]) >= self.settings.max_file_size:
+            self._rotate_csv(source, channel_names)
+
+    def _metrics_sink(
+        self,
+        *,
+        scan_index0,
+        t0_ns,
+        scan_rate,
+        readings,
+        channel_names,
+        device_backlog,
+        ljm_backlog,
+        gap_scans,
+        source,
+    ):
+        """Send one batch to the MetricsHub, one sample per scan.
+
+        The stream clock state (drift, offset, latency) is sent once per
+        batch as a separate ``<origin>_clock`` measurement, and the session's
+        gap counters as ``<origin>_gaps``, together with the size of the gap
+        before this batch (``missing_scans``, normally 0). In a multi-T7
+        session the samples are tagged with the device serial number, since
+        the AIN channel names repeat across devices, and decimated channels
+        with their ``decimation``.
+        """
+        sender = self._metrics_sender
+        if sender is None:
+            return
+        serial_number, _, decimation = str(source).partition("/")
+        # The clock and gap stats are sent with the full-rate series only.
+        logger = None if decimation else self.loggers.get(source)
+        tags = {"device": serial_number} if self.multi_device else {}
+        if decimation:
+            tags["decimation"] = decimation
+
+        timestamps_ns = scan_timestamps_ns(t0_ns, scan_rate, len(readings))
+        try:
+            for ts, row in zip(_isoformat_ns(timestamps_ns), readings.tolist()):
+                sample = {
+                    "measurement": ORIGIN.lower(),
+                    "time": ts,
+                    "fields": dict(zip(channel_names, row)),
+                }
+                if tags:
+                    sample["tags"] = tags
+                sender.send(sample)
+            clock_stats = logger.clock_stats() if logger is not None else {}
+            if clock_stats:
+                sample = {
+                    "measurement": f"{ORIGIN.lower()}_clock",
+                    "time": ts,
+                    "fields": {
+                        "drift_ppm": clock_stats["drift_ppm"],
+                        "offset_us": clock_stats["offset_us"],
+                        "latency_us": clock_stats["latency_us"],
+                        "jitter_us": clock_stats["jitter_us"],
+                    },
+                }
+                if tags:
+                    sample["tags"] = tags
+                sender.send(sample)
+            stream_stats = logger.stream_stats() if logger is not None else {}
+            if stream_stats:
+                sample = {
+                    "measurement": f"{ORIGIN.lower()}_gaps",
+                    "time": ts,
+                    "fields": {
+                        "missing_scans": gap_scans,
+                        "gaps": stream_stats["gaps"],
+                        "gap_scans": stream_stats["gap_scans"],
+                        "dummy_scans": stream_stats["dummy_scans"],
+                    },
+                }
+                if tags:
+                    sample["tags"] = tags
+                sender.send(sample)
         except Exception as exc:
-            if not _metrics_write_failed:
+            # Only this sink's worker thread touches the flag.
+            if not self._metrics_write_failed:
                 print(f"Warning: metrics write to MetricsHub failed: {exc}")
-                _metrics_write_failed = True
+                self._metrics_write_failed = True
             _sg_debug(f"metrics write failed: {exc}")
 
-    if plot_enabled:
-        if logger is None or logger.stream_start_time is None:
-            return
+    def _plot_sink(
+        self,
+        *,
+        scan_index0,
+        t0_ns,
+        scan_rate,
+        readings,
+        channel_names,
+        device_backlog,
+        ljm_backlog,
+        gap_scans,
+        source,
+    ):
+        """Append one batch to the session's live-plot buffers."""
+        plot_columns = self.plot_columns.get(source, [])
+        plot_keep_seconds = self.settings.plot_keep_seconds
 
         # The live plot uses seconds-from-start on the x-axis instead of raw
-        # datetimes, so convert timestamps into offsets from the stream start.
-        t0 = logger.stream_start_time
-        new_times = [(ts - t0).total_seconds() for ts in timestamps]
-        new_vals = list(zip(*readings))
-
-        with plot_lock:
-            time_buffer.extend(new_times)
-            for ch_idx in range(len(channel_names)):
-                ch_buffers[ch_idx].extend(new_vals[ch_idx])
-
-            # Bound in-memory buffers even if no live-plot consumer is running.
-            # This prevents runaway growth that can eventually stall the UI.
-            cutoff = time_buffer[-1] - plot_keep_seconds
-            trim_idx = bisect.bisect_left(time_buffer, cutoff)
-            if trim_idx > 0:
-                del time_buffer[:trim_idx]
-                for ch_idx in range(len(channel_names)):
-                    del ch_buffers[ch_idx][:trim_idx]
-
-
-def start_sg_logging(setup: Setup = None):
-    """Start strain-gauge streaming and CSV logging from the CGSE Setup.
-
-    The startup sequence is:
-
-    1. load setup values,
-    2. merge any in-memory runtime overrides,
-    3. validate the enabled channel set,
-    4. initialise CSV / plot session state,
-    5. create the LabJack logger,
-    6. start the stream so data begins arriving through ``_on_stream_data``.
-    """
-    global _logger, _csv_enabled, _save_path, _base_filename, _max_file_size
-    global _metrics_enabled, _metrics_write_failed, _metrics_sender
-    global _plot_enabled, _plot_keep_seconds, _start_ts
-    global _file_index, _read_count, _csv_file, _csv_writer, _csv_filename
-    global _active_channel_labels
-
-    setup = setup or load_setup()
-    effective = _get_effective_settings(setup=setup)
-    effective_channels = _get_effective_channel_settings(setup=setup)
-    selected_channels = [
-        (sg_name, ch_cfg)
-        for sg_name, ch_cfg in effective_channels.items()
-        if ch_cfg["enabled"]
-    ]
-    if not selected_channels:
-        raise ValueError(
-            "No SG channels are enabled. Enable at least one channel first."
+        # datetimes. All devices are timed on the host clock, so one session
+        # start puts them on a common axis.
+        new_times = (
+            (t0_ns - self.start_ns) / 1e9 + np.arange(len(readings)) / scan_rate
+        ).tolist()
+        new_vals = readings.T.tolist()
+        if gap_scans:
+            # A NaN point at the first missing scan breaks the plotted line.
+            new_times.insert(0, new_times[0] - gap_scans / scan_rate)
+            for values in new_vals:
+                values.insert(0, float("nan"))
+
+        with self.plot_lock:
+            # plot_columns maps this device's columns onto the session's plot
+            # buffers. An extra CORE_TIMER column (keep_timer_channel) has no
+            # plot buffer and is not plotted.
+            for col, ch_idx in enumerate(plot_columns):
+                times = self.time_buffers[ch_idx]
+                values = self.ch_buffers[ch_idx]
+                times.extend(new_times)
+                values.extend(new_vals[col])
+
+                # Bound in-memory buffers even if no live-plot consumer is
+                # running. This prevents runaway growth that can eventually
+                # stall the UI.
+                trim_idx = bisect.bisect_left(times, times[-1] - plot_keep_seconds)
+                if trim_idx > 0:
+                    del times[:trim_idx]
+                    del values[:trim_idx]
+
+    def _events_sink(
+        self,
+        *,
+        scan_index0,
+        t0_ns,
+        scan_rate,
+        readings,
+        channel_names,
+        device_backlog,
+        ljm_backlog,
+        gap_scans,
+        source,
+    ):
+        """Write the edges of the marker line in one batch to the events file.
+
+        Every edge is one row with its scan time, the scan index in the
+        stream, the line and ``rising`` or ``falling``. An edge in the first
+        scan after a gap may have happened anywhere in the gap; its
+        ``gap_scans`` column gives the number of scans missing before it (0
+        otherwise). After a :meth:`retarget`, the edges from its switch time on
+        go to the events file of the new target. The first scan from the switch
+        on is recorded as a ``retarget`` row, which ends the old events file
+        and starts the new one.
+        """
+        line = self.settings.marker_line
+        if line not in channel_names:
+            return
+        levels = readings[:, channel_names.index(line)]
+
+        with self._events_lock:
+            edges, level = _marker_edges(levels, self._marker_levels.get(source))
+            self._marker_levels[source] = level
+            index = self._events_targets.get(source, 0)
+
+            # (offset in the batch, order at that offset, time, target, edge);
+            # a switch goes before an edge in the same scan, which belongs to
+            # the new target.
+            events = []
+            if index + 1 < len(self._targets):
+                # The same split as the CSV sink makes, see _csv_sink.
+                scan_ns = scan_timestamps_ns(t0_ns, scan_rate, len(levels))
+                for target in range(index + 1, len(self._targets)):
+                    switch_ns = self._targets[target].switch_ns
+                    offset = int(np.searchsorted(scan_ns, switch_ns))
+                    if offset == len(levels):
+                        break
+                    events.append((offset, 0, int(scan_ns[offset]), target, "retarget"))
+            edge_ns = t0_ns + np.round(edges * (1e9 / scan_rate)).astype(np.int64)
+            for offset, time_ns in zip(edges.tolist(), edge_ns.tolist()):
+                edge = "rising" if levels[offset] > 0.5 else "falling"
+                events.append((offset, 1, time_ns, None, edge))
+            events.sort(key=lambda event: event[:2])
+
+            rows = []
+            times = _isoformat_ns(np.array([event[2] for event in events], np.int64))
+            for (offset, _, time_ns, target, edge), ts in zip(events, times):
+                missing = gap_scans if offset == 0 and target is None else 0
+                row = [ts, time_ns, scan_index0 + offset, line, edge, missing]
+                rows.append(row)
+                self._marker_events.append(
+                    {
+                        "device": source,
+                        "time_ns": time_ns,
+                        "scan_index": scan_index0 + offset,
+                        "line": line,
+                        "edge": edge,
+                        "gap_scans": missing,
+                    }
+                )
+                if target is not None:
+                    self._write_events(source, rows, index)
+                    self._close_events(source)
+                    rows = [row]
+                    index = target
+            self._write_events(source, rows, index)
+            self._events_targets[source] = index
+
+    def _write_events(self, source, rows: list, index: int) -> None:
+        """Append rows to the events file of ``source`` for target ``index``.
+
+        Called with the events lock held; the file is opened with the first
+        row.
+        """
+        if not rows:
+            return
+        if source not in self._events_writers:
+            target = self._targets[index]
+            device_tag = f"_{source}" if self.multi_device else ""
+            filename = os.path.join(
+                target.settings.save_path,
+                f"{target.settings.base_filename}_{target.start_ts}{device_tag}"
+                f"{EVENTS_SUFFIX}",
+            )
+            self._events_files[source] = open(filename, "w", newline="")
+            self._events_writers[source] = csv.writer(self._events_files[source])
+            self._events_writers[source].writerow(
+                ["timestamp", "time_ns", "scan_index", "line", "edge", "gap_scans"]
+            )
+        self._events_writers[source].writerows(rows)
+        self._events_files[source].flush()
+
+    def _close_events(self, source) -> None:
+        events_file = self._events_files.pop(source, None)
+        if events_file:
+            events_file.close()
+        self._events_writers.pop(source, None)
+
+    def marker_events(self, clear: bool = False) -> list[dict[str, Any]]:
+        """Return the marker edges of the session, see :func:`get_sg_marker_events`."""
+        with self._events_lock:
+            events = list(self._marker_events)
+            if clear:
+                self._marker_events.clear()
+        return events
+
+    def wait_for_trigger(self, timeout_s: float = 5.0) -> bool:
+        """Wait until the armed streams have seen their trigger, see
+        :func:`wait_for_sg_trigger`."""
+        deadline = time.monotonic() + timeout_s
+        waiting = []
+        for serial_number, logger in self.loggers.items():
+            if not logger.wait_for_trigger(max(0.0, deadline - time.monotonic())):
+                waiting.append(serial_number)
+        if waiting:
+            print(
+                f"Warning: T7 {', '.join(waiting)} did not trigger within "
+                f"{timeout_s:g} s; check the wiring of the trigger line."
+            )
+        return not waiting
+
+    @property
+    def triggered_start(self) -> bool:
+        """Whether the streams were armed to start on a trigger edge."""
+        return any(logger.trigger_state != "off" for logger in self.loggers.values())
+
+    def stream_stats(self) -> dict[str, dict]:
+        """Return the statistics per T7, see :func:`get_sg_stream_stats`."""
+        stats = {}
+        for serial_number, logger in self.loggers.items():
+            stats[serial_number] = {
+                "scan_rate": logger.actual_scan_rate,
+                "channels": logger.num_addresses,
+                **logger.stream_stats(),
+                **logger.tuning_stats(),
+                "clock": logger.clock_stats(),
+            }
+            if serial_number in self.supervisors:
+                stats[serial_number]["recovery"] = self.supervisors[
+                    serial_number
+                ].stats()
+        return stats
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait until the sinks have handled every batch received so far.
+
+        See :meth:`tvac.strain_gauge_pipeline.SinkPipeline.drain`. Returns
+        ``False`` on timeout.
+        """
+        return self.pipeline.drain(timeout) if self.pipeline is not None else True
+
+    def sink_stats(self) -> dict[str, dict]:
+        """Return lag, drop and high-water statistics per sink."""
+        return self.pipeline.stats() if self.pipeline is not None else {}
+
+    def buffer_stats(self) -> dict:
+        """Return the block pool usage, see :func:`get_sg_buffer_stats`."""
+        return self.pipeline.pool_stats() if self.pipeline is not None else {}
+
+    def status(self) -> str:
+        """Return a short human-readable status string, see :func:`get_sg_status`."""
+        if not self.running:
+            return "Not running"
+        labels = self.settings.channel_labels
+        latency = device_manager.stats()["latency"]
+        start_ms = latency.get("start", {}).get("last_ms", float("nan"))
+        devices = "; ".join(
+            _describe_device_stats(stats) for stats in self.stream_stats().values()
+        )
+        with self._csv_lock:
+            files = ", ".join(self._csv_filenames.values())
+            read_count = self.read_count
+        sinks = ", ".join(
+            f"{name}: lag={stats['lag_scans']} (max {stats['high_water_scans']}) "
+            f"dropped={stats['dropped_scans']} spilled={stats['spilled_scans']}"
+            for name, stats in self.sink_stats().items()
+        )
+        buffers = self.buffer_stats()
+        return (
+            f"Running, [{', '.join(labels) if labels else 'n/a'}], "
+            f"devices: [{devices}], "
+            f"{read_count} batches written, "
+            f"started in {start_ms:.0f} ms, "
+            f"file: {files}, "
+            f"sinks: [{sinks or 'none'}], "
+            f"buffers: {buffers.get('free', 0)}/{buffers.get('blocks', 0)} free "
+            f"(min {buffers.get('low_water', 0)}), "
+            f"{buffers.get('allocations', 0)} allocations in "
+            f"{buffers.get('batches', 0)} batches"
         )
 
-    # Flatten the enabled channel mapping into the parallel lists expected by
-    # LabJackT7Logger and the plot buffers.
-    n_ch = len(selected_channels)
-    ain_channels = []
-    voltage_ranges = []
-    neg_voltage_ranges = []
-    resolution_indices = []
-    active_channel_labels = []
-    for sg_name, ch_cfg in selected_channels:
-        ain_channels.append(int(ch_cfg["ain_channel"]))
-        voltage_ranges.append(float(ch_cfg["voltage_range"]))
-        neg_voltage_ranges.append(float(ch_cfg["neg_voltage_range"]))
-        resolution_indices.append(int(ch_cfg["resolution_index"]))
-        active_channel_labels.append(f"{sg_name}(AIN{int(ch_cfg['ain_channel'])})")
 
-    if len(set(ain_channels)) != len(ain_channels):
-        raise ValueError("Enabled SG channels must use unique AIN channels.")
+def _active_session() -> StrainGaugeSession | None:
+    """Return the session started by :func:`start_sg_logging`, if any."""
+    with _session_lock:
+        return _session
+
 
-    from tvac.labjack_t7 import LabJackT7Logger
+@_served()
+def get_sg_marker_events(clear: bool = False) -> list[dict[str, Any]]:
+    """Return the marker edges of the current (or last) session, oldest first.
 
+    Each event has the ``device``, its ``time_ns`` (host time of the scan),
+    ``scan_index``, ``line``, ``edge`` (``"rising"`` or ``"falling"``) and
+    ``gap_scans`` (see :meth:`StrainGaugeSession._events_sink`). The last
+    100 000 edges are kept; ``clear`` empties the list after reading it.
+    """
     with _session_lock:
-        if _logger is not None:
-            print("Strain-gauge logging is already running.")
-            return
+        session = _session or _last_session
+    return session.marker_events(clear) if session is not None else []
 
-        # Session settings are copied into module-level state so the callback
-        # can operate without repeatedly consulting setup objects.
-        _csv_enabled = bool(effective["csv"]["enabled"])
-        _save_path = _resolve_csv_save_path(str(effective["csv"]["save_path"]))
-        _base_filename = str(effective["csv"]["base_filename"])
-        _max_file_size = int(effective["csv"]["max_file_size_bytes"])
-
-        if _csv_enabled:
-            os.makedirs(_save_path, exist_ok=True)
-
-        _start_ts = format_datetime()
-        _file_index = 0
-        _read_count = 0
-        _csv_file = None
-        _csv_writer = None
-        _csv_filename = ""
-
-        _metrics_enabled = bool(effective["metrics"]["enabled"])
-        _metrics_write_failed = False
-        if _metrics_enabled:
-            _metrics_sender = MetricsHubSender()
-            _metrics_sender.connect()
-        else:
-            _metrics_sender = None
 
-        _plot_enabled = bool(effective["plot"]["enabled"])
-        _plot_keep_seconds = max(1.0, float(effective["plot"]["window_seconds"]) * 1.2)
-        _active_channel_labels = active_channel_labels
+@_served(local_only=("extra_sinks", "stream_out"))
+def start_sg_logging(
+    setup: Setup = None,
+    extra_sinks: dict[str, Callable] | None = None,
+    supervise: bool | None = None,
+    stream_out: list | None = None,
+):
+    """Start strain-gauge streaming and CSV logging from the CGSE Setup.
 
-        _logger = LabJackT7Logger(
-            ain_channels=ain_channels,
-            scan_rate=float(effective["stream"]["scan_rate"]),
-            voltage_range=voltage_ranges,
-            neg_voltage_range=neg_voltage_ranges,
-            resolution_index=resolution_indices,
-            stream_resolution_index=int(effective["stream"]["stream_resolution_index"]),
-            resync_interval_s=int(effective["stream"]["resync_interval_s"]),
-            buffer_size=int(effective["stream"]["buffer_size"]),
-        )
-        logger = _logger
+    The startup sequence is:
 
-    with plot_lock:
-        # One buffer per enabled channel, aligned with the order used by the
-        # LabJack stream and CSV output.
-        time_buffer.clear()
-        ch_buffers.clear()
-        ch_buffers.extend([] for _ in range(n_ch))
-
-    _sg_debug(
-        "starting stream "
-        f"channels={_active_channel_labels} "
-        f"scan_rate={effective['stream']['scan_rate']} "
-        f"plot_enabled={effective['plot']['enabled']} "
-        f"csv_enabled={effective['csv']['enabled']}"
-        f"metrics_enabled={effective['metrics']['enabled']}",
+    1. load setup values,
+    2. merge any in-memory runtime overrides into a frozen
+       :class:`SessionSettings`,
+    3. validate the enabled channel set and group it by T7,
+    4. create one LabJack logger per T7 and a shared sink pipeline,
+    5. start the streams so data begins arriving in the
+       :class:`StrainGaugeSession`.
+
+    Channels are assigned to a T7 by their ``serial_number`` (``"ANY"`` when
+    not set, which opens the only connected T7). The T7s stream in parallel,
+    each on its own LJM callback thread, into the same sinks. Every device's
+    stream clock maps its scans to host time, so the outputs of all devices
+    share one time base.
+
+    The T7 handles come from :data:`tvac.labjack_devices.device_manager`, so
+    a session started right after another one reuses the open devices.
+
+    ``extra_sinks`` adds sinks (name to callable, with the keyword arguments
+    of the built-in sinks) to the session's pipeline, e.g. to capture the
+    data for an analysis. They spill rather than drop when they fall behind.
+
+    With the ``auto_recover`` stream setting (or ``supervise=True``), every
+    T7 runs under a :class:`tvac.stream_supervisor.StreamSupervisor`, which
+    reopens and restarts a stream that failed or stalled and carries on into
+    the same outputs, with a gap marker for the scans lost.
+    ``supervise=False`` runs without, e.g. for a replay.
+
+    ``stream_out`` is a list of :class:`tvac.stream_out.StreamOut` to play
+    on the DACs of the (single) T7 in stream mode, sample-locked to the
+    inputs. Every stream-out adds a column with its output voltage, named
+    after its DAC, to the outputs.
+
+    ``extra_sinks`` and ``stream_out`` only work on a session in this
+    process: with a strain-gauge server set (``TVAC_SG_SERVER``), passing
+    them raises a ``ValueError``.
+    """
+    global _session, _last_session
+
+    session = StrainGaugeSession(
+        SessionSettings.from_setup(setup),
+        extra_sinks=extra_sinks,
+        supervise=supervise,
+        stream_out=stream_out,
+        plot_buffers=(plot_lock, time_buffers, ch_buffers),
     )
-
+    with _session_lock:
+        if _session is not None:
+            print("Strain-gauge logging is already running.")
+            return
+        # Taken before the devices are opened, so a second start meanwhile
+        # finds the session running.
+        _session = session
     try:
-        logger.start_stream(callback=_on_stream_data)
+        session.start()
     except Exception:
-        # noinspection PyBroadException
-        try:
-            logger.close()
-        except Exception:
-            pass
         with _session_lock:
-            if _logger is logger:
-                _logger = None
+            if _session is session:
+                _session = None
         raise
+    with _session_lock:
+        _last_session = session
 
 
+@_served()
 def stop_sg_logging():
     """Stop the active strain-gauge logging session and release resources."""
-    global \
-        _logger, \
-        _csv_file, \
-        _csv_filename, \
-        _csv_writer, \
-        _active_channel_labels, \
-        _metrics_sender
+    global _session
 
     with _session_lock:
-        logger = _logger
-        if logger is None:
-            print(
-                "No strain-gauge logging session is active. Starting new session to close the device."
-            )
-            _logger = LabJackT7Logger(ain_channels=[])
-            logger = _logger
+        session = _session
+        _session = None
+    if session is None:
+        # The device manager knows every handle this process opened, so
+        # there is no need to open the device just to stop a stream.
+        print("No strain-gauge logging session is active.")
+        device_manager.stop_streams()
+        return
 
-    _sg_debug("stop requested")
+    session.stop()
+    print("Strain-gauge logging stopped.")
 
-    try:
-        logger.close()
-    finally:
-        # Tear down each output path even if the device close raised, so the
-        # next start begins from a clean session state.
-        with _session_lock:
-            if _logger is logger:
-                _logger = None
-            _active_channel_labels = []
-            sender = _metrics_sender
-            _metrics_sender = None
 
-        if sender is not None:
-            sender.close()
+@_served()
+def retarget_sg_logging(
+    save_path: str | None = None, base_filename: str | None = None
+) -> int:
+    """Continue the CSV and events files of the running session elsewhere.
 
-        with _csv_lock:
-            if _csv_file:
-                # noinspection PyUnresolvedReferences
-                _csv_file.close()
-            _csv_file = None
-            _csv_writer = None
-            _csv_filename = ""
+    The stream keeps running: the files switch to ``save_path`` and
+    ``base_filename`` at a scan boundary, without a lost or repeated scan
+    (see :meth:`StrainGaugeSession.retarget`). Returns the host time of the
+    switch [ns].
+    """
+    session = _active_session()
+    if session is None:
+        raise RuntimeError("No strain-gauge logging session is active.")
+    return session.retarget(save_path=save_path, base_filename=base_filename)
+
+
+@_served(local_only=("extra_sinks",))
+def update_sg_logging(
+    setup: Setup = None, extra_sinks: dict[str, Callable] | None = None
+) -> str:
+    """Log with the current settings, keeping a running stream where possible.
+
+    Without a running session this starts one. A session whose settings
+    differ from the current ones only in the CSV save path and base filename
+    is retargeted (see :func:`retarget_sg_logging`), so the T7s keep
+    streaming; any other change stops the session and starts a new one.
+    ``extra_sinks`` go to a session this starts (see
+    :func:`start_sg_logging`); like there, they cannot be passed with a
+    strain-gauge server set.
+
+    A session started on a trigger edge (``trigger_line``) is always
+    restarted: only a new stream is armed again, so that scan 0 lines up
+    with the next waveform rather than the first one.
+
+    Concurrent calls are handled one at a time.
+
+    Returns:
+        ``"started"``, ``"unchanged"``, ``"retargeted"`` or ``"restarted"``.
+    """
+    with _update_lock:
+        session = _active_session()
+        if session is None:
+            start_sg_logging(setup=setup, extra_sinks=extra_sinks)
+            return "started"
+
+        settings = SessionSettings.from_setup(setup)
+        triggered = session.triggered_start or settings.stream["trigger_line"]
+        if not triggered and settings.same_acquisition(session.settings):
+            if (settings.save_path, settings.base_filename) == (
+                session.settings.save_path,
+                session.settings.base_filename,
+            ):
+                return "unchanged"
+            session.retarget(settings.save_path, settings.base_filename)
+            return "retargeted"
+
+        stop_sg_logging()
+        start_sg_logging(setup=setup, extra_sinks=extra_sinks)
+        return "restarted"
+
+
+@_served()
+def wait_for_sg_trigger(timeout_s: float = 5.0, required: bool = False) -> bool:
+    """Wait until the armed streams of the session have seen their trigger.
+
+    Call this right after raising the trigger (e.g.
+    :func:`tvac.wave_generation.start_signal_trigger`). Returns ``True`` at
+    once when no stream is waiting for a trigger (``trigger_line`` not set,
+    polling, or no session), and ``False`` if a T7 did not trigger within
+    ``timeout_s``, e.g. because its trigger line is not wired.
+
+    With ``required``, for a caller whose data must line up with the
+    trigger, the cases that leave scan 0 unaligned raise instead: a
+    ``RuntimeError`` without a session armed on a trigger line, and a
+    ``TimeoutError`` when a T7 did not trigger.
+    """
+    session = _active_session()
+    if not required:
+        return session.wait_for_trigger(timeout_s) if session is not None else True
+
+    if session is None or not session.triggered_start:
+        raise RuntimeError(
+            "A triggered start was expected, but no strain-gauge stream is armed "
+            "on a trigger line; check the trigger_line setting."
+        )
+    if not session.wait_for_trigger(timeout_s):
+        raise TimeoutError(
+            f"The strain-gauge streams did not trigger within {timeout_s:g} s."
+        )
+    return True
 
-        with plot_lock:
-            time_buffer.clear()
-            ch_buffers.clear()
 
-    print("Strain-gauge logging stopped.")
+@_served()
+def get_sg_sink_stats() -> dict[str, dict]:
+    """Return lag, drop and high-water statistics per sink of the active session."""
+    session = _active_session()
+    return session.sink_stats() if session is not None else {}
+
+
+@_served()
+def drain_sg_sinks(timeout: float | None = 10.0) -> bool:
+    """Wait until the sinks of the active session have handled every batch received.
+
+    The session keeps running. Returns ``False`` on timeout, ``True`` at once
+    without a session.
+    """
+    session = _active_session()
+    return session.drain(timeout) if session is not None else True
+
 
+@_served()
+def get_sg_buffer_stats() -> dict:
+    """Return the sink pipeline's block pool usage and allocation count.
+
+    See :meth:`tvac.strain_gauge_pipeline.SinkPipeline.pool_stats`. The
+    allocations of the stream callbacks are in :func:`get_sg_stream_stats`.
+    """
+    session = _active_session()
+    return session.buffer_stats() if session is not None else {}
+
+
+@_served()
+def get_sg_stream_stats() -> dict[str, dict]:
+    """Return throughput, backlog, clock and read-size statistics per T7.
+
+    Keys are the serial numbers the channels are assigned to (``"ANY"`` for
+    a single T7 without one). Supervised devices (``auto_recover``) also
+    report their stalls, failures and recovery times under ``"recovery"``.
+    """
+    session = _active_session()
+    return session.stream_stats() if session is not None else {}
 
+
+@_served()
+def get_sg_device_stats() -> dict:
+    """Return the open T7 handles and the open/reuse/start/stop latencies."""
+    return device_manager.stats()
+
+
+@_served()
+def close_sg_device() -> None:
+    """Close the T7 handles kept open between sessions.
+
+    Stops the active session first, if any. The next session opens the
+    devices again.
+    """
+    if _active_session() is not None:
+        stop_sg_logging()
+    device_manager.close_all()
+    print("LabJack T7 handles closed.")
+
+
+@_served()
+def set_sg_acquisition_mode(
+    mode: str,
+    poll_rate: float | None = None,
+    poll_oversampling: int | None = None,
+    setup: Setup = None,
+) -> None:
+    """Switch between streaming and polling, restarting a running session.
+
+    The mode is a runtime setting like the others (see
+    :func:`set_sg_runtime_settings`). If a session is running it is stopped
+    and started again in the new mode, with otherwise the same settings.
+
+    Args:
+        mode (str): ``"stream"`` or ``"poll"``.
+        poll_rate (float | None): Samples per second when polling [Hz].
+        poll_oversampling (int | None): Reads averaged per sample when polling.
+        setup (Setup): Setup used to restart the session.
+    """
+    set_sg_runtime_settings(
+        mode=mode, poll_rate=poll_rate, poll_oversampling=poll_oversampling
+    )
+    if _active_session() is not None:
+        stop_sg_logging()
+        start_sg_logging(setup=setup)
+
+
+def _describe_device_stats(stats: dict) -> str:
+    """Return the status text of one T7 from its ``get_sg_stream_stats()`` entry."""
+    if stats["mode"] == "poll":
+        text = (
+            f"T7 {stats['serial_number']}: polling {stats['scan_rate']:.3g} Hz x "
+            f"{stats['channels']} ch ({stats['oversampling']} reads/sample), "
+            f"{stats['scans']} samples at {stats['scans_per_s']:.3g}/s, "
+            f"overruns: {stats['overruns']}, read errors: {stats['read_errors']}, "
+            f"gaps: {stats['gaps']} ({stats['gap_scans']} samples missing)"
+        )
+    else:
+        text = (
+            f"T7 {stats['serial_number']}: {stats['scan_rate']:.1f} Hz x "
+            f"{stats['channels']} ch, {stats['scans_per_s']:.1f} scans/s in "
+            f"{stats['reads']} reads of {stats['scans_per_read']} scans "
+            f"({stats['profile']}, restarts: {stats['restarts']}), "
+            f"backlog: {stats['device_backlog']}/{stats['ljm_backlog']} "
+            f"(max {stats['max_device_backlog']}/{stats['max_ljm_backlog']}), "
+            f"clock drift: {stats['clock'].get('drift_ppm', 0.0):+.1f} ppm "
+            f"(offset {stats['clock'].get('offset_us', 0.0):.0f} us), "
+            f"gaps: {stats['gaps']} ({stats['gap_scans']} scans missing, "
+            f"{stats['dummy_scans']} auto-recovery), "
+            f"allocations: {stats['allocations']} in {stats['reads']} reads"
+        )
+    if stats.get("trigger") == "armed":
+        text += ", ARMED: waiting for the trigger"
+    for out in stats.get("stream_out", []):
+        refills = "looping" if out["looping"] else f"{out['refills']} refills"
+        text += (
+            f", {out['target']} stream-out: {refills}, underruns: {out['underruns']}"
+        )
+    recovery = stats.get("recovery")
+    if recovery:
+        text += (
+            f", stalls: {recovery['stalls']}, reconnects: {recovery['recoveries']}"
+            f"/{recovery['failures']} failures"
+        )
+        if recovery["recoveries"]:
+            text += (
+                f" (last {recovery['last_recovery_s']:.1f} s, "
+                f"max {recovery['max_recovery_s']:.1f} s, "
+                f"{recovery['recoveries_per_h']:.2f}/h)"
+            )
+        if recovery["recovering"]:
+            text += f", RECOVERING: {recovery['last_error']}"
+    elif stats.get("failed"):
+        text += f", STOPPED: {stats['failed']}"
+    return text
+
+
+@_served()
 def get_sg_status() -> str:
     """Return a short human-readable status string for the current session."""
+    session = _active_session()
+    return session.status() if session is not None else "Not running"
+
+
+def replay_sg_recording(
+    path: str,
+    speed: float | None = 1.0,
+    setup: Setup = None,
+    timeout: float | None = None,
+) -> None:
+    """Replay a raw stream recording through a complete SG logging session.
+
+    The recording (see :class:`tvac.labjack_replay.StreamRecorder`) is fed to
+    :func:`start_sg_logging` through a :class:`tvac.labjack_replay.ReplayLJM`
+    backend, so the callback path, sink pipeline, CSV rotation and live plot
+    see the same batches, backlogs and errors as during the original session.
+    The enabled channels in the effective settings must match the recording,
+    and belong to a single T7 (each device of a multi-T7 session is recorded
+    to its own file). The replay backend lives in this process, so this
+    cannot run with a strain-gauge server (``TVAC_SG_SERVER``) set.
+
+    Args:
+        path (str): Recording file (``.ljr``).
+        speed (float | None): 1.0 for the recorded pace, N for N times faster, None for as fast as possible.
+        setup (Setup): Setup with the SG configuration to use for the replayed session.
+        timeout (float | None): Longest time to wait for the replay to finish [s].
+    """
+    from tvac.labjack_replay import ReplayLJM
+
+    if _server_endpoint is not None:
+        # The session would start on the server, streaming from its own T7
+        # instead of the recording.
+        raise RuntimeError(
+            "A recording is replayed in this process; "
+            "run it without a strain-gauge server (TVAC_SG_SERVER)."
+        )
+
+    replay = ReplayLJM(path, speed=speed)
+
     with _session_lock:
-        logger = _logger
-        channels = (
-            ", ".join(_active_channel_labels) if _active_channel_labels else "n/a"
-        )
-    if logger is None:
-        return "Not running"
-    rate = logger.actual_scan_rate
-    return (
-        f"Running at {rate:.1f} Hz, "
-        f"{logger.num_addresses} channels, "
-        f"[{channels}], "
-        f"{_read_count} reads, "
-        f"file: {_csv_filename}"
+        previous_backend = _backend
+    set_sg_backend(replay)
+    try:
+        # Restarting would replay the recording from the start, and the end
+        # of the recording looks like a stall.
+        start_sg_logging(setup=setup, supervise=False)
+        if not replay.wait_until_drained(timeout=timeout):
+            print(f"Replay of {path} did not finish within {timeout} s.")
+        if not drain_sg_sinks(timeout=timeout):
+            print(f"The sinks did not catch up with {path} within {timeout} s.")
+    finally:
+        stop_sg_logging()
+        set_sg_backend(previous_backend)
+
+
+@_served()
+def capture_sg_burst(
+    duration: float,
+    setup: Setup = None,
+    save_path: str | None = None,
+    base_filename: str | None = None,
+) -> str:
+    """Capture a fixed-duration record of the enabled channels to a binary file.
+
+    Unlike :func:`start_sg_logging`, nothing is written, published or plotted
+    while the T7 streams: :meth:`tvac.labjack_t7.LabJackT7Logger.capture_burst`
+    collects exactly ``duration * scan_rate`` scans into one preallocated
+    array, which is saved once at the end with :func:`numpy.savez` (see
+    :func:`load_sg_burst`). Without CSV encoding on the way, a single channel
+    can be recorded close to the T7's maximum scan rate.
+
+    The stream and channel settings (including runtime overrides) are those a
+    logging session would use; the enabled channels must belong to one T7,
+    which the logging session may not be streaming from. A session on other
+    T7s keeps running.
+
+    Args:
+        duration (float): Length of the record [s].
+        setup (Setup): Setup with the SG configuration.
+        save_path (str | None): Destination folder; the CSV save path by default.
+        base_filename (str | None): Filename prefix; the CSV base filename by default.
+
+    Returns:
+        Path of the written file.
+    """
+    setup = setup or load_setup()
+    effective = _get_effective_settings(setup=setup)
+    selected_channels = [
+        (sg_name, ch_cfg)
+        for sg_name, ch_cfg in _get_effective_channel_settings(setup=setup).items()
+        if ch_cfg["enabled"]
+    ]
+    if not selected_channels:
+        raise ValueError(
+            "No SG channels are enabled. Enable at least one channel first."
+        )
+    devices = _group_channels_by_device(selected_channels)
+    if len(devices) > 1:
+        raise ValueError("A burst capture records from a single T7.")
+    ((serial_number, channels),) = devices.items()
+
+    session = _active_session()
+    if session is not None and session.uses_device(serial_number):
+        raise RuntimeError(
+            "Stop strain-gauge logging on this T7 before capturing a burst."
+        )
+
+    logger = LabJackT7Logger(
+        ain_channels=[int(ch_cfg["ain_channel"]) for _, _, ch_cfg in channels],
+        scan_rate=float(effective["stream"]["scan_rate"]),
+        voltage_range=[float(ch_cfg["voltage_range"]) for _, _, ch_cfg in channels],
+        neg_voltage_range=[
+            float(ch_cfg["neg_voltage_range"]) for _, _, ch_cfg in channels
+        ],
+        resolution_index=[int(ch_cfg["resolution_index"]) for _, _, ch_cfg in channels],
+        stream_resolution_index=int(effective["stream"]["stream_resolution_index"]),
+        resync_interval_s=int(effective["stream"]["resync_interval_s"]),
+        buffer_size=int(effective["stream"]["buffer_size"]),
+        backend=_get_backend(serial_number),
+        hardware_timestamps=bool(effective["stream"]["hardware_timestamps"]),
+        keep_timer_channel=bool(effective["stream"]["keep_timer_channel"]),
+        profile=str(effective["stream"]["profile"]),
+        device_manager=device_manager,
+        verify_config=bool(effective["stream"]["verify_config"]),
+        identifier=serial_number,
+        rate_limit=str(effective["stream"]["rate_limit"]),
+    )
+    try:
+        n_scans = max(1, round(float(duration) * logger.scan_rate))
+        print(f"Capturing a burst of {n_scans} scans at {logger.scan_rate:.1f} Hz.")
+        timestamps_ns, readings = logger.capture_burst(n_scans)
+    finally:
+        logger.close()
+
+    save_path = _resolve_csv_save_path(str(save_path or effective["csv"]["save_path"]))
+    base_filename = base_filename or str(effective["csv"]["base_filename"])
+    os.makedirs(save_path, exist_ok=True)
+    filename = os.path.join(
+        save_path, f"{base_filename}_{format_datetime()}{BURST_SUFFIX}"
     )
+    sg_names = [sg_name for _, sg_name, _ in channels]
+    np.savez(
+        filename,
+        timestamps_ns=timestamps_ns,
+        readings=readings,
+        channel_names=np.array(sg_names + logger.output_channel_names[len(sg_names) :]),
+        ain_channels=np.array(logger.ain_channels),
+        voltage_ranges=np.array(logger.voltage_ranges, dtype=np.float64),
+        scan_rate=logger.actual_scan_rate,
+        requested_scan_rate=logger.scan_rate,
+        stream_resolution_index=logger.stream_resolution_index,
+        serial_number=logger.serial_number,
+    )
+    print(f"Burst of {n_scans} scans written to: {filename}")
+    return filename
+
+
+def load_sg_burst(path: str) -> dict[str, Any]:
+    """Return the arrays and metadata of a file written by :func:`capture_sg_burst`.
+
+    ``timestamps_ns`` and ``readings`` are arrays, ``channel_names`` a list,
+    and the scalars (scan rates, resolution index, serial number) plain
+    Python numbers.
+    """
+    with np.load(path) as data:
+        burst = {
+            name: data[name].item() if data[name].ndim == 0 else data[name]
+            for name in data.files
+        }
+    burst["channel_names"] = burst["channel_names"].tolist()
+    return burst
 
 
 def trim_plot_buffers(keep_seconds: float):
     """Remove plot-buffer samples older than ``keep_seconds`` from the latest.
 
     This helper is used by the plotting layer when it wants tighter control
-    over memory than the default bounded-buffer logic inside ``_on_stream_data``.
+    over memory than the default bounded-buffer logic inside ``_plot_sink``.
     """
     with plot_lock:
-        if not time_buffer:
-            return
-        cutoff = time_buffer[-1] - keep_seconds
-        idx = bisect.bisect_left(time_buffer, cutoff)
-        if idx > 0:
-            del time_buffer[:idx]
-            for buf in ch_buffers:
-                del buf[:idx]
+        for times, values in zip(time_buffers, ch_buffers):
+            if not times:
+                continue
+            idx = bisect.bisect_left(times, times[-1] - keep_seconds)
+            if idx > 0:
+                del times[:idx]
+                del values[:idx]
 
 
 @building_block
@@ -833,7 +2703,8 @@ def enable_all_sg_logging(
         - Make sure that the HK ends up in the folder, dedicated to the current observation, and that the filenames
           also refer to the current observation (since this function is a building block, it can only be run in the
           context of an observation, so the obsid is guaranteed to be not None),
-        - Start the logging of the LabJack.
+        - Start the logging of the LabJack. A session that already streams with these settings (e.g. from the
+          previous observation) keeps streaming and continues its files in the folder of this observation.
     """
 
     setup = setup or load_setup()
@@ -875,7 +2746,7 @@ def enable_all_sg_logging(
         metrics_enabled=True,
     )
 
-    start_sg_logging(setup=setup)
+    update_sg_logging(setup=setup)
 
 
 @building_block
@@ -887,6 +2758,7 @@ def enable_sg_logging(
     scan_rate: float,
     setup: Setup = None,
     stream_resolution_index: int | None = None,
+    decimate_others: int = 1,
 ) -> None:
     """Enables the logging for the given strain gauge.
 
@@ -894,12 +2766,15 @@ def enable_sg_logging(
 
         - For the given strain gauge, set the voltage ranges and resolution index (from the setup), and enable its
           channel,
+        - With `decimate_others` > 1, also enable the other strain gauges (with their setup ranges), logged at the
+          scan rate divided by `decimate_others`, as far as the T7 sustains the scan rate with them,
         - Set the scan rate for the logging of the requested strain gauge,
         - Enable HK and metrics,
         - Make sure that the HK ends up in the folder, dedicated to the current observation, and that the filenames
           also refer to the current observation (since this function is a building block, it can only be run in the
           context of an observation, so the obsid is guaranteed to be not None),
-        - Start the logging of the LabJack.
+        - Start the logging of the LabJack. A session that already streams with these settings (e.g. from the
+          previous observation) keeps streaming and continues its files in the folder of this observation.
 
     Args:
         sg_name (str): Name of the strain gauge.
@@ -909,6 +2784,7 @@ def enable_sg_logging(
         scan_rate (float): Scan rate of the strain gauge [Hz].
         setup (Setup): Setup.
         stream_resolution_index (int | None): Stream-wide resolution index [m].
+        decimate_others (int): Decimation factor for the other strain gauges; 1 leaves them disabled.
     """
 
     setup = setup or load_setup()
@@ -927,6 +2803,7 @@ def enable_sg_logging(
         voltage_range=voltage_range,
         neg_voltage_range=neg_voltage_range,
         resolution_index=resolution_index,
+        decimation=1,
         setup=setup,
     )
 
@@ -949,7 +2826,123 @@ def enable_sg_logging(
         metrics_enabled=True,
     )
 
-    start_sg_logging(setup=setup)
+    if decimate_others and decimate_others > 1:
+        _enable_decimated_sg_channels(sg_name, int(decimate_others), setup=setup)
+
+    update_sg_logging(setup=setup)
+
+
+def _enable_decimated_sg_channels(sg_name: str, decimation: int, setup: Setup) -> None:
+    """Enable the strain gauges other than ``sg_name`` at a decimated rate.
+
+    Every channel in the scan list is sampled at the scan rate, so the others
+    cost stream rate even though they are logged decimated. Channels the T7
+    cannot fit at the scan rate are disabled again, last ones first, so the
+    monitored strain gauge keeps its rate.
+    """
+    # noinspection PyUnresolvedReferences
+    channels_setup = setup.gse.labjack_t7.channels
+    others = [name for name in channels_setup if name != sg_name]
+    for other in others:
+        ch_setup = channels_setup[other]
+        set_sg_channel_runtime_settings(
+            sg_name=other,
+            enabled=True,
+            ain_channel=ch_setup.ain_channel,
+            voltage_range=ch_setup.voltage_range,
+            neg_voltage_range=ch_setup.neg_voltage_range,
+            resolution_index=ch_setup.resolution_index,
+            decimation=decimation,
+            setup=setup,
+        )
+
+    serial_numbers = {
+        name: ch_cfg["serial_number"]
+        for name, ch_cfg in _get_effective_channel_settings(setup=setup).items()
+    }
+    left_out = []
+    while True:
+        overloaded = {
+            serial_number
+            for serial_number, plan in plan_sg_stream(setup=setup).items()
+            if not plan.feasible
+        }
+        candidates = [name for name in others if serial_numbers[name] in overloaded]
+        if not candidates:
+            break
+        others.remove(candidates[-1])
+        set_sg_channel_runtime_settings(
+            sg_name=candidates[-1], enabled=False, setup=setup
+        )
+        left_out.append(candidates[-1])
+    if left_out:
+        print(
+            f"Not logging {', '.join(reversed(left_out))}: the T7 cannot stream them "
+            f"next to {sg_name} at the scan rate."
+        )
+
+
+@building_block
+def record_sg_burst(
+    sg_name: str,
+    duration: float,
+    voltage_range: float,
+    neg_voltage_range,
+    resolution_index: int,
+    scan_rate: float,
+    setup: Setup = None,
+    stream_resolution_index: int | None = None,
+) -> str:
+    """Records a fixed-duration burst of the given strain gauge.
+
+    The following steps are performed:
+
+        - For the given strain gauge, set the voltage ranges and resolution index, and enable its channel,
+        - Set the scan rate for the burst,
+        - Capture ``duration`` seconds of data straight into memory (no CSV, metrics or plot while streaming),
+        - Write the record to the folder dedicated to the current observation, with a filename that refers to the
+          current observation.
+
+    Args:
+        sg_name (str): Name of the strain gauge.
+        duration (float): Length of the record [s].
+        voltage_range (float): Positive voltage range of the strain gauge [V].
+        neg_voltage_range (float): Negative voltage range of the strain gauge [V].
+        resolution_index (int): Resolution index of the strain gauge [m].
+        scan_rate (float): Scan rate of the strain gauge [Hz].
+        setup (Setup): Setup.
+        stream_resolution_index (int | None): Stream-wide resolution index [m].
+
+    Returns:
+        Path of the written file (see :func:`load_sg_burst`).
+    """
+
+    setup = setup or load_setup()
+
+    # noinspection PyUnresolvedReferences
+    sg_setup = setup.gse.labjack_t7.channels[sg_name]
+
+    set_sg_channel_runtime_settings(
+        sg_name=sg_name,
+        enabled=True,
+        ain_channel=sg_setup.ain_channel,
+        voltage_range=voltage_range,
+        neg_voltage_range=neg_voltage_range,
+        resolution_index=resolution_index,
+        setup=setup,
+    )
+    set_sg_runtime_settings(
+        scan_rate=scan_rate, stream_resolution_index=stream_resolution_index
+    )
+
+    obsid = request_obsid()  # Since we're in a building block, this will not be None
+
+    return capture_sg_burst(
+        duration,
+        setup=setup,
+        save_path=f"{os.environ.get('CUBESPEC_DATA_STORAGE_LOCATION')}/obs/{obsid}",
+        base_filename=f"{obsid}_{ORIGIN}",
+    )
 
 
 @building_block
@@ -1027,3 +3020,254 @@ def reset_sg(setup: Setup = None) -> None:
         plot_interval_ms=plot_setup.interval_ms,
         plot_show_stats=plot_setup.show_stats,
     )
+
+
+@building_block
+def characterise_sg_resolution(
+    stream_resolution_indices: list[int] | None = None,
+    scan_rates: list[float] | None = None,
+    duration: float = 5.0,
+    noise_budget_uv: float | None = None,
+    apply: bool = True,
+    setup: Setup = None,
+) -> list[dict[str, Any]]:
+    """Measures noise and throughput of the enabled strain gauges per resolution index and scan rate.
+
+    For every combination of stream resolution index and scan rate, a short logging session is run on the enabled
+    channels (CSV, metrics and plot output are switched off for these sessions), and the following is recorded:
+
+        - the RMS noise per channel (after removing the mean and a linear trend, so a slowly varying strain does not
+          count as noise) and the corresponding effective resolution in bits,
+        - the achieved scan rate and the device and LJM backlog,
+        - whether the stream kept up: the achieved rate is within 2% of the requested one and the device backlog
+          stayed below a quarter of the T7 stream buffer.
+
+    Channels set up for decimated logging are streamed at the full scan rate in these sessions, so that their noise
+    figures are those of the ADC rather than of the anti-alias filter.
+
+    The combinations that kept up and meet the noise budget are ranked by scan rate (fastest first), then by noise.
+    With ``apply``, the best one is written back as runtime settings: the stream resolution index and scan rate
+    through ``set_sg_runtime_settings``, and the matching resolution index per channel through
+    ``set_sg_channel_runtime_settings`` (the latter only applies to command-response reads). Otherwise, the runtime
+    settings are left as they were.
+
+    On the synthetic backend, use ``SyntheticLJM(model_adc=True)`` to get noise and overlap behaviour that depends
+    on the resolution index.
+
+    Args:
+        stream_resolution_indices (list[int] | None): Stream resolution indices to try (1-8 by default).
+        scan_rates (list[float] | None): Scan rates to try [Hz]. By default, the highest rate the stream planner
+            expects the T7 to sustain for every resolution index, and half and a quarter of it.
+        duration (float): Length of the session per combination [s].
+        noise_budget_uv (float | None): Highest acceptable RMS noise on any channel [uV]. None accepts any noise.
+        apply (bool): Whether to apply the best combination as runtime settings.
+        setup (Setup): Setup with the SG configuration.
+
+    Returns:
+        One row per combination, best first, with the keys ``stream_resolution_index``, ``scan_rate``,
+        ``achieved_rate``, ``noise_uv`` and ``effective_bits`` (per channel), ``max_device_backlog``,
+        ``max_ljm_backlog``, ``kept_up``, ``meets_budget`` and ``rank`` (None for rejected combinations).
+    """
+
+    setup = setup or load_setup()
+    if _server_endpoint is not None:
+        # The capture sink cannot travel to the server, and every combination
+        # would fail on it.
+        raise RuntimeError(
+            "The resolution characterisation captures the data in this process; "
+            "run it without a strain-gauge server (TVAC_SG_SERVER)."
+        )
+    if _active_session() is not None:
+        raise RuntimeError(
+            "Stop strain-gauge logging before characterising the resolution."
+        )
+
+    channels = {
+        sg_name: ch_cfg
+        for sg_name, ch_cfg in _get_effective_channel_settings(setup=setup).items()
+        if ch_cfg["enabled"]
+    }
+    if not channels:
+        raise ValueError(
+            "No SG channels are enabled. Enable at least one channel first."
+        )
+    devices = _group_channels_by_device(list(channels.items()))
+    # The T7 stores 2 bytes per sample in its stream buffer.
+    buffer_size = int(_get_effective_settings(setup=setup)["stream"]["buffer_size"])
+    capacity_scans = buffer_size // (2 * max(len(ch) for ch in devices.values()))
+
+    saved_overrides = {
+        section: dict(values) for section, values in _runtime_overrides.items()
+    }
+    saved_channel_overrides = {
+        sg_name: dict(values) for sg_name, values in _runtime_channel_overrides.items()
+    }
+
+    rows = []
+    try:
+        combinations = []
+        for index in stream_resolution_indices or list(range(1, 9)):
+            if scan_rates:
+                rates = scan_rates
+            else:
+                set_sg_runtime_settings(stream_resolution_index=index)
+                max_rate = get_sg_max_scan_rate(setup=setup)
+                rates = [max_rate, max_rate / 2, max_rate / 4]
+            combinations.extend((index, float(rate)) for rate in rates)
+
+        # Noise is measured at the scan rate, so decimated channels are
+        # streamed at the full rate for the characterisation.
+        for sg_name, ch_cfg in channels.items():
+            if int(ch_cfg["decimation"]) > 1:
+                set_sg_channel_runtime_settings(
+                    sg_name=sg_name, decimation=1, setup=setup
+                )
+
+        for index, rate in combinations:
+            set_sg_runtime_settings(
+                stream_resolution_index=index,
+                scan_rate=rate,
+                # Measure what the device does at this rate, rather than what
+                # the planner expects.
+                rate_limit="off",
+                mode="stream",
+                csv_enabled=False,
+                metrics_enabled=False,
+                plot_enabled=False,
+                record_raw=False,
+            )
+            rows.append(
+                _characterise_combination(index, rate, duration, devices, setup)
+            )
+    finally:
+        _runtime_overrides.update(saved_overrides)
+        _runtime_channel_overrides.clear()
+        _runtime_channel_overrides.update(saved_channel_overrides)
+
+    for row in rows:
+        row["kept_up"] = (
+            row["achieved_rate"] >= 0.98 * row["scan_rate"]
+            and row["max_device_backlog"] < capacity_scans // 4
+        )
+        row["meets_budget"] = noise_budget_uv is None or all(
+            noise <= noise_budget_uv for noise in row["noise_uv"].values()
+        )
+
+    accepted = sorted(
+        (row for row in rows if row["kept_up"] and row["meets_budget"]),
+        key=lambda row: (-row["scan_rate"], max(row["noise_uv"].values(), default=0.0)),
+    )
+    for rank, row in enumerate(accepted, start=1):
+        row["rank"] = rank
+    rejected = [row for row in rows if not (row["kept_up"] and row["meets_budget"])]
+    for row in rejected:
+        row["rank"] = None
+    ranked = accepted + rejected
+
+    print("Resolution characterisation (best first):")
+    for row in ranked:
+        noise = ", ".join(
+            f"{sg_name} {noise:.2f} uV ({row['effective_bits'][sg_name]:.1f} b)"
+            for sg_name, noise in row["noise_uv"].items()
+        )
+        verdict = (
+            f"#{row['rank']}"
+            if row["rank"] is not None
+            else ("over budget" if row["kept_up"] else "did not keep up")
+        )
+        print(
+            f"  index {row['stream_resolution_index']} @ {row['scan_rate']:.1f} Hz: "
+            f"achieved {row['achieved_rate']:.1f} Hz, "
+            f"backlog max {row['max_device_backlog']}/{row['max_ljm_backlog']}, "
+            f"noise: {noise or 'n/a'} -> {verdict}"
+        )
+
+    if not accepted:
+        print("No combination kept up within the noise budget; settings unchanged.")
+    elif apply:
+        best = accepted[0]
+        set_sg_runtime_settings(
+            stream_resolution_index=best["stream_resolution_index"],
+            scan_rate=best["scan_rate"],
+        )
+        for sg_name in channels:
+            set_sg_channel_runtime_settings(
+                sg_name=sg_name,
+                resolution_index=best["stream_resolution_index"],
+                setup=setup,
+            )
+        print(
+            f"Applied stream resolution index {best['stream_resolution_index']} "
+            f"at {best['scan_rate']:.1f} Hz."
+        )
+
+    return ranked
+
+
+def _characterise_combination(index, rate, duration, devices, setup) -> dict[str, Any]:
+    """Run one short session and measure noise, rate and backlog per channel."""
+    captured: dict[str, list[np.ndarray]] = {}
+    columns: dict[str, list[str]] = {}
+
+    def _capture_sink(*, readings, channel_names, source, **_):
+        if "/" in str(source):
+            return  # A decimated series is filtered; its noise is not the ADC's
+        # The pipeline reuses the block once the sink returns.
+        captured.setdefault(source, []).append(readings.copy())
+        columns.setdefault(source, list(channel_names))
+
+    row = {
+        "stream_resolution_index": index,
+        "scan_rate": rate,
+        "achieved_rate": 0.0,
+        "noise_uv": {},
+        "effective_bits": {},
+        "max_device_backlog": 0,
+        "max_ljm_backlog": 0,
+    }
+    try:
+        # A failed combination is a result, not something to recover from.
+        start_sg_logging(
+            setup=setup, extra_sinks={"characterise": _capture_sink}, supervise=False
+        )
+        time.sleep(duration)
+        stream_stats = get_sg_stream_stats()
+    except Exception as exc:
+        print(f"Resolution index {index} at {rate:.1f} Hz failed: {exc}")
+        stream_stats = {}
+    finally:
+        stop_sg_logging()
+
+    if stream_stats:
+        row["achieved_rate"] = min(
+            stats["scans_per_s"] for stats in stream_stats.values()
+        )
+        row["max_device_backlog"] = max(
+            stats["max_device_backlog"] for stats in stream_stats.values()
+        )
+        row["max_ljm_backlog"] = max(
+            stats["max_ljm_backlog"] for stats in stream_stats.values()
+        )
+
+    for serial_number, device_channels in devices.items():
+        if not captured.get(serial_number):
+            continue
+        readings = np.concatenate(captured[serial_number])
+        if len(readings) < 3:
+            continue
+        names = columns[serial_number]
+        x = np.arange(len(readings), dtype=np.float64)
+        for _, sg_name, ch_cfg in device_channels:
+            column = f"AIN{int(ch_cfg['ain_channel'])}"
+            if column not in names:
+                continue
+            values = readings[:, names.index(column)]
+            residual = values - np.polyval(np.polyfit(x, values, 1), x)
+            noise = float(residual.std())
+            row["noise_uv"][sg_name] = noise * 1e6
+            row["effective_bits"][sg_name] = (
+                float(np.log2(2 * float(ch_cfg["voltage_range"]) / noise))
+                if noise > 0
+                else float("inf")
+            )
+    return row
@@ -0,0 +1,518 @@
+"""Bounded fan-out between the LabJack stream callback and its data sinks.
+
+The LJM stream callback must return quickly: every millisecond it spends on
+file I/O or network sends grows the device backlog. This module decouples the
+acquisition thread from the consumers of the data:
+
+1. :class:`SinkPipeline` takes preallocated blocks from a :class:`BlockPool`.
+   The stream callback only copies each batch into a free block.
+2. Every registered sink runs on its own worker thread with its own queue of
+   blocks, so a slow CSV disk does not delay the live plot and vice versa.
+   Sinks receive views of the blocks, not copies; a block returns to the
+   pool once every sink has handled (or dropped) it.
+3. When the pool runs out because a sink has fallen behind, its
+   :class:`SinkPolicy` decides what happens to its oldest queued batch.
+
+In the steady state nothing on this path allocates array memory. The pool
+counts the allocations it could not avoid (spilled copies, blocks added
+because every block was in use) so they show up in the status.
+
+Sinks are plain callables that accept the same keyword arguments as the
+batch-mode callback of :class:`tvac.labjack_t7.LabJackT7Logger`, plus
+``source``: the label of the device the batch came from. Several loggers can
+push into one pipeline, each with its own channel set, so the sinks see the
+batches of all devices of a session in arrival order.
+
+The ``readings`` array handed to a sink is only valid during the call: the
+block is reused afterwards. A sink that keeps the data must copy it.
+"""
+
+import collections
+import threading
+import time
+from enum import Enum
+from typing import Callable
+
+import numpy as np
+
+
+class SinkPolicy(str, Enum):
+    """What to do when a sink is a full ring behind the acquisition."""
+
+    BLOCK = "block"
+    """Make the stream callback wait (up to a timeout) until the sink catches up."""
+    DROP_OLDEST = "drop_oldest"
+    """Discard the oldest unread batch for this sink and count the dropped scans."""
+    SPILL = "spill"
+    """Move the oldest unread batch to an unbounded per-sink overflow queue in memory."""
+
+
+class BlockPool:
+    """Free list of preallocated ``(max_scans, n_channels)`` float64 blocks.
+
+    Blocks are referred to by index and reference counted: :meth:`acquire`
+    hands out a free block with the number of users that will release it,
+    and :meth:`release` returns it to the free list after the last one. The
+    pool is not thread-safe; its owner serialises access.
+
+    Parameters
+    ----------
+    n_blocks : int
+        Number of blocks allocated up front.
+    max_scans : int
+        Rows per block.
+    n_channels : int
+        Columns per block.
+    """
+
+    def __init__(self, n_blocks: int, max_scans: int, n_channels: int):
+        if n_blocks <= 0:
+            raise ValueError(f"n_blocks must be > 0, got {n_blocks}")
+        self.max_scans = max(1, int(max_scans))
+        self.n_channels = int(n_channels)
+
+        self._blocks = [
+            np.empty((self.max_scans, self.n_channels), dtype=np.float64)
+            for _ in range(n_blocks)
+        ]
+        self._refs = [0] * n_blocks
+        self._free = collections.deque(range(n_blocks))
+
+        self.allocations = 0  # Blocks added after construction
+        self.low_water = n_blocks  # Fewest free blocks seen
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    @property
+    def free(self) -> int:
+        """Number of blocks on the free list."""
+        return len(self._free)
+
+    def block(self, block_id: int) -> np.ndarray:
+        """Return the array of block ``block_id``."""
+        return self._blocks[block_id]
+
+    def acquire(self, refs: int) -> int | None:
+        """Take a free block for ``refs`` users, or return None if none is free."""
+        if not self._free:
+            return None
+        block_id = self._free.popleft()
+        self.low_water = min(self.low_water, len(self._free))
+        self._refs[block_id] = refs
+        if refs <= 0:
+            self._free.append(block_id)
+        return block_id
+
+    def grow(self) -> None:
+        """Add one block to the free list, counting the allocation."""
+        self._blocks.append(
+            np.empty((self.max_scans, self.n_channels), dtype=np.float64)
+        )
+        self._refs.append(0)
+        self._free.append(len(self._blocks) - 1)
+        self.allocations += 1
+
+    def release(self, block_id: int) -> None:
+        """Drop one reference to ``block_id``; free it after the last one."""
+        self._refs[block_id] -= 1
+        if self._refs[block_id] == 0:
+            self._free.append(block_id)
+
+    def stats(self) -> dict:
+        return {
+            "blocks": len(self._blocks),
+            "free": len(self._free),
+            "low_water": self.low_water,
+            "allocations": self.allocations,
+        }
+
+
+class _BatchSlot:
+    """Metadata of the batch stored in one pool block."""
+
+    __slots__ = (
+        "seq",
+        "scan_index0",
+        "t0_ns",
+        "scan_rate",
+        "n_scans",
+        "n_columns",
+        "channel_names",
+        "device_backlog",
+        "ljm_backlog",
+        "gap_scans",
+        "source",
+    )
+
+    def __init__(self):
+        self.seq = -1
+        self.n_scans = 0
+
+
+class _SinkWorker:
+    """One sink callable, its queue of pool blocks, and its statistics."""
+
+    def __init__(self, name: str, handler: Callable, policy: SinkPolicy):
+        self.name = name
+        self.handler = handler
+        self.policy = SinkPolicy(policy)
+
+        self.queue = collections.deque()  # Block ids not yet handed to the sink
+        self.in_flight: int | None = None  # Block id the sink is handling
+        self.pending_scans = 0  # Scans in ``queue`` and ``spill``
+        self.spill = collections.deque()
+        self.thread: threading.Thread | None = None
+
+        self.processed_batches = 0
+        self.processed_scans = 0
+        self.dropped_scans = 0
+        self.spilled_scans = 0
+        self.block_timeouts = 0
+        self.errors = 0
+        self.high_water_scans = 0
+        self.busy_s = 0.0
+        self._error_reported = False
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy.value,
+            "lag_scans": self.pending_scans,
+            "high_water_scans": self.high_water_scans,
+            "processed_batches": self.processed_batches,
+            "processed_scans": self.processed_scans,
+            "dropped_scans": self.dropped_scans,
+            "spilled_scans": self.spilled_scans,
+            "block_timeouts": self.block_timeouts,
+            "errors": self.errors,
+            "busy_s": self.busy_s,
+        }
+
+
+class SinkPipeline:
+    """Pool of batch blocks with one worker thread per registered sink.
+
+    Parameters
+    ----------
+    n_channels : int
+        Largest number of columns in a batch.
+    max_scans : int
+        Scans per block. Larger batches are split over several blocks.
+    capacity : int
+        Number of blocks in the pool.
+    block_timeout_s : float
+        Longest time a ``BLOCK`` sink may stall the stream callback for one
+        block. After the timeout its oldest batch is dropped, so a hung sink
+        can never stop acquisition altogether.
+    """
+
+    def __init__(
+        self,
+        n_channels: int,
+        max_scans: int,
+        capacity: int = 64,
+        block_timeout_s: float = 1.0,
+    ):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be > 0, got {capacity}")
+
+        self.n_channels = int(n_channels)
+        self.max_scans = max(1, int(max_scans))
+        self.capacity = int(capacity)
+        self.block_timeout_s = float(block_timeout_s)
+
+        # All blocks are allocated up front, so pushing a batch normally
+        # never allocates.
+        self._pool = BlockPool(self.capacity, self.max_scans, self.n_channels)
+        self._slots = [_BatchSlot() for _ in range(self.capacity)]
+
+        self._head = 0  # Sequence number of the next batch
+        self._scans_written = 0
+        self._spill_copies = 0
+        self._cond = threading.Condition()
+        self._sinks: list[_SinkWorker] = []
+        self._running = False
+        self._closing = False
+
+    def add_sink(
+        self,
+        name: str,
+        handler: Callable,
+        policy: SinkPolicy | str = SinkPolicy.DROP_OLDEST,
+    ) -> None:
+        """Register a sink. Must be called before :meth:`start`."""
+        if self._running:
+            raise RuntimeError("Cannot add sinks to a running pipeline.")
+        self._sinks.append(_SinkWorker(name, handler, SinkPolicy(policy)))
+
+    def start(self) -> None:
+        """Start one daemon worker thread per registered sink."""
+        self._running = True
+        for sink in self._sinks:
+            sink.thread = threading.Thread(
+                target=self._run_sink,
+                args=(sink,),
+                name=f"sg-sink-{sink.name}",
+                daemon=True,
+            )
+            sink.thread.start()
+
+    def push(
+        self,
+        *,
+        scan_index0,
+        t0_ns,
+        scan_rate,
+        readings,
+        channel_names,
+        device_backlog,
+        ljm_backlog,
+        gap_scans=0,
+        source=None,
+    ) -> None:
+        """Copy one stream batch into pool blocks and wake the sink workers.
+
+        The signature matches the batch-mode callback of
+        :class:`tvac.labjack_t7.LabJackT7Logger`, so this method can be used as
+        the stream callback directly. ``source`` is handed on to the sinks.
+        A batch split over several blocks reports its ``gap_scans`` with the
+        first one. ``readings`` is copied, so it may be a view of a buffer
+        the caller reuses.
+
+        The copy is made outside the pipeline lock, so the callbacks of
+        several devices copy in parallel on a free-threaded interpreter, and
+        the sink workers are not held up by it. The block is only queued to
+        the sinks once it is complete.
+        """
+        n_columns = readings.shape[1]
+        if n_columns > self.n_channels:
+            raise ValueError(
+                f"Batch has {n_columns} channels, the pipeline holds at most "
+                f"{self.n_channels}."
+            )
+
+        for lo in range(0, len(readings), self.max_scans):
+            hi = min(lo + self.max_scans, len(readings))
+            n = hi - lo
+            with self._cond:
+                if self._closing:
+                    return
+                # Not in any queue until filled, so nothing reclaims it.
+                block_id = self._acquire_block()
+                block = self._pool.block(block_id)
+
+            block[:n, :n_columns] = readings[lo:hi]
+
+            with self._cond:
+                if self._closing:
+                    for _ in self._sinks:
+                        self._pool.release(block_id)
+                    return
+                slot = self._slots[block_id]
+                slot.seq = self._head
+                slot.scan_index0 = scan_index0 + lo
+                slot.t0_ns = t0_ns + round(lo * 1e9 / scan_rate)
+                slot.scan_rate = scan_rate
+                slot.n_scans = n
+                slot.n_columns = n_columns
+                slot.channel_names = channel_names
+                slot.device_backlog = device_backlog
+                slot.ljm_backlog = ljm_backlog
+                slot.gap_scans = gap_scans if lo == 0 else 0
+                slot.source = source
+
+                for sink in self._sinks:
+                    sink.queue.append(block_id)
+                    sink.pending_scans += n
+                    sink.high_water_scans = max(
+                        sink.high_water_scans, sink.pending_scans
+                    )
+
+                self._head += 1
+                self._scans_written += n
+                self._cond.notify_all()
+
+    def _acquire_block(self) -> int:
+        """Return a free block referenced by every sink.
+
+        Called with ``_cond`` held. While the pool is empty the oldest
+        queued batch is reclaimed according to the policies of the sinks
+        still holding it. If every block is in the hands of a sink, the pool
+        grows by one block.
+        """
+        while True:
+            block_id = self._pool.acquire(len(self._sinks))
+            if block_id is not None:
+                return block_id
+            if not self._reclaim_oldest():
+                self._pool.grow()
+                self._slots.append(_BatchSlot())
+
+    def _reclaim_oldest(self) -> bool:
+        """Take the oldest queued block that no sink is handling from its sinks.
+
+        Called with ``_cond`` held. Returns False if there is no such block.
+        """
+        in_flight = {sink.in_flight for sink in self._sinks}
+        candidates = [
+            block_id
+            for sink in self._sinks
+            for block_id in sink.queue
+            if block_id not in in_flight
+        ]
+        if not candidates:
+            return False
+        block_id = min(candidates, key=lambda b: self._slots[b].seq)
+        n_scans = self._slots[block_id].n_scans
+
+        for sink in self._sinks:
+            if block_id not in sink.queue:
+                continue
+
+            if sink.policy is SinkPolicy.BLOCK:
+                deadline = time.monotonic() + self.block_timeout_s
+                while block_id in sink.queue or sink.in_flight == block_id:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        break
+                if block_id not in sink.queue:
+                    # Handled, or being handled, by the sink in the meantime.
+                    continue
+                sink.block_timeouts += 1
+                sink.dropped_scans += n_scans
+            elif sink.policy is SinkPolicy.SPILL:
+                sink.spill.append(self._copy_slot(block_id))
+                sink.spilled_scans += n_scans
+                self._spill_copies += 1
+            else:
+                sink.dropped_scans += n_scans
+            sink.queue.remove(block_id)
+            if sink.policy is not SinkPolicy.SPILL:
+                sink.pending_scans -= n_scans
+            self._pool.release(block_id)
+        return True
+
+    def _batch_view(self, block_id: int) -> dict:
+        """Return the batch stored in ``block_id`` with ``readings`` as a view."""
+        slot = self._slots[block_id]
+        return {
+            "scan_index0": slot.scan_index0,
+            "t0_ns": slot.t0_ns,
+            "scan_rate": slot.scan_rate,
+            "readings": self._pool.block(block_id)[: slot.n_scans, : slot.n_columns],
+            "channel_names": slot.channel_names,
+            "device_backlog": slot.device_backlog,
+            "ljm_backlog": slot.ljm_backlog,
+            "gap_scans": slot.gap_scans,
+            "source": slot.source,
+        }
+
+    def _copy_slot(self, block_id: int) -> dict:
+        """Return the batch stored in ``block_id`` as owned arrays."""
+        batch = self._batch_view(block_id)
+        batch["readings"] = batch["readings"].copy()
+        return batch
+
+    def _run_sink(self, sink: _SinkWorker) -> None:
+        while True:
+            with self._cond:
+                while not sink.spill and not sink.queue:
+                    if self._closing:
+                        return
+                    self._cond.wait()
+
+                if sink.spill:
+                    block_id = None
+                    batch = sink.spill.popleft()
+                else:
+                    # The block stays referenced until the handler returns,
+                    # so the sink works on a view, not a copy.
+                    block_id = sink.queue.popleft()
+                    sink.in_flight = block_id
+                    batch = self._batch_view(block_id)
+                sink.pending_scans -= len(batch["readings"])
+
+            t_start = time.perf_counter()
+            failed = False
+            try:
+                sink.handler(**batch)
+            except Exception as exc:
+                failed = True
+                if not sink._error_reported:
+                    print(f"Warning: strain-gauge sink '{sink.name}' failed: {exc}")
+                    sink._error_reported = True
+            busy_s = time.perf_counter() - t_start
+
+            # The statistics are read by other threads; update them under
+            # the lock, which the GIL no longer stands in for on a
+            # free-threaded build.
+            with self._cond:
+                if failed:
+                    sink.errors += 1
+                sink.busy_s += busy_s
+                sink.processed_batches += 1
+                sink.processed_scans += len(batch["readings"])
+                if block_id is not None:
+                    sink.in_flight = None
+                    self._pool.release(block_id)
+                # Wake a writer waiting for a block, or a drain
+                self._cond.notify_all()
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every sink has handled every batch pushed so far.
+
+        The pipeline keeps running. Returns ``False`` on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while any(
+                sink.queue or sink.spill or sink.in_flight is not None
+                for sink in self._sinks
+            ):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting batches, let the sinks drain, and join the workers."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+
+        deadline = time.monotonic() + timeout
+        for sink in self._sinks:
+            if sink.thread is not None:
+                sink.thread.join(max(0.0, deadline - time.monotonic()))
+                if sink.thread.is_alive():
+                    print(f"Warning: strain-gauge sink '{sink.name}' did not drain.")
+        self._running = False
+
+    def stats(self) -> dict[str, dict]:
+        """Return per-sink lag, drop and high-water statistics."""
+        with self._cond:
+            return {sink.name: sink.stats() for sink in self._sinks}
+
+    def pool_stats(self) -> dict:
+        """Return the block pool usage and the allocations made after start-up.
+
+        ``allocations`` counts blocks added to the pool plus batches copied
+        to a spill queue; ``allocations_per_batch`` relates them to the
+        batches pushed.
+        """
+        with self._cond:
+            stats = self._pool.stats()
+            stats["allocations"] += self._spill_copies
+            stats["spill_copies"] = self._spill_copies
+            stats["batches"] = self._head
+        stats["allocations_per_batch"] = (
+            stats["allocations"] / stats["batches"] if stats["batches"] else 0.0
+        )
+        return stats
+
+    @property
+    def scans_written(self) -> int:
+        """Total number of scans pushed into the pipeline."""
+        with self._cond:
+            return self._scans_written
@@ -8,6 +8,7 @@ consumes shared buffers from ``tvac.strain_gauge``.
 import bisect
 
 import matplotlib
+import numpy as np
 
 # GUI Executor is Qt-based; prefer a Qt backend to avoid Tk/Qt event-loop conflicts.
 if "qt" not in matplotlib.get_backend().lower():
@@ -23,7 +24,7 @@ from tvac.strain_gauge import (
     ch_buffers,
     get_sg_effective_settings,
     plot_lock,
-    time_buffer,
+    time_buffers,
 )
 
 # Default colours, extended automatically if more channels are needed.
@@ -106,42 +107,49 @@ def open_live_plot(setup=None):
         else:
             stat_texts.append(None)
 
-    axes[-1].set_xlabel("Time since stream start (s)", fontsize=9)
+    axes[-1].set_xlabel("Time since session start (s)", fontsize=9)
     fig.tight_layout()
 
     keep_seconds = window_seconds * 1.2
 
     def _update(_frame):
         with plot_lock:
-            if not time_buffer:
+            # Channels on different T7s have their own time buffers. They
+            # share the session time axis, so the newest sample of any
+            # channel sets the window.
+            latest = [times[-1] for times in time_buffers[:num_channels] if times]
+            if not latest:
                 return lines
 
-            t_now = time_buffer[-1]
+            t_now = max(latest)
             t_start = max(0.0, t_now - window_seconds)
 
-            lo_idx = bisect.bisect_left(time_buffer, t_start)
-            t_win = time_buffer[lo_idx:]
-            v_win = [ch_buffers[ch][lo_idx:] for ch in range(num_channels)]
-
-            trim_idx = bisect.bisect_left(time_buffer, t_now - keep_seconds)
-            if trim_idx > 0:
-                del time_buffer[:trim_idx]
-                for ch in range(num_channels):
+            t_win = []
+            v_win = []
+            for ch in range(min(num_channels, len(time_buffers))):
+                times = time_buffers[ch]
+                lo_idx = bisect.bisect_left(times, t_start)
+                t_win.append(times[lo_idx:])
+                v_win.append(ch_buffers[ch][lo_idx:])
+
+                trim_idx = bisect.bisect_left(times, t_now - keep_seconds)
+                if trim_idx > 0:
+                    del times[:trim_idx]
                     del ch_buffers[ch][:trim_idx]
 
-        if not t_win:
-            return lines
-
         for ch, (line, ax, txt) in enumerate(zip(lines, axes, stat_texts)):
-            line.set_data(t_win, v_win[ch])
+            if ch >= len(t_win) or not t_win[ch]:
+                continue
+            line.set_data(t_win[ch], v_win[ch])
             ax.set_xlim(t_start, t_now)
             ax.relim()
             ax.autoscale_view(scalex=False, scaley=True)
 
             if show_stats and txt is not None:
-                lo = min(v_win[ch])
-                hi = max(v_win[ch])
-                mn = sum(v_win[ch]) / len(v_win[ch])
+                values = np.asarray(v_win[ch])
+                lo = values.min()
+                hi = values.max()
+                mn = values.mean()
                 txt.set_text(f"min: {lo:+.5f} V\nmax: {hi:+.5f} V\nmean:{mn:+.5f} V")
 
         return lines
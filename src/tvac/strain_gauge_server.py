@@ -0,0 +1,344 @@
+"""Run strain-gauge acquisition in its own process, controlled over ZeroMQ.
+
+By default, acquisition runs inside the gui-executor kernel, on the same
+interpreter as the building blocks that sleep for minutes during a sweep and
+as matplotlib. A kernel restart then ends the session, and a busy
+interpreter competes with the stream callback for the GIL. This module moves
+the session into a long-lived process of its own:
+
+* :class:`StrainGaugeServer` owns the :mod:`tvac.strain_gauge` session. It
+  answers commands on a REP socket (start, stop, retarget, configure, status
+  and the other functions in :data:`tvac.strain_gauge.SERVED_COMMANDS`) and
+  publishes a status message every second and every streamed batch on a PUB
+  socket.
+* :class:`StrainGaugeClient` sends those commands. With the
+  ``TVAC_SG_SERVER`` environment variable set to the command endpoint (e.g.
+  ``tcp://localhost:6720``), or after
+  :func:`tvac.strain_gauge.set_sg_server`, the served functions of
+  :mod:`tvac.strain_gauge` forward their calls through a client. The
+  ``exec_ui`` tasks and building blocks thereby become thin clients without
+  changes of their own.
+
+Commands are JSON objects ``{"command": name, "kwargs": {...}}`` and
+replies ``{"ok": true, "result": ...}`` or ``{"ok": false, "error": ...,
+"type": ...}``. Arguments that do not travel as JSON (a ``Setup``, sinks,
+stream-outs) cannot be forwarded: the server loads the setup itself.
+
+Published messages have the topic as their first frame: ``status`` with one
+JSON frame, and ``data.<source>`` with a JSON header (the batch callback
+arguments without ``readings``) and the readings as raw float64 bytes.
+
+Run the server with ``sg_server start``. It listens on the local machine
+only, unless ``--interface`` says otherwise: the commands are not
+authenticated.
+"""
+
+import json
+import threading
+import time
+
+import numpy as np
+import zmq
+
+from tvac import strain_gauge
+
+DEFAULT_COMMAND_PORT = 6720
+DEFAULT_DATA_PORT = 6721
+
+DEFAULT_INTERFACE = "127.0.0.1"
+"""Interface the server binds to. The commands are not authenticated, so by
+default only processes on the same machine can reach them."""
+
+DEFAULT_TIMEOUT_S = 30.0
+"""Time a client waits for a reply. Starting a session opens and configures
+the T7s, and ``wait_for_sg_trigger`` blocks for up to its timeout."""
+
+_ERRORS = {
+    error.__name__: error
+    for error in (ValueError, RuntimeError, KeyError, TypeError, TimeoutError)
+}
+
+
+def _to_json(value):
+    """Convert what ``json`` cannot encode itself (numpy scalars and arrays)."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class StrainGaugeServer:
+    """Serve the strain-gauge session of this process over ZeroMQ.
+
+    Parameters
+    ----------
+    interface : str
+        Interface (IP address) to bind the sockets to. The commands are not
+        authenticated: anyone who can connect can start and stop sessions
+        and choose where files are written. Bind to another interface, or
+        ``"*"`` for all of them, only on a trusted network.
+    command_port : int
+        Port of the REP socket for commands.
+    data_port : int
+        Port of the PUB socket for status and data.
+    status_interval_s : float
+        Time between published status messages [s].
+    publish_data : bool
+        Publish every streamed batch on the data socket.
+    """
+
+    def __init__(
+        self,
+        interface: str = DEFAULT_INTERFACE,
+        command_port: int = DEFAULT_COMMAND_PORT,
+        data_port: int = DEFAULT_DATA_PORT,
+        status_interval_s: float = 1.0,
+        publish_data: bool = True,
+    ):
+        self.interface = str(interface)
+        self.command_port = int(command_port)
+        self.data_port = int(data_port)
+        self.status_interval_s = float(status_interval_s)
+        self.publish_data = bool(publish_data)
+
+        self._context = zmq.Context.instance()
+        self._commands = None
+        self._publisher = None
+        # The publisher is used by the server thread (status) and by the
+        # publish sink's worker thread (data).
+        self._publish_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.commands_handled = 0
+        self.published_batches = 0
+
+    def serve_forever(self) -> None:
+        """Handle commands until a ``shutdown`` command or :meth:`stop`."""
+        # This process runs the session; its own calls must not be forwarded.
+        strain_gauge.set_sg_server(None)
+
+        self._commands = self._context.socket(zmq.REP)
+        self._commands.bind(f"tcp://{self.interface}:{self.command_port}")
+        self._publisher = self._context.socket(zmq.PUB)
+        self._publisher.setsockopt(zmq.SNDHWM, 1000)
+        self._publisher.bind(f"tcp://{self.interface}:{self.data_port}")
+        print(
+            f"Strain-gauge server on {self.interface}: commands on port "
+            f"{self.command_port}, status and data on port {self.data_port}."
+        )
+
+        next_status = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                timeout_ms = max(0.0, next_status - time.monotonic()) * 1e3
+                if self._commands.poll(min(timeout_ms, 250)):
+                    reply = self._handle(self._commands.recv())
+                    self._commands.send(json.dumps(reply, default=_to_json).encode())
+                if time.monotonic() >= next_status:
+                    self._publish_status()
+                    next_status = time.monotonic() + self.status_interval_s
+        finally:
+            strain_gauge.stop_sg_logging()
+            self._commands.close(linger=0)
+            with self._publish_lock:
+                self._publisher.close(linger=0)
+            print("Strain-gauge server stopped.")
+
+    def stop(self) -> None:
+        """Make :meth:`serve_forever` return after the command in progress."""
+        self._stop.set()
+
+    def _handle(self, message: bytes) -> dict:
+        try:
+            request = json.loads(message)
+            command = request["command"]
+            kwargs = request.get("kwargs") or {}
+        except (ValueError, KeyError, TypeError) as exc:
+            return {"ok": False, "type": "ValueError", "error": f"Bad request: {exc}"}
+
+        self.commands_handled += 1
+        try:
+            if command == "ping":
+                result = "pong"
+            elif command == "describe":
+                result = {
+                    "data_port": self.data_port,
+                    "commands": sorted(strain_gauge.SERVED_COMMANDS),
+                }
+            elif command == "shutdown":
+                self._stop.set()
+                result = None
+            elif command in strain_gauge.SERVED_COMMANDS:
+                if self.publish_data and command in (
+                    "start_sg_logging",
+                    "update_sg_logging",
+                ):
+                    kwargs["extra_sinks"] = {"publish": self._publish_sink}
+                result = strain_gauge.SERVED_COMMANDS[command](**kwargs)
+            else:
+                raise ValueError(f"Unknown command {command!r}.")
+        except Exception as exc:
+            return {"ok": False, "type": type(exc).__name__, "error": str(exc)}
+        return {"ok": True, "result": result}
+
+    def _publish(self, frames: list[bytes]) -> None:
+        with self._publish_lock:
+            if self._publisher is None or self._publisher.closed:
+                return
+            try:
+                self._publisher.send_multipart(frames, flags=zmq.NOBLOCK)
+            except zmq.Again:
+                pass  # No subscriber keeps up; PUB drops rather than block
+
+    def _publish_status(self) -> None:
+        status = {
+            "time_ns": time.time_ns(),
+            "status": strain_gauge.get_sg_status(),
+            "streams": strain_gauge.get_sg_stream_stats(),
+        }
+        self._publish([b"status", json.dumps(status, default=_to_json).encode()])
+
+    def _publish_sink(self, *, readings, source, **kwargs) -> None:
+        """Pipeline sink that publishes every batch to the subscribers."""
+        header = json.dumps(
+            {**kwargs, "source": source, "shape": readings.shape}, default=_to_json
+        )
+        self._publish(
+            [
+                f"data.{source}".encode(),
+                header.encode(),
+                np.ascontiguousarray(readings, dtype=np.float64).tobytes(),
+            ]
+        )
+        self.published_batches += 1
+
+
+class StrainGaugeClient:
+    """Send commands to a :class:`StrainGaugeServer`.
+
+    Parameters
+    ----------
+    endpoint : str
+        Command endpoint of the server, e.g. ``"tcp://localhost:6720"``.
+    timeout_s : float
+        Time to wait for a reply [s].
+
+    Errors raised by the server are raised again as the same built-in type
+    (``RuntimeError`` for other types). A request that times out leaves the
+    socket unusable, so the client reconnects before the next one.
+    """
+
+    def __init__(self, endpoint: str, timeout_s: float = DEFAULT_TIMEOUT_S):
+        self.endpoint = str(endpoint)
+        self.timeout_s = float(timeout_s)
+        self._context = zmq.Context.instance()
+        self._socket = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        socket = self._context.socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(self.endpoint)
+        return socket
+
+    def call(self, command: str, reply_timeout_s: float | None = None, **kwargs):
+        """Run ``command`` on the server and return its result.
+
+        ``reply_timeout_s`` overrides :attr:`timeout_s` for this call.
+        """
+        timeout_s = self.timeout_s if reply_timeout_s is None else reply_timeout_s
+        try:
+            request = json.dumps({"command": command, "kwargs": kwargs})
+        except TypeError as exc:
+            raise ValueError(
+                f"Cannot send the arguments of {command} to the strain-gauge "
+                f"server: {exc}"
+            ) from None
+
+        with self._lock:
+            if self._socket is None:
+                self._socket = self._connect()
+            self._socket.send(request.encode())
+            if not self._socket.poll(timeout_s * 1e3):
+                self._socket.close()
+                self._socket = None
+                raise TimeoutError(
+                    f"No reply from the strain-gauge server at {self.endpoint} "
+                    f"to {command} within {timeout_s:g} s."
+                )
+            reply = json.loads(self._socket.recv())
+
+        if not reply["ok"]:
+            raise _ERRORS.get(reply.get("type"), RuntimeError)(reply["error"])
+        return reply["result"]
+
+    def ping(self) -> bool:
+        """Return whether the server answers."""
+        try:
+            return self.call("ping") == "pong"
+        except TimeoutError:
+            return False
+
+    def start(self, **kwargs):
+        """Start a logging session on the server (see ``start_sg_logging``)."""
+        return self.call("start_sg_logging", **kwargs)
+
+    def stop(self):
+        """Stop the server's logging session."""
+        return self.call("stop_sg_logging")
+
+    def retarget(self, save_path: str | None = None, base_filename: str | None = None):
+        """Move the session's files elsewhere (see ``retarget_sg_logging``)."""
+        return self.call(
+            "retarget_sg_logging", save_path=save_path, base_filename=base_filename
+        )
+
+    def configure(self, **settings):
+        """Set runtime settings (see ``set_sg_runtime_settings``)."""
+        return self.call("set_sg_runtime_settings", **settings)
+
+    def configure_channel(self, sg_name: str, **settings):
+        """Set channel settings (see ``set_sg_channel_runtime_settings``)."""
+        return self.call("set_sg_channel_runtime_settings", sg_name=sg_name, **settings)
+
+    def status(self) -> str:
+        """Return the server's status line (see ``get_sg_status``)."""
+        return self.call("get_sg_status")
+
+    def shutdown(self):
+        """Stop the session and the server process."""
+        return self.call("shutdown")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+
+    def subscribe(self, topics=("status", "data"), timeout_s: float | None = None):
+        """Yield published messages until no message came for ``timeout_s``.
+
+        Yields ``("status", status_dict, None)`` and ``("data.<source>",
+        header, readings)``, with ``header`` the batch callback arguments and
+        ``readings`` a ``(scans, channels)`` array. ``timeout_s=None`` waits
+        forever. Subscribers that fall behind lose messages.
+        """
+        data_port = self.call("describe")["data_port"]
+        host = self.endpoint.rsplit(":", 1)[0]
+        socket = self._context.socket(zmq.SUB)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(f"{host}:{data_port}")
+        for topic in topics:
+            socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
+        try:
+            while socket.poll(None if timeout_s is None else timeout_s * 1e3):
+                topic, *frames = socket.recv_multipart()
+                topic = topic.decode()
+                header = json.loads(frames[0])
+                if topic == "status":
+                    yield topic, header, None
+                else:
+                    readings = np.frombuffer(frames[1], dtype=np.float64)
+                    yield topic, header, readings.reshape(header["shape"])
+        finally:
+            socket.close()
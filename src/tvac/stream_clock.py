@@ -0,0 +1,352 @@
+"""Map LabJack stream scan indices to host time.
+
+The T7 samples on its own crystal and does not attach a host timestamp to a
+stream scan. The host only learns when ``eStreamRead`` returns, and at that
+moment it also learns how many scans are still queued in the device buffer
+and in the LJM buffer. :class:`StreamClock` uses both:
+
+1. Every read gives one observation: by ``arrival_ns`` the device had
+   acquired ``scan_index0 + n_scans + device_backlog + ljm_backlog`` scans.
+2. Host time is fitted against that scan count over a sliding window, kept
+   in preallocated arrays and fitted in place, so an observation does not
+   allocate. The
+   slope is the scan period measured in host nanoseconds (so it includes the
+   drift of the T7 clock against the host clock). The offset follows the
+   lower envelope of the observations, because read latency only ever makes
+   an observation late, never early.
+3. The timestamps handed out are a continuous, piecewise-linear function of
+   the scan index. Each batch is described by ``(scan_index0, t0_ns,
+   scan_rate)`` only; the next batch starts exactly where the previous one
+   ended, and any offset against the fitted model is slewed out by adjusting
+   the rate within ``max_slew_ppm``. Timestamps are therefore monotonic and
+   free of the jumps that snapping to the host clock would produce.
+
+Only a host clock step larger than ``step_threshold_s`` (e.g. a manual clock
+change) makes the timeline jump, since slewing could never catch up with it.
+
+With hardware timestamps enabled, the T7 streams its 40 MHz ``CORE_TIMER``
+next to the analog inputs. :class:`CoreTimerTracker` unwraps that counter
+into the device scan index of every scan, which exposes scans lost between
+the device and the host; the clock model then runs on those indices.
+"""
+
+import numpy as np
+
+CORE_TIMER_HZ = 40_000_000
+"""Tick rate of the T7 ``CORE_TIMER`` register (half the core clock)."""
+
+CORE_TIMER_CHANNELS = ["CORE_TIMER", "STREAM_DATA_CAPTURE_16"]
+"""Scan-list entries that stream the 32-bit core timer: the lower 16 bits are
+returned for ``CORE_TIMER`` and the upper 16 bits, captured in the same scan,
+for ``STREAM_DATA_CAPTURE_16``."""
+
+
+def scan_timestamps_ns(t0_ns: int, scan_rate: float, n_scans: int) -> np.ndarray:
+    """Return int64 nanosecond timestamps for ``n_scans`` scans starting at ``t0_ns``."""
+    return t0_ns + np.rint(
+        np.arange(n_scans, dtype=np.float64) * (1e9 / scan_rate)
+    ).astype(np.int64)
+
+
+class StreamClock:
+    """Backlog-compensated, slewed clock model for one stream.
+
+    Parameters
+    ----------
+    scan_rate : float
+        Nominal scan rate in Hz, as returned by ``eStreamStart``.
+    window_s : float
+        Length of the sliding window of observations used for the fit.
+    max_drift_ppm : float
+        Bound on the fitted period against nominal. A T7 clock is specified
+        well within this; the bound keeps a short, jittery window from
+        producing an implausible rate at stream start.
+    max_slew_ppm : float
+        Largest rate correction applied to remove an offset against the fit.
+    slew_time_s : float
+        Time constant over which an offset is slewed out.
+    step_threshold_s : float
+        Offsets larger than this are stepped instead of slewed.
+    read_scans : int
+        Expected scans per observation, which sizes the window arrays. Should
+        the window hold more observations, the arrays are doubled and the
+        allocation counted in :attr:`allocations`.
+    """
+
+    def __init__(
+        self,
+        scan_rate: float,
+        window_s: float = 60.0,
+        max_drift_ppm: float = 200.0,
+        max_slew_ppm: float = 500.0,
+        slew_time_s: float = 10.0,
+        step_threshold_s: float = 1.0,
+        read_scans: int = 1,
+    ):
+        if scan_rate <= 0:
+            raise ValueError(f"scan_rate must be > 0, got {scan_rate}")
+
+        self.scan_rate = float(scan_rate)
+        self.window_scans = max(1, int(window_s * scan_rate))
+        self.max_drift = max_drift_ppm * 1e-6
+        self.max_slew = max_slew_ppm * 1e-6
+        self.slew_scans = max(1.0, slew_time_s * scan_rate)
+        self.step_threshold_ns = step_threshold_s * 1e9
+
+        self._nominal_period_ns = 1e9 / self.scan_rate
+
+        # Observation window: scan counts and arrival times in
+        # _counts[_first:_end] and _times[_first:_end]. Room for twice the
+        # expected window, so it only moves back to the front of the arrays
+        # once per window.
+        capacity = 2 * (self.window_scans // max(1, int(read_scans)) + 2)
+        self._counts = np.empty(capacity, dtype=np.float64)
+        self._times = np.empty(capacity, dtype=np.float64)
+        self._scratch = np.empty((2, capacity), dtype=np.float64)
+        self._first = 0
+        self._end = 0
+        self.allocations = 0  # Window arrays enlarged after construction
+
+        # All host times below are relative to the first arrival, so float64
+        # keeps nanosecond resolution.
+        self._origin_ns = None
+
+        # Fitted model: host_ns = _origin_ns + _intercept_ns + _period_ns * scan_count
+        self._period_ns = self._nominal_period_ns
+        self._intercept_ns = None
+        self._latency_ns = 0.0
+        self._residual_ns = 0.0
+
+        # Output timeline: where the next batch starts
+        self._next_index = None
+        self._next_t_ns = 0.0
+        self._offset_ns = 0.0
+        self._output_rate = self.scan_rate
+        self.steps = 0
+
+    def update(
+        self,
+        scan_index0: int,
+        n_scans: int,
+        arrival_ns: int,
+        device_backlog: int = 0,
+        ljm_backlog: int = 0,
+    ) -> tuple[int, float]:
+        """Add one ``eStreamRead`` observation and time the batch it returned.
+
+        Parameters
+        ----------
+        scan_index0 : int
+            Index of the first scan of the batch since the stream started.
+        n_scans : int
+            Number of scans in the batch.
+        arrival_ns : int
+            Host time (ns since the epoch) at which ``eStreamRead`` returned.
+        device_backlog, ljm_backlog : int
+            Scans still queued in the device and LJM buffers at that time.
+
+        Returns
+        -------
+        tuple[int, float]
+            ``(t0_ns, scan_rate)``: the timestamp of scan ``scan_index0`` and
+            the rate to extrapolate the rest of the batch with. See
+            :func:`scan_timestamps_ns`.
+        """
+        self.observe(
+            scan_index0 + n_scans + max(0, device_backlog) + max(0, ljm_backlog),
+            arrival_ns,
+        )
+        return self.timeline(scan_index0, n_scans)
+
+    def observe(self, scan_count: int, arrival_ns: int) -> None:
+        """Record that the device had acquired ``scan_count`` scans by ``arrival_ns``."""
+        if self._origin_ns is None:
+            self._origin_ns = int(arrival_ns)
+        self._observe(scan_count, arrival_ns - self._origin_ns)
+
+    def timeline(self, scan_index0: int, n_scans: int) -> tuple[int, float]:
+        """Return ``(t0_ns, scan_rate)`` for ``n_scans`` scans from ``scan_index0``.
+
+        Must follow at least one :meth:`observe`. Consecutive calls continue
+        the output timeline; skipping scan indices (lost scans) leaves a gap
+        of the skipped length instead of restarting it.
+        """
+        model_t0_ns = self._intercept_ns + self._period_ns * scan_index0
+        if self._next_index is None:
+            self._next_t_ns = model_t0_ns
+        else:
+            if scan_index0 > self._next_index:
+                self._next_t_ns += (scan_index0 - self._next_index) * (
+                    1e9 / self._output_rate
+                )
+            offset_ns = model_t0_ns - self._next_t_ns
+            if abs(offset_ns) > self.step_threshold_ns:
+                print(
+                    f"[Stream clock stepped by {offset_ns / 1e6:.1f} ms "
+                    f"at scan {scan_index0}]"
+                )
+                self._next_t_ns = model_t0_ns
+                self.steps += 1
+
+        self._offset_ns = model_t0_ns - self._next_t_ns
+
+        # Slew towards the model: spread the offset over slew_scans, within
+        # the allowed rate correction.
+        correction = self._offset_ns / (self.slew_scans * self._period_ns)
+        correction = min(self.max_slew, max(-self.max_slew, correction))
+        period_ns = self._period_ns * (1.0 + correction)
+
+        t0_ns = self._origin_ns + int(round(self._next_t_ns))
+        self._output_rate = 1e9 / period_ns
+        self._next_index = scan_index0 + n_scans
+        self._next_t_ns += n_scans * period_ns
+        return t0_ns, self._output_rate
+
+    def _append(self, scan_count: int, arrival_ns: int) -> None:
+        """Add an observation to the window and drop the ones that fell out."""
+        counts, times = self._counts, self._times
+        first, end = self._first, self._end
+        while end - first > 1 and scan_count - counts[first] > self.window_scans:
+            first += 1
+
+        if end == len(counts):
+            # Move the window back to the front of the arrays.
+            n = end - first
+            if 2 * n > len(counts):
+                # More observations per window than the arrays were sized
+                # for (reads smaller than expected).
+                capacity = 2 * len(counts)
+                self._counts = np.empty(capacity, dtype=np.float64)
+                self._times = np.empty(capacity, dtype=np.float64)
+                self._scratch = np.empty((2, capacity), dtype=np.float64)
+                self.allocations += 1
+            self._counts[:n] = counts[first:end]
+            self._times[:n] = times[first:end]
+            first, end = 0, n
+
+        self._counts[end] = scan_count
+        self._times[end] = arrival_ns
+        self._first, self._end = first, end + 1
+
+    def _observe(self, scan_count: int, arrival_ns: int) -> None:
+        self._append(scan_count, arrival_ns)
+        n = self._end - self._first
+        counts = self._counts[self._first : self._end]
+
+        if n >= 2 and counts[-1] > counts[0]:
+            # Times relative to this arrival keep the sums well conditioned.
+            residuals = self._scratch[0, :n]
+            np.subtract(self._times[self._first : self._end], arrival_ns, out=residuals)
+            counts_c = self._scratch[1, :n]
+            np.subtract(counts, counts.mean(), out=counts_c)
+            # The centred counts sum to zero, so the times need no centring.
+            period_ns = float(np.dot(counts_c, residuals) / np.dot(counts_c, counts_c))
+            self._period_ns = min(
+                self._nominal_period_ns * (1.0 + self.max_drift),
+                max(self._nominal_period_ns * (1.0 - self.max_drift), period_ns),
+            )
+            # residuals = times - period * (counts - scan_count)
+            np.subtract(counts, scan_count, out=counts_c)
+            counts_c *= self._period_ns
+            residuals -= counts_c
+        else:
+            n = 1
+            residuals = self._scratch[0, :1]
+            residuals[0] = 0.0
+
+        # Lower envelope: the least-delayed observation defines the offset.
+        envelope = float(residuals.min())
+        mean = float(residuals.mean())
+        self._intercept_ns = arrival_ns + envelope - self._period_ns * scan_count
+        self._latency_ns = mean - envelope
+        residuals -= mean
+        self._residual_ns = float(np.sqrt(np.dot(residuals, residuals) / n))
+
+    @property
+    def drift_ppm(self) -> float:
+        """Device scan period relative to nominal, measured on the host clock.
+
+        Positive means the T7 clock runs slow compared to the host clock.
+        """
+        return (self._period_ns / self._nominal_period_ns - 1.0) * 1e6
+
+    def stats(self) -> dict:
+        """Return the current fit and slewing state."""
+        return {
+            "drift_ppm": self.drift_ppm,
+            "offset_us": self._offset_ns / 1e3,
+            "latency_us": self._latency_ns / 1e3,
+            "jitter_us": self._residual_ns / 1e3,
+            "output_rate": self._output_rate,
+            "observations": self._end - self._first,
+            "steps": self.steps,
+        }
+
+
+class CoreTimerTracker:
+    """Turn streamed ``CORE_TIMER`` values into device scan indices.
+
+    Parameters
+    ----------
+    scan_rate : float
+        Actual scan rate in Hz, as returned by ``eStreamStart``.
+
+    Notes
+    -----
+    The 32-bit counter wraps every ~107 s at 40 MHz, so wraps are counted
+    whenever it steps backwards. The index increment between two scans is the
+    tick difference divided by the ticks per scan, rounded; deriving it from
+    neighbouring scans (instead of from the first scan) keeps rounding of the
+    reported scan rate from accumulating over long sessions.
+    """
+
+    def __init__(self, scan_rate: float):
+        self.ticks_per_scan = CORE_TIMER_HZ / float(scan_rate)
+        self._last_ticks = None
+        self._last_index = -1
+        self.wraps = 0
+        self.gaps = 0
+        self.lost_scans = 0
+
+    def scan_indices(
+        self, low16: np.ndarray, high16: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(ticks, indices)`` for one batch of streamed timer columns.
+
+        ``ticks`` is the unwrapped 64-bit tick count of every scan and
+        ``indices`` its device scan index since the first scan of the stream.
+        Gaps (index increments larger than one) are counted in :attr:`gaps`
+        and :attr:`lost_scans`.
+        """
+        ticks32 = np.rint(low16).astype(np.int64) | (
+            np.rint(high16).astype(np.int64) << 16
+        )
+        first = self._last_ticks is None
+        prev32 = ticks32[0] if first else self._last_ticks & 0xFFFFFFFF
+
+        steps32 = np.diff(ticks32, prepend=prev32)
+        wrapped = np.cumsum(steps32 < 0)
+        ticks = ticks32 + ((self.wraps + wrapped) << 32)
+        self.wraps += int(wrapped[-1])
+
+        prev = ticks[0] if first else self._last_ticks
+        increments = np.rint(np.diff(ticks, prepend=prev) / self.ticks_per_scan)
+        increments = increments.astype(np.int64)
+        if first:
+            increments[0] = 1
+
+        lost = increments[increments > 1] - 1
+        self.gaps += len(lost)
+        self.lost_scans += int(lost.sum())
+
+        indices = self._last_index + np.cumsum(increments)
+        self._last_ticks = int(ticks[-1])
+        self._last_index = int(indices[-1])
+        return ticks, indices
+
+    def stats(self) -> dict:
+        return {
+            "timer_wraps": self.wraps,
+            "gaps": self.gaps,
+            "lost_scans": self.lost_scans,
+        }
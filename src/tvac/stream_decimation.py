@@ -0,0 +1,226 @@
+"""Anti-alias filtering and decimation of streamed strain-gauge channels.
+
+A sine sweep needs the swept gauge at the full scan rate, but the structural
+response of the other gauges only up to a fraction of it. Every channel of a
+T7 scan list is sampled at the scan rate, so the other gauges are streamed at
+full rate as well and reduced in the pipeline: :class:`Decimator` low-pass
+filters them below the Nyquist frequency of the reduced rate and keeps every
+``factor``-th sample. The CSV, MetricsHub and plot outputs then carry one
+full-rate and one reduced-rate series per T7, with the rate of every channel
+in the session metadata.
+
+The filter is a linear-phase FIR (a Hamming-windowed sinc from
+:func:`scipy.signal.firwin`) with an odd number of taps, so its delay is a
+whole number of scans and is taken out of the timestamps: a decimated sample
+has the time of the scan at the centre of its filter window. Only the kept
+samples are computed, from a window over a preallocated history buffer, so
+the reduction costs ``taps`` multiply-adds per channel and output sample and
+does not allocate in the steady state.
+
+After a gap the filter restarts from the first new sample (its history is
+filled with that value, which is the settled state for a constant input), so
+no output mixes data from both sides of the gap.
+"""
+
+import numpy as np
+from scipy.signal import firwin
+
+TAPS_PER_FACTOR = 8
+"""Filter length per unit of decimation factor (on each side of the centre)."""
+
+PASSBAND = 0.8
+"""Cutoff of the anti-alias filter, relative to the Nyquist frequency of the
+decimated rate."""
+
+
+def anti_alias_taps(factor: int, taps_per_factor: int = TAPS_PER_FACTOR) -> np.ndarray:
+    """Return the FIR taps of the anti-alias filter for ``factor``."""
+    n_taps = 2 * taps_per_factor * factor + 1
+    return firwin(n_taps, PASSBAND / factor)
+
+
+class Decimator:
+    """Filter and decimate consecutive batches of one group of channels.
+
+    Parameters
+    ----------
+    factor : int
+        Keep one sample in ``factor`` (at least 2).
+    n_channels : int
+        Columns of the batches.
+    max_scans : int
+        Largest batch expected; larger batches grow the buffers.
+    taps_per_factor : int
+        Filter length, see :data:`TAPS_PER_FACTOR`.
+    """
+
+    def __init__(
+        self,
+        factor: int,
+        n_channels: int,
+        max_scans: int,
+        taps_per_factor: int = TAPS_PER_FACTOR,
+    ):
+        self.factor = int(factor)
+        if self.factor < 2:
+            raise ValueError(f"A decimation factor must be >= 2, got {factor}.")
+        self.n_channels = int(n_channels)
+        self.taps = anti_alias_taps(self.factor, taps_per_factor)
+        self.delay_scans = (len(self.taps) - 1) // 2
+
+        self.allocations = 0
+        self._history_len = len(self.taps) - 1
+        self._allocate(max(1, int(max_scans)))
+        self._position = 0  # Scans since the filter (re)started
+        self._last_ns: int | None = None  # Time of the last output sample
+        self._out_index = 0  # Index of the next output sample
+
+    def _allocate(self, max_scans: int) -> None:
+        history = getattr(self, "_buffer", None)
+        self._max_scans = max_scans
+        self._buffer = np.empty((self._history_len + max_scans, self.n_channels))
+        if history is not None:
+            self._buffer[: self._history_len] = history[: self._history_len]
+        self._out = np.empty((max_scans // self.factor + 1, self.n_channels))
+
+    def reset(self) -> None:
+        """Restart the filter, e.g. after a gap."""
+        self._position = 0
+
+    def process(self, readings: np.ndarray, t0_ns: int, scan_rate: float):
+        """Filter one batch and return its decimated samples.
+
+        Returns ``(scan_index0, t0_ns, readings, gap_scans)`` in the
+        decimated series, like the batch callback arguments, with
+        ``readings`` a view valid until the next call (possibly empty).
+        ``gap_scans`` counts the decimated samples missing before this batch.
+        """
+        n_scans = len(readings)
+        if n_scans > self._max_scans:
+            self._allocate(n_scans)
+            self.allocations += 1
+        history = self._history_len
+        if self._position == 0 and n_scans:
+            self._buffer[:history] = readings[0]
+        self._buffer[history : history + n_scans] = readings
+
+        # Outputs are centred on scans (since the restart) that are a multiple
+        # of the factor; the one centred on scan c needs scans up to c + delay.
+        first = max(0, -(-(self._position - self.delay_scans) // self.factor))
+        offset = first * self.factor + self.delay_scans - self._position
+        n_out = len(range(offset, n_scans, self.factor))
+        out = self._out[:n_out]
+        if n_out:
+            windows = np.lib.stride_tricks.sliding_window_view(
+                self._buffer[: history + n_scans], len(self.taps), axis=0
+            )
+            np.matmul(windows[offset :: self.factor], self.taps, out=out)
+
+        centre0 = first * self.factor - self._position  # Relative to readings[0]
+        out_t0_ns = t0_ns + round(centre0 * 1e9 / scan_rate)
+        gap_scans = 0
+        if n_out and self._last_ns is not None:
+            period_ns = self.factor * 1e9 / scan_rate
+            gap_scans = max(0, round((out_t0_ns - self._last_ns) / period_ns) - 1)
+        scan_index0 = self._out_index + gap_scans
+        if n_out:
+            self._last_ns = out_t0_ns + round(
+                (n_out - 1) * self.factor * 1e9 / scan_rate
+            )
+            self._out_index = scan_index0 + n_out
+
+        # Keep the last scans as the history of the next batch.
+        self._buffer[:history] = self._buffer[n_scans : n_scans + history]
+        self._position += n_scans
+        return scan_index0, out_t0_ns, out, gap_scans
+
+
+class RateSplit:
+    """Split the batches of one T7 into a full-rate and decimated series.
+
+    Parameters
+    ----------
+    channel_names : list[str]
+        Columns of the logger's batches.
+    decimation : list[int]
+        Decimation factor per column; 1 keeps the column at the full rate.
+    max_scans : int
+        Largest batch expected.
+
+    :meth:`split` returns one batch per rate: the full-rate columns (if
+    any) with factor 1, then one per decimation factor, each with its
+    channel names and the batch callback arguments of its own series.
+    """
+
+    def __init__(self, channel_names: list[str], decimation: list[int], max_scans: int):
+        if len(decimation) != len(channel_names):
+            raise ValueError("Need one decimation factor per column.")
+        self.max_scans = max(1, int(max_scans))
+        self.groups: dict[int, list[int]] = {}
+        for column, factor in enumerate(decimation):
+            self.groups.setdefault(int(factor), []).append(column)
+        self.groups = dict(sorted(self.groups.items()))
+        self.channel_names = {
+            factor: [channel_names[column] for column in columns]
+            for factor, columns in self.groups.items()
+        }
+        self.decimators = {
+            factor: Decimator(factor, len(columns), self.max_scans)
+            for factor, columns in self.groups.items()
+            if factor > 1
+        }
+        self._columns = {
+            factor: np.array(columns, dtype=np.intp)
+            for factor, columns in self.groups.items()
+        }
+        self._allocate(self.max_scans)
+        self._next_index = 0
+
+    def _allocate(self, max_scans: int) -> None:
+        self.max_scans = max_scans
+        self._buffers = {
+            factor: np.empty((max_scans, len(columns)))
+            for factor, columns in self.groups.items()
+        }
+
+    def split(self, scan_index0, t0_ns, scan_rate, readings, gap_scans) -> list[tuple]:
+        """Return ``[(factor, batch kwargs), ...]`` for one logger batch.
+
+        The kwargs hold ``scan_index0``, ``t0_ns``, ``scan_rate``,
+        ``readings`` (a view valid until the next call), ``channel_names``
+        and ``gap_scans``. A decimated series without a sample in this batch
+        is left out.
+        """
+        n_scans = len(readings)
+        if n_scans > self.max_scans:
+            self._allocate(n_scans)
+        if gap_scans or scan_index0 < self._next_index:
+            # A gap or a restarted stream: do not filter across it.
+            for decimator in self.decimators.values():
+                decimator.reset()
+        self._next_index = scan_index0 + n_scans
+
+        batches = []
+        for factor, columns in self._columns.items():
+            data = self._buffers[factor][:n_scans]
+            np.take(readings, columns, axis=1, out=data)
+            if factor == 1:
+                batch = (scan_index0, t0_ns, data, gap_scans)
+            else:
+                batch = self.decimators[factor].process(data, t0_ns, scan_rate)
+                if not len(batch[2]):
+                    continue
+            batches.append(
+                (
+                    factor,
+                    {
+                        "scan_index0": batch[0],
+                        "t0_ns": batch[1],
+                        "scan_rate": scan_rate / factor,
+                        "readings": batch[2],
+                        "channel_names": self.channel_names[factor],
+                        "gap_scans": batch[3],
+                    },
+                )
+            )
+        return batches
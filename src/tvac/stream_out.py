@@ -0,0 +1,270 @@
+"""Drive the T7 DACs from the stream clock with stream-out buffers.
+
+For low-voltage characterisation runs the T7 can output a reference
+excitation itself. A ``STREAM_OUT#`` entry in the scan list writes the next
+value of its buffer to a DAC on every scan, on the same device clock as the
+analog inputs, so stimulus and response are sample-locked: there is no AWG
+or GPIO trigger whose alignment could be off.
+
+:class:`StreamOut` holds the values for one DAC.
+:class:`tvac.labjack_t7.LabJackT7Logger` configures and primes its buffer
+before the stream starts and tops it up from the stream callback, after
+every read. The number of scans the device has acquired (read position plus
+backlogs, as for the stream clock) is the number of values it has used, so
+no buffer status register has to be read. A repeating excitation that fits
+the buffer (e.g. one period of a piezo voltage profile) is looped by the
+device itself and needs no refills at all.
+
+The T7 DACs output 0-5 V. :meth:`StreamOut.from_profile` resamples one
+period of a piezo voltage profile (see
+:func:`tvac.directives.load_piezo_voltage_profile`) to the scan rate and
+scales it into that range.
+"""
+
+import numpy as np
+
+STREAM_OUT_TARGETS = ("DAC0", "DAC1")
+"""Outputs a stream-out can drive."""
+
+MAX_STREAM_OUTS = 4
+"""Stream-outs the T7 has (``STREAM_OUT0`` to ``STREAM_OUT3``)."""
+
+DAC_RANGE = (0.0, 5.0)
+"""Output range of the T7 DACs [V]."""
+
+MIN_BUFFER_BYTES = 32
+MAX_BUFFER_BYTES = 16384
+"""Limits of ``STREAM_OUT#_BUFFER_SIZE``, which must be a power of 2. The
+buffer holds 2 bytes per value."""
+
+REFILL_READS = 8
+"""Reads' worth of values the buffer of a refilled stream-out is sized for."""
+
+
+def _buffer_bytes(n_values: int) -> int:
+    """Smallest valid buffer size [bytes] that holds ``n_values`` values."""
+    size = MIN_BUFFER_BYTES
+    while size < 2 * n_values and size < MAX_BUFFER_BYTES:
+        size *= 2
+    return size
+
+
+class StreamOut:
+    """Values streamed to one T7 DAC, one per scan.
+
+    Parameters
+    ----------
+    target : str
+        DAC to drive, one of :data:`STREAM_OUT_TARGETS`.
+    values : np.ndarray
+        Output voltages [V], one per scan, within :data:`DAC_RANGE`.
+    repeat : bool
+        Start over after the last value, for a periodic excitation.
+        Otherwise the last value is held once the values run out.
+
+    Notes
+    -----
+    The logger assigns :attr:`index` (the ``STREAM_OUT#`` number). The value
+    the DAC outputs at scan ``k`` of the stream is ``values[k % len(values)]``
+    with ``repeat`` and ``values[min(k, len(values) - 1)]`` without, which
+    :meth:`fill` reproduces for the stimulus columns of a batch. An underrun
+    (the host not refilling in time) breaks that relation until the next
+    refill resynchronises it; :attr:`underruns` counts them.
+    """
+
+    def __init__(self, target: str, values, repeat: bool = True):
+        self.target = str(target).upper()
+        if self.target not in STREAM_OUT_TARGETS:
+            raise ValueError(
+                f"Stream-out target {target!r} is not one of "
+                f"{', '.join(STREAM_OUT_TARGETS)}."
+            )
+        self.values = np.ascontiguousarray(values, dtype=np.float64).ravel()
+        if not len(self.values):
+            raise ValueError(f"Stream-out to {self.target} has no values.")
+        low, high = DAC_RANGE
+        if self.values.min() < low or self.values.max() > high:
+            raise ValueError(
+                f"Stream-out to {self.target} spans {self.values.min():.3g} to "
+                f"{self.values.max():.3g} V, outside the {low:g}-{high:g} V DAC "
+                "range; scale or offset the values."
+            )
+        self.repeat = bool(repeat)
+        self.index = 0
+
+        self.buffer_values = 0
+        self.looping = False
+        self.refills = 0
+        self.underruns = 0
+        self._fill_target = 0
+        self._written = 0  # Values written since the stream started
+        self._done = False
+        self._offsets = np.empty(0, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def from_profile(
+        cls,
+        profile: dict,
+        key: str,
+        scan_rate: float,
+        target: str = "DAC0",
+        scale: float = 1.0,
+        offset: float = 0.0,
+        repeat: bool = True,
+    ) -> "StreamOut":
+        """Return a stream-out playing one channel of a piezo voltage profile.
+
+        Args:
+            profile (dict): Profile with the ``frequency`` [Hz] at which it
+                repeats and one period per voltage key, as returned by
+                :func:`tvac.directives.load_piezo_voltage_profile` or found
+                under ``piezo_tests.profiles`` in the setup.
+            key (str): Voltage key to play, e.g. ``"V1_V"``.
+            scan_rate (float): Scan rate of the stream [Hz].
+            target (str): DAC to drive.
+            scale (float): Factor applied to the profile voltages.
+            offset (float): Voltage added after scaling [V].
+            repeat (bool): Play the period over and over.
+
+        The period is resampled to a whole number of scans, so the played
+        frequency is ``scan_rate`` divided by that number.
+        """
+        signal = np.ravel(np.asarray(profile[key], dtype=np.float64))
+        frequency = float(profile["frequency"])
+        n_scans = max(2, round(scan_rate / frequency))
+        if abs(scan_rate / n_scans - frequency) > 1e-3 * frequency:
+            print(
+                f"Profile {key} plays at {scan_rate / n_scans:.4g} Hz instead of "
+                f"{frequency:.4g} Hz ({n_scans} scans per period at {scan_rate:g} Hz)."
+            )
+        phase = np.arange(n_scans) / n_scans
+        values = np.interp(
+            phase, np.arange(len(signal)) / len(signal), signal, period=1
+        )
+        return cls(target, values * scale + offset, repeat=repeat)
+
+    @property
+    def name(self) -> str:
+        """Scan-list name of this stream-out (``STREAM_OUT#``)."""
+        return f"STREAM_OUT{self.index}"
+
+    def configure(self, ljm, handle, scans_per_read: int) -> None:
+        """Set up and prime the buffer for a stream that is about to start.
+
+        Must be called before ``eStreamStart``, with the stream stopped.
+        """
+        n_values = len(self.values)
+        self.looping = self.repeat and n_values < MAX_BUFFER_BYTES // 2
+        if self.looping:
+            # The whole period fits: the device loops it without refills.
+            buffer_bytes = _buffer_bytes(n_values + 1)
+        else:
+            buffer_bytes = _buffer_bytes(REFILL_READS * scans_per_read)
+        self.buffer_values = buffer_bytes // 2
+        # Stay clear of a full buffer, which the device would reject.
+        self._fill_target = self.buffer_values * 3 // 4
+        if not self.looping and 2 * scans_per_read > self._fill_target:
+            print(
+                f"Warning: reads of {scans_per_read} scans are too large for the "
+                f"{self.target} stream-out buffer; expect underruns."
+            )
+
+        address = ljm.namesToAddresses(1, [self.target])[0][0]
+        names = [
+            f"{self.name}_ENABLE",
+            f"{self.name}_TARGET",
+            f"{self.name}_BUFFER_SIZE",
+            f"{self.name}_ENABLE",
+            f"{self.name}_LOOP_NUM_VALUES",
+        ]
+        values = [0, address, buffer_bytes, 1, n_values if self.looping else 0]
+        ljm.eWriteNames(handle, len(names), names, values)
+
+        self._written = 0
+        self._done = False
+        self.refills = 0
+        self.underruns = 0
+        if self.looping:
+            self._write(ljm, handle, n_values)
+            ljm.eWriteName(handle, f"{self.name}_SET_LOOP", 1)
+        else:
+            self._write(ljm, handle, self._fill_target)
+
+    def refill(self, ljm, handle, acquired_scans: int) -> None:
+        """Top the buffer up after the device has acquired ``acquired_scans`` scans."""
+        if self.looping or self._done:
+            return
+        outstanding = self._written - acquired_scans
+        if outstanding < 0:
+            # The buffer ran dry. Continue with the values due now, so the
+            # scan-to-value relation holds again from here on.
+            self.underruns += 1
+            self._written = acquired_scans
+            outstanding = 0
+            if not self.repeat and self._written >= len(self.values):
+                # It ran dry past the end of a single play: only the last
+                # value is left to hold.
+                self._hold(ljm, handle, write_last=True)
+                return
+        free = self._fill_target - outstanding
+        if free > 0:
+            self._write(ljm, handle, free)
+            self.refills += 1
+
+    def _write(self, ljm, handle, n: int) -> None:
+        """Write the next ``n`` values (fewer at the end of a single play)."""
+        n_values = len(self.values)
+        name = f"{self.name}_BUFFER_F32"
+        while n > 0 and not self._done:
+            start = self._written % n_values if self.repeat else self._written
+            count = max(0, min(n, n_values - start))
+            if count:
+                # Contiguous slices only; a wrap is a second write.
+                ljm.eWriteNameArray(
+                    handle, name, count, self.values[start : start + count]
+                )
+                self._written += count
+                n -= count
+            if not self.repeat and self._written >= n_values:
+                # Hold the last value once the buffer reaches it.
+                self._hold(ljm, handle, write_last=not count)
+
+    def _hold(self, ljm, handle, write_last: bool = False) -> None:
+        """Loop the last value written, ending a single play.
+
+        With ``write_last`` the last value is written again first, for a
+        buffer that ran dry before it got there.
+        """
+        if write_last:
+            ljm.eWriteNameArray(handle, f"{self.name}_BUFFER_F32", 1, self.values[-1:])
+        ljm.eWriteNames(
+            handle,
+            2,
+            [f"{self.name}_LOOP_NUM_VALUES", f"{self.name}_SET_LOOP"],
+            [1, 1],
+        )
+        self._done = True
+
+    def fill(self, scan_index0: int, out: np.ndarray) -> None:
+        """Write the values output at scans ``scan_index0...`` into ``out``."""
+        n = len(out)
+        if len(self._indices) < n:
+            self._offsets = np.arange(n, dtype=np.int64)
+            self._indices = np.empty(n, dtype=np.int64)
+        indices = self._indices[:n]
+        np.add(self._offsets[:n], scan_index0, out=indices)
+        np.take(self.values, indices, out=out, mode="wrap" if self.repeat else "clip")
+
+    def stats(self) -> dict:
+        """Return the buffer size, the values written and the refills and underruns."""
+        return {
+            "target": self.target,
+            "values": len(self.values),
+            "repeat": self.repeat,
+            "looping": self.looping,
+            "buffer_values": self.buffer_values,
+            "written": self._written,
+            "refills": self.refills,
+            "underruns": self.underruns,
+        }
@@ -0,0 +1,256 @@
+"""Plan LabJack T7 stream rates from the channel set, range and resolution.
+
+The T7 samples the addresses of a scan list one after the other, so the
+fastest scan rate it can sustain is set by the time every sample of one scan
+takes. That time depends on:
+
+1. the stream resolution index (``STREAM_RESOLUTION_INDEX``): higher indices
+   oversample each conversion, which lowers noise and the sample rate,
+2. the analog input range: the ±0.1 V and ±0.01 V ranges use the high-gain
+   amplifier, which needs extra settling time after the multiplexer switches
+   (``STREAM_SETTLING_US`` = 0 selects this automatically), and
+3. the number of addresses in the scan list, including non-analog entries
+   such as the ``CORE_TIMER`` channels of hardware timestamps.
+
+Asking for more than that makes the device report ``STREAM_SCAN_OVERLAP``
+or fall behind, which used to show up only as a growing backlog.
+:func:`plan_stream` turns the tables below into a :class:`StreamPlan` with
+the maximum scan rate and the expected noise of every channel, and
+:func:`resolve_scan_rate` clamps or rejects a requested rate before
+``eStreamStart``.
+
+The tables follow the T7 datasheet (appendix A-1, stream data rates, and
+appendix A-3, noise and resolution), rounded. They are meant for planning a
+session, not as an uncertainty budget.
+
+Note that the per-channel ``AIN#_RESOLUTION_INDEX`` only applies to
+command-response reads; in stream mode every channel uses the stream
+resolution index.
+"""
+
+T7_MAX_SAMPLE_RATE = 100_000.0
+"""Highest total stream sample rate of the T7 [samples/s], over all addresses."""
+
+STREAM_SAMPLE_RATES: dict[int, float] = {
+    1: 100_000.0,
+    2: 48_000.0,
+    3: 22_000.0,
+    4: 11_000.0,
+    5: 5_500.0,
+    6: 2_500.0,
+    7: 1_200.0,
+    8: 600.0,
+}
+"""Highest stream sample rate [samples/s] per stream resolution index on the
+±10 V and ±1 V ranges. Index 0 selects the default, index 1."""
+
+AUTO_SETTLING_US: dict[float, float] = {
+    10.0: 0.0,
+    1.0: 0.0,
+    0.1: 30.0,
+    0.01: 300.0,
+}
+"""Extra settling time [us] per sample with automatic settling, per range [V]."""
+
+EFFECTIVE_RESOLUTION_BITS: dict[int, float] = {
+    1: 16.0,
+    2: 16.5,
+    3: 17.0,
+    4: 17.5,
+    5: 17.9,
+    6: 18.3,
+    7: 18.8,
+    8: 19.1,
+}
+"""Effective (RMS) resolution [bits] on the ±10 V range per resolution index."""
+
+RANGE_RESOLUTION_LOSS_BITS: dict[float, float] = {
+    10.0: 0.0,
+    1.0: 1.0,
+    0.1: 3.0,
+    0.01: 5.5,
+}
+"""Effective resolution lost on the smaller ranges, where amplifier noise dominates."""
+
+RATE_LIMIT_POLICIES = ("clamp", "reject", "off")
+"""What to do with a scan rate above the planned maximum: lower it to the
+maximum, raise ``ValueError``, or start the stream anyway."""
+
+
+def _normalise_range(voltage_range: float) -> float:
+    """Return the T7 range (10, 1, 0.1 or 0.01 V) that ``voltage_range`` selects."""
+    for t7_range in sorted(AUTO_SETTLING_US):
+        if voltage_range <= t7_range * (1 + 1e-9):
+            return t7_range
+    raise ValueError(f"Voltage range {voltage_range} V exceeds the T7's ±10 V range.")
+
+
+def _resolution_index(stream_resolution_index: int) -> int:
+    index = int(stream_resolution_index) or 1
+    if index not in STREAM_SAMPLE_RATES:
+        raise ValueError(
+            f"Stream resolution index {stream_resolution_index} is not available in "
+            f"stream mode; the T7 streams with index 0-{max(STREAM_SAMPLE_RATES)}."
+        )
+    return index
+
+
+def noise_uv_rms(voltage_range: float, stream_resolution_index: int = 0) -> float:
+    """Return the expected RMS noise [uV] of one sample on ``voltage_range``."""
+    t7_range = _normalise_range(voltage_range)
+    bits = (
+        EFFECTIVE_RESOLUTION_BITS[_resolution_index(stream_resolution_index)]
+        - RANGE_RESOLUTION_LOSS_BITS[t7_range]
+    )
+    return 2 * t7_range / 2**bits * 1e6
+
+
+class StreamPlan:
+    """Timing and noise estimate for one T7 scan list.
+
+    Parameters
+    ----------
+    channel_names : list[str]
+        Analog channels of the scan list.
+    sample_times_us : list[float]
+        Time [us] each analog channel takes per scan.
+    noise_uv : list[float]
+        Expected RMS noise [uV] per analog channel.
+    extra_addresses : int
+        Non-analog entries in the scan list (e.g. ``CORE_TIMER``).
+    stream_resolution_index : int
+        Stream resolution index the plan was made for.
+    requested_scan_rate : float | None
+        Scan rate the plan was asked about, if any.
+    """
+
+    def __init__(
+        self,
+        channel_names: list[str],
+        sample_times_us: list[float],
+        noise_uv: list[float],
+        extra_addresses: int,
+        stream_resolution_index: int,
+        requested_scan_rate: float | None = None,
+    ):
+        self.channel_names = list(channel_names)
+        self.sample_times_us = list(sample_times_us)
+        self.noise_uv = list(noise_uv)
+        self.extra_addresses = int(extra_addresses)
+        self.stream_resolution_index = int(stream_resolution_index)
+        self.requested_scan_rate = requested_scan_rate
+
+        self.scan_time_us = sum(self.sample_times_us) + self.extra_addresses * (
+            1e6 / T7_MAX_SAMPLE_RATE
+        )
+        self.max_scan_rate = 1e6 / self.scan_time_us
+
+    @property
+    def feasible(self) -> bool:
+        """Whether the requested scan rate (if any) is within the maximum."""
+        return (
+            self.requested_scan_rate is None
+            or self.requested_scan_rate <= self.max_scan_rate
+        )
+
+    @property
+    def scan_rate(self) -> float:
+        """Requested scan rate clamped to the maximum (the maximum if none was given)."""
+        if self.requested_scan_rate is None:
+            return self.max_scan_rate
+        return min(self.requested_scan_rate, self.max_scan_rate)
+
+    def describe(self) -> str:
+        """Return a one-line summary for the status and settings output."""
+        noise = ", ".join(
+            f"{name} {noise:.2g} uV"
+            for name, noise in zip(self.channel_names, self.noise_uv)
+        )
+        return (
+            f"max {self.max_scan_rate:.1f} Hz "
+            f"(scan {self.scan_time_us:.0f} us, "
+            f"stream resolution index {self.stream_resolution_index}), "
+            f"noise: {noise}"
+        )
+
+
+def plan_stream(
+    voltage_ranges: list[float],
+    stream_resolution_index: int = 0,
+    settling_us: float = 0.0,
+    extra_addresses: int = 0,
+    scan_rate: float | None = None,
+    channel_names: list[str] | None = None,
+) -> StreamPlan:
+    """Return the :class:`StreamPlan` for a scan list.
+
+    Parameters
+    ----------
+    voltage_ranges : list[float]
+        Range [V] of every analog channel in the scan list (the positive
+        input for differential channels; the negative input is not sampled
+        separately).
+    stream_resolution_index : int
+        ``STREAM_RESOLUTION_INDEX``; 0 selects the default.
+    settling_us : float
+        ``STREAM_SETTLING_US``. Values below 1 select automatic settling.
+    extra_addresses : int
+        Non-analog scan-list entries, each taking one sample slot.
+    scan_rate : float | None
+        Scan rate to check against the maximum.
+    channel_names : list[str] | None
+        Labels for :meth:`StreamPlan.describe`; ``CH0``, ``CH1``, ... if omitted.
+    """
+    if not voltage_ranges:
+        raise ValueError("A stream needs at least one analog channel.")
+
+    index = _resolution_index(stream_resolution_index)
+    conversion_us = 1e6 / STREAM_SAMPLE_RATES[index]
+    sample_times_us = []
+    noise_uv = []
+    for voltage_range in voltage_ranges:
+        t7_range = _normalise_range(float(voltage_range))
+        settling = AUTO_SETTLING_US[t7_range] if settling_us < 1 else settling_us
+        sample_times_us.append(conversion_us + settling)
+        noise_uv.append(noise_uv_rms(t7_range, index))
+
+    if channel_names is None:
+        channel_names = [f"CH{i}" for i in range(len(voltage_ranges))]
+
+    return StreamPlan(
+        channel_names=channel_names,
+        sample_times_us=sample_times_us,
+        noise_uv=noise_uv,
+        extra_addresses=extra_addresses,
+        stream_resolution_index=index,
+        requested_scan_rate=scan_rate,
+    )
+
+
+def resolve_scan_rate(plan: StreamPlan, policy: str = "clamp") -> float:
+    """Return the scan rate to request from the T7 for ``plan``.
+
+    With ``"clamp"`` an unachievable rate is lowered to the maximum, with
+    ``"reject"`` it raises ``ValueError``, and with ``"off"`` it is returned
+    unchanged.
+    """
+    if policy not in RATE_LIMIT_POLICIES:
+        raise ValueError(
+            f"Unknown rate limit policy {policy!r}; "
+            f"expected one of {', '.join(RATE_LIMIT_POLICIES)}"
+        )
+    if plan.requested_scan_rate is None:
+        return plan.max_scan_rate
+    if plan.feasible or policy == "off":
+        return plan.requested_scan_rate
+
+    message = (
+        f"Scan rate {plan.requested_scan_rate:.1f} Hz is above the "
+        f"{plan.max_scan_rate:.1f} Hz the T7 sustains for "
+        f"{len(plan.channel_names)} channel(s) at stream resolution index "
+        f"{plan.stream_resolution_index}"
+    )
+    if policy == "reject":
+        raise ValueError(f"{message}.")
+    print(f"{message}; streaming at {plan.max_scan_rate:.1f} Hz instead.")
+    return plan.max_scan_rate
@@ -0,0 +1,232 @@
+"""Keep LabJack T7 streams running through USB disconnects and LJM errors.
+
+A T7 that drops off USB, or an ``eStreamRead`` that fails for any other
+reason than a stopped stream, ends the stream. Before the supervisor this
+went unnoticed until the next status check, so a glitch at night could cost
+the rest of the night's data.
+
+:class:`StreamSupervisor` watches one :class:`tvac.labjack_t7.LabJackT7Logger`
+(or :class:`tvac.labjack_t7.LabJackT7Poller`) from a watchdog thread:
+
+1. A stream error reported by the logger is a failure.
+2. Callbacks missing for more than ``stall_batches`` read periods flag a
+   stall. A stall that lasts ``stall_timeout_s`` (and at least those read
+   periods) is a failure too: the device may be gone without an error, e.g.
+   when its USB hub loses power. A triggered stream that is still waiting
+   for its trigger edge is not stalled.
+3. On failure the logger is reopened, reconfigured and restarted with
+   :meth:`~tvac.labjack_t7.LabJackT7Logger.reconnect`, retrying with
+   exponential backoff until it succeeds or the supervisor is stopped.
+
+The restarted stream feeds the same callback, so the session carries on. The
+first batch after a recovery reports the scans lost while the device was
+down as ``gap_scans``, which the sinks turn into their usual gap markers.
+"""
+
+import collections
+import threading
+import time
+
+
+class StreamSupervisor:
+    """Watch one T7 logger and restart its stream when it fails or stalls.
+
+    Parameters
+    ----------
+    logger : tvac.labjack_t7.LabJackT7Logger
+        Logger to supervise. Must not be streaming yet; :meth:`start` starts it.
+    stall_batches : float
+        Read periods without a callback after which a stall is flagged.
+    stall_timeout_s : float
+        Shortest stall that is treated as a failure [s].
+    initial_backoff_s : float
+        Wait after the first failed recovery attempt [s]; doubled after
+        every further failed attempt.
+    max_backoff_s : float
+        Longest wait between recovery attempts [s].
+    history : int
+        Number of recoveries kept for the recovery time statistics.
+    """
+
+    def __init__(
+        self,
+        logger,
+        stall_batches: float = 2.0,
+        stall_timeout_s: float = 2.0,
+        initial_backoff_s: float = 1.0,
+        max_backoff_s: float = 60.0,
+        history: int = 100,
+    ):
+        self.logger = logger
+        self.stall_batches = float(stall_batches)
+        self.stall_timeout_s = float(stall_timeout_s)
+        self.initial_backoff_s = float(initial_backoff_s)
+        self.max_backoff_s = max(self.initial_backoff_s, float(max_backoff_s))
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._failed = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._callback = None
+        self._started_at = 0.0
+        self._last_data = 0.0
+        self._stalled = False
+        self._recovering = False
+
+        self.stalls = 0
+        self.failures = 0
+        self.recoveries = 0
+        self.failed_attempts = 0
+        self.last_error: str | None = None
+        self._recovery_s = collections.deque(maxlen=history)
+        self._downtime_s = 0.0
+
+    def start(self, callback, batch: bool = True) -> None:
+        """Start the logger's stream with ``callback`` and the watchdog thread."""
+        self._callback = callback
+        self._started_at = self._last_data = time.monotonic()
+        self.logger.error_handler = self._on_error
+        self.logger.start_stream(self._on_data, batch=batch)
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch,
+            name=f"t7-watchdog-{self.logger.serial_number}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop watching, waiting for a recovery in progress to give up.
+
+        The logger's stream is left to its owner to stop and close.
+        """
+        self._stop.set()
+        self._failed.set()  # Wake the watchdog
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._thread = None
+        self.logger.error_handler = None
+
+    def _on_data(self, **kwargs) -> None:
+        self._last_data = time.monotonic()
+        self._callback(**kwargs)
+
+    def _on_error(self, error: Exception) -> None:
+        """Called by the logger, on its callback thread, when the stream failed."""
+        with self._lock:
+            self.last_error = str(error)
+        self._failed.set()
+
+    @property
+    def stall_threshold_s(self) -> float:
+        """Time without a callback after which a stall is flagged [s]."""
+        return self.stall_batches * self.logger.read_period_s
+
+    def _watch(self) -> None:
+        while not self._stop.is_set():
+            threshold_s = self.stall_threshold_s
+            self._failed.wait(min(0.25, max(0.01, threshold_s / 2)))
+            if self._stop.is_set():
+                return
+            if self.logger.trigger_state == "armed" and not self._failed.is_set():
+                # Waiting for the trigger edge is not a stall.
+                self._last_data = time.monotonic()
+                continue
+
+            silent_s = time.monotonic() - self._last_data
+            if silent_s <= threshold_s:
+                self._stalled = False
+            elif not self._stalled:
+                self._stalled = True
+                with self._lock:
+                    self.stalls += 1
+                    first = self.stalls == 1
+                if first:
+                    # Short stalls are common at small read sizes; count
+                    # them, but only announce the first one.
+                    print(
+                        f"[T7 {self.logger.serial_number}: no data for "
+                        f"{silent_s:.1f} s ({self.stall_batches:g} read periods); "
+                        "stalls are counted in the status]"
+                    )
+
+            failed = self._failed.is_set()
+            if failed or silent_s > max(threshold_s, self.stall_timeout_s):
+                if not failed:
+                    with self._lock:
+                        self.last_error = f"stalled for {silent_s:.1f} s"
+                self._recover(
+                    failed_at=time.monotonic() - (0.0 if failed else silent_s)
+                )
+
+    def _recover(self, failed_at: float) -> None:
+        serial_number = self.logger.serial_number
+        with self._lock:
+            self.failures += 1
+            reason = self.last_error
+        print(f"[T7 {serial_number}: stream failed ({reason}); recovering]")
+
+        self._recovering = True
+        try:
+            self._retry(failed_at)
+        finally:
+            self._recovering = False
+
+    def _retry(self, failed_at: float) -> None:
+        serial_number = self.logger.serial_number
+        backoff_s = self.initial_backoff_s
+        while not self._stop.is_set():
+            self._failed.clear()
+            try:
+                self.logger.reconnect()
+            except Exception as exc:
+                with self._lock:
+                    self.failed_attempts += 1
+                print(
+                    f"[T7 {serial_number}: recovery failed ({exc}); "
+                    f"retrying in {backoff_s:.0f} s]"
+                )
+                if self._stop.wait(backoff_s):
+                    return
+                backoff_s = min(2 * backoff_s, self.max_backoff_s)
+                continue
+
+            recovery_s = time.monotonic() - failed_at
+            self._last_data = time.monotonic()
+            self._stalled = False
+            with self._lock:
+                self.recoveries += 1
+                self._recovery_s.append(recovery_s)
+                self._downtime_s += recovery_s
+            print(f"[T7 {serial_number}: stream recovered after {recovery_s:.1f} s]")
+            return
+
+    def stats(self) -> dict:
+        """Return stall, failure and recovery counts and recovery times.
+
+        ``recovery_s`` is the time from the failure (or the last data before
+        a stall) to the restarted stream, ``downtime_s`` its total, and
+        ``recoveries_per_h`` the recovery frequency over the session.
+        """
+        with self._lock:
+            recovery_s = list(self._recovery_s)
+            stats = {
+                "stalls": self.stalls,
+                "failures": self.failures,
+                "recoveries": self.recoveries,
+                "failed_attempts": self.failed_attempts,
+                "last_error": self.last_error,
+                "downtime_s": self._downtime_s,
+            }
+        elapsed_h = (time.monotonic() - self._started_at) / 3600
+        stats["recoveries_per_h"] = (
+            stats["recoveries"] / elapsed_h if elapsed_h else 0.0
+        )
+        stats["recovering"] = self._recovering
+        if recovery_s:
+            stats["last_recovery_s"] = recovery_s[-1]
+            stats["mean_recovery_s"] = sum(recovery_s) / len(recovery_s)
+            stats["max_recovery_s"] = max(recovery_s)
+        return stats
@@ -0,0 +1,158 @@
+"""Acquisition profiles and adaptive read sizing for LabJack T7 streams.
+
+``scans_per_read`` sets how many scans LJM collects before it fires the
+stream callback, and therefore the latency of everything downstream (live
+plot, anomaly checks) as well as the per-read overhead on the host:
+
+- a small read size gives fresh data but many callbacks per second,
+- a large read size is cheap per sample but half a second or more stale.
+
+:data:`ACQUISITION_PROFILES` names the useful trade-offs as a target read
+period. :class:`ReadSizeController` watches the backlogs reported by
+``eStreamRead`` and the time spent handling each read, and suggests a larger
+read size when the host falls behind, or a smaller one (never below the
+profile target) once it has been comfortably keeping up. It runs on the
+stream callback path, so its window is kept in preallocated ring arrays and
+the backlog trend in running sums.
+"""
+
+import numpy as np
+
+ACQUISITION_PROFILES: dict[str, float] = {
+    "balanced": 0.5,
+    "low_latency": 0.02,
+    "bulk": 2.0,
+}
+"""Target time [s] covered by one ``eStreamRead``, per profile name."""
+
+DEFAULT_PROFILE = "balanced"
+
+
+def scans_per_read_for(profile: str, scan_rate: float) -> int:
+    """Return the read size that gives ``profile``'s read period at ``scan_rate``."""
+    try:
+        period_s = ACQUISITION_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown acquisition profile {profile!r}; "
+            f"expected one of {', '.join(ACQUISITION_PROFILES)}"
+        ) from None
+    return max(1, int(scan_rate * period_s))
+
+
+class ReadSizeController:
+    """Suggest a ``scans_per_read`` from observed backlog and processing time.
+
+    Parameters
+    ----------
+    scan_rate : float
+        Actual scan rate in Hz.
+    scans_per_read : int
+        Read size of the running stream.
+    target_scans : int
+        Smallest read size to suggest, normally the profile's read size.
+    max_scans : int
+        Largest read size to suggest.
+    device_capacity_scans : int
+        Scans the T7 stream buffer holds. A device backlog above half of it
+        risks a buffer overflow and calls for a restart with a larger read.
+    window : int
+        Number of reads the trends are computed over.
+    """
+
+    def __init__(
+        self,
+        scan_rate: float,
+        scans_per_read: int,
+        target_scans: int,
+        max_scans: int,
+        device_capacity_scans: int,
+        window: int = 20,
+    ):
+        self.scan_rate = float(scan_rate)
+        self.scans_per_read = int(scans_per_read)
+        self.target_scans = max(1, int(target_scans))
+        self.max_scans = max(self.target_scans, int(max_scans))
+        self.device_capacity_scans = max(1, int(device_capacity_scans))
+
+        # The last ``window`` reads, oldest at _head once the ring is full.
+        # _backlog_sum and _backlog_moment are the sums of the backlogs and of
+        # the backlogs times their age order (0 = oldest), for the trend.
+        self._window = max(2, int(window))
+        self._backlogs = np.zeros(self._window, dtype=np.int64)
+        self._busy_s = np.zeros(self._window, dtype=np.float64)
+        self._head = 0
+        self._filled = 0
+        self._backlog_sum = 0
+        self._backlog_moment = 0
+        self.reads = 0
+        self.busy_total_s = 0.0
+        self.busy_max_s = 0.0
+        self.suggestion = self.scans_per_read
+        self.needs_restart = False
+
+    @property
+    def read_period_s(self) -> float:
+        return self.scans_per_read / self.scan_rate
+
+    def observe(self, device_backlog: int, ljm_backlog: int, busy_s: float) -> None:
+        """Add one read: the backlogs it reported and the time spent handling it."""
+        self.reads += 1
+        backlog = max(0, device_backlog) + max(0, ljm_backlog)
+        if self._filled < self._window:
+            self._backlog_moment += self._filled * backlog
+            self._filled += 1
+        else:
+            # The oldest read leaves, every other read moves one place down.
+            oldest = int(self._backlogs[self._head])
+            self._backlog_moment += (
+                oldest - self._backlog_sum + (self._window - 1) * backlog
+            )
+            self._backlog_sum -= oldest
+        self._backlog_sum += backlog
+        self._backlogs[self._head] = backlog
+        self._busy_s[self._head] = busy_s
+        self._head = (self._head + 1) % self._window
+        self.busy_total_s += busy_s
+        self.busy_max_s = max(self.busy_max_s, busy_s)
+
+        if device_backlog > self.device_capacity_scans // 2:
+            self.needs_restart = self.scans_per_read < self.max_scans
+            self.suggestion = min(self.max_scans, 2 * self.scans_per_read)
+            return
+
+        if self._filled < self._window:
+            return
+
+        busy_ratio = float(self._busy_s.mean()) / self.read_period_s
+        # Sign of the least-squares slope of backlog against read order,
+        # sum((x - mean(x)) * backlog), in exact integer arithmetic.
+        growing = (
+            2 * self._backlog_moment > (self._window - 1) * self._backlog_sum
+            and backlog > self.scans_per_read
+        )
+
+        if growing or busy_ratio > 0.5:
+            self.suggestion = min(self.max_scans, 2 * self.scans_per_read)
+        elif (
+            self._backlogs.max() <= self.scans_per_read
+            and busy_ratio < 0.1
+            and self.scans_per_read > self.target_scans
+        ):
+            self.suggestion = max(self.target_scans, self.scans_per_read // 2)
+        else:
+            self.suggestion = self.scans_per_read
+
+    def stats(self) -> dict:
+        n = self._filled
+        busy = float(self._busy_s[:n].mean()) if n else 0.0
+        return {
+            "scans_per_read": self.scans_per_read,
+            "suggested_scans_per_read": self.suggestion,
+            "mean_backlog_scans": self._backlog_sum / n if n else 0.0,
+            "busy_ratio": busy / self.read_period_s,
+            "needs_restart": self.needs_restart,
+            # Over all reads, for benchmarks; the fields above cover the window.
+            "mean_busy_ms": self.busy_total_s / self.reads * 1e3 if self.reads else 0.0,
+            "max_busy_ms": self.busy_max_s * 1e3,
+        }
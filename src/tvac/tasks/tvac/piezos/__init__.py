@@ -1,7 +1,11 @@
+import math
 from typing import List
 
 from egse.setup import load_setup, Setup
 from tvac.runtime_config import is_amplifier_excluded
+from tvac.strain_gauge import get_sg_effective_settings
+from tvac.stream_clock import CORE_TIMER_CHANNELS
+from tvac.stream_planner import plan_stream
 
 UI_TAB_DISPLAY_NAME = "Piezo Actuators"
 
@@ -126,7 +130,25 @@ def sine_sweep_sg_resolution_index() -> float:
 
 
 def sine_sweep_sg_scan_rate() -> float:
-    return _sine_sweep_labjack_logging_param("scan_rate")
+    """Scan rate from the setup, lowered to what the T7 sustains for one strain gauge."""
+
+    setup = load_setup()
+    labjack_logging = setup.gse.wave_generators.piezo_tests.sine_sweep.labjack_logging
+    scan_rate = float(labjack_logging.scan_rate)
+    hardware_timestamps = get_sg_effective_settings(setup=setup)["stream"][
+        "hardware_timestamps"
+    ]
+    plan = plan_stream(
+        [float(labjack_logging.voltage_range)],
+        stream_resolution_index=int(
+            getattr(labjack_logging, "stream_resolution_index", 0)
+        ),
+        extra_addresses=len(CORE_TIMER_CHANNELS) if hardware_timestamps else 0,
+        scan_rate=scan_rate,
+    )
+    if plan.feasible:
+        return scan_rate
+    return math.floor(plan.max_scan_rate * 10) / 10
 
 
 def _ramp_param(param: str) -> float:
@@ -50,6 +50,8 @@ def sine_sweep(
     scan_rate: Callback(
         sine_sweep_sg_scan_rate, name="Scan rate for strain gauge [Hz]"
     ) = None,
+    burst: bool = False,
+    decimate_others: int = 10,
 ):
     """Performs a single sine sweep of the given piezo actuator, while keeping the others at a fixed voltage.
 
@@ -74,6 +76,9 @@ def sine_sweep(
         fixed_voltage (float): Fixed voltage for the other piezo actuators.
         strain_gauge (StrainGauge): Strain gauge to monitor.
         scan_rate (float): Scan rate for the monitored strain gauge [Hz].
+        burst (bool): Capture the strain gauge straight to a binary file instead of logging it continuously.
+        decimate_others (int): Log the other strain gauges at the scan rate divided by this factor (1: not at all).
+                               The sweeps from this task opt in with a factor of 10.
     """
 
     start_observation(
@@ -92,6 +97,8 @@ def sine_sweep(
             strain_gauge=strain_gauge,
             scan_rate=float(scan_rate),
             setup=load_setup(),
+            burst=bool(burst),
+            decimate_others=int(decimate_others),
         )
     except Exception as e:
         print(f"Failed to execute sine sweep for piezo actuator {piezo}: {e}")
@@ -1,8 +1,17 @@
+import math
 from typing import List
 
 from egse.setup import load_setup
 
-from tvac.strain_gauge import get_sg_effective_settings
+from tvac.strain_gauge import (
+    ACQUISITION_MODES,
+    get_sg_effective_settings,
+    get_sg_max_scan_rate,
+)
+from tvac.labjack_t7 import TRIGGER_EDGES
+from tvac.strain_gauge_pipeline import SinkPolicy
+from tvac.stream_planner import RATE_LIMIT_POLICIES
+from tvac.stream_tuning import ACQUISITION_PROFILES
 
 UI_TAB_DISPLAY_NAME = "Strain Gauges"
 
@@ -42,7 +51,18 @@ def resolution_indices() -> List[int]:
 
 
 def sg_scan_rate() -> float:
-    return float(get_sg_effective_settings()["stream"]["scan_rate"])
+    """Configured scan rate, lowered to what the T7 sustains for the enabled channels."""
+
+    scan_rate = float(get_sg_effective_settings()["stream"]["scan_rate"])
+    try:
+        max_scan_rate = get_sg_max_scan_rate()
+    except ValueError:
+        return scan_rate
+    if max_scan_rate is None:
+        return scan_rate
+    if scan_rate <= max_scan_rate:
+        return scan_rate
+    return math.floor(max_scan_rate * 10) / 10
 
 
 def sg_resync_interval_s() -> int:
@@ -53,6 +73,87 @@ def sg_buffer_size() -> int:
     return int(get_sg_effective_settings()["stream"]["buffer_size"])
 
 
+def sg_ring_capacity() -> int:
+    return int(get_sg_effective_settings()["stream"]["ring_capacity"])
+
+
+def sg_record_raw() -> bool:
+    return bool(get_sg_effective_settings()["stream"]["record_raw"])
+
+
+def sg_hardware_timestamps() -> bool:
+    return bool(get_sg_effective_settings()["stream"]["hardware_timestamps"])
+
+
+def sg_keep_timer_channel() -> bool:
+    return bool(get_sg_effective_settings()["stream"]["keep_timer_channel"])
+
+
+def acquisition_profiles() -> List[str]:
+    """List of acquisition profiles, current one first."""
+
+    current = get_sg_effective_settings()["stream"]["profile"]
+    return [current] + [name for name in ACQUISITION_PROFILES if name != current]
+
+
+def sg_adaptive_read_size() -> bool:
+    return bool(get_sg_effective_settings()["stream"]["adaptive_read_size"])
+
+
+def sg_verify_config() -> bool:
+    return bool(get_sg_effective_settings()["stream"]["verify_config"])
+
+
+def sg_auto_recover() -> bool:
+    return bool(get_sg_effective_settings()["stream"]["auto_recover"])
+
+
+def sg_marker_line() -> str:
+    return str(get_sg_effective_settings()["stream"]["marker_line"])
+
+
+def sg_trigger_line() -> str:
+    return str(get_sg_effective_settings()["stream"]["trigger_line"])
+
+
+def trigger_edges() -> List[str]:
+    """List of trigger edges, current one first."""
+
+    current = get_sg_effective_settings()["stream"]["trigger_edge"]
+    return [current] + [name for name in TRIGGER_EDGES if name != current]
+
+
+def rate_limit_policies() -> List[str]:
+    """List of policies for scan rates the T7 cannot sustain, current one first."""
+
+    current = get_sg_effective_settings()["stream"]["rate_limit"]
+    return [current] + [name for name in RATE_LIMIT_POLICIES if name != current]
+
+
+def acquisition_modes() -> List[str]:
+    """List of acquisition modes (stream or poll), current one first."""
+
+    current = get_sg_effective_settings()["stream"]["mode"]
+    return [current] + [name for name in ACQUISITION_MODES if name != current]
+
+
+def sg_poll_rate() -> float:
+    return float(get_sg_effective_settings()["stream"]["poll_rate"])
+
+
+def sg_poll_oversampling() -> int:
+    return int(get_sg_effective_settings()["stream"]["poll_oversampling"])
+
+
+# Sink callbacks
+
+
+def sink_policies() -> List[str]:
+    """List of policies for sinks that fall behind the acquisition."""
+
+    return [policy.value for policy in SinkPolicy]
+
+
 # CSV callbacks
 
 
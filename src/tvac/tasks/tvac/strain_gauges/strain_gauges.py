@@ -1,34 +1,54 @@
 from pathlib import Path
 
 from PyQt5.QtWidgets import QCheckBox, QComboBox, QHBoxLayout
+from egse.observation import end_observation, start_observation
 from egse.setup import load_setup
 from gui_executor.exec import exec_ui
 from gui_executor.utypes import Callback, TypeObject, UQWidget
 
 from tvac.strain_gauge import (
+    characterise_sg_resolution,
+    close_sg_device,
     get_cached_sg_channel_settings,
     get_sg_effective_settings,
     get_sg_settings,
     get_sg_status,
     reset_sg_runtime_settings,
+    set_sg_acquisition_mode,
     set_sg_channel_runtime_settings,
     set_sg_runtime_settings,
     start_sg_logging,
     stop_sg_logging,
 )
 from tvac.tasks.tvac.strain_gauges import (
+    acquisition_modes,
+    acquisition_profiles,
+    rate_limit_policies,
+    sg_adaptive_read_size,
+    sg_auto_recover,
     sg_buffer_size,
     sg_csv_base_filename,
     sg_csv_enabled,
     sg_csv_max_file_size_bytes,
     sg_csv_save_path,
+    sg_hardware_timestamps,
+    sg_keep_timer_channel,
+    sg_marker_line,
     sg_plot_enabled,
     sg_plot_interval_ms,
     sg_plot_show_stats,
     sg_plot_window_seconds,
+    sg_poll_oversampling,
+    sg_poll_rate,
+    sg_record_raw,
     sg_resync_interval_s,
+    sg_ring_capacity,
     sg_scan_rate,
+    sg_trigger_line,
+    sg_verify_config,
+    sink_policies,
     strain_gauges,
+    trigger_edges,
     voltage_ranges,
     resolution_indices,
 )
@@ -161,6 +181,7 @@ def configure_sg_channels(
         voltage_ranges, name="Negative voltage range [V]"
     ) = None,
     resolution_index: Callback(resolution_indices, name="Resolution index") = None,
+    decimation: int = 1,
 ) -> None:
     setup = load_setup()
     sg_setup = setup.gse.labjack_t7.channels[sg_name]
@@ -172,6 +193,7 @@ def configure_sg_channels(
         voltage_range=pos_voltage_range,
         neg_voltage_range=neg_voltage_range,
         resolution_index=resolution_index,
+        decimation=decimation,
         setup=setup,
     )
     print(f"Runtime channel settings updated for {sg_name}.")
@@ -183,9 +205,26 @@ def configure_sg_channels(
 def configure_stream(
     scan_rate: Callback(sg_scan_rate, name="Scan rate [Hz]") = None,
     resync_interval_s: Callback(
-        sg_resync_interval_s, name="Resync interval [s]"
+        sg_resync_interval_s, name="Clock fit window [s]"
     ) = None,
     buffer_size: Callback(sg_buffer_size, name="Buffer size") = None,
+    record_raw: Callback(sg_record_raw, name="Record raw stream reads") = None,
+    hardware_timestamps: Callback(
+        sg_hardware_timestamps, name="CORE_TIMER timestamps"
+    ) = None,
+    keep_timer_channel: Callback(
+        sg_keep_timer_channel, name="Write CORE_TIMER to CSV"
+    ) = None,
+    profile: Callback(acquisition_profiles, name="Acquisition profile") = None,
+    adaptive_read_size: Callback(
+        sg_adaptive_read_size, name="Adapt read size to backlog"
+    ) = None,
+    verify_config: Callback(sg_verify_config, name="Verify T7 configuration") = None,
+    rate_limit: Callback(rate_limit_policies, name="Unachievable scan rate") = None,
+    auto_recover: Callback(sg_auto_recover, name="Restart failed T7 streams") = None,
+    marker_line: Callback(sg_marker_line, name="Marker DIO line (e.g. FIO4)") = None,
+    trigger_line: Callback(sg_trigger_line, name="Start on trigger (FIO0/FIO1)") = None,
+    trigger_edge: Callback(trigger_edges, name="Trigger edge") = None,
 ) -> None:
     """Set runtime stream settings (applied on next Start logging)."""
     try:
@@ -193,6 +232,17 @@ def configure_stream(
             scan_rate=float(scan_rate),
             resync_interval_s=int(resync_interval_s),
             buffer_size=int(buffer_size),
+            record_raw=bool(record_raw),
+            hardware_timestamps=bool(hardware_timestamps),
+            keep_timer_channel=bool(keep_timer_channel),
+            profile=profile,
+            adaptive_read_size=bool(adaptive_read_size),
+            verify_config=bool(verify_config),
+            rate_limit=rate_limit,
+            auto_recover=bool(auto_recover),
+            marker_line=str(marker_line),
+            trigger_line=str(trigger_line),
+            trigger_edge=trigger_edge,
         )
         print("Stream runtime settings updated.")
         print(get_sg_settings())
@@ -200,6 +250,29 @@ def configure_stream(
         print(f"Failed to configure stream settings: {e}")
 
 
+# noinspection PyTypeHints
+@exec_ui(display_name="Acquisition mode", use_kernel=True)
+def configure_acquisition_mode(
+    mode: Callback(acquisition_modes, name="Mode") = None,
+    poll_rate: Callback(sg_poll_rate, name="Poll rate [Hz]") = None,
+    poll_oversampling: Callback(
+        sg_poll_oversampling, name="Reads averaged per sample"
+    ) = None,
+) -> None:
+    """Switch between streaming and polling (a running session is restarted)."""
+    try:
+        set_sg_acquisition_mode(
+            mode=mode,
+            poll_rate=float(poll_rate),
+            poll_oversampling=int(poll_oversampling),
+            setup=load_setup(),
+        )
+        print("Acquisition mode updated.")
+        print(get_sg_settings())
+    except Exception as e:
+        print(f"Failed to switch the acquisition mode: {e}")
+
+
 # noinspection PyTypeHints
 @exec_ui(display_name="Configure CSV", use_kernel=True)
 def configure_csv(
@@ -224,6 +297,28 @@ def configure_csv(
         print(f"Failed to configure CSV settings: {e}")
 
 
+# noinspection PyTypeHints
+@exec_ui(display_name="Configure sinks", use_kernel=True)
+def configure_sinks(
+    ring_capacity: Callback(sg_ring_capacity, name="Ring capacity [batches]") = None,
+    csv_policy: Callback(sink_policies, name="CSV policy when behind") = None,
+    metrics_policy: Callback(sink_policies, name="Metrics policy when behind") = None,
+    plot_policy: Callback(sink_policies, name="Plot policy when behind") = None,
+) -> None:
+    """Set the sink ring size and slow-sink policies (applied on next Start logging)."""
+    try:
+        set_sg_runtime_settings(
+            ring_capacity=int(ring_capacity),
+            csv_policy=csv_policy,
+            metrics_policy=metrics_policy,
+            plot_policy=plot_policy,
+        )
+        print("Sink runtime settings updated.")
+        print(get_sg_settings())
+    except Exception as e:
+        print(f"Failed to configure sink settings: {e}")
+
+
 @exec_ui(display_name="Configure metrics", use_kernel=True)
 def config_metrics(enabled: bool = True) -> None:
     """Enabled/disabled metrics collection.
@@ -289,6 +384,33 @@ def start_logging() -> None:
         print(f"Failed to start strain-gauge logging: {e}")
 
 
+# noinspection PyTypeHints
+@exec_ui(display_name="Characterise resolution", use_kernel=True)
+def characterise_resolution(
+    duration: float = 5.0,
+    noise_budget_uv: float = 10.0,
+    apply: bool = True,
+) -> None:
+    """Rank stream resolution indices and scan rates on the enabled channels.
+
+    Runs a short session per combination and, with ``apply``, keeps the
+    fastest one within the noise budget as runtime settings.
+    """
+    start_observation("Strain-gauge resolution characterisation")
+    try:
+        characterise_sg_resolution(
+            duration=float(duration),
+            noise_budget_uv=float(noise_budget_uv),
+            apply=bool(apply),
+            setup=load_setup(),
+        )
+        print(get_sg_settings())
+    except Exception as e:
+        print(f"Failed to characterise the strain-gauge resolution: {e}")
+
+    end_observation()
+
+
 @exec_ui(display_name="Stop logging", use_kernel=True)
 def stop_logging() -> None:
     """Stop the active strain-gauge logging session."""
@@ -298,6 +420,15 @@ def stop_logging() -> None:
         print(f"Failed to stop strain-gauge logging: {e}")
 
 
+@exec_ui(display_name="Close device", use_kernel=True)
+def close_device() -> None:
+    """Close the LabJack handle that is kept open between logging sessions."""
+    try:
+        close_sg_device()
+    except Exception as e:
+        print(f"Failed to close the LabJack device: {e}")
+
+
 @exec_ui(display_name="Status", use_kernel=True, immediate_run=True)
 def status() -> None:
     """Print the current strain-gauge logging status."""
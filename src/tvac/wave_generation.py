@@ -24,6 +24,10 @@ from tvac.strain_gauge import (
     enable_sg_logging,
     disable_sg_channels,
     enable_all_sg_logging,
+    get_sg_effective_settings,
+    record_sg_burst,
+    reset_sg,
+    wait_for_sg_trigger,
 )
 
 # noinspection PyTypeChecker
@@ -233,10 +237,11 @@ def load_voltage_profile(profile: str, setup: Setup = None) -> None:
                 f"Voltage profile {profile} for piezo actuator {config.name} has an amplitude of 0Vpp, which is not supported"
             )
 
-    # Interrupt ongoing logging (this incl. resetting to defaults from the setup) and re-start logging with the
-    # default configuration (except for the output folder and filenames: these should pertain to the obsid)
+    # Reset to the defaults from the setup and log with the default configuration (except for the output folder and
+    # filenames: these should pertain to the obsid).  A session that already streams with that configuration keeps
+    # streaming and only continues its files in the folder of this obsid.
 
-    disable_sg_logging(setup=setup)
+    reset_sg(setup=setup)
     enable_all_sg_logging(
         setup=setup,
         stream_resolution_index=_piezo_test_stream_resolution_index(
@@ -312,6 +317,8 @@ def load_voltage_profile(profile: str, setup: Setup = None) -> None:
     # noinspection PyUnresolvedReferences
     time.sleep(setup.gse.wave_generators.piezo_tests.trigger_delay)
     start_signal_trigger()
+    # SG streams armed on the same line start now
+    wait_for_sg_trigger(required=_sg_trigger_expected(setup))
 
     # This is the end of the building block and potentially of the observation
     #   - Since the observation stopped, it will be possible to start a new one (e.g. to command the heaters)
@@ -363,6 +370,15 @@ def extract_awg_config_from_setup(profile: str, setup: Setup = None):
     return v1_config, v2_config, v3_config, frequency
 
 
+def _sg_trigger_expected(setup: Setup) -> bool:
+    """Return whether the strain-gauge streams are set to start on the trigger edge.
+
+    The piezo tests then require the streams to be armed, so that scan 0 lines up with the start of the waveforms.
+    """
+    stream = get_sg_effective_settings(setup=setup)["stream"]
+    return bool(stream["trigger_line"]) and stream["mode"] == "stream"
+
+
 def _piezo_test_stream_resolution_index(test_setup) -> int:
     """Return the LabJack stream resolution index for one piezo test."""
     if isinstance(test_setup, dict):
@@ -387,6 +403,8 @@ def sine_sweep(
     strain_gauge: str = None,
     scan_rate: float = 7500.0,
     setup: Setup = None,
+    burst: bool = False,
+    decimate_others: int | None = None,
 ):
     """Performs a single sine sweep of the given piezo actuator, while keeping the others as a fixed voltage.
 
@@ -394,13 +412,19 @@ def sine_sweep(
 
         - Interrupt all logging from the LabJack, to ensure a clean logging of the requested strain gauge.
         - Configure + start logging of the requested strain gauge at the requested scan rate (all other configuration
-          parameters are taken from the setup).
+          parameters are taken from the setup).  With `decimate_others`, the other strain gauges are logged in the same
+          session at the scan rate divided by `decimate_others` (anti-alias filtered), as far as the LabJack can stream
+          them at that scan rate.
         - For the given piezo actuator, we configure (and switch on) a frequency sweep.  For the other piezo actuators,
           we configure a constant voltage.
         - Sleep for the requested duration of the sine sweep (we should only cover a single sine sweep).
         - Stop the wave generation.
         - Stop the logging of the requested strain gauge (disable + reset its parameters).
 
+    In burst mode, the strain gauge is not logged continuously (CSV, metrics, plot).  Instead, once the sweep runs,
+    a record of twice the sweep time is captured straight into memory and written to a single binary file at the end
+    (see `record_sg_burst`).  This allows scan rates close to the maximum of the LabJack T7.
+
     Args:
         piezo: Name of the piezo actuator for which to configure a frequency sweep.
         amplitude (float): Amplitude for the frequency sweep [Vpp].
@@ -412,6 +436,9 @@ def sine_sweep(
         strain_gauge (StrainGauge): Strain gauge to monitor.
         scan_rate (float): Scan rate for the monitored strain gauge [Hz].
         setup (Setup): Setup used for the setup phase of the wave generation.
+        burst (bool): Whether to capture the strain gauge in burst mode rather than logging it continuously.
+        decimate_others (int | None): Decimation factor for the other strain gauges; None (or 0, 1) only logs the
+                                      requested strain gauge.  Not used in burst mode.
     """
 
     setup = setup or load_setup()
@@ -450,25 +477,32 @@ def sine_sweep(
             f"The combination of amplitude and DC offset leads to voltages outside of the safety range for the piezo actuators ({min_voltage} - {max_voltage}V)"
         )
 
-    # Interrupt ongoing logging (this incl. resetting to defaults from the setup)
+    # Reset to the defaults from the setup; a burst needs the T7 for itself, so then also interrupt ongoing logging
+    # (otherwise enabling the logging below restarts it with the new configuration)
     # All channels should be disabled -> This may not be the default behaviour from the setup, so do this explicitly
 
-    disable_sg_logging(setup=setup)
+    if burst:
+        disable_sg_logging(setup=setup)
+    else:
+        reset_sg(setup=setup)
     disable_sg_channels(setup=setup)
 
-    # Configure + enable the logging of the requested strain gauge
+    # Configure + enable the logging of the requested strain gauge (in burst mode, this happens once the sweep runs)
 
-    enable_sg_logging(
-        sg_name=strain_gauge,
-        voltage_range=sine_sweep_labjack_logging.voltage_range,
-        neg_voltage_range=sine_sweep_labjack_logging.neg_voltage_range,
-        resolution_index=sine_sweep_labjack_logging.resolution_index,
-        scan_rate=scan_rate,
-        setup=setup,
-        stream_resolution_index=_piezo_test_stream_resolution_index(
-            piezo_tests_setup.sine_sweep
-        ),
+    stream_resolution_index = _piezo_test_stream_resolution_index(
+        piezo_tests_setup.sine_sweep
     )
+    if not burst:
+        enable_sg_logging(
+            sg_name=strain_gauge,
+            voltage_range=sine_sweep_labjack_logging.voltage_range,
+            neg_voltage_range=sine_sweep_labjack_logging.neg_voltage_range,
+            resolution_index=sine_sweep_labjack_logging.resolution_index,
+            scan_rate=scan_rate,
+            setup=setup,
+            stream_resolution_index=stream_resolution_index,
+            decimate_others=decimate_others or 1,
+        )
 
     # Configure and initiate the sine sweep (keeps on going until the wave generation is stopped explicitly)
 
@@ -487,7 +521,19 @@ def sine_sweep(
     # Since the sine sweep starts at random time in the sweep, we let it go on for twice the requested duration, to
     # ensure that we get at least one full sine sweep.
 
-    time.sleep(2 * float(sweep_time))
+    if burst:
+        record_sg_burst(
+            sg_name=strain_gauge,
+            duration=2 * float(sweep_time),
+            voltage_range=sine_sweep_labjack_logging.voltage_range,
+            neg_voltage_range=sine_sweep_labjack_logging.neg_voltage_range,
+            resolution_index=sine_sweep_labjack_logging.resolution_index,
+            scan_rate=scan_rate,
+            setup=setup,
+            stream_resolution_index=stream_resolution_index,
+        )
+    else:
+        time.sleep(2 * float(sweep_time))
 
     # Stop the wave generation + reset the wave generators + disable the logging of the strain gauges
 
@@ -630,10 +676,11 @@ def ramp(
             "The amplitude for the voltage ramp has an amplitude of 0Vpp, which is not supported"
         )
 
-    # Interrupt ongoing logging (this incl. resetting to defaults from the setup) and re-start logging with the
-    # default configuration (except for the output folder and filenames: these should pertain to the obsid)
+    # Reset to the defaults from the setup and log with the default configuration (except for the output folder and
+    # filenames: these should pertain to the obsid).  A session that already streams with that configuration keeps
+    # streaming and only continues its files in the folder of this obsid.
 
-    disable_sg_logging(setup=setup)
+    reset_sg(setup=setup)
     enable_all_sg_logging(
         setup=setup,
         stream_resolution_index=_piezo_test_stream_resolution_index(
@@ -704,6 +751,7 @@ def start_ramp(
         start_time = time.monotonic()
 
         start_signal_trigger()
+        wait_for_sg_trigger(required=_sg_trigger_expected(setup))  # First ramp only
         time.sleep(1)
         stop_signal_trigger()
 
@@ -784,10 +832,11 @@ def plateau(
     if voltage == 0:
         raise ValueError("Plateau for piezo actuators is 0V, which is not supported")
 
-    # Interrupt ongoing logging (this incl. resetting to defaults from the setup) and re-start logging with the
-    # default configuration (except for the output folder and filenames: these should pertain to the obsid)
+    # Reset to the defaults from the setup and log with the default configuration (except for the output folder and
+    # filenames: these should pertain to the obsid).  A session that already streams with that configuration keeps
+    # streaming and only continues its files in the folder of this obsid.
 
-    disable_sg_logging(setup=setup)
+    reset_sg(setup=setup)
     enable_all_sg_logging(
         setup=setup,
         stream_resolution_index=_piezo_test_stream_resolution_index(
@@ -816,6 +865,7 @@ def plateau(
     # External trigger, coming from the Raspberry Pi -> Start waveform generation (plateau)
 
     start_signal_trigger()
+    wait_for_sg_trigger(required=_sg_trigger_expected(setup))
     time.sleep(duration + 2 * edges)
     stop_signal_trigger()
 
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from tvac.labjack_replay import ReplayLJM, StreamRecorder, read_recording
+from tvac.labjack_sim import LJMError, errorcodes
+
+CHANNELS = ["AIN0", "AIN2"]
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Two data reads, a stream error, and a third data read."""
+    batches = [
+        np.arange(10, dtype=float).reshape(5, 2),
+        np.arange(10, 20, dtype=float).reshape(5, 2),
+        np.arange(20, 30, dtype=float).reshape(5, 2),
+    ]
+    path = tmp_path / "session.ljr"
+    recorder = StreamRecorder(
+        path,
+        header={
+            "channel_names": CHANNELS,
+            "scan_rate": 1000.0,
+            "serial_number": 470012345,
+        },
+    )
+    recorder.write(batches[0].ravel().tolist(), 3, 0, 1_000_000_000)
+    recorder.write(batches[1].ravel().tolist(), 7, 5, 1_005_000_000)
+    recorder.write_error(errorcodes.STREAM_SCAN_OVERLAP, 1_006_000_000)
+    recorder.write(batches[2].ravel().tolist(), 0, 0, 1_010_000_000)
+    recorder.close()
+    return path, batches
+
+
+def test_read_recording(recording):
+    path, batches = recording
+
+    header, records = read_recording(path)
+
+    assert header["channel_names"] == CHANNELS
+    assert header["scan_rate"] == 1000.0
+    assert [record[0] for record in records] == ["data", "data", "error", "data"]
+    _, arrival_ns, device_backlog, ljm_backlog, values = records[1]
+    assert (arrival_ns, device_backlog, ljm_backlog) == (1_005_000_000, 7, 5)
+    np.testing.assert_array_equal(values, batches[1].ravel())
+    _, _, code, _, values = records[2]
+    assert code == errorcodes.STREAM_SCAN_OVERLAP
+    assert values.size == 0
+
+
+def test_read_recording_ignores_truncated_record(recording):
+    path, _ = recording
+    path.write_bytes(path.read_bytes()[:-8])
+
+    _, records = read_recording(path)
+
+    assert [record[0] for record in records] == ["data", "data", "error"]
+
+
+def test_read_recording_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_recording.ljr"
+    path.write_bytes(b"0123456789")
+
+    with pytest.raises(ValueError):
+        read_recording(path)
+
+
+def test_replay_round_trip(recording):
+    path, batches = recording
+    ljm = ReplayLJM(path, speed=None)
+    handle = ljm.openS("T7", "USB", "ANY")
+    addresses, _ = ljm.namesToAddresses(len(CHANNELS), CHANNELS)
+
+    assert ljm.getHandleInfo(handle)[2] == 470012345
+    assert ljm.eStreamStart(handle, 5, len(CHANNELS), addresses, 500.0) == 1000.0
+    try:
+        data, device_backlog, _ = ljm.eStreamRead(handle)
+        np.testing.assert_array_equal(data, batches[0].ravel())
+        assert device_backlog == 3
+        data, device_backlog, ljm_backlog = ljm.eStreamRead(handle)
+        np.testing.assert_array_equal(data, batches[1].ravel())
+        assert device_backlog == 7
+        assert ljm_backlog >= 5
+
+        # The recorded error is raised at the same position in the reads.
+        with pytest.raises(LJMError) as excinfo:
+            ljm.eStreamRead(handle)
+        assert excinfo.value.errorCode == errorcodes.STREAM_SCAN_OVERLAP
+
+        data, _, _ = ljm.eStreamRead(handle)
+        np.testing.assert_array_equal(data, batches[2].ravel())
+        assert ljm.wait_until_drained(timeout=5.0)
+    finally:
+        ljm.eStreamStop(handle)
+
+
+def test_replay_rejects_other_channel_count(recording):
+    path, _ = recording
+    ljm = ReplayLJM(path, speed=None)
+    handle = ljm.openS("T7", "USB", "ANY")
+    addresses, _ = ljm.namesToAddresses(1, ["AIN0"])
+
+    with pytest.raises(LJMError):
+        ljm.eStreamStart(handle, 5, 1, addresses, 1000.0)
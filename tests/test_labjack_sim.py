@@ -0,0 +1,273 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from tvac.labjack_sim import (
+    Drift,
+    LJMError,
+    Noise,
+    Offset,
+    Pulse,
+    Sine,
+    Step,
+    SyntheticLJM,
+    errorcodes,
+)
+
+SCAN_RATE = 1000.0
+
+
+@pytest.fixture
+def streams():
+    """Start streams on simulated T7s and stop whatever is still running."""
+    started = []
+
+    def start(ljm, names, scans_per_read=100, scan_rate=SCAN_RATE, registers=None):
+        handle = ljm.openS("T7", "USB", "ANY")
+        if registers:
+            ljm.eWriteNames(
+                handle, len(registers), list(registers), list(registers.values())
+            )
+        addresses, _ = ljm.namesToAddresses(len(names), names)
+        ljm.eStreamStart(handle, scans_per_read, len(names), addresses, scan_rate)
+        started.append((ljm, handle))
+        return handle
+
+    yield start
+
+    for ljm, handle in started:
+        try:
+            ljm.eStreamStop(handle)
+        except LJMError:
+            pass  # Already stopped by the test, or by the end of a burst
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+# -- Signal components -------------------------------------------------------
+
+
+def test_signal_components():
+    t = np.array([0.0, 0.25, 0.5, 1.0, 1.5])
+    rng = np.random.default_rng(0)
+
+    np.testing.assert_array_equal(Offset(2.0).sample(t, rng), np.full(5, 2.0))
+    np.testing.assert_allclose(
+        Sine(3.0, 1.0).sample(t, rng), [0.0, 3.0, 0.0, 0.0, 0.0], atol=1e-12
+    )
+    np.testing.assert_allclose(
+        Sine(3.0, 1.0, phase=np.pi / 2).sample(t, rng)[:2], [3.0, 0.0], atol=1e-12
+    )
+    np.testing.assert_array_equal(
+        Step(5.0, at=0.5).sample(t, rng), [0.0, 0.0, 5.0, 5.0, 5.0]
+    )
+    np.testing.assert_allclose(Drift(2.0).sample(t, rng), 2.0 * t)
+
+
+def test_pulse():
+    t = np.arange(0.0, 2.0, 0.1)
+    rng = np.random.default_rng(0)
+
+    single = Pulse(bit=3, start=0.5, width=0.2).sample(t, rng)
+    assert set(single) == {0.0, 8.0}
+    np.testing.assert_array_equal(np.flatnonzero(single), [5, 6])
+
+    repeated = Pulse(bit=0, start=0.5, width=0.2, period=1.0).sample(t, rng)
+    np.testing.assert_array_equal(np.flatnonzero(repeated), [5, 6, 15, 16])
+
+
+def test_noise():
+    t = np.zeros(100_000)
+
+    values = Noise(20e-6).sample(t, np.random.default_rng(1))
+
+    assert abs(values.mean()) < 1e-6
+    assert values.std() == pytest.approx(20e-6, rel=0.02)
+
+
+def test_stream_sums_components_per_channel(streams):
+    ljm = SyntheticLJM(
+        signals={"AIN0": [Offset(1.0), Drift(2.0)]},
+        default_signal=[Offset(-1.0)],
+        time_scale=None,
+    )
+    handle = streams(ljm, ["AIN0", "AIN2"])
+
+    data, _, _ = ljm.eStreamRead(handle)
+
+    scans = np.asarray(data).reshape(-1, 2)
+    t = np.arange(100) / SCAN_RATE
+    np.testing.assert_allclose(scans[:, 0], 1.0 + 2.0 * t)
+    np.testing.assert_array_equal(scans[:, 1], -1.0)
+
+
+def test_noise_is_reproducible_with_a_seed(streams):
+    values = []
+    for _ in range(2):
+        ljm = SyntheticLJM(default_signal=[Noise(1e-3)], seed=7, time_scale=None)
+        handle = streams(ljm, ["AIN0"])
+        values.append(ljm.eStreamRead(handle)[0])
+        ljm.eStreamStop(handle)
+
+    assert values[0] == values[1]
+
+
+# -- Backlog and overflow accounting ----------------------------------------
+
+
+def test_max_speed_waits_for_the_consumer(streams):
+    ljm = SyntheticLJM(time_scale=None, max_buffered_scans=300)
+    handle = streams(ljm, ["AIN0"])
+
+    _wait_for(lambda: ljm.buffered_scans == 300)
+    time.sleep(0.1)
+    assert ljm.buffered_scans == 300
+
+    _, _, ljm_backlog = ljm.eStreamRead(handle)
+
+    assert ljm_backlog == 200
+    assert ljm.overflowed_scans == 0
+
+
+def test_real_time_overflow_discards_the_oldest_scans(streams):
+    ljm = SyntheticLJM(
+        default_signal=[Drift(1.0)], time_scale=100.0, max_buffered_scans=300
+    )
+    handle = streams(ljm, ["AIN0"])
+
+    _wait_for(lambda: ljm.overflowed_scans >= 1000)
+    assert ljm.buffered_scans <= 300
+
+    data, _, _ = ljm.eStreamRead(handle)
+
+    # Drift(1.0) reads the scan time, so the first value tells which scan
+    # the read starts at: everything before it was lost.
+    first_scan = round(data[0] * SCAN_RATE)
+    assert first_scan > 0
+    assert first_scan % 100 == 0
+    assert first_scan <= ljm.overflowed_scans
+
+
+def test_device_backlog(streams):
+    ljm = SyntheticLJM(device_backlog=lambda scan_index: scan_index, time_scale=None)
+    handle = streams(ljm, ["AIN0"])
+
+    backlogs = [ljm.eStreamRead(handle)[1] for _ in range(3)]
+
+    assert backlogs == [0, 100, 200]
+
+
+# -- Error injection ---------------------------------------------------------
+
+
+def test_inject_error(streams):
+    ljm = SyntheticLJM(time_scale=None)
+    handle = streams(ljm, ["AIN0"])
+    ljm.inject_error(errorcodes.STREAM_SCAN_OVERLAP, after_reads=1)
+
+    ljm.eStreamRead(handle)
+    with pytest.raises(LJMError) as excinfo:
+        ljm.eStreamRead(handle)
+    assert excinfo.value.errorCode == errorcodes.STREAM_SCAN_OVERLAP
+    ljm.eStreamRead(handle)
+
+
+def test_scan_rate_above_the_device_limit(streams):
+    ljm = SyntheticLJM(time_scale=None, max_sample_rate=10_000.0)
+    handle = streams(ljm, ["AIN0", "AIN2"], scan_rate=6000.0)
+
+    with pytest.raises(LJMError) as excinfo:
+        ljm.eStreamRead(handle)
+    assert excinfo.value.errorCode == errorcodes.STREAM_SCAN_OVERLAP
+
+
+def test_disconnect(streams):
+    ljm = SyntheticLJM(time_scale=None)
+    handle = streams(ljm, ["AIN0"])
+
+    ljm.disconnect(duration_s=60.0)
+
+    with pytest.raises(LJMError) as excinfo:
+        ljm.eStreamRead(handle)
+    assert excinfo.value.errorCode == errorcodes.DEVICE_DISCONNECTED
+    with pytest.raises(LJMError) as excinfo:
+        ljm.openS("T7", "USB", "ANY")
+    assert excinfo.value.errorCode == errorcodes.NO_DEVICES_FOUND
+
+
+def test_inject_auto_recovery(streams):
+    ljm = SyntheticLJM(default_signal=[Offset(1.0)], time_scale=None)
+    handle = streams(ljm, ["AIN0"])
+    ljm.inject_auto_recovery(10, after_reads=0)
+
+    data, _, _ = ljm.eStreamRead(handle)
+
+    assert data[:10] == [-9999.0] * 10
+    assert data[10:] == [1.0] * 90
+
+
+# -- Bursts ------------------------------------------------------------------
+
+
+def test_burst_ends_after_stream_num_scans(streams):
+    ljm = SyntheticLJM(default_signal=[Drift(1.0)], time_scale=None)
+    handle = streams(ljm, ["AIN0"], registers={"STREAM_NUM_SCANS": 250})
+
+    sizes = [len(ljm.eStreamRead(handle)[0]) for _ in range(3)]
+
+    assert sizes == [100, 100, 50]
+    assert ljm.wait_until_drained(timeout=5.0)
+    with pytest.raises(LJMError) as excinfo:
+        ljm.eStreamRead(handle)
+    assert excinfo.value.errorCode == errorcodes.STREAM_BURST_COMPLETE
+
+
+def test_burst_end_reaches_the_callback(streams):
+    ljm = SyntheticLJM(time_scale=None)
+    results = []
+    done = threading.Event()
+
+    def callback(handle):
+        try:
+            results.append(len(ljm.eStreamRead(handle)[0]))
+        except LJMError as exc:
+            results.append(exc.errorCode)
+            done.set()
+
+    handle = streams(ljm, ["AIN0"], registers={"STREAM_NUM_SCANS": 150})
+    ljm.setStreamCallback(handle, callback)
+
+    assert done.wait(5.0)
+    assert results == [100, 50, errorcodes.STREAM_BURST_COMPLETE]
+
+
+# -- Triggered start ---------------------------------------------------------
+
+
+def test_armed_stream_starts_on_trigger(streams):
+    ljm = SyntheticLJM(default_signal=[Drift(1.0)], time_scale=None)
+    ljm.trigger()  # An edge before the stream is armed is missed
+    handle = streams(ljm, ["AIN0"], registers={"STREAM_TRIGGER_INDEX": 2000})
+
+    time.sleep(0.2)
+    assert ljm.buffered_scans == 0
+
+    ljm.trigger(delay_s=0.05)
+    data, _, _ = ljm.eStreamRead(handle)
+
+    # Scan 0 is acquired at the edge.
+    np.testing.assert_allclose(data, np.arange(100) / SCAN_RATE)
+
+
+def test_unarmed_stream_starts_at_once(streams):
+    ljm = SyntheticLJM(time_scale=None)
+    streams(ljm, ["AIN0"], registers={"STREAM_TRIGGER_INDEX": 0})
+
+    _wait_for(lambda: ljm.buffered_scans > 0)
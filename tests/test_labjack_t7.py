@@ -0,0 +1,107 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("egse.setup")
+
+from tvac.labjack_sim import LJMError, SyntheticLJM
+from tvac.labjack_t7 import LabJackT7Logger, LabJackT7Poller
+
+
+class _SlowStopLJM(SyntheticLJM):
+    """Simulated T7 whose eStreamStop takes a while, to race it."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.stopping = threading.Event()
+
+    def eStreamStop(self, handle):
+        self.stopping.set()
+        time.sleep(0.2)
+        super().eStreamStop(handle)
+
+
+def _errors(logger):
+    errors = []
+    logger.error_handler = errors.append
+    return errors
+
+
+def test_poller_reports_a_failing_callback():
+    logger = LabJackT7Poller([0], scan_rate=50.0, backend=SyntheticLJM())
+    errors = _errors(logger)
+
+    def callback(**kwargs):
+        raise ValueError("sink rejected the batch")
+
+    logger.start_stream(callback, batch=True)
+    try:
+        deadline = time.monotonic() + 5.0
+        while not errors and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [str(error) for error in errors] == ["sink rejected the batch"]
+        assert logger.stream_stats()["failed"] == "sink rejected the batch"
+    finally:
+        logger.close()
+
+
+def test_stop_wins_over_a_restart_in_progress():
+    backend = _SlowStopLJM(time_scale=1.0)
+    logger = LabJackT7Logger([0], scan_rate=1000.0, backend=backend)
+    logger.start_stream(lambda **kwargs: None, batch=True)
+
+    restart = threading.Thread(target=logger.restart_stream, args=(200,))
+    restart.start()
+    assert backend.stopping.wait(5.0)
+    logger.stop_stream()
+    restart.join(5.0)
+
+    assert logger.restarts == 0
+    with pytest.raises(LJMError):
+        backend.eStreamRead(logger._handle)  # Nothing left streaming
+    logger.close()
+
+
+def test_failed_restart_is_reported():
+    backend = SyntheticLJM(time_scale=1.0)
+    logger = LabJackT7Logger([0], scan_rate=1000.0, backend=backend)
+    errors = _errors(logger)
+    logger.start_stream(lambda **kwargs: None, batch=True)
+
+    def refuse(*args, **kwargs):
+        raise LJMError(errorString="LJME_DEVICE_NOT_OPEN")
+
+    backend.eStreamStart = refuse
+    logger.restart_stream(200)
+
+    assert [str(error) for error in errors] == ["LJME_DEVICE_NOT_OPEN"]
+    assert logger.last_error is errors[0]
+    assert logger.stream_stats()["failed"] == "LJME_DEVICE_NOT_OPEN"
+    logger.close()
+
+
+def test_capture_burst():
+    logger = LabJackT7Logger([0, 2], scan_rate=1000.0, backend=SyntheticLJM())
+
+    timestamps_ns, readings = logger.capture_burst(250)
+
+    assert readings.shape == (250, 2)
+    assert not np.isnan(readings).any()
+    assert np.all(np.diff(timestamps_ns) > 0)
+    logger.close()
+
+
+def test_capture_burst_raises_the_stream_error():
+    backend = SyntheticLJM()
+    logger = LabJackT7Logger([0], scan_rate=1000.0, backend=backend)
+    backend.inject_error(backend.errorcodes.DEVICE_DISCONNECTED, after_reads=1)
+
+    t_start = time.monotonic()
+    with pytest.raises(LJMError) as excinfo:
+        logger.capture_burst(5000, timeout=30.0)
+
+    assert excinfo.value.errorCode == backend.errorcodes.DEVICE_DISCONNECTED
+    assert time.monotonic() - t_start < 5.0
+    logger.close()
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+pytest.importorskip("egse.setup")
+
+from scripts.sg_load_test import cli
+from tvac.labjack_replay import StreamRecorder
+
+
+def test_replay_command(tmp_path):
+    path = tmp_path / "session.ljr"
+    recorder = StreamRecorder(
+        path, header={"channel_names": ["AIN0", "AIN2"], "scan_rate": 1000.0}
+    )
+    for index in range(10):
+        recorder.write(np.full(200, 1e-3), 0, 0, index * 100_000_000)
+    recorder.close()
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "replay",
+            str(path),
+            "--speed",
+            "max",
+            "--no-plot",
+            "--save-path",
+            str(tmp_path / "csv"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Scans lost in the simulated LJM buffer: 0" in result.output
+    (csv_file,) = (tmp_path / "csv").glob("*.csv")
+    assert len(csv_file.read_text().splitlines()) == 1 + 10 * 100
@@ -0,0 +1,217 @@
+import threading
+
+import numpy as np
+import pytest
+
+from tvac.strain_gauge_pipeline import BlockPool, SinkPipeline, SinkPolicy
+
+CHANNELS = ["AIN0", "AIN2"]
+
+
+class _Sink:
+    """Records the batches it gets; ``gate`` holds it inside the handler."""
+
+    def __init__(self, gated=False):
+        self.gate = threading.Event()
+        if not gated:
+            self.gate.set()
+        self.entered = threading.Event()
+        self.batches = []
+
+    def __call__(self, **batch):
+        self.entered.set()
+        self.gate.wait(5)
+        # The readings are a view of a reused block: copy them.
+        self.batches.append({**batch, "readings": batch["readings"].copy()})
+
+
+def _push(pipeline, scan_index0, n_scans=4, gap_scans=0):
+    pipeline.push(
+        scan_index0=scan_index0,
+        t0_ns=1_000_000 * scan_index0,
+        scan_rate=1000.0,
+        readings=np.full((n_scans, 2), float(scan_index0)),
+        channel_names=CHANNELS,
+        device_backlog=0,
+        ljm_backlog=0,
+        gap_scans=gap_scans,
+        source="T7",
+    )
+
+
+def _pipeline_with_a_stuck_sink(policy, capacity=2, **kwargs):
+    """A pipeline whose only sink is busy with the batch of scan 0."""
+    sink = _Sink(gated=True)
+    pipeline = SinkPipeline(2, max_scans=4, capacity=capacity, **kwargs)
+    pipeline.add_sink("slow", sink, policy)
+    pipeline.start()
+    _push(pipeline, 0)
+    assert sink.entered.wait(5)
+    return pipeline, sink
+
+
+def test_block_pool_reference_counting():
+    pool = BlockPool(2, max_scans=4, n_channels=2)
+
+    block_id = pool.acquire(refs=2)
+    pool.release(block_id)
+    assert pool.free == 1
+    pool.release(block_id)
+    assert pool.free == 2
+
+    pool.acquire(refs=1)
+    pool.acquire(refs=1)
+    assert pool.acquire(refs=1) is None
+    pool.grow()
+    assert pool.stats() == {"blocks": 3, "free": 1, "low_water": 0, "allocations": 1}
+
+
+def test_batches_reach_every_sink_in_order():
+    sinks = [_Sink(), _Sink()]
+    pipeline = SinkPipeline(3, max_scans=4, capacity=8)
+    for i, sink in enumerate(sinks):
+        pipeline.add_sink(f"sink{i}", sink)
+    pipeline.start()
+
+    for scan_index0 in (0, 4, 8):
+        _push(pipeline, scan_index0)
+    assert pipeline.drain(timeout=5)
+    pipeline.stop()
+
+    for sink in sinks:
+        assert [b["scan_index0"] for b in sink.batches] == [0, 4, 8]
+        assert sink.batches[1]["readings"].shape == (4, 2)
+        assert (sink.batches[1]["readings"] == 4.0).all()
+        assert sink.batches[0]["source"] == "T7"
+    assert pipeline.scans_written == 12
+    assert pipeline.pool_stats()["allocations"] == 0
+
+
+def test_large_batch_is_split_over_blocks():
+    sink = _Sink()
+    pipeline = SinkPipeline(2, max_scans=4, capacity=8)
+    pipeline.add_sink("sink", sink)
+    pipeline.start()
+
+    _push(pipeline, 100, n_scans=10, gap_scans=3)
+    pipeline.stop()
+
+    batches = sink.batches
+    assert [b["scan_index0"] for b in batches] == [100, 104, 108]
+    assert [len(b["readings"]) for b in batches] == [4, 4, 2]
+    assert [b["t0_ns"] for b in batches] == [100_000_000, 104_000_000, 108_000_000]
+    # The gap precedes the batch, so only its first block reports it.
+    assert [b["gap_scans"] for b in batches] == [3, 0, 0]
+
+
+def test_drop_oldest_discards_the_oldest_queued_batch():
+    pipeline, sink = _pipeline_with_a_stuck_sink(SinkPolicy.DROP_OLDEST)
+
+    _push(pipeline, 4)
+    _push(pipeline, 8)  # No free block: the batch of scan 4 is dropped.
+    sink.gate.set()
+    pipeline.stop()
+
+    assert [b["scan_index0"] for b in sink.batches] == [0, 8]
+    stats = pipeline.stats()["slow"]
+    assert stats["dropped_scans"] == 4
+    assert stats["processed_scans"] == 8
+    assert stats["lag_scans"] == 0
+
+
+def test_spill_keeps_every_batch_in_order():
+    pipeline, sink = _pipeline_with_a_stuck_sink(SinkPolicy.SPILL)
+
+    _push(pipeline, 4)
+    _push(pipeline, 8)  # The batch of scan 4 moves to the spill queue.
+    _push(pipeline, 12)
+    sink.gate.set()
+    pipeline.stop()
+
+    assert [b["scan_index0"] for b in sink.batches] == [0, 4, 8, 12]
+    assert (sink.batches[1]["readings"] == 4.0).all()
+    assert pipeline.stats()["slow"]["spilled_scans"] == 8
+    pool_stats = pipeline.pool_stats()
+    assert pool_stats["spill_copies"] == 2
+    assert pool_stats["allocations"] == 2
+
+
+def test_block_waits_for_the_sink():
+    pipeline, sink = _pipeline_with_a_stuck_sink(SinkPolicy.BLOCK, block_timeout_s=5)
+    _push(pipeline, 4)
+
+    pushed = threading.Event()
+
+    def push_next():
+        _push(pipeline, 8)
+        pushed.set()
+
+    threading.Thread(target=push_next, daemon=True).start()
+    assert not pushed.wait(0.2)
+    sink.gate.set()
+    assert pushed.wait(5)
+    pipeline.stop()
+
+    assert [b["scan_index0"] for b in sink.batches] == [0, 4, 8]
+    assert pipeline.stats()["slow"]["block_timeouts"] == 0
+
+
+def test_block_gives_up_after_the_timeout():
+    pipeline, sink = _pipeline_with_a_stuck_sink(SinkPolicy.BLOCK, block_timeout_s=0.05)
+
+    _push(pipeline, 4)
+    _push(pipeline, 8)
+    sink.gate.set()
+    pipeline.stop()
+
+    assert [b["scan_index0"] for b in sink.batches] == [0, 8]
+    stats = pipeline.stats()["slow"]
+    assert stats["block_timeouts"] == 1
+    assert stats["dropped_scans"] == 4
+
+
+def test_pool_grows_when_every_block_is_in_use():
+    pipeline, sink = _pipeline_with_a_stuck_sink(SinkPolicy.DROP_OLDEST, capacity=1)
+
+    _push(pipeline, 4)
+    sink.gate.set()
+    pipeline.stop()
+
+    assert [b["scan_index0"] for b in sink.batches] == [0, 4]
+    assert pipeline.pool_stats()["blocks"] == 2
+    assert pipeline.pool_stats()["allocations"] == 1
+
+
+def test_failing_sink_is_counted_and_keeps_running(capsys):
+    def failing(**batch):
+        raise OSError("disk full")
+
+    sink = _Sink()
+    pipeline = SinkPipeline(2, max_scans=4, capacity=4)
+    pipeline.add_sink("failing", failing)
+    pipeline.add_sink("ok", sink)
+    pipeline.start()
+
+    _push(pipeline, 0)
+    _push(pipeline, 4)
+    pipeline.stop()
+
+    assert pipeline.stats()["failing"]["errors"] == 2
+    assert len(sink.batches) == 2
+    assert capsys.readouterr().out.count("disk full") == 1
+
+
+def test_drain_times_out_on_a_stuck_sink():
+    pipeline, sink = _pipeline_with_a_stuck_sink(SinkPolicy.DROP_OLDEST)
+
+    assert not pipeline.drain(timeout=0.05)
+    sink.gate.set()
+    assert pipeline.drain(timeout=5)
+    pipeline.stop()
+
+
+def test_rejects_a_batch_wider_than_the_pipeline():
+    pipeline = SinkPipeline(1, max_scans=4)
+
+    with pytest.raises(ValueError, match="at most 1"):
+        _push(pipeline, 0)
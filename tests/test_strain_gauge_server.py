@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+pytest.importorskip("egse.setup")
+pytest.importorskip("zmq")
+
+from tvac import strain_gauge
+
+
+@pytest.fixture
+def server_set():
+    # Nothing listens here; the calls below must fail before sending.
+    strain_gauge.set_sg_server("tcp://localhost:1")
+    yield
+    strain_gauge.set_sg_server(None)
+
+
+@pytest.mark.parametrize(
+    "func, kwargs",
+    [
+        (strain_gauge.start_sg_logging, {"extra_sinks": {"capture": print}}),
+        (strain_gauge.start_sg_logging, {"stream_out": [object()]}),
+        (strain_gauge.update_sg_logging, {"extra_sinks": {"capture": print}}),
+    ],
+)
+def test_local_only_arguments_are_refused(server_set, func, kwargs):
+    with pytest.raises(ValueError, match="only exist in this process"):
+        func(**kwargs)
+
+
+def test_replay_is_refused(server_set, tmp_path):
+    with pytest.raises(RuntimeError, match="TVAC_SG_SERVER"):
+        strain_gauge.replay_sg_recording(tmp_path / "session.ljr")
+
+
+def test_server_listens_on_localhost():
+    from tvac.strain_gauge_server import StrainGaugeClient, StrainGaugeServer
+
+    server = StrainGaugeServer(command_port=46720, data_port=46721)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = StrainGaugeClient("tcp://127.0.0.1:46720", timeout_s=5.0)
+    try:
+        assert client.ping()
+        assert client.call("describe")["data_port"] == 46721
+    finally:
+        client.shutdown()
+        client.close()
+        thread.join(timeout=5.0)
+    assert server.interface == "127.0.0.1"
+    assert not thread.is_alive()
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("egse.setup")
+
+from egse.setup import Setup
+
+from tvac import strain_gauge
+from tvac.labjack_sim import SyntheticLJM
+
+SCAN_RATE = 1000.0
+
+
+def _setup(save_path, base_filename: str) -> Setup:
+    channels = {
+        f"SG_AIN{ain}": {
+            "ain_channel": ain,
+            "voltage_range": 0.1,
+            "neg_voltage_range": 10.0,
+            "resolution_index": 0,
+        }
+        for ain in (0, 2)
+    }
+    return Setup(
+        {
+            "gse": {
+                "labjack_t7": {
+                    "channels": channels,
+                    "stream": {
+                        "scan_rate": SCAN_RATE,
+                        "resync_interval_s": 60,
+                        "buffer_size": 32768,
+                    },
+                    "csv": {
+                        "enabled": True,
+                        "save_path": str(save_path),
+                        "base_filename": base_filename,
+                        "max_file_size_bytes": 50_000_000,
+                    },
+                    "metrics": {"enabled": False},
+                    "plot": {
+                        "enabled": True,
+                        "window_seconds": 10,
+                        "interval_ms": 200,
+                        "show_stats": False,
+                    },
+                }
+            }
+        }
+    )
+
+
+@pytest.fixture
+def synthetic_backend():
+    backend = SyntheticLJM(time_scale=5.0)
+    strain_gauge.set_sg_backend(backend)
+    strain_gauge.reset_sg_runtime_settings()
+    yield backend
+    strain_gauge.stop_sg_logging()
+    strain_gauge.set_sg_backend(None)
+
+
+def test_status_and_updates_during_logging(tmp_path, synthetic_backend):
+    setups = [_setup(tmp_path, "sg_a"), _setup(tmp_path, "sg_b")]
+    delivered = []
+
+    def count_sink(*, readings, **kwargs):
+        delivered.append(len(readings))
+
+    strain_gauge.start_sg_logging(setup=setups[0], extra_sinks={"count": count_sink})
+
+    stop = threading.Event()
+    errors = []
+    scans_seen = []
+    results = []
+
+    def hammer(action):
+        try:
+            while not stop.is_set():
+                action()
+        except Exception as exc:
+            errors.append(exc)
+            stop.set()
+
+    def read_stream_stats():
+        stats = strain_gauge.get_sg_stream_stats()
+        if stats:
+            scans_seen.append(stats["ANY"]["scans"])
+
+    def update(setup):
+        results.append(strain_gauge.update_sg_logging(setup=setup))
+
+    threads = [
+        threading.Thread(target=hammer, args=(strain_gauge.get_sg_status,)),
+        threading.Thread(target=hammer, args=(strain_gauge.get_sg_sink_stats,)),
+        threading.Thread(target=hammer, args=(read_stream_stats,)),
+        # Two updaters fighting over the base filename: every call retargets
+        # or finds the files already switched, the stream keeps running.
+        threading.Thread(target=hammer, args=(lambda: update(setups[0]),)),
+        threading.Thread(target=hammer, args=(lambda: update(setups[1]),)),
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(2.0)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=10.0)
+
+    assert not errors
+    assert set(results) <= {"unchanged", "retargeted"}
+    assert "retargeted" in results
+    assert scans_seen == sorted(scans_seen)
+    assert scans_seen[-1] > 0
+
+    strain_gauge.stop_sg_logging()
+
+    stream_scans = scans_seen[-1]
+    rows = sum(
+        len(path.read_text().splitlines()) - 1 for path in tmp_path.glob("sg_*.csv")
+    )
+    assert sum(delivered) >= stream_scans
+    assert rows == sum(delivered)
+    assert synthetic_backend.overflowed_scans == 0
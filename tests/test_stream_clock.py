@@ -0,0 +1,130 @@
+import itertools
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from tvac.stream_clock import CoreTimerTracker, StreamClock, scan_timestamps_ns
+
+T0_NS = 1_700_000_000_000_000_000
+
+
+def _run_clock(clock, scan_rate, drift_ppm, n_reads=400, read_scans=50, seed=0):
+    """Feed reads of a device running ``drift_ppm`` slow, with up to 0.2 ms latency."""
+    rng = np.random.default_rng(seed)
+    period_ns = 1e9 / scan_rate * (1 + drift_ppm * 1e-6)
+    batches = []
+    for i in range(n_reads):
+        scan_index0 = i * read_scans
+        acquired = scan_index0 + read_scans
+        arrival_ns = T0_NS + round(acquired * period_ns) + int(rng.integers(0, 200_000))
+        batches.append(clock.update(scan_index0, read_scans, arrival_ns))
+    return batches
+
+
+def test_scan_timestamps_ns():
+    assert scan_timestamps_ns(100, 1000.0, 3).tolist() == [100, 1_000_100, 2_000_100]
+
+
+def test_clock_fits_the_drift():
+    clock = StreamClock(1000.0, window_s=10.0, read_scans=50)
+
+    _run_clock(clock, 1000.0, drift_ppm=50.0)
+
+    stats = clock.stats()
+    assert stats["drift_ppm"] == pytest.approx(50.0, abs=5.0)
+    assert 0 < stats["latency_us"] < 200
+    assert stats["observations"] == 201
+    assert stats["steps"] == 0
+
+
+def test_clock_drift_is_bounded():
+    clock = StreamClock(1000.0, window_s=10.0, max_drift_ppm=100.0, read_scans=50)
+
+    _run_clock(clock, 1000.0, drift_ppm=1000.0)
+
+    assert clock.drift_ppm == pytest.approx(100.0)
+
+
+def test_clock_timeline_is_continuous():
+    clock = StreamClock(1000.0, window_s=10.0, read_scans=50)
+
+    batches = _run_clock(clock, 1000.0, drift_ppm=-30.0)
+
+    # Every batch starts where the previous one ended, to within a nanosecond.
+    for (t0_ns, rate), (next_t0_ns, _) in itertools.pairwise(batches):
+        end_ns = (t0_ns - T0_NS) + 50 * 1e9 / rate
+        assert (next_t0_ns - T0_NS) - end_ns == pytest.approx(0, abs=1)
+        assert rate == pytest.approx(1000.0, rel=600e-6)
+
+
+def test_clock_steps_when_the_host_clock_is_set_back():
+    clock = StreamClock(1000.0, window_s=1.0, read_scans=50)
+    _run_clock(clock, 1000.0, drift_ppm=0.0, n_reads=40)
+
+    # An early observation moves the lower envelope at once.
+    t0_ns, _ = clock.update(2000, 50, T0_NS + 2_050_000_000 - 5_000_000_000)
+
+    assert clock.steps == 1
+    assert t0_ns < T0_NS
+
+
+def test_clock_grows_its_window_for_small_reads():
+    clock = StreamClock(1000.0, window_s=10.0, read_scans=500)
+
+    _run_clock(clock, 1000.0, drift_ppm=20.0, read_scans=10, n_reads=2000)
+
+    assert clock.allocations > 0
+    assert clock.stats()["observations"] == 1001
+    assert clock.drift_ppm == pytest.approx(20.0, abs=5.0)
+
+
+def test_clock_observe_does_not_allocate_arrays():
+    clock = StreamClock(1000.0, window_s=20.0, read_scans=10)
+    _run_clock(clock, 1000.0, drift_ppm=0.0, read_scans=10, n_reads=3000)
+    arrival_ns = T0_NS + 30_000 * 1_000_000
+
+    tracemalloc.start()
+    try:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for i in range(100):
+            arrival_ns += 10_000_000
+            clock.update(30_000 + 10 * i, 10, arrival_ns)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A window of 2000 observations would take 16 kB per array.
+    assert peak - current < 8000
+    assert clock.allocations == 0
+
+
+def _timer_columns(ticks):
+    ticks = np.asarray(ticks, dtype=np.int64) & 0xFFFFFFFF
+    return (ticks & 0xFFFF).astype(float), (ticks >> 16).astype(float)
+
+
+def test_core_timer_indices_and_lost_scans():
+    tracker = CoreTimerTracker(1000.0)  # 40 000 ticks per scan
+    ticks = [0, 40_000, 80_000, 200_000, 240_000]
+
+    _, indices = tracker.scan_indices(*_timer_columns(ticks))
+
+    assert indices.tolist() == [0, 1, 2, 5, 6]
+    assert tracker.stats() == {"timer_wraps": 0, "gaps": 1, "lost_scans": 2}
+
+
+def test_core_timer_unwraps_across_batches():
+    tracker = CoreTimerTracker(1000.0)
+    start = 2**32 - 80_000
+    first = [start, start + 40_000]
+    second = [start + 80_000, start + 120_000]
+
+    tracker.scan_indices(*_timer_columns(first))
+    ticks, indices = tracker.scan_indices(*_timer_columns(second))
+
+    assert ticks.tolist() == second
+    assert indices.tolist() == [2, 3]
+    assert tracker.wraps == 1
+    assert tracker.lost_scans == 0
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from tvac.stream_decimation import Decimator, RateSplit
+
+SCAN_RATE = 1000.0
+
+
+def _process(decimator, signal, batch_scans, t0_ns=0):
+    """Feed ``signal`` in batches; return the concatenated output and the batches."""
+    outputs, batches = [], []
+    for lo in range(0, len(signal), batch_scans):
+        batch_t0_ns = t0_ns + round(lo * 1e9 / SCAN_RATE)
+        index0, out_t0_ns, out, gap = decimator.process(
+            signal[lo : lo + batch_scans], batch_t0_ns, SCAN_RATE
+        )
+        outputs.append(out.copy())
+        batches.append((index0, out_t0_ns, len(out), gap))
+    return np.concatenate(outputs), batches
+
+
+def test_rejects_a_factor_below_2():
+    with pytest.raises(ValueError, match=">= 2"):
+        Decimator(1, n_channels=1, max_scans=100)
+
+
+def test_constant_input_passes_unchanged():
+    decimator = Decimator(4, n_channels=2, max_scans=100)
+    signal = np.tile([1.5, -2.0], (400, 1))
+
+    out, _ = _process(decimator, signal, 100)
+
+    # The outputs centred on the last 32 scans (the filter delay) are still due.
+    assert out.shape == (92, 2)
+    np.testing.assert_allclose(out, signal[:368:4], atol=1e-12)
+
+
+def test_output_does_not_depend_on_the_batch_size():
+    rng = np.random.default_rng(0)
+    signal = rng.normal(size=(1000, 1))
+
+    whole, _ = _process(Decimator(5, 1, max_scans=1000), signal, 1000)
+    split, batches = _process(Decimator(5, 1, max_scans=64), signal, 37)
+
+    np.testing.assert_allclose(split, whole, atol=1e-12)
+    assert len(whole) == 1000 // 5 - 8  # The last delay_scans are still due.
+    # Consecutive batches continue the decimated series without gaps.
+    index = 0
+    for index0, out_t0_ns, n_out, gap in batches:
+        if n_out:
+            assert (index0, gap) == (index, 0)
+            assert out_t0_ns == index0 * 5_000_000
+            index += n_out
+
+
+def test_anti_alias_filter():
+    t = np.arange(4000) / SCAN_RATE
+    # 10 Hz is in the passband of a factor 10 decimation (Nyquist 50 Hz),
+    # 80 Hz would alias.
+    slow = np.sin(2 * np.pi * 10 * t)[:, None]
+    fast = np.sin(2 * np.pi * 80 * t)[:, None]
+
+    slow_out, _ = _process(Decimator(10, 1, max_scans=500), slow, 500)
+    fast_out, _ = _process(Decimator(10, 1, max_scans=500), fast, 500)
+
+    # Skip the start-up of the filter.
+    np.testing.assert_allclose(slow_out[20:], slow[::10][20 : len(slow_out)], atol=1e-2)
+    assert np.abs(fast_out[20:]).max() < 1e-2
+
+
+def test_gap_restarts_the_filter():
+    decimator = Decimator(4, n_channels=1, max_scans=100)
+    decimator.process(np.zeros((100, 1)), 0, SCAN_RATE)
+
+    decimator.reset()
+    index0, t0_ns, out, gap = decimator.process(
+        np.ones((100, 1)), 200_000_000, SCAN_RATE
+    )
+
+    # The filter does not mix the zeros from before the gap into the output.
+    np.testing.assert_allclose(out, 1.0, atol=1e-12)
+    assert t0_ns == 200_000_000
+    # The last output before the gap was centred on scan 64 (sample 16).
+    assert gap == 200 // 4 - 16 - 1
+    assert index0 == 50
+
+
+def test_larger_batch_grows_the_buffers():
+    decimator = Decimator(2, n_channels=1, max_scans=10)
+
+    _process(decimator, np.ones((100, 1)), 50)
+
+    assert decimator.allocations == 1
+
+
+def test_rate_split_groups_columns_by_factor():
+    split = RateSplit(["A", "B", "C"], decimation=[1, 4, 1], max_scans=100)
+    readings = np.column_stack([np.arange(100.0), np.full(100, 2.0), -np.arange(100.0)])
+
+    batches = split.split(0, 0, SCAN_RATE, readings, gap_scans=0)
+
+    (full_factor, full), (factor, reduced) = batches
+    assert (full_factor, factor) == (1, 4)
+    assert full["channel_names"] == ["A", "C"]
+    np.testing.assert_array_equal(full["readings"], readings[:, [0, 2]])
+    assert full["scan_rate"] == SCAN_RATE
+    assert reduced["channel_names"] == ["B"]
+    assert reduced["scan_rate"] == SCAN_RATE / 4
+    np.testing.assert_allclose(reduced["readings"], 2.0, atol=1e-12)
+
+
+def test_rate_split_leaves_out_a_series_without_samples():
+    split = RateSplit(["A", "B"], decimation=[1, 10], max_scans=10)
+
+    batches = split.split(0, 0, SCAN_RATE, np.ones((10, 2)), gap_scans=0)
+
+    # The first output of factor 10 needs scan 80 (its filter delay).
+    assert [factor for factor, _ in batches] == [1]
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from tvac.stream_out import StreamOut
+
+
+class _RecordingLJM:
+    """Records the stream-out buffer writes and loop settings."""
+
+    def __init__(self):
+        self.buffer = []
+        self.registers = {}
+
+    def namesToAddresses(self, n, names):
+        return [1000] * n, [3] * n
+
+    def eWriteNames(self, handle, n, names, values):
+        self.registers.update(zip(names, values))
+
+    def eWriteName(self, handle, name, value):
+        self.registers[name] = value
+
+    def eWriteNameArray(self, handle, name, n, values):
+        assert name == "STREAM_OUT0_BUFFER_F32"
+        assert n == len(values) > 0
+        self.buffer.extend(values)
+
+
+def test_rejects_values_outside_the_dac_range():
+    with pytest.raises(ValueError, match="outside the 0-5 V DAC range"):
+        StreamOut("DAC0", [1.0, 6.0])
+    with pytest.raises(ValueError, match="not one of"):
+        StreamOut("DAC2", [1.0])
+
+
+def test_fill_repeats_or_holds_the_values():
+    out = np.empty(5)
+
+    StreamOut("DAC0", [1.0, 2.0, 3.0]).fill(2, out)
+    assert out.tolist() == [3.0, 1.0, 2.0, 3.0, 1.0]
+
+    StreamOut("DAC0", [1.0, 2.0, 3.0], repeat=False).fill(1, out)
+    assert out.tolist() == [2.0, 3.0, 3.0, 3.0, 3.0]
+
+
+def test_short_period_loops_on_the_device():
+    ljm = _RecordingLJM()
+    stream_out = StreamOut("DAC0", np.linspace(0, 5, 100))
+
+    stream_out.configure(ljm, 1, scans_per_read=50)
+    stream_out.refill(ljm, 1, acquired_scans=10_000)
+
+    assert stream_out.looping
+    assert len(ljm.buffer) == 100
+    assert ljm.registers["STREAM_OUT0_LOOP_NUM_VALUES"] == 100
+    assert stream_out.stats()["refills"] == 0
+
+
+def test_refill_tops_the_buffer_up():
+    ljm = _RecordingLJM()
+    values = np.linspace(0, 5, 1000)
+    stream_out = StreamOut("DAC0", values, repeat=False)
+
+    stream_out.configure(ljm, 1, scans_per_read=10)  # 128 values, fill to 96
+    stream_out.refill(ljm, 1, acquired_scans=30)
+
+    assert ljm.buffer == values[:126].tolist()
+    assert stream_out.stats()["refills"] == 1
+    assert stream_out.underruns == 0
+
+
+def test_single_play_holds_the_last_value():
+    ljm = _RecordingLJM()
+    values = np.linspace(0, 5, 100)
+    stream_out = StreamOut("DAC0", values, repeat=False)
+    stream_out.configure(ljm, 1, scans_per_read=10)
+
+    stream_out.refill(ljm, 1, acquired_scans=40)
+    stream_out.refill(ljm, 1, acquired_scans=80)
+
+    assert ljm.buffer == values.tolist()
+    assert ljm.registers["STREAM_OUT0_LOOP_NUM_VALUES"] == 1
+    assert ljm.registers["STREAM_OUT0_SET_LOOP"] == 1
+
+
+def test_underrun_resynchronises_the_values():
+    ljm = _RecordingLJM()
+    values = np.linspace(0, 5, 1000)
+    stream_out = StreamOut("DAC0", values, repeat=False)
+    stream_out.configure(ljm, 1, scans_per_read=10)
+
+    stream_out.refill(ljm, 1, acquired_scans=500)
+
+    assert stream_out.underruns == 1
+    assert ljm.buffer[96:] == values[500:596].tolist()
+
+
+def test_underrun_past_the_end_of_a_single_play():
+    ljm = _RecordingLJM()
+    values = np.linspace(0, 5, 200)
+    stream_out = StreamOut("DAC0", values, repeat=False)
+    stream_out.configure(ljm, 1, scans_per_read=10)
+
+    stream_out.refill(ljm, 1, acquired_scans=250)
+    stream_out.refill(ljm, 1, acquired_scans=300)
+
+    # Only the last value is written, once, and then held.
+    assert ljm.buffer == values[:96].tolist() + [5.0]
+    assert ljm.registers["STREAM_OUT0_LOOP_NUM_VALUES"] == 1
+    assert stream_out.underruns == 1
+
+
+def test_from_profile_resamples_one_period():
+    profile = {"frequency": 10.0, "V1_V": [0.0, 1.0, 2.0, 1.0]}
+
+    stream_out = StreamOut.from_profile(
+        profile, "V1_V", scan_rate=80.0, scale=2.0, offset=0.5
+    )
+
+    assert stream_out.values.tolist() == [0.5, 1.5, 2.5, 3.5, 4.5, 3.5, 2.5, 1.5]
@@ -0,0 +1,78 @@
+import pytest
+
+from tvac.stream_planner import noise_uv_rms, plan_stream, resolve_scan_rate
+
+
+def test_plan_on_the_10v_range():
+    # Resolution index 0 is index 1: 100 kS/s, 10 us per sample.
+    plan = plan_stream([10.0] * 4)
+
+    assert plan.scan_time_us == pytest.approx(40.0)
+    assert plan.max_scan_rate == pytest.approx(25_000.0)
+    assert plan.noise_uv == [pytest.approx(20 / 2**16 * 1e6)] * 4
+    assert plan.channel_names == ["CH0", "CH1", "CH2", "CH3"]
+
+
+def test_plan_counts_extra_addresses():
+    plan = plan_stream([10.0] * 4, extra_addresses=2)
+
+    assert plan.scan_time_us == pytest.approx(60.0)
+
+
+@pytest.mark.parametrize(
+    "voltage_range, index, sample_time_us",
+    [
+        (10.0, 8, 1e6 / 600 + 0.0),
+        (1.0, 1, 10.0),
+        (0.1, 1, 10.0 + 30.0),
+        # A range is rounded up to the next T7 range.
+        (0.05, 1, 10.0 + 30.0),
+        (0.01, 4, 1e6 / 11_000 + 300.0),
+    ],
+)
+def test_sample_time_per_range_and_resolution(voltage_range, index, sample_time_us):
+    plan = plan_stream([voltage_range], stream_resolution_index=index)
+
+    assert plan.sample_times_us == [pytest.approx(sample_time_us)]
+
+
+def test_explicit_settling_replaces_auto_settling():
+    plan = plan_stream([0.01, 10.0], settling_us=50.0)
+
+    assert plan.sample_times_us == [pytest.approx(60.0), pytest.approx(60.0)]
+
+
+def test_noise_grows_on_the_smaller_ranges():
+    assert noise_uv_rms(0.01, 8) == pytest.approx(0.02 / 2**13.6 * 1e6)
+    assert noise_uv_rms(1.0) < noise_uv_rms(10.0)
+    assert noise_uv_rms(10.0, 8) < noise_uv_rms(10.0, 1)
+
+
+def test_plan_rejects_unknown_settings():
+    with pytest.raises(ValueError, match="exceeds"):
+        plan_stream([20.0])
+    with pytest.raises(ValueError, match="not available in stream mode"):
+        plan_stream([10.0], stream_resolution_index=9)
+    with pytest.raises(ValueError, match="at least one"):
+        plan_stream([])
+
+
+def test_resolve_scan_rate_within_the_maximum():
+    plan = plan_stream([10.0] * 4, scan_rate=1000.0)
+
+    assert plan.feasible
+    assert resolve_scan_rate(plan, "reject") == 1000.0
+    assert resolve_scan_rate(plan_stream([10.0])) == pytest.approx(100_000.0)
+
+
+def test_resolve_scan_rate_above_the_maximum(capsys):
+    plan = plan_stream([0.01] * 2, scan_rate=5000.0)  # 2 x 310 us per scan
+
+    assert not plan.feasible
+    assert resolve_scan_rate(plan, "clamp") == pytest.approx(1e6 / 620)
+    assert "streaming at 1612.9 Hz instead" in capsys.readouterr().out
+    assert resolve_scan_rate(plan, "off") == 5000.0
+    with pytest.raises(ValueError, match="above the 1612.9 Hz"):
+        resolve_scan_rate(plan, "reject")
+    with pytest.raises(ValueError, match="Unknown rate limit policy"):
+        resolve_scan_rate(plan, "ignore")
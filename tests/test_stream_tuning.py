@@ -0,0 +1,73 @@
+import pytest
+
+from tvac.stream_tuning import ReadSizeController, scans_per_read_for
+
+
+def _controller(**kwargs):
+    kwargs = {
+        "scan_rate": 1000.0,
+        "scans_per_read": 500,
+        "target_scans": 100,
+        "max_scans": 2000,
+        "device_capacity_scans": 10_000,
+        "window": 10,
+    } | kwargs
+    return ReadSizeController(**kwargs)
+
+
+def test_scans_per_read_for():
+    assert scans_per_read_for("balanced", 1000.0) == 500
+    assert scans_per_read_for("low_latency", 10.0) == 1
+    with pytest.raises(ValueError, match="Unknown acquisition profile"):
+        scans_per_read_for("fast", 1000.0)
+
+
+def test_growing_backlog_suggests_a_larger_read():
+    controller = _controller()
+
+    for i in range(10):
+        controller.observe(device_backlog=0, ljm_backlog=100 * i, busy_s=0.01)
+
+    assert controller.suggestion == 1000
+    assert not controller.needs_restart
+
+
+def test_steady_backlog_keeps_the_read_size():
+    controller = _controller()
+
+    # Above one read, but falling: the host is catching up.
+    for i in range(10):
+        controller.observe(device_backlog=0, ljm_backlog=1500 - 50 * i, busy_s=0.01)
+
+    assert controller.suggestion == 500
+
+
+def test_idle_host_suggests_a_smaller_read():
+    controller = _controller()
+
+    for _ in range(10):
+        controller.observe(device_backlog=0, ljm_backlog=10, busy_s=0.001)
+
+    assert controller.suggestion == 250
+    assert controller.stats()["mean_backlog_scans"] == 10
+
+
+def test_trend_follows_the_window():
+    controller = _controller(window=5)
+
+    # A rising backlog that has flattened out again drops out of the window.
+    for backlog in [0, 600, 1200, 1800, 2400] + [2400] * 5:
+        controller.observe(device_backlog=0, ljm_backlog=backlog, busy_s=0.01)
+    assert controller.suggestion == 500
+
+    controller.observe(device_backlog=0, ljm_backlog=3000, busy_s=0.01)
+    assert controller.suggestion == 1000
+
+
+def test_device_backlog_calls_for_a_restart():
+    controller = _controller()
+
+    controller.observe(device_backlog=6000, ljm_backlog=0, busy_s=0.01)
+
+    assert controller.needs_restart
+    assert controller.suggestion == 1000